@@ -1,20 +1,205 @@
 #!/usr/bin/env python3
 
 import customtkinter as ctk
-import subprocess
+import configparser
+import re
+import tkinter
+from tkinter import ttk
 import time
-import multiprocessing.shared_memory as shm
-import json
-from PIL import Image, ImageTk # ImageTk is included
+from PIL import ImageTk
+from telemetry_shm import TelemetrySegment
+from telemetry_notify import ChangeListener
+from gif_frames import FrameCache
+from process_manager import ProcessManager
+from swarm_config import specs_from_dir, CONFIG_DIR
 from config import (
-    SHM_NAME, SHM_SIZE, TIMEOUT_THRESHOLD,
+    SHM_NAME, TIMEOUT_THRESHOLD,
     DRONE_IMAGE_PATH, DRONE_GIF_PATH,
     CARD_WIDTH_SMALL, CARD_HEIGHT_SMALL, FEED_WIDTH_SMALL, FEED_HEIGHT_SMALL,
-    COLORS, COLORS_DARK, COLORS_LIGHT, FONTS, COMMANDS # COLORS_DARK ve COLORS_LIGHT eklendi
+    COLORS, COLORS_DARK, COLORS_LIGHT, FONTS, COMMANDS, # COLORS_DARK ve COLORS_LIGHT eklendi
+    apply_appearance, ensure_placeholder_image,
 )
 
+# Kartlarda gösterilen telemetri alanları
+GUI_TELEMETRY_FIELDS = (
+    "latitude", "longitude", "absolute_altitude", "speed", "battery_percent",
+    "flight_mode", "pitch", "roll", "yaw"
+)
+TELEMETRY_POLL_MS = 500        # Bildirim gelmese de zaman aşımı kontrolü için
+TELEMETRY_MIN_REFRESH_MS = 50  # Yenilemeler arası en kısa süre (bildirim yoksa yoklama aralığı)
+OVERVIEW_REFRESH_MS = 250      # Genel bakış tablosu değişiklikleri toplu olarak bu aralıkla yazılır
+DISCOVERY_MS = 5000            # Config dizini yeni drone'lar için bu aralıkla taranır
+FEED_RESIZE_DEBOUNCE_MS = 150  # Pencere boyutlandırılırken kareler sadece son boyut için ölçeklenir
+GIF_POLL_MS = 30               # Arka planda hazırlanan kare setleri bu aralıkla alınır
+PROCESS_POLL_MS = 100          # Süreç yöneticisinin durum değişiklikleri bu aralıkla alınır
+SWARM_SESSION = "swarm_session" # tmux oturumu (COMMANDS["swarm"])
+
+# Kart ızgaraları: sadece görünen satırlar kadar kart oluşturulur
+DASHBOARD_COLUMNS = 2
+DASHBOARD_ROW_HEIGHT = CARD_HEIGHT_SMALL + 24
+TELEMETRY_COLUMNS = 2
+TELEMETRY_ROW_HEIGHT = 400
+
+TELEMETRY_ROW_NAMES = {
+    "latitude": "Latitude", "longitude": "Longitude", "altitude": "Altitude",
+    "speed": "Speed", "battery": "Battery", "mode": "Flight Mode",
+    "pitch": "Pitch Angle", "roll": "Roll Angle", "yaw": "Yaw Angle"
+}
+OVERVIEW_COLUMNS = (
+    ("id", "ID", 60), ("status", "Status", 130), ("mode", "Mode", 120), ("battery", "Battery", 80),
+    ("altitude", "Altitude", 100), ("speed", "Speed", 90), ("latitude", "Latitude", 120), ("longitude", "Longitude", 120),
+)
+
+def format_telemetry_texts(telemetry):
+    """Card label texts for one drone: {label_key: text}."""
+    telemetry = telemetry if isinstance(telemetry, dict) else {}
+    lat_text = f"{telemetry.get('latitude', 0.0):.6f}" if isinstance(telemetry.get('latitude'), (float, int)) else "-"
+    lon_text = f"{telemetry.get('longitude', 0.0):.6f}" if isinstance(telemetry.get('longitude'), (float, int)) else "-"
+    alt_raw = telemetry.get('absolute_altitude', telemetry.get('altitude', "-"))
+    alt_text = f"{alt_raw:.2f} m" if isinstance(alt_raw, (float, int)) else f"{alt_raw} m"
+
+    speed_val = telemetry.get('speed', '-')
+    speed_text = f"{speed_val:.2f} m/s" if isinstance(speed_val, (float, int)) else f"{speed_val} m/s"
+
+    battery_val = telemetry.get('battery_percent', None)
+    battery_text = "-%"
+    if isinstance(battery_val, (float, int)) and battery_val is not None: battery_text = f"{battery_val:.0f}%"
+    elif battery_val is not None and str(battery_val).replace('.', '', 1).isdigit(): battery_text = f"{float(battery_val):.0f}%"
+    elif battery_val is not None: battery_text = str(battery_val)
+
+    texts = {
+        "latitude": lat_text, "longitude": lon_text, "altitude": alt_text,
+        "speed": speed_text, "battery": battery_text, "mode": f"{telemetry.get('flight_mode', '-')}",
+    }
+    for key in ("pitch", "roll", "yaw"):
+        value = telemetry.get(key, '-')
+        texts[key] = f"{value:.2f}°" if isinstance(value, (float, int)) else f"{value}°"
+    return texts
+
+def drone_sessions(drone_id):
+    """tmux sessions created by the drone's launch command in COMMANDS."""
+    return (f"drone{drone_id}_session", f"drone{drone_id}_py")
+
+def controllable_drone_ids():
+    """Drone IDs that have a launch command ("droneN") in COMMANDS."""
+    ids = set()
+    for key in COMMANDS:
+        match = re.fullmatch(r"drone(\d+)", key)
+        if match:
+            ids.add(int(match.group(1)))
+    return ids
+
+def discover_drone_ids(segment=None):
+    """Drone IDs from the launch commands, droneN_config.ini files and written SHM slots."""
+    ids = controllable_drone_ids()
+    try:
+        ids.update(int(spec.drone_id) for spec in specs_from_dir(CONFIG_DIR))
+    except (OSError, ValueError, configparser.Error) as e:
+        print(f"WARNING: Could not scan config directory {CONFIG_DIR}: {e}")
+    if segment is not None:
+        ids.update(index + 1 for index, seq in enumerate(segment.sequences()) if seq)
+    return ids
+
+class VirtualCardGrid:
+    """
+    Scrollable card grid that only builds as many cards as fit on screen.
+    Cards are pooled and re-bound to whichever drone IDs are scrolled into view,
+    so widget count (and Tk work per refresh) does not grow with the swarm size.
+    """
+
+    def __init__(self, parent, columns, row_height, create_card, bind_card):
+        self.columns = columns
+        self.row_height = row_height
+        self.create_card = create_card # parent -> card dict (must contain "frame")
+        self.bind_card = bind_card     # (card, drone_id) -> fill the card for that drone
+        self.ids = []
+        self.first_row = 0
+        self.visible_rows = 1
+        self.cards = []  # pooled cards, index = position in the visible window
+        self.bound = {}  # drone_id -> card currently showing it
+
+        self.frame = ctk.CTkFrame(parent, fg_color="transparent")
+        self.area = ctk.CTkFrame(self.frame, fg_color="transparent")
+        self.area.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ctk.CTkScrollbar(self.frame, command=self.scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        for col in range(columns):
+            self.area.grid_columnconfigure(col, weight=1, uniform="cards")
+        self.area.bind("<Configure>", self._on_resize)
+        # Wheel events go to the widget under the pointer, so listen app-wide and filter
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.area.bind_all(sequence, self._on_wheel, add="+")
+
+    def total_rows(self):
+        return max(1, -(-len(self.ids) // self.columns))
+
+    def set_ids(self, ids):
+        ids = sorted(ids)
+        if ids != self.ids:
+            self.ids = ids
+            self.refresh()
+
+    def card_for(self, drone_id):
+        return self.bound.get(drone_id)
+
+    def refresh(self):
+        total_rows = self.total_rows()
+        self.first_row = max(0, min(self.first_row, total_rows - self.visible_rows))
+        start = self.first_row * self.columns
+        visible = self.ids[start:start + self.visible_rows * self.columns]
+        self.bound = {}
+        for index, card in enumerate(self.cards):
+            if index < len(visible):
+                drone_id = visible[index]
+                self.bound[drone_id] = card
+                if card["drone_id"] != drone_id:
+                    card["drone_id"] = drone_id
+                    self.bind_card(card, drone_id)
+                if not card["shown"]:
+                    card["frame"].grid()
+                    card["shown"] = True
+            else:
+                card["drone_id"] = None
+                if card["shown"]:
+                    card["frame"].grid_remove()
+                    card["shown"] = False
+        self.scrollbar.set(self.first_row / total_rows, min(1.0, (self.first_row + self.visible_rows) / total_rows))
+
+    def scroll(self, action, value, unit=None):
+        if action == "moveto":
+            self.first_row = int(round(float(value) * self.total_rows()))
+        else:
+            step = self.visible_rows if unit == "pages" else 1
+            self.first_row += step if float(value) > 0 else -step
+        self.refresh()
+
+    def _on_wheel(self, event):
+        if not self.frame.winfo_ismapped() or not str(event.widget).startswith(str(self.area)):
+            return
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll("scroll", -1, "units")
+        else:
+            self.scroll("scroll", 1, "units")
+
+    def _on_resize(self, event):
+        visible_rows = max(1, event.height // self.row_height)
+        if visible_rows == self.visible_rows and self.cards:
+            return
+        self.visible_rows = visible_rows
+        for row in range(visible_rows):
+            self.area.grid_rowconfigure(row, weight=1)
+        # Grow the pool to fill the window; surplus cards are only hidden
+        while len(self.cards) < visible_rows * self.columns:
+            index = len(self.cards)
+            card = self.create_card(self.area)
+            card["drone_id"], card["shown"] = None, True
+            card["frame"].grid(row=index // self.columns, column=index % self.columns, padx=12, pady=12, sticky="nsew")
+            self.cards.append(card)
+        self.refresh()
+
 class DroneControlCenter:
     def __init__(self):
+        apply_appearance() # Must run before the first window is created
         self.app = ctk.CTk()
         self.app.title("SwarMind PX4 Drone Control Center")
         self.app.geometry("1280x800")
@@ -29,50 +214,96 @@ class DroneControlCenter:
         self.app.grid_columnconfigure(1, weight=1) # Main content area expands (was column 2)
         self.app.grid_rowconfigure(0, weight=1) # Main row expands
 
-        # State variables
-        self.last_telemetry_update_time = {1: 0.0, 2: 0.0}
-        self.drone_process_commanded_active = {1: False, 2: False}
-        self.is_drone_connected_via_telemetry = {1: False, 2: False}
-
-        # UI element references for dashboard drone cards
-        self.dash_drone1_card_ref = None
-        self.dash_drone2_card_ref = None
-        self.drone1_dashboard_status_light = None
-        self.drone1_dashboard_status_label = None
-        self.drone2_dashboard_status_light = None
-        self.drone2_dashboard_status_label = None
-        self.drone_image_labels = {1: None, 2: None} # For image/GIF display
-
-        # GIF Animation properties
-        self.drone_gif_ctk_frames = {1: [], 2: []} # Store CTkImage objects
-        self.drone_gif_durations = {1: [], 2: []}
-        self.drone_gif_current_frame_index = {1: 0, 2: 0}
-        self.drone_gif_animation_job_id = {1: None, 2: None}
-        self.gif_loaded_successfully = {1: False, 2: False}
-
-        # UI element references for telemetry view
-        self.drone1_telemetry_connection_label = None
-        self.drone2_telemetry_connection_label = None
-        self.drone1_card_ref = None # Telemetry view card
-        self.drone2_card_ref = None # Telemetry view card
-        self.drone1_data = {} # Labels for drone 1 telemetry values
-        self.drone2_data = {} # Labels for drone 2 telemetry values
+        # State variables, keyed by drone ID (filled by _ensure_drone as drones are discovered)
+        self.last_telemetry_update_time = {}
+        self.drone_process_commanded_active = {}
+        self.is_drone_connected_via_telemetry = {}
+        self.drone_telemetry = {} # Last telemetry shown for each drone
+
+        # GIF Animation properties. Frames live in a shared (path, size) cache, so every
+        # card of the same size shows the same PhotoImages; only the frame index is per drone.
+        self.gif_cache = FrameCache(convert=ImageTk.PhotoImage)
+        self.feed_size = (FEED_WIDTH_SMALL, FEED_HEIGHT_SMALL)
+        self.pending_feed_size = None
+        self.feed_resize_job_id = None
+        self.gif_poll_job_id = None
+        self.gif_frames = None # FrameSet currently animated (may lag feed_size during a resize)
+        self.drone_gif_current_frame_index = {}
+        self.drone_gif_animation_job_id = {}
+
+        # Card grids (dashboard and telemetry view) and the overview table
+        self.dashboard_grid = None
+        self.telemetry_grid = None
+        self.overview_tree = None
+        self.overview_pending = set() # drone IDs whose overview row must be rewritten
+        self.overview_job_id = None
+        self.current_view = None
+        self.widget_state = {} # widget -> last (text, text_color) pushed to Tk
 
         self.static_placeholder_ctkimage = None # Initialize as None
-        
+
+        # Telemetry refresh: SHM change notifications + slow poll for timeouts
+        self.telemetry_job_id = None
+        self.telemetry_notify_job_id = None
+        self.last_telemetry_refresh = 0.0
+        self.telemetry_listener = None
+        # One attached SHM reader; only slots whose seq changed are decoded
+        self.telemetry_segment = None
+        self.telemetry_seqs = {}
+        self.telemetry_generation = None
+        self._setup_telemetry_notifications()
+
+        # Start/stop commands and tmux calls run on the manager's worker threads;
+        # state changes come back through its queue (never block the Tk thread)
+        self.processes = ProcessManager()
+        self.process_poll_job_id = None
+
         self.setup_ui()
+        self.discover_drones()
         self.update_telemetry()
 
-    def _load_static_placeholder_images(self, target_width, target_height):
-        """Pre-loads the static placeholder CTkImage with dynamic sizing."""
+    def _ensure_drone(self, drone_id):
+        if drone_id in self.is_drone_connected_via_telemetry:
+            return False
+        self.last_telemetry_update_time[drone_id] = 0.0
+        self.drone_process_commanded_active[drone_id] = False
+        self.is_drone_connected_via_telemetry[drone_id] = False
+        self.drone_telemetry[drone_id] = {}
+        self.drone_gif_current_frame_index[drone_id] = 0
+        self.drone_gif_animation_job_id[drone_id] = None
+        self.overview_pending.add(drone_id)
+        return True
+
+    def _publish_drone_ids(self):
+        ids = list(self.is_drone_connected_via_telemetry)
+        self.dashboard_grid.set_ids(ids)
+        self.telemetry_grid.set_ids(ids)
+        self._schedule_overview_flush()
+
+    def discover_drones(self):
+        segment = None
         try:
-            pil_image = Image.open(DRONE_IMAGE_PATH)
-            pil_image_resized = pil_image.resize((target_width, target_height), Image.Resampling.LANCZOS)
-            self.static_placeholder_ctkimage = ImageTk.PhotoImage(pil_image_resized)
+            segment = self._attach_telemetry_segment()
+        except (FileNotFoundError, ValueError):
+            pass
+        added = False
+        for drone_id in discover_drone_ids(segment):
+            added = self._ensure_drone(drone_id) or added
+        if added:
+            self._publish_drone_ids()
+        self.app.after(DISCOVERY_MS, self.discover_drones)
+
+    def _load_static_placeholder_images(self, target_width, target_height):
+        """Loads the static placeholder at the given size (cached per size, small enough to load inline)."""
+        size = (target_width, target_height)
+        already_failed = DRONE_IMAGE_PATH in self.gif_cache.failed
+        cached = self.gif_cache.get(DRONE_IMAGE_PATH, size)
+        placeholder = cached or self.gif_cache.load(ensure_placeholder_image(), size)
+        self.static_placeholder_ctkimage = placeholder.frames[0] if placeholder else None
+        if placeholder and not cached:
             print(f"INFO: Static placeholder image loaded and resized to {target_width}x{target_height}.")
-        except Exception as e:
-            print(f"ERROR: Could not load static placeholder image '{DRONE_IMAGE_PATH}': {e}")
-            self.static_placeholder_ctkimage = None
+        elif not placeholder and not already_failed:
+            print(f"ERROR: Could not load static placeholder image '{DRONE_IMAGE_PATH}': {self.gif_cache.failed[DRONE_IMAGE_PATH]}")
 
     def setup_ui(self):
         # ===== NAVIGATION SIDEBAR (Far Left) =====
@@ -101,11 +332,13 @@ class DroneControlCenter:
         self.main_content_area.grid(row=0, column=1, sticky="nswe") # Column changed from 2 to 1
         self.main_content_area.grid_propagate(False)
 
+        # Placeholder must exist before the first pooled cards are bound
+        self._load_static_placeholder_images(FEED_WIDTH_SMALL, FEED_HEIGHT_SMALL)
         self.dashboard_frame = self.create_dashboard(self.main_content_area)
         self.telemetry_frame = self.create_telemetry_display(self.main_content_area)
+        self.overview_frame = self.create_overview(self.main_content_area)
 
         self.show_dashboard()
-        self._load_static_placeholder_images(FEED_WIDTH_SMALL, FEED_HEIGHT_SMALL)
 
     def create_nav_buttons(self, parent_sidebar):
         nav_buttons_frame = ctk.CTkFrame(parent_sidebar, fg_color="transparent")
@@ -113,6 +346,7 @@ class DroneControlCenter:
         nav_buttons = [
             {"text": "Dashboard", "command": self.show_dashboard},
             {"text": "Telemetry", "command": self.show_telemetry},
+            {"text": "Overview", "command": self.show_overview},
             {"text": "Settings", "command": lambda: print("Settings clicked")}
         ]
         self.nav_button_refs = [] 
@@ -217,165 +451,172 @@ class DroneControlCenter:
                                                    text_color=self.colors["text_primary"])
         self.dashboard_header_label.pack()
 
-        cards_frame = ctk.CTkFrame(frame, fg_color="transparent")
-        cards_frame.pack(fill="both", expand=True, padx=15, pady=10)
-        cards_frame.grid_columnconfigure(0, weight=1)
-        cards_frame.grid_columnconfigure(1, weight=1)
-        cards_frame.grid_rowconfigure(0, weight=1) 
-
-        self.create_drone_card(cards_frame, "DRONE 1", drone_id=1, column_idx=0)
-        self.create_drone_card(cards_frame, "DRONE 2", drone_id=2, column_idx=1)
+        self.dashboard_grid = VirtualCardGrid(frame, DASHBOARD_COLUMNS, DASHBOARD_ROW_HEIGHT,
+                                              self.create_drone_card, self.bind_drone_card)
+        self.dashboard_grid.frame.pack(fill="both", expand=True, padx=15, pady=10)
         return frame
 
-    def create_drone_card(self, parent, title_text, drone_id, column_idx):
-        card = ctk.CTkFrame(
+    def create_drone_card(self, parent):
+        card = {}
+        frame = ctk.CTkFrame(
             parent, fg_color=self.colors["card_bg"], corner_radius=12,
             border_width=2, border_color=self.colors["gray"],
         )
-        card.grid(row=0, column=column_idx, padx=12, pady=12, sticky="nsew")
-        card.grid_propagate(False)
-
-        # Store title label references directly for easier color update
-        title_label_attr = f"drone{drone_id}_card_title_label"
-        title_label = ctk.CTkLabel(card, text=title_text, font=FONTS["subtitle"], text_color=self.colors["accent"])
-        title_label.pack(pady=(12, 8))
-        setattr(self, title_label_attr, title_label)
+        frame.grid_propagate(False)
+        card["frame"] = frame
 
-        if drone_id == 1: self.dash_drone1_card_ref = card
-        else: self.dash_drone2_card_ref = card
+        card["title"] = ctk.CTkLabel(frame, text="", font=FONTS["subtitle"], text_color=self.colors["accent"])
+        card["title"].pack(pady=(12, 8))
 
-        feed_frame = ctk.CTkFrame(card, fg_color=self.colors["dark"], corner_radius=8)
+        feed_frame = ctk.CTkFrame(frame, fg_color=self.colors["dark"], corner_radius=8)
         feed_frame.pack(pady=(5, 10), padx=10, fill="both", expand=True)
         feed_frame.pack_propagate(False) 
+        card["feed"] = feed_frame
 
         image_label = ctk.CTkLabel(feed_frame, text="")
         image_label.pack(expand=True, fill="both")
-        self.drone_image_labels[drone_id] = image_label
+        card["image"] = image_label
+        self._show_placeholder(image_label)
+        feed_frame.bind("<Configure>", lambda event: self._on_feed_resize(card, event))
 
-        if self.static_placeholder_ctkimage:
-            image_label.configure(image=self.static_placeholder_ctkimage, text="")
-        else:
-            image_label.configure(text="Placeholder N/A", font=FONTS["small"], text_color=self.colors["warning"])
-
-        def resize_image_on_frame_resize(event):
-            if event.width > 0 and event.height > 0:
-                if not self.drone_process_commanded_active[drone_id] or not self.gif_loaded_successfully[drone_id]:
-                    self._load_static_placeholder_images(event.width, event.height)
-                    if self.static_placeholder_ctkimage:
-                        image_label.configure(image=self.static_placeholder_ctkimage, text="")
-                elif self.drone_process_commanded_active[drone_id] and self.gif_loaded_successfully[drone_id]:
-                    if self.drone_gif_ctk_frames[drone_id] and (
-                        event.width != self.drone_gif_ctk_frames[drone_id][0].width() or
-                        event.height != self.drone_gif_ctk_frames[drone_id][0].height()
-                    ):
-                        print(f"INFO: Resizing GIF for Drone {drone_id} to {event.width}x{event.height}")
-                        self._load_gif_frames(drone_id, DRONE_GIF_PATH)
-                        if self.drone_gif_animation_job_id[drone_id]:
-                            self.app.after_cancel(self.drone_gif_animation_job_id[drone_id])
-                            self.drone_gif_animation_job_id[drone_id] = None
-                        self.drone_gif_current_frame_index[drone_id] = 0
-                        self._animate_gif(drone_id)
-        feed_frame.bind("<Configure>", resize_image_on_frame_resize)
-
-        status_display_frame = ctk.CTkFrame(card, fg_color="transparent")
+        status_display_frame = ctk.CTkFrame(frame, fg_color="transparent")
         status_display_frame.pack(pady=(8, 8))
-        if drone_id == 1:
-            self.drone1_dashboard_status_light, self.drone1_dashboard_status_label = \
-                self._create_dashboard_status_widgets(status_display_frame, "INACTIVE")
-        else:
-            self.drone2_dashboard_status_light, self.drone2_dashboard_status_label = \
-                self._create_dashboard_status_widgets(status_display_frame, "INACTIVE")
+        card["light"], card["status"] = self._create_dashboard_status_widgets(status_display_frame, "INACTIVE")
 
-        buttons_control_frame = ctk.CTkFrame(card, fg_color="transparent")
+        buttons_control_frame = ctk.CTkFrame(frame, fg_color="transparent")
         buttons_control_frame.pack(pady=(8, 12), padx=15, fill="x")
-        start_cmd = self.start_drone1 if drone_id == 1 else self.start_drone2
-        stop_cmd = self.stop_drone1 if drone_id == 1 else self.stop_drone2
-        
-        self.drone_start_buttons = getattr(self, 'drone_start_buttons', {})
-        self.drone_stop_buttons = getattr(self, 'drone_stop_buttons', {})
-
-        start_btn = self.create_control_button(buttons_control_frame, f"Start Drone {drone_id}", start_cmd,
-                                               self.colors["success"], self.colors["success_hover"])
-        self.drone_start_buttons[drone_id] = start_btn
-
-        stop_btn = self.create_control_button(buttons_control_frame, f"Stop Drone {drone_id}", stop_cmd,
-                                             self.colors["danger"], self.colors["danger_hover"])
-        self.drone_stop_buttons[drone_id] = stop_btn
+        # Buttons act on whichever drone the pooled card is currently showing
+        card["start"] = self.create_control_button(buttons_control_frame, "Start Drone", lambda: self.start_drone(card["drone_id"]),
+                                                   self.colors["success"], self.colors["success_hover"])
+        card["stop"] = self.create_control_button(buttons_control_frame, "Stop Drone", lambda: self.stop_drone(card["drone_id"]),
+                                                  self.colors["danger"], self.colors["danger_hover"])
         return card
 
-    def _load_gif_frames(self, drone_id, gif_path):
-        image_label_widget = self.drone_image_labels.get(drone_id)
-        if not image_label_widget:
-            print(f"ERROR: No image label widget found for Drone {drone_id} for GIF loading.")
-            self.gif_loaded_successfully[drone_id] = False
-            return
+    def bind_drone_card(self, card, drone_id):
+        card["title"].configure(text=f"DRONE {drone_id}")
+        state = "normal" if f"drone{drone_id}" in COMMANDS else "disabled"
+        card["start"].configure(text=f"Start Drone {drone_id}", state=state)
+        card["stop"].configure(text=f"Stop Drone {drone_id}", state=state)
+        if self.drone_process_commanded_active[drone_id]:
+            if self.drone_gif_animation_job_id[drone_id] is None:
+                self._animate_gif(drone_id)
+        else:
+            self._show_placeholder(card["image"])
+        self._update_telemetry_card_visuals(drone_id, self._visible_telemetry(drone_id))
 
-        current_width = image_label_widget.winfo_width()
-        current_height = image_label_widget.winfo_height()
-        if current_width == 0 or current_height == 0:
-            print(f"WARNING: Image label for Drone {drone_id} has zero dimensions. Using default for GIF.")
-            current_width, current_height = FEED_WIDTH_SMALL, FEED_HEIGHT_SMALL
+    def _image_label(self, drone_id):
+        card = self.dashboard_grid.card_for(drone_id) if self.dashboard_grid else None
+        return card["image"] if card else None
 
-        try:
-            pil_gif = Image.open(gif_path)
-            self.drone_gif_ctk_frames[drone_id] = []
-            self.drone_gif_durations[drone_id] = []
-            for i in range(pil_gif.n_frames):
-                pil_gif.seek(i)
-                pil_frame_copy = pil_gif.copy().convert("RGBA")
-                pil_frame_resized = pil_frame_copy.resize((current_width, current_height), Image.Resampling.LANCZOS)
-                self.drone_gif_ctk_frames[drone_id].append(ImageTk.PhotoImage(pil_frame_resized))
-                self.drone_gif_durations[drone_id].append(pil_gif.info.get('duration', 100))
-            self.gif_loaded_successfully[drone_id] = True
-            print(f"INFO: GIF loaded for Drone {drone_id} ({pil_gif.n_frames} frames) resized to {current_width}x{current_height}.")
-        except Exception as e:
-            print(f"ERROR: Could not load GIF for Drone {drone_id}: {e}")
-            self.gif_loaded_successfully[drone_id] = False
+    def _show_placeholder(self, image_label):
+        if self.static_placeholder_ctkimage:
+            image_label.configure(image=self.static_placeholder_ctkimage, text="")
+        else:
+            image_label.configure(text="Placeholder N/A", font=FONTS["small"], text_color=self.colors["warning"])
+
+    def _on_feed_resize(self, card, event):
+        # <Configure> fires continuously while the window is dragged; frames are only
+        # rescaled once the size has settled. All feeds share one size (uniform grid columns).
+        if event.width <= 1 or event.height <= 1:
+            return
+        self.pending_feed_size = (event.width, event.height)
+        if self.feed_resize_job_id is not None:
+            self.app.after_cancel(self.feed_resize_job_id)
+        self.feed_resize_job_id = self.app.after(FEED_RESIZE_DEBOUNCE_MS, self._apply_feed_size)
+
+    def _apply_feed_size(self):
+        self.feed_resize_job_id = None
+        if self.pending_feed_size == self.feed_size:
+            return
+        self.feed_size = self.pending_feed_size
+        print(f"INFO: Resizing drone feeds to {self.feed_size[0]}x{self.feed_size[1]}")
+        self._load_static_placeholder_images(*self.feed_size)
+        animated = False
+        for drone_id, card in self.dashboard_grid.bound.items():
+            if self.drone_gif_animation_job_id[drone_id] is not None:
+                animated = True
+            else:
+                self._show_placeholder(card["image"])
+        if animated:
+            # Running animations keep the old frames until the new size is ready
+            self._request_gif_frames()
+        else:
+            self.gif_frames = None
+
+    def _request_gif_frames(self):
+        """Frames for the current feed size, or None while they are prepared in the background."""
+        frames = self.gif_cache.request(DRONE_GIF_PATH, self.feed_size, self._on_gif_frames_ready)
+        if frames is not None:
+            self.gif_frames = frames
+        elif self.gif_cache.pending():
+            self._schedule_gif_poll()
+        return frames
+
+    def _schedule_gif_poll(self):
+        if self.gif_poll_job_id is None:
+            self.gif_poll_job_id = self.app.after(GIF_POLL_MS, self._poll_gif_cache)
+
+    def _poll_gif_cache(self):
+        self.gif_poll_job_id = None
+        if self.gif_cache.poll():
+            self._schedule_gif_poll()
+
+    def _on_gif_frames_ready(self, frames):
+        if frames is None:
+            print(f"ERROR: Could not load GIF '{DRONE_GIF_PATH}': {self.gif_cache.failed.get(DRONE_GIF_PATH)}")
+            return
+        # The worker finishes requests in order, so the last one delivered is the current size
+        self.gif_frames = frames
+        print(f"INFO: GIF frames ready ({len(frames)} frames) at {self.feed_size[0]}x{self.feed_size[1]}.")
+        for drone_id in self.dashboard_grid.bound:
+            if self.drone_process_commanded_active[drone_id] and self.drone_gif_animation_job_id[drone_id] is None:
+                self._animate_gif(drone_id)
 
     def _animate_gif(self, drone_id):
-        if not self.drone_process_commanded_active[drone_id] or not self.gif_loaded_successfully[drone_id] or not self.drone_gif_ctk_frames[drone_id]:
+        image_label_widget = self._image_label(drone_id)
+        if image_label_widget is None:
+            # Card scrolled out of view: stop ticking, bind_drone_card restarts the animation
+            self.drone_gif_animation_job_id[drone_id] = None
+            return
+        frames = None
+        if self.drone_process_commanded_active[drone_id]:
+            # While frames are prepared the placeholder is shown; _on_gif_frames_ready restarts us
+            frames = self.gif_frames if self.gif_frames is not None else self._request_gif_frames()
+        if frames is None:
             if self.drone_gif_animation_job_id[drone_id]:
                 self.app.after_cancel(self.drone_gif_animation_job_id[drone_id])
                 self.drone_gif_animation_job_id[drone_id] = None
-            image_label_widget = self.drone_image_labels.get(drone_id)
-            if image_label_widget and self.static_placeholder_ctkimage:
-                image_label_widget.configure(image=self.static_placeholder_ctkimage, text="")
+            self._show_placeholder(image_label_widget)
             return
 
-        idx = self.drone_gif_current_frame_index[drone_id]
-        self.drone_image_labels[drone_id].configure(image=self.drone_gif_ctk_frames[drone_id][idx], text="")
-        self.drone_gif_current_frame_index[drone_id] = (idx + 1) % len(self.drone_gif_ctk_frames[drone_id])
-        duration = self.drone_gif_durations[drone_id][idx] if self.drone_gif_durations[drone_id] and idx < len(self.drone_gif_durations[drone_id]) else 100
-        self.drone_gif_animation_job_id[drone_id] = self.app.after(duration, lambda: self._animate_gif(drone_id))
+        idx = self.drone_gif_current_frame_index[drone_id] % len(frames)
+        image_label_widget.configure(image=frames.frames[idx], text="")
+        self.drone_gif_current_frame_index[drone_id] = idx + 1
+        self.drone_gif_animation_job_id[drone_id] = self.app.after(frames.durations[idx], lambda: self._animate_gif(drone_id))
 
-    def _populate_telemetry_card_content(self, card_widget, title_text, drone_id):
-        title_frame = ctk.CTkFrame(card_widget, fg_color="transparent")
-        title_frame.pack(pady=(15, 10), fill="x", padx=20)
-        
-        # Store references for easier color updates
-        title_label_attr = f"drone{drone_id}_telemetry_title_label"
-        conn_label_attr = f"drone{drone_id}_telemetry_connection_label"
+    def create_telemetry_card(self, parent):
+        card = {}
+        frame = ctk.CTkFrame(parent, corner_radius=12, fg_color=self.colors["card_bg"],
+                             border_color=self.colors["gray"], border_width=2)
+        frame.grid_propagate(False)
+        card["frame"] = frame
 
-        title_label = ctk.CTkLabel(title_frame, text=title_text, font=FONTS["subtitle"], text_color=self.colors["accent"])
-        title_label.pack(side="left")
-        setattr(self, title_label_attr, title_label)
-        
-        conn_label = ctk.CTkLabel(title_frame, text="Status: UNKNOWN", font=FONTS["small"], text_color=self.colors["gray"])
-        conn_label.pack(side="right", padx=(0, 5))
-        setattr(self, conn_label_attr, conn_label)
+        title_frame = ctk.CTkFrame(frame, fg_color="transparent")
+        title_frame.pack(pady=(15, 10), fill="x", padx=20)
+        card["title"] = ctk.CTkLabel(title_frame, text="", font=FONTS["subtitle"], text_color=self.colors["accent"])
+        card["title"].pack(side="left")
+        card["connection"] = ctk.CTkLabel(title_frame, text="Status: UNKNOWN", font=FONTS["small"], text_color=self.colors["gray"])
+        card["connection"].pack(side="right", padx=(0, 5))
         
-        data_rows_frame = ctk.CTkFrame(card_widget, fg_color="transparent")
+        data_rows_frame = ctk.CTkFrame(frame, fg_color="transparent")
         data_rows_frame.pack(fill="both", expand=True, pady=(5, 15), padx=20)
-        telemetry_fields = {
-            "latitude": "Latitude", "longitude": "Longitude", "altitude": "Altitude",
-            "speed": "Speed", "battery": "Battery", "mode": "Flight Mode",
-            "pitch": "Pitch Angle", "roll": "Roll Angle", "yaw": "Yaw Angle"
-        }
-        current_data_dict = {}
-        for key, display_name in telemetry_fields.items():
-            current_data_dict[key] = self.create_telemetry_row(data_rows_frame, display_name, "-")
-        if drone_id == 1: self.drone1_data = current_data_dict
-        else: self.drone2_data = current_data_dict
+        card["rows"] = {key: self.create_telemetry_row(data_rows_frame, display_name, "-")
+                        for key, display_name in TELEMETRY_ROW_NAMES.items()}
+        return card
+
+    def bind_telemetry_card(self, card, drone_id):
+        card["title"].configure(text=f"Drone {drone_id} Telemetry")
+        self._update_telemetry_card_visuals(drone_id, self._visible_telemetry(drone_id))
 
     def create_telemetry_display(self, parent_frame):
         frame = ctk.CTkFrame(parent_frame, fg_color="transparent")
@@ -384,23 +625,9 @@ class DroneControlCenter:
         self.telemetry_header_label = ctk.CTkLabel(header, text="Live Drone Telemetry", font=FONTS["title"], text_color=self.colors["text_primary"])
         self.telemetry_header_label.pack(side="left")
         
-        cards_frame = ctk.CTkFrame(frame, fg_color="transparent")
-        cards_frame.pack(fill="both", expand=True, padx=15, pady=10)
-        cards_frame.grid_columnconfigure(0, weight=1)
-        cards_frame.grid_columnconfigure(1, weight=1)
-        cards_frame.grid_rowconfigure(0, weight=1)
-
-        self.drone1_card_ref = ctk.CTkFrame(cards_frame, corner_radius=12, fg_color=self.colors["card_bg"],
-                                            border_color=self.colors["gray"], border_width=2)
-        self.drone1_card_ref.grid(row=0, column=0, padx=12, pady=12, sticky="nsew")
-        self.drone1_card_ref.grid_propagate(False)
-        self._populate_telemetry_card_content(self.drone1_card_ref, "Drone 1 Telemetry", drone_id=1)
-
-        self.drone2_card_ref = ctk.CTkFrame(cards_frame, corner_radius=12, fg_color=self.colors["card_bg"],
-                                            border_color=self.colors["gray"], border_width=2)
-        self.drone2_card_ref.grid(row=0, column=1, padx=12, pady=12, sticky="nsew")
-        self.drone2_card_ref.grid_propagate(False)
-        self._populate_telemetry_card_content(self.drone2_card_ref, "Drone 2 Telemetry", drone_id=2)
+        self.telemetry_grid = VirtualCardGrid(frame, TELEMETRY_COLUMNS, TELEMETRY_ROW_HEIGHT,
+                                              self.create_telemetry_card, self.bind_telemetry_card)
+        self.telemetry_grid.frame.pack(fill="both", expand=True, padx=15, pady=10)
         return frame
 
     def create_telemetry_row(self, parent, label, value):
@@ -412,13 +639,83 @@ class DroneControlCenter:
         value_label.pack(side="left", expand=True, fill="x")
         return value_label
 
+    def create_overview(self, parent_frame):
+        # One row per drone; ttk.Treeview only draws the rows scrolled into view
+        frame = ctk.CTkFrame(parent_frame, fg_color="transparent")
+        header = ctk.CTkFrame(frame, fg_color="transparent")
+        header.pack(fill="x", padx=25, pady=(25, 15))
+        self.overview_header_label = ctk.CTkLabel(header, text="Swarm Overview", font=FONTS["title"], text_color=self.colors["text_primary"])
+        self.overview_header_label.pack(side="left")
+        self.overview_count_label = ctk.CTkLabel(header, text="", font=FONTS["small"], text_color=self.colors["text_secondary"])
+        self.overview_count_label.pack(side="right")
+
+        table_frame = ctk.CTkFrame(frame, fg_color="transparent")
+        table_frame.pack(fill="both", expand=True, padx=25, pady=10)
+        self.overview_style = ttk.Style(self.app)
+        self.overview_style.theme_use("default")
+        self.overview_tree = ttk.Treeview(table_frame, columns=[key for key, _, _ in OVERVIEW_COLUMNS],
+                                          show="headings", style="Overview.Treeview")
+        for key, title, width in OVERVIEW_COLUMNS:
+            self.overview_tree.heading(key, text=title)
+            self.overview_tree.column(key, width=width, anchor="w", stretch=True)
+        scrollbar = ctk.CTkScrollbar(table_frame, command=self.overview_tree.yview)
+        self.overview_tree.configure(yscrollcommand=scrollbar.set)
+        self.overview_tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        self._style_overview()
+        return frame
+
+    def _style_overview(self):
+        self.overview_style.configure("Overview.Treeview", background=self.colors["card_bg"], fieldbackground=self.colors["card_bg"],
+                                      foreground=self.colors["text_primary"], rowheight=26, font=FONTS["small"])
+        self.overview_style.configure("Overview.Treeview.Heading", background=self.colors["secondary"],
+                                      foreground=self.colors["text_primary"], font=FONTS["button_small"])
+        for status, color_key in (("ACTIVE", "success"), ("AWAITING DATA", "warning"), ("DISCONNECTED", "text_secondary")):
+            self.overview_tree.tag_configure(status, foreground=self.colors[color_key])
+
+    def _schedule_overview_flush(self):
+        if self.overview_job_id is None and self.current_view == "overview":
+            self.overview_job_id = self.app.after(OVERVIEW_REFRESH_MS, self._flush_overview)
+
+    def _flush_overview(self):
+        # Every row changed since the last flush is written in one pass
+        if self.overview_job_id is not None:
+            self.app.after_cancel(self.overview_job_id)
+            self.overview_job_id = None
+        tree = self.overview_tree
+        for drone_id in sorted(self.overview_pending):
+            status = self._drone_status(drone_id)[0]
+            texts = format_telemetry_texts(self._visible_telemetry(drone_id))
+            values = [drone_id, status] + [texts[key] for key, _, _ in OVERVIEW_COLUMNS[2:]]
+            iid = str(drone_id)
+            if tree.exists(iid):
+                tree.item(iid, values=values, tags=(status,))
+            else:
+                # Rows are kept in ID order
+                position = sum(1 for other in tree.get_children() if int(other) < drone_id)
+                tree.insert("", position, iid=iid, values=values, tags=(status,))
+        self.overview_pending.clear()
+        active = sum(1 for connected in self.is_drone_connected_via_telemetry.values() if connected)
+        self.overview_count_label.configure(text=f"{active} / {len(self.is_drone_connected_via_telemetry)} active")
+
+    def _show_view(self, name):
+        views = {"dashboard": self.dashboard_frame, "telemetry": self.telemetry_frame, "overview": self.overview_frame}
+        for view_name, view in views.items():
+            if view_name != name:
+                view.pack_forget()
+        views[name].pack(fill="both", expand=True)
+        self.current_view = name
+        if name == "overview":
+            self._flush_overview()
+
     def show_dashboard(self):
-        self.telemetry_frame.pack_forget()
-        self.dashboard_frame.pack(fill="both", expand=True)
+        self._show_view("dashboard")
 
     def show_telemetry(self):
-        self.dashboard_frame.pack_forget()
-        self.telemetry_frame.pack(fill="both", expand=True)
+        self._show_view("telemetry")
+
+    def show_overview(self):
+        self._show_view("overview")
 
     def toggle_theme(self):
         if self.current_theme == "dark":
@@ -472,39 +769,32 @@ class DroneControlCenter:
 
         self.dashboard_header_label.configure(text_color=self.colors["text_primary"])
         
-        for i in [1, 2]:
-            dash_card = getattr(self, f"dash_drone{i}_card_ref", None)
-            dash_title = getattr(self, f"drone{i}_card_title_label", None)
-            if dash_card: dash_card.configure(fg_color=self.colors["card_bg"], border_color=self.colors.get("gray", "#6c757d"))
-            if dash_title: dash_title.configure(text_color=self.colors["accent"])
-
-            # Update feed frame background and placeholder text color
-            if self.drone_image_labels[i]:
-                feed_frame = self.drone_image_labels[i].master # Get parent CTkFrame
-                if isinstance(feed_frame, ctk.CTkFrame): # Ensure it's the feed_frame
-                    feed_frame.configure(fg_color=self.colors["dark"])
-                # Check if placeholder text needs color update
-                if self.drone_image_labels[i].cget("image") == "" and "Placeholder N/A" in self.drone_image_labels[i].cget("text"):
-                    self.drone_image_labels[i].configure(text_color=self.colors["warning"])
-
-            start_btn = self.drone_start_buttons.get(i)
-            stop_btn = self.drone_stop_buttons.get(i)
-            if start_btn: start_btn.configure(fg_color=self.colors["success"], hover_color=self.colors["success_hover"])
-            if stop_btn: stop_btn.configure(fg_color=self.colors["danger"], hover_color=self.colors["danger_hover"])
+        # Pooled cards: every card is recolored, bound ones are re-rendered below
+        for card in self.dashboard_grid.cards:
+            card["frame"].configure(fg_color=self.colors["card_bg"], border_color=self.colors.get("gray", "#6c757d"))
+            card["title"].configure(text_color=self.colors["accent"])
+            card["feed"].configure(fg_color=self.colors["dark"])
+            # Check if placeholder text needs color update
+            if card["image"].cget("image") == "" and "Placeholder N/A" in card["image"].cget("text"):
+                card["image"].configure(text_color=self.colors["warning"])
+            card["start"].configure(fg_color=self.colors["success"], hover_color=self.colors["success_hover"])
+            card["stop"].configure(fg_color=self.colors["danger"], hover_color=self.colors["danger_hover"])
 
         self.telemetry_header_label.configure(text_color=self.colors["text_primary"])
-        for i in [1, 2]:
-            tel_card = getattr(self, f"drone{i}_card_ref", None) # Telemetry view card
-            tel_title = getattr(self, f"drone{i}_telemetry_title_label", None)
-            tel_conn = getattr(self, f"drone{i}_telemetry_connection_label", None)
-            if tel_card:
-                tel_card.configure(fg_color=self.colors["card_bg"], border_color=self.colors.get("gray", "#6c757d"))
-                self._update_telemetry_row_colors(tel_card)
-            if tel_title: tel_title.configure(text_color=self.colors["accent"])
+        for card in self.telemetry_grid.cards:
+            card["frame"].configure(fg_color=self.colors["card_bg"], border_color=self.colors.get("gray", "#6c757d"))
+            self._update_telemetry_row_colors(card["frame"])
+            card["title"].configure(text_color=self.colors["accent"])
             # Connection label color is updated in _update_telemetry_card_visuals
+
+        self.overview_header_label.configure(text_color=self.colors["text_primary"])
+        self.overview_count_label.configure(text_color=self.colors["text_secondary"])
+        self._style_overview()
         
-        self._update_telemetry_card_visuals(1, self.drone1_data if self.is_drone_connected_via_telemetry[1] else {}) 
-        self._update_telemetry_card_visuals(2, self.drone2_data if self.is_drone_connected_via_telemetry[2] else {})
+        # Colors changed: cached widget state no longer matches, push everything again
+        self.widget_state.clear()
+        for drone_id in set(self.dashboard_grid.bound) | set(self.telemetry_grid.bound):
+            self._update_telemetry_card_visuals(drone_id, self._visible_telemetry(drone_id))
 
     def _update_telemetry_row_colors(self, card_widget):
         for child_frame in card_widget.winfo_children():
@@ -521,49 +811,57 @@ class DroneControlCenter:
 
 
     def handle_drone_process_command(self, drone_id, start_process):
-        self.drone_process_commanded_active[drone_id] = start_process
-        if not start_process: self.is_drone_connected_via_telemetry[drone_id] = False
-        self.last_telemetry_update_time[drone_id] = 0.0 
-
+        if drone_id is None:
+            return
+        command_key = f"drone{drone_id}" # Simplified command key
+        if command_key not in COMMANDS:
+            print(f"No launch command configured for Drone {drone_id}.")
+            return
         if start_process:
             print(f"Attempting to start Drone {drone_id} processes...")
-            command_key = f"drone{drone_id}" # Simplified command key
-            subprocess.Popen(COMMANDS[command_key], shell=True, text=True)
-
-            current_width = self.drone_image_labels[drone_id].winfo_width()
-            current_height = self.drone_image_labels[drone_id].winfo_height()
-            if not self.gif_loaded_successfully[drone_id] or (
-                current_width > 0 and current_height > 0 and (
-                (self.drone_gif_ctk_frames[drone_id] and \
-                (current_width != self.drone_gif_ctk_frames[drone_id][0].width() or \
-                 current_height != self.drone_gif_ctk_frames[drone_id][0].height())) or \
-                 not self.drone_gif_ctk_frames[drone_id] 
-                )
-            ):
-                self._load_gif_frames(drone_id, DRONE_GIF_PATH)
-            
-            if self.gif_loaded_successfully[drone_id]:
-                self.drone_gif_current_frame_index[drone_id] = 0
-                if self.drone_gif_animation_job_id[drone_id]:
-                    self.app.after_cancel(self.drone_gif_animation_job_id[drone_id])
-                self._animate_gif(drone_id)
-            else:
-                image_label_widget = self.drone_image_labels.get(drone_id)
-                if image_label_widget:
-                    if self.static_placeholder_ctkimage:
-                        image_label_widget.configure(image=self.static_placeholder_ctkimage, text="")
-                    else:
-                        image_label_widget.configure(text="Image N/A", image=None)
+            self.processes.start(command_key, COMMANDS[command_key])
         else: 
             print(f"Attempting to stop Drone {drone_id} processes...")
-            subprocess.call(f"tmux kill-session -t drone{drone_id}_session 2>/dev/null", shell=True)
-            subprocess.call(f"tmux kill-session -t drone{drone_id}_py 2>/dev/null", shell=True)
+            self.processes.stop(command_key, drone_sessions(drone_id))
+        self._set_drone_commanded(drone_id, start_process)
+        self._schedule_process_poll()
+
+    def _schedule_process_poll(self):
+        if self.process_poll_job_id is None:
+            self.process_poll_job_id = self.app.after(PROCESS_POLL_MS, self._poll_processes)
+
+    def _poll_processes(self):
+        self.process_poll_job_id = None
+        for event in self.processes.poll():
+            detail = f" ({event.detail})" if event.detail else ""
+            pid = f" pgid {event.pid}" if event.pid else ""
+            print(f"[{event.name}] {event.state}{pid}{detail}")
+            match = re.fullmatch(r"drone(\d+)", event.name)
+            if event.state == "failed" and match and int(match.group(1)) in self.drone_process_commanded_active:
+                # The launch command could not be spawned: the card must not look active
+                self._set_drone_commanded(int(match.group(1)), False)
+        # Keep polling while anything is still starting or stopping
+        if any(state in ("starting", "stopping") for state in self.processes.states.values()):
+            self._schedule_process_poll()
+
+    def _set_drone_commanded(self, drone_id, active):
+        """Card state for a drone whose processes were just started or stopped."""
+        self.drone_process_commanded_active[drone_id] = active
+        if not active: self.is_drone_connected_via_telemetry[drone_id] = False
+        self.last_telemetry_update_time[drone_id] = 0.0 
 
+        image_label_widget = self._image_label(drone_id)
+        if active:
+            self.drone_gif_current_frame_index[drone_id] = 0
+            if self.drone_gif_animation_job_id[drone_id]:
+                self.app.after_cancel(self.drone_gif_animation_job_id[drone_id])
+                self.drone_gif_animation_job_id[drone_id] = None
+            self._animate_gif(drone_id)
+        else:
             if self.drone_gif_animation_job_id[drone_id]:
                 self.app.after_cancel(self.drone_gif_animation_job_id[drone_id])
                 self.drone_gif_animation_job_id[drone_id] = None
             
-            image_label_widget = self.drone_image_labels.get(drone_id)
             if image_label_widget:
                 if self.static_placeholder_ctkimage:
                     image_label_widget.configure(image=self.static_placeholder_ctkimage, text="")
@@ -571,80 +869,106 @@ class DroneControlCenter:
                     image_label_widget.configure(text="Image Stopped", image=None)
         self._update_telemetry_card_visuals(drone_id, {}) 
 
-    def start_drone1(self): self.handle_drone_process_command(1, True)
-    def stop_drone1(self): self.handle_drone_process_command(1, False)
-    def start_drone2(self): self.handle_drone_process_command(2, True)
-    def stop_drone2(self): self.handle_drone_process_command(2, False)
+    def start_drone(self, drone_id): self.handle_drone_process_command(drone_id, True)
+    def stop_drone(self, drone_id): self.handle_drone_process_command(drone_id, False)
 
     def start_qgc(self):
         print("Launching QGroundControl...")
-        subprocess.Popen(COMMANDS["qgc"], shell=True, text=True)
+        self.processes.start("qgc", COMMANDS["qgc"])
+        self._schedule_process_poll()
 
     def start_all(self):
         print("Starting all systems...")
-        self.start_drone1()
-        self.app.after(2000, self.start_drone2) 
-        self.app.after(7000, self.start_qgc) 
+        drone_ids = sorted(controllable_drone_ids())
+        if "swarm" in COMMANDS:
+            # One launcher boots every drone in parallel, gating each stage on readiness
+            # (connection, health, altitude) instead of fixed delays between drones
+            for drone_id in drone_ids:
+                self._set_drone_commanded(drone_id, True)
+            self.processes.start("swarm", COMMANDS["swarm"].format(ids=" ".join(str(drone_id) for drone_id in drone_ids)))
+        else:
+            for drone_id in drone_ids:
+                self.start_drone(drone_id)
+        self.start_qgc()
 
     def stop_all(self):
         print("Stopping all drone systems...")
-        self.stop_drone1()
-        self.stop_drone2()
+        self.processes.stop("swarm", (SWARM_SESSION,))
+        for drone_id in sorted(controllable_drone_ids()):
+            self.stop_drone(drone_id)
+        self._schedule_process_poll()
 
     def emergency_stop(self):
+        # Signals the swarm/drone process groups right away; one background job then
+        # hangs up every drone session and SIGKILLs whatever outlives the shared grace
+        # period. QGC is left running so the operator keeps the ground-control view.
         print("EMERGENCY STOP ACTIVE!")
-        self.stop_all()
+        drone_ids = sorted(controllable_drone_ids())
+        names = ["swarm"] + [f"drone{drone_id}" for drone_id in drone_ids]
+        sessions = [SWARM_SESSION] + [session for drone_id in drone_ids for session in drone_sessions(drone_id)]
+        self.processes.emergency_stop(names=names, sessions=sessions)
+        for drone_id in drone_ids:
+            if drone_id in self.drone_process_commanded_active:
+                self._set_drone_commanded(drone_id, False)
+        self._schedule_process_poll()
+
+    def _attach_telemetry_segment(self):
+        if self.telemetry_segment is None:
+            self.telemetry_segment = TelemetrySegment.open(SHM_NAME, create=False)
+            # telemetry_seqs is kept: stale slots must not look new after a reattach
+            self.telemetry_generation = None
+        return self.telemetry_segment
+
+    def _detach_telemetry_segment(self):
+        if self.telemetry_segment is not None:
+            try:
+                self.telemetry_segment.close()
+            except Exception:
+                pass
+            self.telemetry_segment = None
 
     def read_shared_memory(self):
+        """Changed drones since the last call as {"<drone_id>": {...}}; None if SHM is unavailable."""
         try:
-            telemetry_shm = shm.SharedMemory(name=SHM_NAME, create=False, size=SHM_SIZE)
-            raw_bytes = bytearray(telemetry_shm.buf)
-            try: null_index = raw_bytes.index(0) 
-            except ValueError: null_index = len(raw_bytes) # Read all if no null byte
-            decoded_str = raw_bytes[:null_index].decode('utf-8', errors='ignore').rstrip('\x00')
-            telemetry_shm.close()
-            return json.loads(decoded_str) if decoded_str.strip() else {}
+            segment = self._attach_telemetry_segment()
+            # Nothing written since last refresh: skip the slot scan entirely
+            generation = segment.generation()
+            if generation == self.telemetry_generation:
+                return {}
+            self.telemetry_generation = generation
+            # Sadece kartlarda gösterilen alanları çöz
+            return dict(segment.read_changed(self.telemetry_seqs, GUI_TELEMETRY_FIELDS))
         except FileNotFoundError: return None
-        except json.JSONDecodeError: return None
-        except Exception: return None
+        except ValueError: # Uyumsuz/eski segment formatı
+            self._detach_telemetry_segment()
+            return None
+        except Exception:
+            self._detach_telemetry_segment()
+            return None
+
+    def _set_label(self, widget, text, text_color):
+        # Only touch Tk when the visible state actually changes
+        if widget is None:
+            return
+        state = (text, text_color)
+        if self.widget_state.get(widget) != state:
+            self.widget_state[widget] = state
+            widget.configure(text=text, text_color=text_color)
+
+    def _set_widget(self, widget, **options):
+        if widget is None:
+            return
+        state = tuple(sorted(options.items()))
+        if self.widget_state.get(widget) != state:
+            self.widget_state[widget] = state
+            widget.configure(**options)
 
     # Telemetry data display keys are corrected in this version
     def update_telemetry_data_labels(self, card_data_labels, telemetry):
-        telemetry = telemetry if isinstance(telemetry, dict) else {}
         if card_data_labels:
-            lat_text = f"{telemetry.get('latitude', 0.0):.6f}" if isinstance(telemetry.get('latitude'), (float, int)) else "-"
-            lon_text = f"{telemetry.get('longitude', 0.0):.6f}" if isinstance(telemetry.get('longitude'), (float, int)) else "-"
-            alt_raw = telemetry.get('absolute_altitude', telemetry.get('altitude', "-")) 
-            alt_text = f"{alt_raw:.2f} m" if isinstance(alt_raw, (float, int)) else f"{alt_raw} m"
-
-            card_data_labels.get("latitude").configure(text=lat_text, text_color=self.colors["text_primary"])
-            card_data_labels.get("longitude").configure(text=lon_text, text_color=self.colors["text_primary"])
-            card_data_labels.get("altitude").configure(text=alt_text, text_color=self.colors["text_primary"])
-            
-            speed_val = telemetry.get('speed', '-') 
-            speed_text = f"{speed_val:.2f} m/s" if isinstance(speed_val, (float, int)) else f"{speed_val} m/s"
-            card_data_labels.get("speed").configure(text=speed_text, text_color=self.colors["text_primary"])
-            
-            battery_val = telemetry.get('battery_percent', None) 
-            battery_text = "-%"
-            if isinstance(battery_val, (float, int)) and battery_val is not None: battery_text = f"{battery_val:.0f}%"
-            elif battery_val is not None and str(battery_val).replace('.', '', 1).isdigit(): battery_text = f"{float(battery_val):.0f}%"
-            elif battery_val is not None: battery_text = str(battery_val)
-            card_data_labels.get("battery").configure(text=battery_text, text_color=self.colors["text_primary"])
-
-            card_data_labels.get("mode").configure(text=f"{telemetry.get('flight_mode', '-')}", text_color=self.colors["text_primary"])
-            
-            pitch_val = telemetry.get('pitch', '-') 
-            pitch_text = f"{pitch_val:.2f}°" if isinstance(pitch_val, (float, int)) else f"{pitch_val}°"
-            card_data_labels.get("pitch").configure(text=pitch_text, text_color=self.colors["text_primary"])
-
-            roll_val = telemetry.get('roll', '-') 
-            roll_text = f"{roll_val:.2f}°" if isinstance(roll_val, (float, int)) else f"{roll_val}°"
-            card_data_labels.get("roll").configure(text=roll_text, text_color=self.colors["text_primary"])
-
-            yaw_val = telemetry.get('yaw', '-') 
-            yaw_text = f"{yaw_val:.2f}°" if isinstance(yaw_val, (float, int)) else f"{yaw_val}°"
-            card_data_labels.get("yaw").configure(text=yaw_text, text_color=self.colors["text_primary"])
+            # Unchanged fields are skipped in _set_label, so only changed text reaches Tk
+            for key, text in format_telemetry_texts(telemetry).items():
+                self._set_label(card_data_labels.get(key), text, self.colors["text_primary"])
 
     def _clear_telemetry_data_labels(self, card_data_labels):
         if card_data_labels:
@@ -654,91 +978,124 @@ class DroneControlCenter:
             }
             for key, label_widget in card_data_labels.items():
                 if label_widget and isinstance(label_widget, ctk.CTkLabel):
-                    label_widget.configure(text=default_texts.get(key, "-"), text_color=self.colors["text_primary"])
-
-    def _update_telemetry_card_visuals(self, drone_id, current_telemetry_data):
-        dash_light_ref, dash_label_ref = (self.drone1_dashboard_status_light, self.drone1_dashboard_status_label) if drone_id == 1 else \
-                                 (self.drone2_dashboard_status_light, self.drone2_dashboard_status_label)
-        
-        tel_view_card_widget = getattr(self, f"drone{drone_id}_card_ref", None)
-        tel_conn_label_widget = getattr(self, f"drone{drone_id}_telemetry_connection_label", None)
-        dashboard_card_widget = getattr(self, f"dash_drone{drone_id}_card_ref", None)
-        current_data_labels_dict = getattr(self, f"drone{drone_id}_data", {})
+                    self._set_label(label_widget, default_texts.get(key, "-"), self.colors["text_primary"])
 
-        status_text, light_color_key, text_color_key, border_color_key = "INACTIVE", "gray", "text_secondary", "gray"
+    def _visible_telemetry(self, drone_id):
+        return self.drone_telemetry[drone_id] if self.is_drone_connected_via_telemetry[drone_id] else {}
 
+    def _drone_status(self, drone_id):
+        """(status_text, light_color_key, text_color_key, border_color_key) for a drone."""
+        # Drones launched outside the GUI (e.g. by a swarm launcher) are ACTIVE while telemetry flows
+        if self.is_drone_connected_via_telemetry[drone_id]:
+            return "ACTIVE", "success", "success", "success"
         if self.drone_process_commanded_active[drone_id]:
-            if self.is_drone_connected_via_telemetry[drone_id]:
-                status_text, light_color_key, text_color_key, border_color_key = "ACTIVE", "success", "success", "success"
-            else: 
-                status_text, light_color_key, text_color_key, border_color_key = "AWAITING DATA", "warning", "warning", "warning"
-        else: 
-            status_text, light_color_key, text_color_key, border_color_key = "DISCONNECTED", "disconnected", "text_secondary", "gray"
-            
-        if dash_light_ref: dash_light_ref.configure(text_color=self.colors.get(light_color_key, self.colors["gray"]))
-        if dash_label_ref: dash_label_ref.configure(text=status_text.upper(), text_color=self.colors.get(text_color_key, self.colors["text_secondary"]))
-        if dashboard_card_widget: dashboard_card_widget.configure(border_color=self.colors.get(border_color_key, self.colors["gray"]))
-        if tel_view_card_widget: tel_view_card_widget.configure(border_color=self.colors.get(border_color_key, self.colors["gray"]))
+            return "AWAITING DATA", "warning", "warning", "warning"
+        return "DISCONNECTED", "disconnected", "text_secondary", "gray"
+
+    def _update_telemetry_card_visuals(self, drone_id, current_telemetry_data):
+        status_text, light_color_key, text_color_key, border_color_key = self._drone_status(drone_id)
+        self.overview_pending.add(drone_id)
+        self._schedule_overview_flush()
         
-        if tel_conn_label_widget:
+        # Only drones scrolled into view have cards; the rest live in the overview table
+        dash_card = self.dashboard_grid.card_for(drone_id)
+        if dash_card:
+            self._set_widget(dash_card["light"], text_color=self.colors.get(light_color_key, self.colors["gray"]))
+            self._set_label(dash_card["status"], status_text.upper(), self.colors.get(text_color_key, self.colors["text_secondary"]))
+            self._set_widget(dash_card["frame"], border_color=self.colors.get(border_color_key, self.colors["gray"]))
+
+        tel_card = self.telemetry_grid.card_for(drone_id)
+        if tel_card:
+            self._set_widget(tel_card["frame"], border_color=self.colors.get(border_color_key, self.colors["gray"]))
             conn_disp_text = "Status: DISCONNECTED"
             conn_disp_color = self.colors["text_secondary"]
-            if self.drone_process_commanded_active[drone_id]:
-                conn_disp_text = "Status: CONNECTED" if self.is_drone_connected_via_telemetry[drone_id] else "Status: NO TELEMETRY"
-                conn_disp_color = self.colors["success"] if self.is_drone_connected_via_telemetry[drone_id] else self.colors["warning"]
-            tel_conn_label_widget.configure(text=conn_disp_text, text_color=conn_disp_color)
+            if self.is_drone_connected_via_telemetry[drone_id]:
+                conn_disp_text, conn_disp_color = "Status: CONNECTED", self.colors["success"]
+            elif self.drone_process_commanded_active[drone_id]:
+                conn_disp_text, conn_disp_color = "Status: NO TELEMETRY", self.colors["warning"]
+            self._set_label(tel_card["connection"], conn_disp_text, conn_disp_color)
 
-        if self.drone_process_commanded_active[drone_id] and self.is_drone_connected_via_telemetry[drone_id]:
-            self.update_telemetry_data_labels(current_data_labels_dict, current_telemetry_data)
-        else:
-            self._clear_telemetry_data_labels(current_data_labels_dict)
+            if self.is_drone_connected_via_telemetry[drone_id]:
+                self.update_telemetry_data_labels(tel_card["rows"], current_telemetry_data)
+            else:
+                self._clear_telemetry_data_labels(tel_card["rows"])
+
+    def _setup_telemetry_notifications(self):
+        # Tk file handler wakes us when new telemetry is written (falls back to polling only)
+        try:
+            self.telemetry_listener = ChangeListener(SHM_NAME)
+            self.app.tk.createfilehandler(self.telemetry_listener.fileno(), tkinter.READABLE, self._on_telemetry_notify)
+        except (OSError, AttributeError, tkinter.TclError) as e:
+            print(f"Telemetry notifications unavailable, polling only: {e}")
+            if self.telemetry_listener:
+                self.telemetry_listener.close()
+            self.telemetry_listener = None
+
+    def _on_telemetry_notify(self, fd, mask):
+        self.telemetry_listener.drain()
+        if self.telemetry_notify_job_id is None:
+            elapsed_ms = (time.time() - self.last_telemetry_refresh) * 1000
+            delay = max(0, int(TELEMETRY_MIN_REFRESH_MS - elapsed_ms))
+            self.telemetry_notify_job_id = self.app.after(delay, self._refresh_from_notify)
+
+    def _refresh_from_notify(self):
+        self.telemetry_notify_job_id = None
+        self.update_telemetry()
 
     def update_telemetry(self):
+        if self.telemetry_job_id is not None:
+            self.app.after_cancel(self.telemetry_job_id)
+            self.telemetry_job_id = None
+        self.last_telemetry_refresh = time.time()
         shared_data = self.read_shared_memory()
         now = time.time()
-        data_received_this_cycle = {1: False, 2: False}
 
         if shared_data:
+            added = False
             for drone_id_str, telemetry_content in shared_data.items():
                 try:
                     drone_id = int(drone_id_str)
-                    if drone_id in [1, 2]:
-                        if self.drone_process_commanded_active[drone_id]: # Only process if active
-                            self.is_drone_connected_via_telemetry[drone_id] = True 
-                            self.last_telemetry_update_time[drone_id] = now
-                            # Pass the actual telemetry content for this drone
-                            self._update_telemetry_card_visuals(drone_id, telemetry_content) 
-                        data_received_this_cycle[drone_id] = True # Mark data was present in SHM
                 except ValueError:
                     print(f"Invalid drone_id format in shared memory: {drone_id_str}")
-
-        for did in [1, 2]:
-            if self.drone_process_commanded_active[did]:
-                # If active, but no data received for it in this cycle from SHM
-                if not data_received_this_cycle[did] and self.is_drone_connected_via_telemetry[did]: 
-                    # And if it was previously connected and timeout exceeded
-                    if (now - self.last_telemetry_update_time[did] > TIMEOUT_THRESHOLD):
-                        print(f"Drone {did} telemetry timed out.")
-                        self.is_drone_connected_via_telemetry[did] = False
-                        self._update_telemetry_card_visuals(did, {}) # Update visuals to show timeout
-                # If active but not connected (e.g. awaiting first data, or already timed out)
-                elif not self.is_drone_connected_via_telemetry[did]:
-                     self._update_telemetry_card_visuals(did, {}) # Ensure visuals reflect "AWAITING" or "NO TELEMETRY"
-            else: # If drone is not commanded to be active
-                if self.is_drone_connected_via_telemetry[did]: # If it was somehow marked connected, correct it
-                    self.is_drone_connected_via_telemetry[did] = False
-                self._update_telemetry_card_visuals(did, {}) # Update visuals to "DISCONNECTED"
+                    continue
+                # New IDs in the segment get a card/table row without a restart
+                added = self._ensure_drone(drone_id) or added
+                self.is_drone_connected_via_telemetry[drone_id] = True
+                self.last_telemetry_update_time[drone_id] = now
+                self.drone_telemetry[drone_id] = telemetry_content
+                # Pass the actual telemetry content for this drone
+                self._update_telemetry_card_visuals(drone_id, telemetry_content)
+            if added:
+                self._publish_drone_ids()
+
+        timed_out = False
+        for did, connected in self.is_drone_connected_via_telemetry.items():
+            if connected and now - self.last_telemetry_update_time[did] > TIMEOUT_THRESHOLD:
+                print(f"Drone {did} telemetry timed out.")
+                self.is_drone_connected_via_telemetry[did] = False
+                self._update_telemetry_card_visuals(did, {}) # Update visuals to show timeout
+                timed_out = True
+        if timed_out:
+            # Writer may have recreated the segment; reattach on the next refresh
+            self._detach_telemetry_segment()
             
-        self.app.after(500, self.update_telemetry)
+        # Without notifications fall back to polling at the refresh rate (cheap when nothing changed)
+        poll_ms = TELEMETRY_POLL_MS if self.telemetry_listener else TELEMETRY_MIN_REFRESH_MS
+        self.telemetry_job_id = self.app.after(poll_ms, self.update_telemetry)
 
     def run(self):
-        self.app.mainloop()
+        try:
+            self.app.mainloop()
+        finally:
+            self.gif_cache.close()
+            self.processes.close()
 
 if __name__ == "__main__":
     try:
-        existing_shm = shm.SharedMemory(name=SHM_NAME, create=False, size=SHM_SIZE)
-        existing_shm.close()
+        TelemetrySegment.open(SHM_NAME, create=False).close()
         print(f"INFO: Shared memory '{SHM_NAME}' found.")
+    except ValueError as e:
+        print(f"WARNING: {e}")
     except FileNotFoundError:
         print(f"INFO: Shared memory '{SHM_NAME}' not found. Ensure the telemetry script (writer) is running and has created it.")
     
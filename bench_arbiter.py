@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+import argparse
+from collections import defaultdict, namedtuple
+import metrics
+from command_arbiter import send_hooks, AVOIDANCE, FLOCK
+from replay import run_replay, synthetic_frames, CONTROLLERS
+
+# Komut hakemi (command_arbiter) etkisi: sentetik senaryolar tekrar oynatılır, kontrolcülerin
+# hakeme bıraktığı komutlar (hakemsiz gRPC çağrısı sayısı) ile gerçekten gönderilenler
+# karşılaştırılır. Çakışma: GOTO'dan sonra CONFLICT_WINDOW içinde aynı drone'a eşit veya
+# düşük öncelikli hız setpoint'i gitmesi (GOTO'yu yarıda keser; kaçınmanın GOTO'yu kesmesi
+# ya da GOTO'nun hız komutunu kesmesi öncelik geçişidir, sayılmaz).
+# ucak11 = ucak111 hız kontrolcüsü + flocking1 GOTO'ları aynı drone'da; flocking1 hedef
+# bıraktığı halde hiçbir sürü GOTO'su araca ulaşmazsa (kaçınma tüm süreyi tutmadıysa)
+# benchmark başarısız olur.
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+CONFLICT_WINDOW = 1.0  # s
+
+Sent = namedtuple("Sent", "time drone_id kind priority")
+
+
+def record_sends(log):
+    """Hakemin gönderdiği her komutu önceliğiyle kaydeder; kaydı durduran çağrıyı döner."""
+    def hook(drone_id, source, command, time):
+        log.append(Sent(time, drone_id, command.kind, command.priority))
+    send_hooks.append(hook)
+    return lambda: send_hooks.remove(hook)
+
+
+def conflicts(sends):
+    """GOTO'dan sonra CONFLICT_WINDOW içinde gelen, GOTO'dan yüksek öncelikli olmayan hız setpoint'leri."""
+    last = {}
+    count = 0
+    for sent in sends:
+        previous = last.get(sent.drone_id)
+        if (previous and previous.kind == "goto" and sent.kind == "velocity"
+                and sent.time - previous.time < CONFLICT_WINDOW and sent.priority <= previous.priority):
+            count += 1
+        last[sent.drone_id] = sent
+    return count
+
+
+def flock_delivery(sends, expected):
+    """
+    (araca giden sürü GOTO'su, başarılı mı). Kontrolcü flocking1 içeriyorsa ve araca
+    kaçınma dışında bir komut gittiyse sürü GOTO'su da gitmiş olmalı.
+    """
+    delivered = sum(1 for sent in sends if sent.kind == "goto" and sent.priority == FLOCK)
+    contested = any(sent.priority < AVOIDANCE for sent in sends)
+    return delivered, delivered > 0 or not expected or not contested
+
+
+def counters():
+    totals = defaultdict(int)
+    for item in metrics.snapshot()["metrics"]:
+        if item["kind"] != "counter":
+            continue
+        if item["name"] == "arbiter_dropped_total":
+            totals[item["labels"]["reason"]] += item["value"]
+        elif item["name"] in ("arbiter_submitted_total", "arbiter_keepalive_total"):
+            totals[item["name"]] += item["value"]
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Komut hakemi: gönderilen komut ve çakışma sayısı")
+    parser.add_argument("--counts", type=int, nargs="+", default=[2, 10, 50])
+    parser.add_argument("--controllers", nargs="+", choices=sorted(CONTROLLERS),
+                        default=["ucak111", "ucak1", "ucak11"])
+    parser.add_argument("--scenarios", nargs="+", default=["converge", "line"])
+    parser.add_argument("--duration", type=float, default=30.0, help="sanal süre (s)")
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{CYAN}{'senaryo':<9} {'kontrolcü':<10} {'N':>4} {'bırakılan':>10} {'gönderilen':>11} {'azalma':>7} "
+          f"{'tekrar':>7} {'birleşen':>9} {'öncelik':>8} {'canlı':>6} {'sürü':>6} {'çakışma':>8}{ENDC}")
+    for scenario in args.scenarios:
+        for controller in args.controllers:
+            for count in args.counts:
+                frames = synthetic_frames(scenario, count, args.duration)
+                metrics.reset()
+                sends = []
+                restore = record_sends(sends)
+                try:
+                    run_replay(frames, controller)
+                finally:
+                    restore()
+                totals = counters()
+                submitted = totals["arbiter_submitted_total"]
+                sent = len(sends)
+                clash = conflicts(sends)
+                flock, ok = flock_delivery(sends, controller in ("ucak11", "flocking1"))
+                failed |= not ok
+                reduction = submitted / sent if sent else float("inf")
+                color = GREEN if reduction >= 2 else YELLOW
+                print(f"{scenario:<9} {controller:<10} {count:>4} {submitted:>10} {sent:>11} "
+                      f"{color}{reduction:>6.1f}x{ENDC} {totals['duplicate']:>7} {totals['coalesced']:>9} "
+                      f"{totals['preempted']:>8} {totals['arbiter_keepalive_total']:>6} "
+                      f"{'' if ok else RED}{flock:>6}{'' if ok else ENDC} "
+                      f"{GREEN if clash == 0 else RED}{clash:>8}{ENDC}")
+                failed |= clash > 0
+    print(f"{CYAN}bırakılan: hakemsiz gönderilecek komutlar; gönderilen: GOTO + hız setpoint'i "
+          f"(offboard.start hariç); sürü: araca giden flocking1 GOTO'su; {args.duration:g} s sanal süre{ENDC}")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import time
+from replay import VirtualClockLoop
+from swarm_sim import SwarmSim, SimSystem
+from telemetry_cache import TelemetryCache
+from connection_broker import broker
+
+# Bağlantı aracısı (connection_broker) etkisi. Kinematik simülatörde drone başına C telemetri
+# tüketicisi (SHM yayıncısı, kontrolcü, izleyici...) sanal saatte koşar:
+#   ayrı  : her tüketici kendi System'ine bağlanır ve kendi TelemetryCache'ini açar (eski düzen)
+#   broker: drone başına tek bağlantı ve tek önbellek, tüketiciler subscribe() ile paylaşır
+# Sayılanlar: System bağlantısı (gerçekte her biri bir mavsdk_server + gRPC kanalı), açılan
+# telemetri akışı, akışlardan gelen mesaj (gRPC trafiği) ve tüketicilere ulaşan güncelleme.
+# Ayrıca eski Drone*_bayland düzeninde drone başına açılan ek flocking sürecinin açılış süresi
+# (python + mavsdk içe aktarma; mavsdk_server başlatma hariç) ölçülür.
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+
+
+class CountingTelemetry:
+    """Sadece bu benchmark için: açılan akışları ve gelen mesajları sayar."""
+
+    def __init__(self, telemetry, counts):
+        self._telemetry = telemetry
+        self._counts = counts
+
+    def __getattr__(self, name):
+        method = getattr(self._telemetry, name)
+
+        def open_stream():
+            self._counts["streams"] += 1
+            return self._count(method())
+        return open_stream
+
+    async def _count(self, stream):
+        async for message in stream:
+            self._counts["messages"] += 1
+            yield message
+
+
+class CountingSystem(SimSystem):
+    def __init__(self, sim, drone_id, counts):
+        super().__init__(sim, drone_id)
+        self.telemetry = CountingTelemetry(self.telemetry, counts)
+        self._counts = counts
+
+    async def connect(self, system_address=None):
+        self._counts["connections"] += 1
+
+
+async def consume(telemetry, counts):
+    await telemetry.wait_ready()
+    while True:
+        await telemetry.wait_update()
+        telemetry.snapshot()
+        counts["updates"] += 1
+
+
+async def run_layout(layout, count, consumers, duration):
+    sim = SwarmSim(count)
+    counts = dict(connections=0, streams=0, messages=0, updates=0)
+    tasks = []
+    for index in range(count):
+        drone_id = str(index + 1)
+        if layout == "broker":
+            system = CountingSystem(sim, drone_id, counts)
+            await system.connect()
+            vehicle = broker().attach(drone_id, system)
+            feeds = [vehicle.subscribe() for _ in range(consumers)]
+        else:
+            feeds = []
+            for _ in range(consumers):
+                system = CountingSystem(sim, drone_id, counts)
+                await system.connect()
+                feeds.append(TelemetryCache(system).start())
+        tasks += [asyncio.create_task(consume(feed, counts)) for feed in feeds]
+    try:
+        await sim.run(duration)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await broker().close()
+    return counts
+
+
+def measure(layout, count, consumers, duration):
+    began = time.perf_counter()
+    with asyncio.Runner(loop_factory=VirtualClockLoop) as runner:
+        counts = runner.run(run_layout(layout, count, consumers, duration))
+    return counts, time.perf_counter() - began
+
+
+def process_startup(rounds=3):
+    """Ayrı flocking sürecinin açılışı (s): python + flocking1 (mavsdk) içe aktarma."""
+    times = []
+    for _ in range(rounds):
+        began = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import flocking1"], check=True, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - began)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bağlantı aracısı: bağlantı, akış ve mesaj sayıları")
+    parser.add_argument("--counts", type=int, nargs="+", default=[2, 10, 50])
+    parser.add_argument("--consumers", type=int, default=3, help="drone başına telemetri tüketicisi")
+    parser.add_argument("--duration", type=float, default=10.0, help="sanal süre (s)")
+    args = parser.parse_args()
+
+    print(f"{CYAN}{'N':>4} {'düzen':<7} {'bağlantı':>9} {'akış':>6} {'mesaj':>9} {'güncelleme':>11} {'gerçek':>8}{ENDC}")
+    for count in args.counts:
+        results = {layout: measure(layout, count, args.consumers, args.duration) for layout in ("ayrı", "broker")}
+        for layout, (counts, wall) in results.items():
+            color = GREEN if layout == "broker" else ""
+            print(f"{color}{count:>4} {layout:<7} {counts['connections']:>9} {counts['streams']:>6} "
+                  f"{counts['messages']:>9} {counts['updates']:>11} {wall:>7.2f}s{ENDC if color else ''}")
+        old, new = results["ayrı"][0], results["broker"][0]
+        print(f"{CYAN}{'':>4} {'azalma':<7} {old['connections'] / new['connections']:>8.1f}x "
+              f"{old['streams'] / new['streams']:>5.1f}x {old['messages'] / new['messages']:>8.1f}x "
+              f"{results['ayrı'][1] / results['broker'][1]:>20.1f}x{ENDC}")
+    startup = process_startup()
+    print(f"{CYAN}Drone başına kalkan flocking süreci: {startup * 1000:.0f} ms açılış "
+          f"(+ ikinci mavsdk_server); {args.consumers} tüketici/drone, {args.duration:g} s sanal süre{ENDC}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import bisect
+import os
+import random
+import time
+from control_loop import ControlLoop, clear_loops, CONTROL_RATE
+from swarm_sim import simulate
+from telemetry_shm import TelemetrySegment
+
+# Sabit hızlı kontrol döngüsü, gerçek zamanda. İki ölçüm:
+#   - kayma: her tick 'work' ms CPU harcar; eski desen (tick + sleep(periyot)) ile
+#     ControlLoop'un ulaştığı hız
+#   - bildirim: SHM'ye rastgele anlarda yazılır; yazımdan sonraki ilk tick'e kadar geçen
+#     süre, sadece sabit hızda ve ChangeListener ile uyanarak (ucak111'in kullandığı)
+#   - sürü: kinematik simülatör + ucak111 gerçek zamanda (speed=1); kontrol döngülerinin
+#     uyanma gecikmesi, jitter'ı ve kaçırılan son tarihleri
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+async def naive_rate(rate, work, duration):
+    ticks = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        busy(work)
+        ticks += 1
+        await asyncio.sleep(1.0 / rate)
+    return ticks / (time.perf_counter() - start)
+
+
+async def loop_rate(rate, work, duration):
+    loop = ControlLoop("bench", rate)
+
+    async def tick():
+        busy(work)
+
+    try:
+        await asyncio.wait_for(loop.run(tick), duration)
+    except TimeoutError:
+        pass
+    return loop.stats()
+
+
+async def wake_latency(rate, wake, writes):
+    """Yazım -> ilk tick gecikmeleri (s, sıralı) ve tick sayısı."""
+    segment = TelemetrySegment.open(f"bench_wake_{os.getpid()}", max_drones=1)
+    loop = asyncio.get_running_loop()
+    control = ControlLoop("bench wake", rate)
+    ticks, written = [], []
+    rng = random.Random(1)
+
+    async def tick():
+        ticks.append(loop.time())
+
+    task = asyncio.create_task(control.run(tick, segment.change_listener() if wake else None))
+    try:
+        for _ in range(writes):
+            await asyncio.sleep(rng.uniform(0.03, 0.13))
+            written.append(loop.time())
+            segment.write(1, {"latitude": 47.4, "longitude": 8.5})
+        await asyncio.sleep(2 / rate)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        segment.close(unlink=True)
+    delays = sorted(ticks[bisect.bisect_left(ticks, at)] - at for at in written)
+    return delays, len(ticks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kontrol döngüsü zamanlama benchmark'ı")
+    parser.add_argument("--rates", type=float, nargs="+", default=[20.0, 50.0])
+    parser.add_argument("--work", type=float, nargs="+", default=[1.0, 5.0, 25.0], help="tick başına CPU (ms)")
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--swarm-duration", type=float, default=10.0)
+    parser.add_argument("--writes", type=int, default=100, help="bildirim ölçümünde SHM yazımı")
+    args = parser.parse_args()
+
+    print(f"{CYAN}{'hız':>6} {'iş':>7} {'eski':>9} {'ControlLoop':>12} {'kaçırılan':>10} {'jitter':>9}{ENDC}")
+    for rate in args.rates:
+        for work in args.work:
+            naive = asyncio.run(naive_rate(rate, work / 1000, args.duration))
+            stats = asyncio.run(loop_rate(rate, work / 1000, args.duration))
+            clear_loops()
+            color = GREEN if stats["achieved_rate"] >= rate * 0.98 else YELLOW
+            print(f"{rate:>5.0f}H {work:>5.0f}ms {naive:>7.1f}Hz {color}{stats['achieved_rate']:>10.1f}Hz{ENDC} "
+                  f"{stats['missed']:>10} {stats['jitter_ms']:>7.2f}ms")
+
+    print(f"\n{CYAN}{'uyanma':<10} {'yazım->tick p50':>16} {'p99':>8} {'tick/s':>8}{ENDC}")
+    for wake in (False, True):
+        delays, ticks = asyncio.run(wake_latency(CONTROL_RATE, wake, args.writes))
+        clear_loops()
+        duration = args.writes * 0.08
+        print(f"{'bildirim' if wake else 'sabit hız':<10} {delays[len(delays) // 2] * 1000:>14.2f}ms "
+              f"{delays[int(len(delays) * 0.99)] * 1000:>6.2f}ms {ticks / duration:>8.1f}")
+
+    print(f"\n{CYAN}{'N':>6} {'hız':>8} {'gecikme p50':>12} {'p99':>8} {'max':>8} {'süre p99':>9} "
+          f"{'jitter':>8} {'kaçırılan':>10}{ENDC}")
+    for count in args.counts:
+        _, _, _, loops = simulate(count, args.swarm_duration, speed=1.0)
+        rate = min(item["achieved_rate"] for item in loops)
+        late = [item["lateness_p50_ms"] for item in loops]
+        missed = sum(item["missed"] for item in loops)
+        color = GREEN if not missed else YELLOW
+        print(f"{count:>6} {rate:>6.1f}Hz {sorted(late)[len(late) // 2]:>10.2f}ms "
+              f"{max(item['lateness_p99_ms'] for item in loops):>6.2f}ms "
+              f"{max(item['lateness_max_ms'] for item in loops):>6.2f}ms "
+              f"{max(item['duration_p99_ms'] for item in loops):>7.2f}ms "
+              f"{max(item['jitter_ms'] for item in loops):>6.2f}ms {color}{missed:>10}{ENDC}")
+    print(f"{CYAN}eski: tick + sleep(periyot); sürü: en yavaş döngünün hızı, gecikme/süre/jitter tüm "
+          f"döngülerin en kötüsü (p50 hariç){ENDC}")
+
+
+if __name__ == "__main__":
+    main()
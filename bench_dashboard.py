@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+import argparse
+import contextlib
+import os
+import threading
+import time
+from dashboard import Dashboard, telemetry_rows
+
+# Terminal çıktısının veri alımına etkisi. Çıktı, okuyucusu sınırlı hızda boşaltan bir
+# boruya gider (yavaş terminal / ssh). Veri tarafı hedef hızda N drone'luk anlık
+# görüntü üretir ve ekrana verir:
+#   - eski: her güncellemede drone başına 15 ayrı print (listener2.print_telemetry deseni)
+#   - pano: Dashboard.update; çizim ayrı thread'de, kare başına tek write
+# Ölçülen: ulaşılan güncelleme hızı, güncelleme başına en kötü bekleme, yazılan bayt.
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+
+SAMPLE = {
+    "latitude": 47.3977419, "longitude": 8.5455938, "absolute_altitude": 498.1,
+    "relative_altitude": 10.0, "speed": 1.2, "roll": 0.5, "pitch": -1.3, "yaw": 87.4,
+    "flight_mode": "OFFBOARD", "battery_percent": 87.0, "battery_voltage": 15.9,
+    "satellites_visible": 10, "fix_type": 3, "uptime": "02:41",
+}
+FIELDS = ("latitude", "longitude", "absolute_altitude", "relative_altitude", "speed", "roll", "pitch", "yaw",
+          "flight_mode", "battery_percent", "battery_voltage", "satellites_visible", "fix_type", "uptime")
+
+
+def slow_reader(fd, bandwidth, done):
+    # Yavaş terminal: saniyede en fazla 'bandwidth' bayt boşaltır
+    chunk = max(1, int(bandwidth / 100))
+    while not done.is_set():
+        try:
+            if not os.read(fd, chunk):
+                return
+        except OSError:
+            return
+        time.sleep(0.01)
+
+
+def old_output(snapshot, out):
+    for drone_id, telem in snapshot.items():
+        print(f"\n{CYAN}--- Gelen Telemetri (Drone {drone_id}) ---{ENDC}", file=out)
+        for name in FIELDS:
+            print(f"{name}: {telem.get(name, 'N/A')}", file=out)
+        print(f"{CYAN}-----------------------------{ENDC}", file=out)
+
+
+def run(style, count, rate, duration, bandwidth, fps):
+    read_fd, write_fd = os.pipe()
+    done = threading.Event()
+    reader = threading.Thread(target=slow_reader, args=(read_fd, bandwidth, done), daemon=True)
+    reader.start()
+    snapshot = {str(i): dict(SAMPLE, latitude=SAMPLE["latitude"] + i * 1e-5) for i in range(1, count + 1)}
+    out = os.fdopen(write_fd, "w", buffering=1)  # tty gibi satır tamponlu
+    dashboard = None
+    if style == "pano":
+        dashboard = Dashboard("bench", fps=fps, in_place=True, fd=write_fd)
+        with contextlib.redirect_stdout(out):
+            dashboard.start()
+    updates, worst = 0, 0.0
+    period = 1.0 / rate
+    began = time.perf_counter()
+    next_update = began
+    while time.perf_counter() - began < duration:
+        t = time.perf_counter()
+        if dashboard is None:
+            old_output(snapshot, out)
+        else:
+            dashboard.update(telemetry_rows(snapshot))
+        worst = max(worst, time.perf_counter() - t)
+        updates += 1
+        next_update += period
+        delay = next_update - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    achieved = updates / (time.perf_counter() - began)
+    done.set()
+    if dashboard is not None:
+        # Okuyucu durdu; son kare yazılamazsa beklemesin
+        os.set_blocking(write_fd, False)
+        dashboard.stop()
+    with contextlib.suppress(OSError):
+        out.close()
+    os.close(read_fd)
+    frames = dashboard.frames if dashboard else updates
+    return achieved, worst, frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Terminal panosu vs satır satır print benchmark'ı")
+    parser.add_argument("--counts", type=int, nargs="+", default=[5, 20, 100])
+    parser.add_argument("--rate", type=float, default=50.0, help="hedef güncelleme hızı (Hz)")
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--bandwidth", type=float, default=200_000, help="terminalin boşaltma hızı (bayt/s)")
+    parser.add_argument("--fps", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{CYAN}{'N':>5} {'çıktı':<6} {'güncelleme':>11} {'en kötü bekleme':>16} {'kare':>6}{ENDC}")
+    for count in args.counts:
+        for style in ("eski", "pano"):
+            achieved, worst, frames = run(style, count, args.rate, args.duration, args.bandwidth, args.fps)
+            color = GREEN if achieved >= args.rate * 0.95 else RED
+            print(f"{count:>5} {style:<6} {color}{achieved:>9.1f}Hz{ENDC} {worst * 1000:>14.2f}ms {frames:>6}")
+    print(f"{CYAN}hedef {args.rate:g} Hz, terminal {args.bandwidth / 1000:g} kB/s, pano {args.fps:g} kare/s{ENDC}")
+
+
+if __name__ == "__main__":
+    main()
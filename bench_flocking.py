@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+import argparse
+import math
+import random
+import time
+import numpy as np
+import flocking_kernel
+import ucak111
+import ucak1
+import flocking1
+from telemetry_shm import TelemetrySegment, SHM_NAME
+
+# Skaler flocking kararları (her drone için en yakın komşu + flocking_decision /
+# flock_target) ile flocking_kernel'in tek geçişlik vektörel hali karşılaştırılır.
+# Önce çıktıların aynı olduğu doğrulanır (fark varsa çıkış kodu 1), sonra sürü turu
+# başına süre ölçülür.
+# --shm ile canlı telemetri segmentindeki kayıtlı konumlar da kullanılabilir.
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+ORIGIN_LAT, ORIGIN_LON, ORIGIN_ALT = 47.397742, 8.545594, 498.0
+TOLERANCE = 1e-6
+
+
+def make_swarm(count, spacing=12.0, seed=1):
+    """Ortalama 'spacing' metre aralıklı rastgele sürü: {"<id>": {...}}."""
+    rng = random.Random(seed)
+    side = spacing * math.sqrt(count)
+    m_per_deg_lat = 111195.0
+    m_per_deg_lon = m_per_deg_lat * math.cos(math.radians(ORIGIN_LAT))
+    return {
+        str(i + 1): {
+            "latitude": ORIGIN_LAT + rng.uniform(0, side) / m_per_deg_lat,
+            "longitude": ORIGIN_LON + rng.uniform(0, side) / m_per_deg_lon,
+            "absolute_altitude": ORIGIN_ALT + rng.uniform(-1, 1),
+            "yaw": rng.uniform(-180, 180),
+        }
+        for i in range(count)
+    }
+
+
+def shm_swarm():
+    segment = TelemetrySegment.open(SHM_NAME, create=False)
+    try:
+        snapshot = segment.read_all(("latitude", "longitude", "absolute_altitude", "yaw"))
+    finally:
+        segment.close()
+    return {key: data for key, data in snapshot.items()
+            if all(name in data for name in ("latitude", "longitude", "absolute_altitude", "yaw"))}
+
+
+def scalar_tick(swarm):
+    """Eski kontrolcülerdeki gibi: her drone için doğrusal en yakın komşu + skaler karar."""
+    band, flock, target = {}, {}, {}
+    for my_id, my in swarm.items():
+        others = [(oid, o) for oid, o in swarm.items() if oid != my_id]
+        if not others:
+            continue
+        nearest_id, nearest = min(
+            others, key=lambda item: ucak111.calculate_distance(my["latitude"], my["longitude"],
+                                                                item[1]["latitude"], item[1]["longitude"])
+        )
+        dist = ucak111.calculate_distance(my["latitude"], my["longitude"], nearest["latitude"], nearest["longitude"])
+        band[my_id] = ucak111.flocking_decision(my, nearest, dist)
+        flock[my_id] = ucak1.flocking_decision(my, nearest, dist)
+        target[my_id] = flocking1.flock_target(my, nearest)
+    return band, flock, target
+
+
+def kernel_tick(lat, lon, alt, yaw):
+    neighbors = flocking_kernel.nearest_neighbors(lat, lon)
+    band = flocking_kernel.band_commands(lat, lon, yaw, neighbors)
+    flock = flocking_kernel.flocking_commands(lat, lon, alt, yaw, neighbors)
+    target = flocking_kernel.flock_targets(lat, lon, neighbors)
+    return band, flock, target
+
+
+def close(a, b):
+    return all(abs(x - y) <= TOLERANCE * max(1.0, abs(x)) for x, y in zip(a, b))
+
+
+def mismatches(keys, scalar, vector):
+    band, flock, target = scalar
+    (b_mode, vn, ve, vd, b_yaw), (f_mode, command), (active, t_lat, t_lon) = vector
+    count = 0
+    for i, key in enumerate(keys):
+        if key not in band:
+            continue
+        mode, setpoint = band[key]
+        if flocking_kernel.BAND_MODES[b_mode[i]] != mode or not close(setpoint, (vn[i], ve[i], vd[i], b_yaw[i])):
+            count += 1
+            continue
+        mode, cmd = flock[key]
+        if flocking_kernel.FLOCK_MODES[f_mode[i]] != mode or not close(cmd, command[i]):
+            count += 1
+            continue
+        expected = target[key]
+        if (expected is None) == bool(active[i]) or (expected and not close(expected, (t_lat[i], t_lon[i]))):
+            count += 1
+    return count
+
+
+def timed(func, rounds):
+    best = math.inf
+    result = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(label, swarm, rounds):
+    keys = list(swarm)
+    lat = np.array([swarm[k]["latitude"] for k in keys])
+    lon = np.array([swarm[k]["longitude"] for k in keys])
+    alt = np.array([swarm[k]["absolute_altitude"] for k in keys])
+    yaw = np.array([swarm[k]["yaw"] for k in keys])
+
+    rounds = rounds if len(keys) <= 100 else 1
+    scalar_time, scalar = timed(lambda: scalar_tick(swarm), rounds)
+    kernel_time, vector = timed(lambda: kernel_tick(lat, lon, alt, yaw), max(rounds, 3))
+    diff = mismatches(keys, scalar, vector)
+    status = f"{GREEN}tamam{ENDC}" if diff == 0 else f"{RED}{diff} fark{ENDC}"
+    print(f"{label:>6} {scalar_time * 1000:>10.2f}ms {kernel_time * 1000:>10.2f}ms "
+          f"{scalar_time / kernel_time:>8.1f}x {len(keys) / kernel_time:>12.0f}  {status}")
+    return diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Skaler vs vektörel flocking benchmark'ı")
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--shm", action="store_true", help="canlı telemetri segmentindeki konumları da kullan")
+    args = parser.parse_args()
+
+    print(f"{CYAN}{'N':>6} {'skaler':>12} {'vektörel':>12} {'hızlanma':>9} {'drone/s':>12}  eşleşme{ENDC}")
+    failed = False
+    for count in args.counts:
+        failed |= run(str(count), make_swarm(count), args.rounds) != 0
+    if args.shm:
+        try:
+            failed |= run("shm", shm_swarm(), args.rounds) != 0
+        except FileNotFoundError:
+            print(f"{YELLOW}[SHM] Telemetri segmenti bulunamadı.{ENDC}")
+    print(f"{CYAN}Süreler: bir sürü turu (en yakın komşu + üç kontrolcünün kararı){ENDC}")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+
+import argparse
+from swarm_sim import simulate
+from ucak111 import TARGET_DISTANCE
+
+# Kapalı döngü formasyon testi: kinematik simülatörde 2 drone, farklı başlangıç
+# mesafelerinden, ucak111 tek başına ve ucak11 (ucak111 + flocking1 --flock-with) ile uçar.
+# Son SETTLE saniyedeki ayrım TARGET_DISTANCE'a TOLERANCE içinde oturmalı; oturmazsa
+# (ör. iki kontrolcü birbirine karşı salınıyorsa) benchmark başarısız olur.
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+SETTLE = 30.0     # s, sonda ayrımın bantta kalması gereken süre
+TOLERANCE = 2.0   # m
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kapalı döngü formasyon: son ayrım TARGET_DISTANCE'a oturuyor mu")
+    parser.add_argument("--controllers", nargs="+", choices=("ucak111", "ucak11"), default=["ucak111", "ucak11"])
+    parser.add_argument("--spacings", type=float, nargs="+", default=[5.0, 40.0], help="başlangıç mesafeleri (m)")
+    parser.add_argument("--duration", type=float, default=120.0, help="sanal süre (s)")
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{CYAN}{'kontrolcü':<10} {'başlangıç':>10} {'son':>8} {'son aralık':>16} {'en küçük':>9}{ENDC}")
+    for controller in args.controllers:
+        for spacing in args.spacings:
+            trace = []
+            _, separation, _, _ = simulate(2, args.duration, controller=controller, trace=trace, spacing=spacing)
+            tail = [value for when, value in trace if when >= args.duration - SETTLE]
+            low, high = min(tail), max(tail)
+            ok = abs(low - TARGET_DISTANCE) <= TOLERANCE and abs(high - TARGET_DISTANCE) <= TOLERANCE
+            failed |= not ok
+            color = GREEN if ok else RED
+            print(f"{controller:<10} {spacing:>8.1f} m {color}{tail[-1]:>6.1f} m {low:>6.1f}..{high:<6.1f} m{ENDC} "
+                  f"{separation:>7.1f} m")
+    print(f"{CYAN}hedef {TARGET_DISTANCE} ± {TOLERANCE:g} m; son aralık: son {SETTLE:g} s; "
+          f"{args.duration:g} s sanal süre{ENDC}")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
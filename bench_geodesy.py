@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+import argparse
+import math
+import random
+import time
+from geodesy import LocalFrame, haversine, initial_bearing, bearing, nearest_batch
+
+# geodesy.LocalFrame doğruluğu ve maliyeti.
+#  1) Doğruluk: orijin etrafında 0..RANGE metre içindeki rastgele çiftlerde ENU mesafe ve
+#     yönü haversine / büyük daire başlangıç yönüyle karşılaştırılır (enlem 0, 47.4, 70).
+#     Eski ham derece yönü (atan2(dlon, dlat)) de yanında gösterilir.
+#  2) Maliyet: sürü turu başına tüm çiftler; çift başına haversine vs örnek başına bir
+#     to_enu + çift başına hypot, ve numpy toplu to_enu_batch + nearest_batch.
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+ORIGIN_LON = 8.545594
+RANGE = 1000.0
+DISTANCE_TOLERANCE = 1e-3   # m
+BEARING_TOLERANCE = 0.05    # derece
+
+
+def random_points(frame, count, rng, radius=RANGE / 2):
+    points = []
+    for _ in range(count):
+        lat, lon, _ = frame.to_geodetic(rng.uniform(-radius, radius), rng.uniform(-radius, radius))
+        points.append((lat, lon))
+    return points
+
+
+def angle_error(a, b):
+    return abs(math.degrees(math.remainder(a - b, 2 * math.pi)))
+
+
+def accuracy(lat, pairs, rng):
+    frame = LocalFrame(lat, ORIGIN_LON)
+    points = random_points(frame, 2 * pairs, rng)
+    worst_distance = worst_bearing = worst_raw = worst_round_trip = 0.0
+    for (lat1, lon1), (lat2, lon2) in zip(points[::2], points[1::2]):
+        e1, n1, _ = frame.to_enu(lat1, lon1)
+        e2, n2, _ = frame.to_enu(lat2, lon2)
+        reference = haversine(lat1, lon1, lat2, lon2)
+        if reference < 1.0:
+            continue
+        worst_distance = max(worst_distance, abs(math.hypot(e2 - e1, n2 - n1) - reference))
+        true_bearing = initial_bearing(lat1, lon1, lat2, lon2)
+        worst_bearing = max(worst_bearing, angle_error(bearing(e2 - e1, n2 - n1), true_bearing))
+        worst_raw = max(worst_raw, angle_error(math.atan2(lon2 - lon1, lat2 - lat1), true_bearing))
+        back_lat, back_lon, _ = frame.to_geodetic(e1, n1)
+        worst_round_trip = max(worst_round_trip, abs(back_lat - lat1), abs(back_lon - lon1))
+    return worst_distance, worst_bearing, worst_raw, worst_round_trip
+
+
+def timed(func, rounds):
+    best = math.inf
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def haversine_tick(points):
+    for lat1, lon1 in points:
+        for lat2, lon2 in points:
+            haversine(lat1, lon1, lat2, lon2)
+
+
+def enu_tick(frame, points):
+    enu = [frame.to_enu(lat, lon) for lat, lon in points]
+    for e1, n1, _ in enu:
+        for e2, n2, _ in enu:
+            math.hypot(e2 - e1, n2 - n1)
+
+
+def batch_tick(frame, lats, lons):
+    east, north, _ = frame.to_enu_batch(lats, lons)
+    nearest_batch(east, north)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Yerel ENU çerçevesi doğruluk ve maliyet ölçümü")
+    parser.add_argument("--latitudes", type=float, nargs="+", default=[0.0, 47.397742, 70.0])
+    parser.add_argument("--pairs", type=int, default=20000)
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 300])
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    failed = False
+    print(f"{CYAN}Doğruluk (0..{RANGE:g} m, haversine'e göre en kötü){ENDC}")
+    print(f"{CYAN}{'enlem':>8} {'mesafe':>10} {'yön':>8} {'ham yön':>8} {'ters':>9}{ENDC}")
+    for lat in args.latitudes:
+        distance, heading, raw, round_trip = accuracy(lat, args.pairs, rng)
+        ok = distance <= DISTANCE_TOLERANCE and heading <= BEARING_TOLERANCE
+        failed |= not ok
+        color = GREEN if ok else RED
+        print(f"{color}{lat:>8.2f} {distance * 1e6:>8.1f}µm {heading:>7.3f}° {raw:>7.2f}° {round_trip:>9.1e}{ENDC}")
+
+    print(f"\n{CYAN}Sürü turu, tüm çiftler{ENDC}")
+    print(f"{CYAN}{'N':>6} {'haversine':>12} {'ENU':>12} {'numpy':>12} {'hızlanma':>9}{ENDC}")
+    frame = LocalFrame(47.397742, ORIGIN_LON)
+    for count in args.counts:
+        points = random_points(frame, count, rng)
+        lats = [lat for lat, _ in points]
+        lons = [lon for _, lon in points]
+        rounds = args.rounds if count <= 100 else 1
+        slow = timed(lambda: haversine_tick(points), rounds)
+        fast = timed(lambda: enu_tick(frame, points), rounds)
+        batch = timed(lambda: batch_tick(frame, lats, lons), rounds)
+        print(f"{count:>6} {slow * 1000:>10.2f}ms {fast * 1000:>10.2f}ms {batch * 1000:>10.2f}ms {slow / fast:>8.1f}x")
+    print(f"{CYAN}ham yön: eski atan2(dlon, dlat) yönünün hatası; ters: lat/lon -> ENU -> lat/lon (derece){ENDC}")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
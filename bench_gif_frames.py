@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import time
+from gif_frames import FrameCache, decode_frames, scale_frames
+from SwarMindGui import FEED_RESIZE_DEBOUNCE_MS, GIF_POLL_MS
+
+# Pencere boyutlandırılırken drone kartlarının GIF maliyeti (Tk olmadan, PhotoImage hariç):
+#   eski : her kartın her <Configure> olayında GIF ana iş parçacığında açılır, tüm kareler
+#          çözülür ve ölçeklenir; her drone kendi kare kopyasını tutar
+#   yeni : olaylar FEED_RESIZE_DEBOUNCE_MS ile birleştirilir, son boyut için tek iş arka
+#          plan iş parçacığında yapılır, kareler (dosya, boyut) önbelleğinde paylaşılır
+# Ana iş parçacığı süresi pencerenin donduğu süredir; yeni yolda sadece poll() çağrıları kalır.
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+DEFAULT_GIF = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Drone.gif")
+VISIBLE_CARDS = 4  # sanal ızgarada <Configure> alan kart sayısı
+
+
+def drag_sizes(events, start=(300, 150), step=(4, 2)):
+    """Kullanıcı pencereyi sürüklerken gelen ardışık kart boyutları."""
+    return [(start[0] + i * step[0], start[1] + i * step[1]) for i in range(events)]
+
+
+def settled_sizes(sizes, interval_ms):
+    """Debounce sonrası gerçekten uygulanan boyutlar: arkasından debounce süresi kadar olay gelmeyenler."""
+    if interval_ms < FEED_RESIZE_DEBOUNCE_MS:
+        return sizes[-1:]
+    return list(sizes)
+
+
+def old_load_time(path, size):
+    start = time.perf_counter()
+    frames, _ = decode_frames(path)
+    scale_frames(frames, size)
+    return time.perf_counter() - start
+
+
+def new_drag(path, sizes, interval_ms, drones):
+    """Yeni yol: (ana iş parçacığı süresi, bitiş süresi, önbellek)."""
+    cache = FrameCache()
+    main = 0.0
+    start = time.perf_counter()
+    for size in settled_sizes(sizes, interval_ms):
+        # Boyut uygulanınca tek istek; tüm drone'lar aynı seti bekler
+        t = time.perf_counter()
+        for _ in range(drones):
+            cache.request(path, size)
+        main += time.perf_counter() - t
+    while True:
+        t = time.perf_counter()
+        busy = cache.poll()
+        main += time.perf_counter() - t
+        if not busy:
+            break
+        time.sleep(GIF_POLL_MS / 1000)
+    ready = time.perf_counter() - start
+    # Aynı boyuta tekrar gelen istekler (kaydırma, yeni kart) önbellekten döner
+    t = time.perf_counter()
+    for _ in range(drones):
+        assert cache.request(path, sizes[-1]) is not None
+    main += time.perf_counter() - t
+    cache.close()
+    return main, ready, cache
+
+
+def frame_bytes(size, frames):
+    return size[0] * size[1] * 4 * frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GIF kare önbelleği / boyutlandırma benchmark'ı")
+    parser.add_argument("--gif", default=DEFAULT_GIF)
+    parser.add_argument("--events", type=int, default=30, help="sürükleme sırasında gelen <Configure> sayısı")
+    parser.add_argument("--interval", type=float, default=16.0, help="olaylar arası ms (60 Hz sürükleme)")
+    parser.add_argument("--drones", type=int, nargs="+", default=[2, 16, 100])
+    args = parser.parse_args()
+
+    sizes = drag_sizes(args.events)
+    frame_count = len(decode_frames(args.gif)[0])
+    # Eski yol tek yükleme ölçülüp olay x görünen kart sayısıyla çarpılır (tamamını koşmak dakikalar sürer)
+    one_load = old_load_time(args.gif, sizes[-1])
+    print(f"{CYAN}{args.gif}: {frame_count} kare, eski yolda tek yükleme {one_load * 1000:.0f} ms{ENDC}")
+    print(f"{CYAN}{'drone':>6} {'eski ana iş p.':>15} {'yeni ana iş p.':>15} {'yeni hazır':>11} "
+          f"{'çözme/ölçek':>12} {'eski bellek':>12} {'yeni bellek':>12}{ENDC}")
+    for drones in args.drones:
+        old_main = one_load * args.events * min(drones, VISIBLE_CARDS)
+        new_main, ready, cache = new_drag(args.gif, sizes, args.interval, drones)
+        old_memory = frame_bytes(sizes[-1], frame_count) * drones
+        new_memory = sum(frame_bytes(key[1], len(entry)) for key, entry in cache.entries.items())
+        # Bir kare süresinden (~16 ms) uzun donma akıcılığı bozar
+        color = GREEN if new_main < 0.016 else YELLOW
+        print(f"{drones:>6} {old_main:>14.1f}s {color}{new_main * 1000:>13.2f}ms{ENDC} {ready * 1000:>9.0f}ms "
+              f"{cache.decodes:>5}/{cache.scales:<6} {old_memory / 2**20:>10.0f}MB {new_memory / 2**20:>10.0f}MB")
+    print(f"{CYAN}{args.events} olay, {args.interval:.0f} ms aralık, debounce {FEED_RESIZE_DEBOUNCE_MS} ms. "
+          f"Bellek: RGBA kareler (PhotoImage kopyaları dahil değil); yeni yolda drone sayısından bağımsız{ENDC}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+import argparse
+import time
+from telemetry_shm import TelemetrySegment
+from SwarMindGui import (
+    GUI_TELEMETRY_FIELDS, TELEMETRY_MIN_REFRESH_MS, OVERVIEW_REFRESH_MS, format_telemetry_texts,
+)
+
+# GUI telemetri yenilemesinin ana iş parçacığı maliyeti (Tk olmadan ölçülür):
+#   eski : her yenilemede segment aç, tüm slotları çöz, kapat; kartın tüm etiketlerini yaz
+#   yeni : açık segment, generation değişmediyse hiçbir şey; sadece seq'i değişen slotlar
+#          çözülür, sadece görünen kartlarda metni değişen etiketler Tk'ye gider; genel
+#          bakış tablosunun bekleyen satırları her OVERVIEW_REFRESH_MS'de bir toplu yazılır
+# Segmentteki drone sayısı artarken yeni yolun yenileme süresi 50 ms bütçenin çok altında kalmalı.
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+BENCH_SHM_NAME = "telemetry_bench_gui"
+GUI_DRONES = ("1", "2")  # eski GUI'nin gösterdiği drone'lar
+VISIBLE_CARDS = 4        # sanal ızgarada aynı anda görünen kart sayısı
+OVERVIEW_EVERY = max(1, OVERVIEW_REFRESH_MS // TELEMETRY_MIN_REFRESH_MS)
+
+
+def sample(drone_id, k):
+    # Konum her turda değişir; mod, batarya ve açılar çoğu turda aynı kalır
+    return {
+        "latitude": 47.397742 + drone_id * 1e-4 + k * 1e-6, "longitude": 8.545594 + k * 1e-6,
+        "absolute_altitude": 498.0 + (k % 10) * 0.1, "speed": 2.0, "battery_percent": 87.0 - k // 1000,
+        "flight_mode": "OFFBOARD", "pitch": 0.5, "roll": -0.3, "yaw": 90.0,
+    }
+
+
+def old_refresh():
+    segment = TelemetrySegment.open(BENCH_SHM_NAME, create=False)
+    try:
+        data = segment.read_all(GUI_TELEMETRY_FIELDS)
+    finally:
+        segment.close()
+    updates = 0
+    for drone_id in GUI_DRONES:
+        # Eski kod her etiketi her yenilemede configure ediyordu
+        updates += len(format_telemetry_texts(data.get(drone_id)))
+    return updates
+
+
+class NewRefresh:
+    def __init__(self):
+        self.segment = TelemetrySegment.open(BENCH_SHM_NAME, create=False)
+        self.seqs = {}
+        self.generation = None
+        self.shown = {}
+        self.telemetry = {}
+        self.pending = set()
+        self.refreshes = 0
+
+    def __call__(self):
+        self.refreshes += 1
+        updates = 0
+        generation = self.segment.generation()
+        if generation != self.generation:
+            self.generation = generation
+            # Tüm drone'ların değişen slotları okunur, etiketler sadece görünen kartlarda
+            for drone_id, data in self.segment.read_changed(self.seqs, GUI_TELEMETRY_FIELDS):
+                self.telemetry[drone_id] = data
+                self.pending.add(drone_id)
+                if int(drone_id) > VISIBLE_CARDS:
+                    continue
+                for key, text in format_telemetry_texts(data).items():
+                    if self.shown.get((drone_id, key)) != text:
+                        self.shown[(drone_id, key)] = text
+                        updates += 1
+        if self.refreshes % OVERVIEW_EVERY == 0:
+            # Tablo: bekleyen satırlar tek geçişte (satır başına bir Tk çağrısı)
+            for drone_id in self.pending:
+                format_telemetry_texts(self.telemetry[drone_id])
+                updates += 1
+            self.pending.clear()
+        return updates
+
+    def close(self):
+        self.segment.close()
+
+
+def measure(drones, refreshes, writes_per_refresh):
+    segment = TelemetrySegment.open(BENCH_SHM_NAME, max_drones=drones)
+    new = NewRefresh()
+    results = {}
+    try:
+        for label, refresh in (("eski", old_refresh), ("yeni", new)):
+            total = 0.0
+            updates = 0
+            for k in range(refreshes):
+                # Yazıcılar (drone süreçleri) ölçüme dahil değil; her yenilemede
+                # writes_per_refresh kadar drone yeni örnek yazar
+                for i in range(writes_per_refresh):
+                    drone_id = 1 + (k * writes_per_refresh + i) % drones
+                    segment.write(drone_id, sample(drone_id, k))
+                start = time.perf_counter()
+                updates += refresh()
+                total += time.perf_counter() - start
+            results[label] = (total / refreshes, updates / refreshes)
+    finally:
+        new.close()
+        segment.close(unlink=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GUI telemetri yenileme maliyeti benchmark'ı")
+    parser.add_argument("--drones", type=int, nargs="+", default=[2, 16, 100, 256])
+    parser.add_argument("--refreshes", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{CYAN}{'segment':>8} {'yazım/yenileme':>15} {'eski':>10} {'yeni':>10} "
+          f"{'Tk çağrısı (eski)':>18} {'Tk çağrısı (yeni)':>18}{ENDC}")
+    for drones in args.drones:
+        for writes in sorted({0, 2, drones}):
+            result = measure(drones, args.refreshes, writes)
+            (old_time, old_updates), (new_time, new_updates) = result["eski"], result["yeni"]
+            # Yenileme bütçesinin %10'u ana döngüye bol pay bırakır
+            color = GREEN if new_time < TELEMETRY_MIN_REFRESH_MS / 1000 * 0.1 else YELLOW
+            print(f"{drones:>8} {writes:>15} {old_time * 1e6:>8.1f}µs {color}{new_time * 1e6:>8.1f}µs{ENDC} "
+                  f"{old_updates:>18.1f} {new_updates:>18.1f}")
+    print(f"{CYAN}Süreler yenileme başına (Tk çağrıları hariç); eski GUI sadece drone 1-2'yi gösteriyordu, "
+          f"yeni GUI tüm drone'ları izler. {TELEMETRY_MIN_REFRESH_MS} ms aralıkla bütçe "
+          f"{TELEMETRY_MIN_REFRESH_MS * 1000}µs{ENDC}")
+
+
+if __name__ == "__main__":
+    main()
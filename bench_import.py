@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Başlangıç (import) maliyeti: her durum taze bir yorumlayıcıda `python -X importtime`
+# ile koşulur. Ölçülenler: deyimin süresi, yüklenen ağır modüller (customtkinter, tkinter,
+# PIL) ve çalışma dizinine dosya yazılıp yazılmadığı (eskiden config importu yer tutucu
+# PNG oluşturuyordu). "config + GUI varlıkları" eski config importunun yaptığı işin aynısıdır.
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+HEAVY_MODULES = ("customtkinter", "tkinter", "PIL")
+
+CASES = (
+    ("settings", "import settings"),
+    ("config", "import config"),
+    ("telemetry_shm", "import telemetry_shm"),
+    ("config + GUI varlıkları", "import config; config.apply_appearance(); config.ensure_placeholder_image()"),
+    ("SwarMindGui", "import SwarMindGui"),
+)
+
+CHILD = """
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def run_case(statement):
+    """(süre_s, yüklenen ağır modüller, en pahalı üst seviye importlar, yazılan dosyalar)"""
+    with tempfile.TemporaryDirectory() as cwd:
+        env = dict(os.environ, PYTHONPATH=REPO_DIR)
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", CHILD.format(statement=statement)],
+            cwd=cwd, env=env, capture_output=True, text=True, check=True,
+        )
+        written = os.listdir(cwd)
+    loaded = set()
+    top = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        module = name.strip()
+        loaded.add(module.split(".")[0])
+        # Girinti yoksa üst seviye import
+        if name[1:2] != " ":
+            top.append((int(cumulative), module))
+    heavy = [module for module in HEAVY_MODULES if module in loaded]
+    top.sort(reverse=True)
+    return float(proc.stdout.strip().splitlines()[-1]), heavy, top[:3], written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Modül import (başlangıç) süresi benchmark'ı")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{CYAN}{'durum':<24} {'süre (medyan)':>14}  {'ağır modüller':<30} {'yazılan dosya':<30}{ENDC}")
+    for label, statement in CASES:
+        results = [run_case(statement) for _ in range(args.runs)]
+        elapsed = statistics.median(result[0] for result in results)
+        _, heavy, top, written = results[-1]
+        color = GREEN if not heavy and not written else YELLOW
+        print(f"{label:<24} {elapsed * 1000:>12.1f}ms  {color}{', '.join(heavy) or '-':<30}{ENDC} "
+              f"{', '.join(written) or '-':<30}")
+        print(f"{'':<24} en pahalı: " + ", ".join(f"{module} {us / 1000:.1f}ms" for us, module in top))
+    print(f"{CYAN}Yeşil: Tk/PIL yüklenmeden ve diske yazmadan import edilir (başsız araçlar için){ENDC}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+import argparse
+import time
+import metrics
+from metrics import histogram
+from replay import run_replay, synthetic_frames
+
+# Ölçüm altyapısının maliyeti. İki ölçüm:
+#   - mikro: bir start()/stop() çiftinin maliyeti (kapalı, örneklemeli, tam)
+#   - kontrolcü: ucak111 sanal saatte tekrar oynatılır; ölçümler kapalıyken alınan
+#     gerçek süreye göre ek yük (hedef < %1)
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+MODES = (("kapalı", 0), (f"1/{metrics.SAMPLE_EVERY}", metrics.SAMPLE_EVERY), ("tam", 1))
+
+
+def pair_cost(sample, calls):
+    metrics.reset()
+    metrics.configure(sample)
+    h = histogram("bench_seconds")
+    began = time.perf_counter_ns()
+    for _ in range(calls):
+        started = h.start()
+        h.stop(started)
+    return (time.perf_counter_ns() - began) / calls
+
+
+def replay_walls(frames, repeat):
+    """Mod başına en iyi gerçek süre ve toplam zamanlanan çağrı sayısı (modlar dönüşümlü koşar)."""
+    walls = [float("inf")] * len(MODES)
+    calls = 0
+    for _ in range(repeat):
+        for i, (_, sample) in enumerate(MODES):
+            metrics.reset()
+            metrics.configure(sample)
+            walls[i] = min(walls[i], run_replay(frames, "ucak111").wall_time)
+            calls = sum(item["calls"] for item in metrics.snapshot()["metrics"] if item["kind"] == "histogram")
+    return walls, calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ölçüm (metrics) ek yük benchmark'ı")
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--duration", type=float, default=20.0, help="sanal süre (s)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{CYAN}{'mod':<8} {'start+stop':>11}{ENDC}")
+    costs = []
+    for label, sample in MODES:
+        costs.append(pair_cost(sample, args.calls))
+        print(f"{label:<8} {costs[-1]:>9.0f}ns")
+
+    # Gerçek süre farkı bu makinede gürültülü; tahmin = zamanlanan çağrı × çift maliyeti / süre
+    print(f"\n{CYAN}{'N':>4} {'çağrı':>8} " + " ".join(f"{label:>8} {'tahmini':>8}" for label, _ in MODES) + ENDC)
+    for count in args.counts:
+        frames = synthetic_frames("converge", count, args.duration)
+        walls, calls = replay_walls(frames, args.repeat)
+        cells = []
+        for wall, cost in zip(walls, costs):
+            overhead = calls * cost / 1e9 / walls[0] * 100
+            color = GREEN if overhead < 1 else YELLOW if overhead < 5 else RED
+            cells.append(f"{wall:>7.2f}s {color}{overhead:>7.2f}%{ENDC}")
+        print(f"{count:>4} {calls:>8} " + " ".join(cells))
+    print(f"{CYAN}kontrolcü: ucak111, converge senaryosu, {args.duration:g} s sanal süre, en iyi {args.repeat} koşu; "
+          f"tahmini: ölçümlerin kapalı koşuya göre payı{ENDC}")
+    metrics.configure(metrics.SAMPLE_EVERY)
+
+
+if __name__ == "__main__":
+    main()
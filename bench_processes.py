@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import subprocess
+import time
+from process_manager import ProcessManager, session_panes
+
+# GUI'deki durdurma yolunun maliyeti. N "drone" için iki tmux oturumu (drone, _py) ve
+# bir de yönetici üzerinden başlatılmış süreç grubu açılır, sonra hepsi durdurulur:
+#   - eski: Tk iş parçacığında sırayla subprocess.call("tmux kill-session ...", shell=True)
+#   - yönetici: ProcessManager.emergency_stop; çağrı hemen döner, oturumlar paralel kapanır
+# Ölçülen: çağıranın (Tk iş parçacığının) bloklandığı süre ve tüm süreçlerin bitme süresi.
+# SIGHUP'ı yok sayan paneller (trap) SIGKILL'e kadar bekletir.
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+
+
+def sessions_for(count):
+    return [f"bench{i}_{suffix}" for i in range(1, count + 1) for suffix in ("session", "py")]
+
+
+def open_sessions(sessions, stubborn):
+    command = "trap '' HUP TERM; sleep 1000" if stubborn else "sleep 1000"
+    for session in sessions:
+        subprocess.run(["tmux", "new-session", "-d", "-s", session, command], check=True)
+    return [pid for session in sessions for pid in session_panes(session)]
+
+
+def running_groups(pgids):
+    # Zombiler sayılmaz (init'i çocuklarını geç toplayan konteynerlerde grup boşalmış sayılır)
+    running = set()
+    for entry in os.scandir("/proc"):
+        if entry.name.isdigit():
+            try:
+                with open(f"/proc/{entry.name}/stat") as f:
+                    fields = f.read().rsplit(")", 1)[1].split()
+            except OSError:
+                continue
+            if fields[0] != "Z" and int(fields[2]) in pgids:
+                running.add(int(fields[2]))
+    return running
+
+
+def wait_gone(pids, began):
+    pgids = set(pids)
+    while running_groups(pgids):
+        time.sleep(0.005)
+    return time.perf_counter() - began
+
+
+def old_stop(sessions, pids):
+    began = time.perf_counter()
+    for session in sessions:
+        subprocess.call(f"tmux kill-session -t {session} 2>/dev/null", shell=True)
+    blocked = time.perf_counter() - began
+    return blocked, wait_gone(pids, began)
+
+
+def manager_stop(sessions, pids, groups):
+    manager = ProcessManager()
+    for i in range(groups):
+        manager.start(f"group{i}", "sleep 1000 & sleep 1000")
+    while len(manager.running()) < groups:
+        time.sleep(0.005)
+    pids = pids + list(manager.running().values())
+    began = time.perf_counter()
+    manager.emergency_stop(sessions=sessions)
+    blocked = time.perf_counter() - began
+    done = wait_gone(pids, began)
+    manager.close()
+    return blocked, done
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GUI durdurma yolu: sıralı tmux çağrıları vs ProcessManager")
+    parser.add_argument("--counts", type=int, nargs="+", default=[2, 10, 25])
+    args = parser.parse_args()
+
+    print(f"{CYAN}{'N':>4} {'panel':<7} {'yol':<9} {'Tk bloklandı':>13} {'hepsi bitti':>12}{ENDC}")
+    for count in args.counts:
+        sessions = sessions_for(count)
+        for stubborn in (False, True):
+            for style in ("eski", "yönetici"):
+                if style == "eski" and stubborn:
+                    # Eski yol SIGKILL göndermez: süreçler hiç bitmez
+                    pids = open_sessions(sessions, stubborn)
+                    began = time.perf_counter()
+                    for session in sessions:
+                        subprocess.call(f"tmux kill-session -t {session} 2>/dev/null", shell=True)
+                    blocked = time.perf_counter() - began
+                    time.sleep(0.5)
+                    left = len(running_groups(set(pids)))
+                    subprocess.run(["kill", "-9", *map(str, pids)], capture_output=True)
+                    print(f"{count:>4} {'inatçı':<7} {style:<9} {blocked * 1000:>11.1f}ms {RED}{left:>4} kaldı{ENDC}")
+                    continue
+                pids = open_sessions(sessions, stubborn)
+                if style == "eski":
+                    blocked, done = old_stop(sessions, pids)
+                else:
+                    blocked, done = manager_stop(sessions, pids, count)
+                color = GREEN if blocked < 0.01 else RED
+                print(f"{count:>4} {'inatçı' if stubborn else 'normal':<7} {style:<9} "
+                      f"{color}{blocked * 1000:>11.1f}ms{ENDC} {done * 1000:>10.0f}ms")
+    print(f"{CYAN}N drone = 2N tmux oturumu (+ yöneticide N süreç grubu); inatçı: HUP/TERM yok sayılır{ENDC}")
+
+
+if __name__ == "__main__":
+    main()
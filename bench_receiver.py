@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import multiprocessing as mp
+import socket
+import time
+from telemetry_receiver import start_receiver, DroneTrack
+from telemetry_wire import encode_record, encode_frame, encode_json
+
+# Yer istasyonu alıcısı yük testi: bir üreteç süreci hedef hızda (paket/s) binary
+# telemetri datagramları yollar, alıcı ayrı bir süreçte (tek çekirdek) asyncio ile alır.
+# Ölçülenler: alınan paket hızı, seq'ten hesaplanan kayıp, alıcı sürecin CPU kullanımı.
+# Önce kasıtlı atlanan/yer değiştirilen paketlerle sayaçların doğruluğu, gönderici yeniden
+# başlaması (seq 1'e döner) ve tek bir sahte ileri sıçrama (seq 0x7fffffff) kontrol edilir.
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+
+SAMPLE = {
+    "timestamp": 0.0, "latitude": 47.3977419, "longitude": 8.5455938, "absolute_altitude": 498.1,
+    "relative_altitude": 10.0, "speed": 1.2, "roll": 0.5, "pitch": -1.3, "yaw": 87.4,
+    "flight_mode": "OFFBOARD", "battery_percent": 87.0, "battery_voltage": 15.9,
+    "satellites_visible": 10, "fix_type": 3, "uptime": "02:41",
+}
+
+
+def receiver_main(ready, done, results):
+    async def run():
+        transport, receiver = await start_receiver("127.0.0.1", 0)
+        ready.put(transport.get_extra_info("sockname")[1])
+        cpu = time.process_time()
+        while not done.is_set():
+            await asyncio.sleep(0.05)
+        # Soket tamponunda kalanlar da işlensin: paket sayısı durana kadar bekle
+        count = -1
+        while count != receiver.packets:
+            count = receiver.packets
+            await asyncio.sleep(0.1)
+        cpu = time.process_time() - cpu
+        stats = receiver.stats()
+        transport.close()
+        drones = stats["drones"].values()
+        results.put({
+            "packets": stats["packets"],
+            "lost": sum(d["lost"] for d in drones),
+            "out_of_order": sum(d["out_of_order"] for d in drones),
+            "duplicates": sum(d["duplicates"] for d in drones),
+            "cpu": cpu,
+        })
+    asyncio.run(run())
+
+
+def make_packet(drone_id, seq, binary=True):
+    if binary:
+        return encode_frame([encode_record(drone_id, SAMPLE, seq)])
+    return encode_json(drone_id, SAMPLE, seq)
+
+
+def generate(port, rate, duration, drones, binary=True):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    total = int(rate * duration)
+    seqs = [0] * drones
+    interval = 1.0 / rate
+    start = next_time = time.perf_counter()
+    for i in range(total):
+        index = i % drones
+        seqs[index] += 1
+        sock.sendto(make_packet(index + 1, seqs[index], binary), ("127.0.0.1", port))
+        next_time += interval
+        if i % 50 == 0:
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+    elapsed = time.perf_counter() - start
+    sock.close()
+    return total, elapsed
+
+
+def verify(port):
+    """100 paket: 5 seq atlanır (kayıp), 5 komşu çift yer değiştirir (sıra dışı), 3 tekrar."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    order = [seq for seq in range(1, 101) if seq not in (10, 20, 30, 40, 50)]
+    for pos in (60, 65, 70, 75, 80):
+        order[pos], order[pos + 1] = order[pos + 1], order[pos]
+    order += [90, 91, 92]
+    for seq in order:
+        sock.sendto(make_packet(1, seq), ("127.0.0.1", port))
+        time.sleep(0.0002)
+    sock.close()
+    return {"lost": 5, "out_of_order": 5, "duplicates": 3}
+
+
+def verify_restart():
+    """Gönderici 500 paketten sonra yeniden başlar (seq tekrar 1..300): yeni paketler tampona girmeli."""
+    track = DroneTrack()
+    for seq in list(range(1, 501)) + list(range(1, 301)):
+        track.add(seq, SAMPLE, 0.0)
+    latest = track.ring.latest()[1]
+    return {"resets": track.resets, "duplicates": track.duplicates, "latest": latest}, \
+        {"resets": 1, "duplicates": 0, "latest": 300}
+
+
+def verify_jump():
+    """Tek sahte seq (0x7fffffff) alıcıyı bekletmemeli; ardından gelen gerçek seq yeniden başlama sayılır."""
+    track = DroneTrack()
+    for seq in range(1, 11):
+        track.add(seq, SAMPLE, 0.0)
+    began = time.perf_counter()
+    track.add(0x7FFFFFFF, SAMPLE, 0.0)
+    elapsed = time.perf_counter() - began
+    track.add(11, SAMPLE, 0.0)
+    return {"fast": elapsed < 0.01, "resets": track.resets, "latest": track.ring.latest()[1]}, \
+        {"fast": True, "resets": 1, "latest": 11}
+
+
+def run(rate, duration, drones, binary=True, check=False):
+    ready, results, done = mp.Queue(), mp.Queue(), mp.Event()
+    proc = mp.Process(target=receiver_main, args=(ready, done, results))
+    proc.start()
+    port = ready.get()
+    time.sleep(0.1)
+    if check:
+        expected = verify(port)
+        sent, elapsed = 0, 1.0
+    else:
+        expected = None
+        sent, elapsed = generate(port, rate, duration, drones, binary)
+    done.set()
+    result = results.get()
+    proc.join()
+    return sent, elapsed, result, expected
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Asyncio UDP telemetri alıcısı yük testi")
+    parser.add_argument("--rates", type=int, nargs="+", default=[5000, 10000, 20000, 40000])
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--drones", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="binary yerine JSON datagramlar")
+    args = parser.parse_args()
+
+    _, _, result, expected = run(0, 0, 1, check=True)
+    checks = [("Sayaç doğrulaması (5 kayıp, 5 sıra dışı, 3 tekrar)", ({key: result[key] for key in expected}, expected)),
+              ("Gönderici yeniden başlaması", verify_restart()),
+              ("Sahte ileri sıçrama", verify_jump())]
+    failed = False
+    for label, (got, expected) in checks:
+        failed |= got != expected
+        status = f"{GREEN}doğru{ENDC}" if got == expected else f"{RED}hatalı: {got} (beklenen {expected}){ENDC}"
+        print(f"{CYAN}{label}:{ENDC} {status}")
+
+    fmt = "JSON" if args.json else "binary"
+    print(f"{CYAN}{'hedef p/s':>10} {'gönderilen p/s':>15} {'alınan p/s':>11} {'kayıp':>8} {'seq kayıp':>10} {'CPU':>7}  ({fmt}){ENDC}")
+    for rate in args.rates:
+        sent, elapsed, result, _ = run(rate, args.duration, args.drones, not args.json)
+        # Kuyruk kayıpları seq'ten görünmez; kayıp gönderilen/alınan farkından, seq
+        # tabanlı sayaç da aynı değeri vermeli (sondaki kayıplar hariç)
+        loss = (sent - result["packets"]) / sent * 100 if sent else 0.0
+        cpu = result["cpu"] / elapsed * 100
+        color = GREEN if loss < 0.1 else YELLOW if loss < 1 else RED
+        print(f"{rate:>10} {sent / elapsed:>15.0f} {result['packets'] / elapsed:>11.0f} "
+              f"{color}{loss:>7.2f}%{ENDC} {result['lost']:>10} {cpu:>6.1f}%")
+    print(f"{CYAN}CPU: alıcı sürecin tek çekirdek yüzdesi, seq kayıp: alıcının seq boşluklarından saydığı{ENDC}")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
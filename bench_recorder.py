@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+import argparse
+import multiprocessing as mp
+import os
+import random
+import shutil
+import tempfile
+import time
+import numpy as np
+from telemetry_shm import TelemetrySegment
+from telemetry_notify import ChangeListener
+from drone_logger import Recorder, FlightLog, COLUMNS
+
+# Telemetri kaydedici yük testi: yazıcı süreç N drone'un slotunu drone başına sabit hızda
+# yazar, kaydedici ayrı bir süreçte (drone_logger.main ile aynı döngü) hepsini diske yazar.
+# Ölçülenler: kaydedilen / yazılan örnek, kaçırılan örnek (seq boşlukları), kaydedicinin
+# CPU'su, saatlik kayıt boyutu; ardından kayıttan rastgele zaman aralıklarının okunma süresi.
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+BENCH_SHM_NAME = "telemetry_bench_recorder"
+
+
+def sample(drone_id, k):
+    return {
+        "latitude": 47.397742 + drone_id * 1e-4 + k * 1e-7, "longitude": 8.545594 + k * 1e-7,
+        "absolute_altitude": 498.0 + (k % 100) * 0.01, "relative_altitude": 10.0, "speed": 2.0,
+        "battery_percent": 87.0, "flight_mode": "OFFBOARD", "pitch": 0.5, "roll": -0.3, "yaw": 90.0,
+        "satellites_visible": 10, "fix_type": 3, "uptime": k // 50,
+    }
+
+
+def writer(stop, drones, rate, written):
+    segment = TelemetrySegment.open(BENCH_SHM_NAME, create=False)
+    interval = 1.0 / rate
+    next_time = time.perf_counter()
+    k = 0
+    try:
+        while not stop.is_set():
+            for drone_id in range(1, drones + 1):
+                segment.write(drone_id, sample(drone_id, k))
+            k += 1
+            next_time += interval
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+    finally:
+        written.value = k * drones
+        segment.close()
+
+
+def recorder_main(directory, stop, ready, results):
+    segment = TelemetrySegment.open(BENCH_SHM_NAME, create=False)
+    recorder = Recorder(segment, directory)
+    listener = ChangeListener(BENCH_SHM_NAME)
+    ready.set()
+    cpu = time.process_time()
+    start = time.monotonic()
+    while not stop.is_set():
+        listener.wait(timeout=0.1)
+        recorder.poll()
+        recorder.maybe_flush()
+    # Yazıcı durdu: son yazımlar da alınsın
+    recorder.poll()
+    recorder.close()
+    elapsed = time.monotonic() - start
+    cpu = time.process_time() - cpu
+    listener.close()
+    segment.close()
+    results.put((recorder.samples, recorder.missed, cpu / elapsed))
+
+
+def run(directory, drones, rate, duration):
+    segment = TelemetrySegment.open(BENCH_SHM_NAME, max_drones=drones)
+    stop_writer, stop_recorder, ready = mp.Event(), mp.Event(), mp.Event()
+    results, written = mp.Queue(), mp.Value("q", 0)
+    consumer = mp.Process(target=recorder_main, args=(directory, stop_recorder, ready, results))
+    consumer.start()
+    ready.wait()
+    producer = mp.Process(target=writer, args=(stop_writer, drones, rate, written))
+    producer.start()
+    time.sleep(duration)
+    stop_writer.set()
+    producer.join()
+    time.sleep(0.2)
+    stop_recorder.set()
+    samples, missed, cpu = results.get()
+    consumer.join()
+    segment.close(unlink=True)
+    return written.value, samples, missed, cpu
+
+
+def directory_size(directory):
+    # Sütun dosyaları seyrek (önceden ayrılmış); sadece gerçekten kullanılan bloklar
+    return sum(os.stat(os.path.join(root, name)).st_blocks * 512
+               for root, _, names in os.walk(directory) for name in names)
+
+
+def query(directory, windows, width, rng):
+    log = FlightLog(directory)
+    first, last = log.time_range()
+    times = []
+    rows = 0
+    for _ in range(windows):
+        start = rng.uniform(first, max(first, last - width))
+        began = time.perf_counter()
+        result = log.window(start, start + width, fields=("latitude", "longitude", "absolute_altitude"))
+        times.append(time.perf_counter() - began)
+        rows += len(result["time"])
+    times.sort()
+    return len(log), times[len(times) // 2], times[int(len(times) * 0.99)], rows / windows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Telemetri kaydedici yük ve okuma testi")
+    parser.add_argument("--drones", type=int, nargs="+", default=[2, 10, 50])
+    parser.add_argument("--rate", type=float, default=50.0, help="drone başına yazım hızı (Hz)")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--windows", type=int, default=200, help="rastgele okunan zaman aralığı sayısı")
+    parser.add_argument("--width", type=float, default=1.0, help="okunan aralık genişliği (s)")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    row_bytes = sum(np.dtype(dtype).itemsize for _, dtype in COLUMNS)
+    print(f"{CYAN}{'drone':>6} {'yazılan':>9} {'kaydedilen':>11} {'kaçırılan':>10} {'CPU':>7} "
+          f"{'MB/saat':>9} {'aralık p50':>11} {'p99':>9} {'satır/aralık':>13}{ENDC}")
+    for drones in args.drones:
+        directory = tempfile.mkdtemp(prefix="bench_recorder_")
+        try:
+            written, samples, missed, cpu = run(directory, drones, args.rate, args.duration)
+            stored, p50, p99, rows = query(directory, args.windows, args.width, rng)
+            per_hour = drones * args.rate * 3600 * row_bytes / 2**20
+            color = GREEN if samples == written and stored == samples else YELLOW
+            cpu_color = GREEN if cpu < 0.05 else YELLOW
+            print(f"{drones:>6} {written:>9} {color}{samples:>11}{ENDC} {missed:>10} "
+                  f"{cpu_color}{cpu * 100:>6.1f}%{ENDC} {per_hour:>9.0f} {p50 * 1000:>9.2f}ms "
+                  f"{p99 * 1000:>7.2f}ms {rows:>13.0f}")
+            print(f"{'':>6} disk: {directory_size(directory) / 2**20:.1f} MB, {stored} satır okunabilir")
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+    print(f"{CYAN}{args.rate:g} Hz/drone, {args.duration:g} s; satır {row_bytes} bayt; "
+          f"CPU: kaydedici sürecin tek çekirdek yüzdesi; aralık: {args.width:g} s'lik rastgele pencere{ENDC}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+
+import argparse
+from replay import run_replay, synthetic_frames, digest, CONTROLLERS
+
+# Tekrar oynatma hızı: sentetik senaryo N drone ile sanal saatte olabildiğince hızlı
+# oynatılır. Ölçülenler: saniyede kontrolcü kararı (komut), saniyede yazılan kare,
+# gerçek zamana göre hızlanma ve aynı girdinin iki koşuda aynı komutları üretip üretmediği.
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deterministik tekrar oynatma benchmark'ı")
+    parser.add_argument("--counts", type=int, nargs="+", default=[2, 10, 50])
+    parser.add_argument("--controllers", nargs="+", choices=sorted(CONTROLLERS), default=["ucak111", "ucak1"])
+    parser.add_argument("--scenario", default="converge")
+    parser.add_argument("--duration", type=float, default=30.0, help="sanal süre (s)")
+    parser.add_argument("--rate", type=float, default=20.0, help="drone başına telemetri hızı (Hz)")
+    args = parser.parse_args()
+
+    print(f"{CYAN}{'kontrolcü':<10} {'N':>4} {'kare':>8} {'komut':>8} {'gerçek':>8} {'hızlanma':>9} "
+          f"{'komut/s':>9} {'kare/s':>9} {'deterministik':>14}{ENDC}")
+    for controller in args.controllers:
+        for count in args.counts:
+            frames = synthetic_frames(args.scenario, count, args.duration, args.rate)
+            first = run_replay(frames, controller)
+            second = run_replay(frames, controller)
+            same = digest(first.commands) == digest(second.commands)
+            wall = first.wall_time
+            speedup = first.duration / wall
+            color = GREEN if speedup >= 10 else YELLOW if speedup >= 1 else RED
+            print(f"{controller:<10} {count:>4} {first.frames:>8} {len(first.commands):>8} {wall:>7.2f}s "
+                  f"{color}{speedup:>8.0f}x{ENDC} {len(first.commands) / wall:>9.0f} {first.frames / wall:>9.0f} "
+                  f"{GREEN + 'evet' if same else RED + 'HAYIR':>19}{ENDC}")
+    print(f"{CYAN}{args.scenario}, {args.duration:g} s sanal süre, {args.rate:g} Hz/drone; "
+          f"hızlanma: sanal süre / gerçek süre{ENDC}")
+
+
+if __name__ == "__main__":
+    main()
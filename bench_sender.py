@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import threading
+import time
+from telemetry_shm import TelemetrySegment
+from telemetry_sender import TelemetrySender, changed_samples
+from telemetry_wire import decode, is_control
+
+# UDP telemetri gönderim maliyeti:
+#   süreç/paket : eski model, her örnek için "python3 sender.py <json>"
+#   kalıcı      : TelemetrySender, soket açık, her örnek ayrı datagram
+#   toplu       : segmentten değişen slotlar okunup MTU'ya sığan datagramlarda toplanır
+# Yerel bir alıcı datagram ve örnek sayısını doğrular.
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+BENCH_SHM_NAME = "telemetry_bench_sender"
+SENDER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sender.py")
+
+SAMPLE = {
+    "latitude": 47.3977419, "longitude": 8.5455938, "absolute_altitude": 498.12,
+    "relative_altitude": 10.05, "speed": 1.21, "roll": 0.52, "pitch": -1.3, "yaw": 87.4,
+    "flight_mode": "OFFBOARD", "battery_percent": 87.0, "battery_voltage": 15.9,
+    "satellites_visible": 10, "fix_type": 3, "uptime": "02:41",
+}
+
+
+class Receiver(threading.Thread):
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        self.sock.bind(("127.0.0.1", 0))
+        self.port = self.sock.getsockname()[1]
+        self.packets = 0
+        self.messages = 0
+
+    def run(self):
+        while True:
+            data = self.sock.recv(65535)
+            # HELLO'lar yanıtlanmaz: gönderici JSON'da kalır
+            if is_control(data):
+                continue
+            self.packets += 1
+            self.messages += len(decode(data))
+
+    def wait_for(self, messages, timeout=5.0):
+        end = time.monotonic() + timeout
+        while self.messages < messages and time.monotonic() < end:
+            time.sleep(0.01)
+
+
+def per_process(receiver, count):
+    message = json.dumps({"drone_id": "2", "udp_port": receiver.port, "telemetry": SAMPLE})
+    before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    start = time.perf_counter()
+    for _ in range(count):
+        subprocess.run([sys.executable, SENDER_SCRIPT, message, "--ip", "127.0.0.1", "--port", str(receiver.port)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    wall = time.perf_counter() - start
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu = (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+    return count, count, wall, cpu
+
+
+def persistent(receiver, count):
+    sender = TelemetrySender("127.0.0.1", receiver.port)
+    start, cpu = time.perf_counter(), time.process_time()
+    for _ in range(count):
+        sender.send("2", SAMPLE)
+    result = sender.messages, sender.packets, time.perf_counter() - start, time.process_time() - cpu
+    sender.close()
+    return result
+
+
+def batched(receiver, count, drones):
+    segment = TelemetrySegment.open(BENCH_SHM_NAME, max_drones=drones)
+    sender = TelemetrySender("127.0.0.1", receiver.port)
+    last_seqs = {}
+    wall = cpu = 0.0
+    try:
+        for _ in range(max(1, count // drones)):
+            # Yazım (drone süreçlerinin işi) ölçüme dahil değil
+            for drone_id in range(1, drones + 1):
+                segment.write(drone_id, SAMPLE)
+            start, cpu_start = time.perf_counter(), time.process_time()
+            sender.send_batch(changed_samples(segment, last_seqs))
+            wall += time.perf_counter() - start
+            cpu += time.process_time() - cpu_start
+        return sender.messages, sender.packets, wall, cpu
+    finally:
+        sender.close()
+        segment.close(unlink=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UDP telemetri gönderici benchmark'ı")
+    parser.add_argument("--process-count", type=int, default=30, help="süreç/paket modelinde paket sayısı")
+    parser.add_argument("--count", type=int, default=20000, help="kalıcı/toplu modellerde örnek sayısı")
+    parser.add_argument("--drones", type=int, default=10, help="toplu modelde drone sayısı")
+    args = parser.parse_args()
+
+    receiver = Receiver()
+    receiver.start()
+    print(f"{CYAN}{'model':<14} {'örnek/s':>10} {'datagram/s':>11} {'CPU/örnek':>11} {'alınan':>8}{ENDC}")
+    runs = (
+        ("süreç/paket", lambda: per_process(receiver, args.process_count)),
+        ("kalıcı", lambda: persistent(receiver, args.count)),
+        (f"toplu ({args.drones})", lambda: batched(receiver, args.count, args.drones)),
+    )
+    for label, run in runs:
+        base_messages = receiver.messages
+        messages, packets, wall, cpu = run()
+        receiver.wait_for(base_messages + messages)
+        received = receiver.messages - base_messages
+        color = GREEN if received == messages else YELLOW
+        print(f"{label:<14} {messages / wall:>10.0f} {packets / wall:>11.0f} "
+              f"{cpu / messages * 1e6:>9.1f}µs {color}{received:>8}{ENDC}")
+    print(f"{CYAN}CPU/örnek: gönderen tarafın (süreç/paket için alt süreçlerin) CPU süresi{ENDC}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+import argparse
+import multiprocessing as mp
+import time
+from telemetry_shm import TelemetrySegment, SLOT
+
+# Seqlock stres testi: N yazıcı süreç kendi slotunu durmadan yazar, okuyucular
+# tüm slotları okuyup her slotun tutarlı (tek bir yazıma ait) olup olmadığını kontrol eder.
+# Yazıcı her turda tüm float alanlara aynı k değerini yazar; farklı değerler = yırtık okuma.
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+BENCH_SHM_NAME = "telemetry_bench"
+CHECK_FIELDS = (
+    "latitude", "longitude", "absolute_altitude", "relative_altitude", "speed",
+    "roll", "pitch", "yaw", "battery_percent", "battery_voltage"
+)
+
+
+def writer(drone_id, rate, stop, counts):
+    segment = TelemetrySegment.open(BENCH_SHM_NAME, create=False)
+    period = 1.0 / rate if rate else 0.0
+    k = 0
+    while not stop.is_set():
+        k = (k + 1) % (1 << 24)  # float32 ile tam temsil edilebilir aralık
+        value = float(k)
+        segment.write(drone_id, dict.fromkeys(CHECK_FIELDS, value))
+        if k & 0x3FF == 0:
+            counts[drone_id - 1] = k
+        if period:
+            time.sleep(period)
+    counts[drone_id - 1] = k
+    segment.close()
+
+
+def reader(index, writers, naive, stop, results):
+    segment = TelemetrySegment.open(BENCH_SHM_NAME, create=False)
+    reads = torn = 0
+    # Ham slot içindeki float alanların indeksleri (seq, drone_id, flags, timestamp'tan sonra)
+    raw_range = slice(4, 4 + len(CHECK_FIELDS))
+    while not stop.is_set():
+        for drone_id in range(1, writers + 1):
+            if naive:
+                # Seqlock kontrolü olmadan doğrudan okuma (karşılaştırma için)
+                values = SLOT.unpack_from(segment.buf, segment.slot_offset(drone_id))[raw_range]
+            else:
+                data = segment.read(drone_id, CHECK_FIELDS)
+                if data is None:
+                    continue
+                values = [data[name] for name in CHECK_FIELDS]
+            reads += 1
+            if min(values) != max(values):
+                torn += 1
+    results.put((index, reads, torn, segment.read_retries))
+    segment.close()
+
+
+def run(writers, readers, duration, naive, rate=0):
+    segment = TelemetrySegment.open(BENCH_SHM_NAME, max_drones=max(writers, 1))
+    stop = mp.Event()
+    counts = mp.Array("q", writers)
+    results = mp.Queue()
+    procs = [mp.Process(target=writer, args=(i + 1, rate, stop, counts)) for i in range(writers)]
+    procs += [mp.Process(target=reader, args=(i, writers, naive, stop, results)) for i in range(readers)]
+    for p in procs:
+        p.start()
+    time.sleep(duration)
+    stop.set()
+    stats = [results.get() for _ in range(readers)]
+    for p in procs:
+        p.join()
+    segment.close(unlink=True)
+
+    writes = sum(counts)
+    reads = sum(r[1] for r in stats)
+    torn = sum(r[2] for r in stats)
+    retries = sum(r[3] for r in stats)
+    mode = "naive" if naive else "seqlock"
+    color = GREEN if torn == 0 else RED
+    rate_text = f"{rate} Hz" if rate else "sınırsız"
+    print(f"{CYAN}[{mode}] writers={writers} readers={readers} hız={rate_text} süre={duration:.1f}s{ENDC}")
+    print(f"  yazım: {writes / duration:,.0f}/s toplam, {writes / duration / max(writers, 1):,.0f}/s yazıcı başına")
+    print(f"  okuma: {reads / duration:,.0f} slot/s, tekrar deneme: {retries}")
+    print(f"  {color}yırtık okuma: {torn}{ENDC}")
+    return torn
+
+
+def main():
+    parser = argparse.ArgumentParser(description="telemetry_shared seqlock stres testi")
+    parser.add_argument("--writers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--readers", type=int, default=1)
+    parser.add_argument("--duration", type=float, default=2.0)
+    parser.add_argument("--rate", type=float, default=0, help="yazıcı başına yazım hızı (Hz), 0 = sınırsız")
+    parser.add_argument("--naive", action="store_true", help="seqlock'suz okuma ile de karşılaştır")
+    args = parser.parse_args()
+
+    torn = 0
+    for n in args.writers:
+        torn += run(n, args.readers, args.duration, naive=False, rate=args.rate)
+        if args.naive:
+            run(n, args.readers, args.duration, naive=True, rate=args.rate)
+    if torn:
+        print(f"{RED}Seqlock okumalarında yırtık veri bulundu!{ENDC}")
+        raise SystemExit(1)
+    print(f"{GREEN}Seqlock: sıfır yırtık okuma.{ENDC}")
+
+
+if __name__ == "__main__":
+    main()
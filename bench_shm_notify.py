@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+import argparse
+import multiprocessing as mp
+import random
+import time
+from telemetry_shm import TelemetrySegment
+from telemetry_notify import ChangeListener
+
+# Sabit aralıklı yoklama (eski listener2 / flocking döngüleri) ile telemetry_notify
+# bildirimlerinin karşılaştırması. Bir yazıcı süreç rastgele aralıklarla slot yazar,
+# okuyucu süreç değişikliği fark ettiği anda slot zaman damgasına göre gecikmeyi ölçer.
+# Ardından yazıcı durur ve okuyucunun boştaki CPU kullanımı ölçülür.
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+BENCH_SHM_NAME = "telemetry_bench_notify"
+
+
+def writer(stop, rate):
+    segment = TelemetrySegment.open(BENCH_SHM_NAME, create=False)
+    rng = random.Random(1)
+    try:
+        while not stop.is_set():
+            segment.write(1, {"latitude": 47.0, "longitude": 8.0})
+            time.sleep(rng.uniform(0.5, 1.5) / rate)
+    finally:
+        segment.close()
+
+
+def reader(mode, interval, busy, idle, ready, results):
+    segment = TelemetrySegment.open(BENCH_SHM_NAME, create=False)
+    listener = ChangeListener(BENCH_SHM_NAME) if mode == "notify" else None
+    ready.set()
+    latencies = []
+    last = segment.generation()
+
+    def phase(duration, record):
+        nonlocal last
+        end = time.monotonic() + duration
+        cpu = time.process_time()
+        while time.monotonic() < end:
+            if listener is not None:
+                listener.wait(timeout=end - time.monotonic())
+            else:
+                time.sleep(interval)
+            generation = segment.generation()
+            if generation != last:
+                last = generation
+                data = segment.read(1, ("timestamp",))
+                if record and data:
+                    latencies.append(time.time() - data["timestamp"])
+        return time.process_time() - cpu
+
+    busy_cpu = phase(busy, True)
+    idle_cpu = phase(idle, False)
+    if listener is not None:
+        listener.close()
+    segment.close()
+    results.put((latencies, busy_cpu / busy, idle_cpu / idle))
+
+
+def percentile(values, p):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+def run(mode, interval, rate, busy, idle):
+    segment = TelemetrySegment.open(BENCH_SHM_NAME, max_drones=1)
+    stop, ready, results = mp.Event(), mp.Event(), mp.Queue()
+    consumer = mp.Process(target=reader, args=(mode, interval, busy, idle, ready, results))
+    consumer.start()
+    ready.wait()
+    producer = mp.Process(target=writer, args=(stop, rate))
+    producer.start()
+    time.sleep(busy)
+    stop.set()
+    producer.join()
+    latencies, busy_cpu, idle_cpu = results.get()
+    consumer.join()
+    segment.close(unlink=True)
+    return latencies, busy_cpu, idle_cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SHM yoklama vs bildirim gecikme/CPU benchmark'ı")
+    parser.add_argument("--rate", type=float, default=50.0, help="yazım hızı (Hz)")
+    parser.add_argument("--busy", type=float, default=4.0, help="yazıcı çalışırken ölçüm süresi (s)")
+    parser.add_argument("--idle", type=float, default=3.0, help="yazıcı durduktan sonra ölçüm süresi (s)")
+    parser.add_argument("--intervals", type=float, nargs="+", default=[0.1, 0.02, 0.001],
+                        help="karşılaştırılacak yoklama aralıkları (s)")
+    args = parser.parse_args()
+
+    print(f"{CYAN}{'yöntem':<14} {'gecikme p50':>12} {'p99':>10} {'CPU (yazım)':>12} {'CPU (boşta)':>12}{ENDC}")
+    modes = [(f"yoklama {interval * 1000:g}ms", "poll", interval) for interval in args.intervals]
+    modes.append(("bildirim", "notify", None))
+    for label, mode, interval in modes:
+        latencies, busy_cpu, idle_cpu = run(mode, interval, args.rate, args.busy, args.idle)
+        p50, p99 = percentile(latencies, 50) * 1000, percentile(latencies, 99) * 1000
+        color = GREEN if p99 < 1 else YELLOW if p99 < 10 else RED
+        print(f"{label:<14} {color}{p50:>10.3f}ms {p99:>8.3f}ms{ENDC} "
+              f"{busy_cpu * 100:>11.2f}% {idle_cpu * 100:>11.2f}%")
+    print(f"{CYAN}gecikme: yazım -> okuyucunun fark etmesi, CPU: okuyucu sürecin tek çekirdek yüzdesi{ENDC}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import time
+from swarm_sim import SwarmSim, simulate, STEP_RATE
+
+# Kinematik simülatör maliyeti. İki ölçüm:
+#   - sadece fizik: N drone'un tek vektörel adımı (akış mesajları hariç)
+#   - tam yığın: simülatör + ucak111 (start_flight, telemetry_collector, flocking_controller)
+#     sanal saatte olabildiğince hızlı; hızlanma = sanal süre / gerçek süre (> 1: gerçek zamandan hızlı)
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+
+
+def step_cost(count, steps):
+    async def measure():
+        sim = SwarmSim(count)
+        sim.armed[:] = True
+        began = time.perf_counter()
+        for _ in range(steps):
+            sim.step()
+        return (time.perf_counter() - began) / steps
+    return asyncio.run(measure())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kinematik sürü simülatörü benchmark'ı")
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 50, 100, 200])
+    parser.add_argument("--duration", type=float, default=20.0, help="tam yığın sanal süresi (s)")
+    parser.add_argument("--steps", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{CYAN}{'N':>6} {'adım':>10} {'fizik payı':>11} {'tam yığın':>10} {'hızlanma':>9} {'en küçük ayrım':>15}{ENDC}")
+    for count in args.counts:
+        cost = step_cost(count, args.steps)
+        sim, separation, wall, _ = simulate(count, args.duration)
+        speedup = args.duration / wall
+        color = GREEN if speedup >= 1 else RED
+        # Gerçek zamanda adım bütçesi 1 / STEP_RATE; fizik bunun ne kadarını kullanıyor
+        print(f"{count:>6} {cost * 1e6:>8.0f}µs {cost * STEP_RATE * 100:>10.2f}% {wall:>9.2f}s "
+              f"{color}{speedup:>8.1f}x{ENDC} {separation:>13.1f} m")
+    print(f"{CYAN}fizik payı: gerçek zamanda bir çekirdeğin fizik adımına giden oranı; "
+          f"tam yığın: {args.duration:g} s sanal uçuş{ENDC}")
+
+
+if __name__ == "__main__":
+    main()
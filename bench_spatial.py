@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+import argparse
+import math
+import random
+import time
+from spatial_index import SpatialGrid, SwarmIndex, shared_index, STALE_AFTER
+from telemetry_shm import TelemetrySegment
+from ucak111 import calculate_distance
+
+# Sürü turu başına komşu arama maliyeti: her drone en yakın komşusunu ve
+# SEE_RADIUS içindeki komşularını bulur. Doğrusal tarama (flocking_controller'daki
+# eski min(...) + calculate_distance) ile ızgara karşılaştırılır.
+# Önce SwarmIndex'in yazmayı bırakan drone'u düşürdüğü ve shared_index'in segment
+# kapanınca bırakıldığı kontrol edilir.
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+ORIGIN_LAT, ORIGIN_LON = 47.397742, 8.545594
+SEE_RADIUS = 30
+BENCH_SHM_NAME = "telemetry_bench_spatial"
+
+
+def make_swarm(count, spacing=12.0, seed=1):
+    """Ortalama 'spacing' metre aralıklı rastgele sürü: {"<id>": {"latitude", "longitude"}}."""
+    rng = random.Random(seed)
+    side = spacing * math.sqrt(count)
+    m_per_deg_lat = 111195.0
+    m_per_deg_lon = m_per_deg_lat * math.cos(math.radians(ORIGIN_LAT))
+    return {
+        str(i + 1): {
+            "latitude": ORIGIN_LAT + rng.uniform(0, side) / m_per_deg_lat,
+            "longitude": ORIGIN_LON + rng.uniform(0, side) / m_per_deg_lon,
+        }
+        for i in range(count)
+    }
+
+
+def jitter(swarm, rng, meters=0.5):
+    # Bir tur sonra drone'lar biraz hareket etmiş olur
+    for data in swarm.values():
+        data["latitude"] += rng.uniform(-meters, meters) / 111195.0
+        data["longitude"] += rng.uniform(-meters, meters) / 75000.0
+
+
+def linear_tick(swarm):
+    result = {}
+    for my_id, my in swarm.items():
+        others = [(oid, o) for oid, o in swarm.items() if oid != my_id]
+        nearest_id, nearest = min(
+            others, key=lambda item: calculate_distance(my["latitude"], my["longitude"],
+                                                        item[1]["latitude"], item[1]["longitude"])
+        )
+        dist = calculate_distance(my["latitude"], my["longitude"], nearest["latitude"], nearest["longitude"])
+        seen = [oid for oid, o in others
+                if calculate_distance(my["latitude"], my["longitude"], o["latitude"], o["longitude"]) <= SEE_RADIUS]
+        result[my_id] = (nearest_id, dist, len(seen))
+    return result
+
+
+def grid_tick(grid, swarm):
+    grid.sync(swarm)
+    result = {}
+    for my_id in swarm:
+        dist, nearest_id = grid.nearest_to(my_id, 1)[0]
+        seen = grid.within_of(my_id, SEE_RADIUS)
+        result[my_id] = (nearest_id, dist, len(seen))
+    return result
+
+
+def verify_index():
+    """3 drone yazar, sonra sadece 1 ve 2 yazmaya devam eder: 3, STALE_AFTER sonra düşmeli."""
+    swarm = make_swarm(3, spacing=5.0)
+    segment = TelemetrySegment.open(BENCH_SHM_NAME, max_drones=4)
+    try:
+        index = SwarmIndex(segment)
+        for key, data in swarm.items():
+            segment.write(key, dict(data, yaw=0.0))
+        index.refresh(now=0.0)
+        before = sorted(index.data)
+        for key in ("1", "2"):
+            segment.write(key, dict(swarm[key], yaw=0.0))
+        index.refresh(now=STALE_AFTER + 1)
+        after = sorted(index.data)
+        neighbors = sorted(key for _, key, _ in index.within("1", 1000))
+        shared = shared_index(segment)
+        same = shared_index(segment) is shared
+    finally:
+        segment.close(unlink=True)
+    return {"önce": before, "sonra": after, "komşular": neighbors, "paylaşılan": same,
+            "kapanınca": len(segment.indexes)}, \
+        {"önce": ["1", "2", "3"], "sonra": ["1", "2"], "komşular": ["2"], "paylaşılan": True, "kapanınca": 0}
+
+
+def timed(func, rounds):
+    best = math.inf
+    result = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Izgara vs doğrusal tarama komşu arama benchmark'ı")
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    got, expected = verify_index()
+    failed = got != expected
+    status = f"{GREEN}doğru{ENDC}" if got == expected else f"{RED}hatalı: {got} (beklenen {expected}){ENDC}"
+    print(f"{CYAN}Bayat drone / paylaşılan indeks:{ENDC} {status}")
+
+    rng = random.Random(2)
+    print(f"{CYAN}{'N':>6} {'doğrusal':>12} {'ızgara':>12} {'hızlanma':>9}  eşleşme{ENDC}")
+    for count in args.counts:
+        swarm = make_swarm(count)
+        grid = SpatialGrid(SEE_RADIUS)
+        grid.sync(swarm)
+        jitter(swarm, rng)
+        rounds = args.rounds if count <= 100 else 1
+        linear_time, linear = timed(lambda: linear_tick(swarm), rounds)
+        grid_time, gridded = timed(lambda: grid_tick(grid, swarm), rounds)
+
+        # Aynı en yakın komşu ve SEE_RADIUS içindeki aynı sayıda komşu bulunmalı
+        mismatches = sum(
+            1 for key in swarm
+            if linear[key][0] != gridded[key][0] and abs(linear[key][1] - gridded[key][1]) > 0.01
+            or linear[key][2] != gridded[key][2]
+        )
+        failed |= mismatches != 0
+        status = f"{GREEN}tamam{ENDC}" if mismatches == 0 else f"{RED}{mismatches} fark{ENDC}"
+        print(f"{count:>6} {linear_time * 1000:>10.2f}ms {grid_time * 1000:>10.2f}ms "
+              f"{linear_time / grid_time:>8.1f}x  {status}")
+    print(f"{CYAN}Süreler: bir sürü turu (her drone için en yakın + SEE_RADIUS sorgusu){ENDC}")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import contextlib
+import math
+import os
+import time
+from types import SimpleNamespace
+from telemetry_shm import TelemetrySegment
+from ucak111 import telemetry_collector, flocking_controller
+
+# Swarm runner kontrol döngüsü gecikmesi: N sahte drone tek asyncio döngüsünde
+# telemetry_collector + flocking_controller çalıştırır. Ölçülenler:
+#   - komut anındaki telemetri yaşı (SHM slot zaman damgası -> set_velocity_ned)
+#   - asyncio döngü gecikmesi (10 ms'lik uykunun ne kadar geç uyandığı)
+#   - drone başına komut hızı
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+BENCH_SHM_NAME = "telemetry_bench_swarm"
+ORIGIN_LAT, ORIGIN_LON, ORIGIN_ALT = 47.397742, 8.545594, 488.0
+
+
+class FakeDrone:
+    """Sadece bu benchmark için: sabit hızda akış üreten, komut hızını entegre eden drone."""
+
+    def __init__(self, drone_id, index, segment, rate):
+        self.drone_id = drone_id
+        self.segment = segment
+        self.period = 1.0 / rate
+        # Drone'lar 12 m aralıklı bir ızgaraya yerleşir
+        row, col = divmod(index, 10)
+        self.north, self.east = row * 12.0, col * 12.0
+        self.vn = self.ve = 0.0
+        self.yaw = 0.0
+        self.last_step = time.monotonic()
+        self.command_ages = []
+        self.telemetry = SimpleNamespace(
+            position=lambda: self._stream(self._position),
+            position_velocity_ned=lambda: self._stream(self._velocity),
+            attitude_euler=lambda: self._stream(self._attitude),
+            flight_mode=lambda: self._stream(lambda: "OFFBOARD"),
+            battery=lambda: self._stream(lambda: SimpleNamespace(remaining_percent=0.9, voltage_v=16.0)),
+            raw_gps=lambda: self._stream(lambda: SimpleNamespace(satellites_visible=10)),
+        )
+        self.offboard = SimpleNamespace(set_velocity_ned=self._set_velocity_ned)
+
+    def _step(self):
+        now = time.monotonic()
+        dt, self.last_step = now - self.last_step, now
+        self.north += self.vn * dt
+        self.east += self.ve * dt
+
+    async def _stream(self, make):
+        while True:
+            await asyncio.sleep(self.period)
+            yield make()
+
+    def _position(self):
+        self._step()
+        lat = ORIGIN_LAT + self.north / 111320.0
+        lon = ORIGIN_LON + self.east / (111320.0 * math.cos(math.radians(ORIGIN_LAT)))
+        return SimpleNamespace(latitude_deg=lat, longitude_deg=lon,
+                               absolute_altitude_m=ORIGIN_ALT + 10, relative_altitude_m=10.0)
+
+    def _velocity(self):
+        return SimpleNamespace(velocity=SimpleNamespace(north_m_s=self.vn, east_m_s=self.ve))
+
+    def _attitude(self):
+        return SimpleNamespace(roll_deg=0.0, pitch_deg=0.0, yaw_deg=self.yaw)
+
+    async def _set_velocity_ned(self, setpoint):
+        data = self.segment.read(self.drone_id, ("timestamp",))
+        if data and "timestamp" in data:
+            self.command_ages.append(time.time() - data["timestamp"])
+        self.vn, self.ve, self.yaw = setpoint.north_m_s, setpoint.east_m_s, setpoint.yaw_deg
+
+
+async def loop_lag_probe(samples, interval=0.01):
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - start - interval)
+
+
+def percentile(values, p):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+async def run_once(count, duration, rate):
+    segment = TelemetrySegment.open(BENCH_SHM_NAME, max_drones=max(count, 1))
+    drones = [FakeDrone(str(i + 1), i, segment, rate) for i in range(count)]
+    lags = []
+    tasks = [asyncio.create_task(loop_lag_probe(lags))]
+    for drone in drones:
+        tasks.append(asyncio.create_task(telemetry_collector(drone, drone.drone_id, segment)))
+        tasks.append(asyncio.create_task(flocking_controller(drone.drone_id, drone, segment)))
+    await asyncio.sleep(duration)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    segment.close(unlink=True)
+
+    ages = [age for drone in drones for age in drone.command_ages]
+    return {
+        "count": count,
+        "age_p50": percentile(ages, 50) * 1000,
+        "age_p99": percentile(ages, 99) * 1000,
+        "lag_p50": percentile(lags, 50) * 1000,
+        "lag_p99": percentile(lags, 99) * 1000,
+        "cmd_rate": len(ages) / duration / max(count, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Swarm kontrol döngüsü gecikme benchmark'ı")
+    parser.add_argument("--counts", type=int, nargs="+", default=[2, 10, 25, 50, 100])
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--rate", type=float, default=50.0, help="sahte telemetri akış hızı (Hz)")
+    args = parser.parse_args()
+
+    print(f"{CYAN}{'N':>5} {'yaş p50':>9} {'yaş p99':>9} {'lag p50':>9} {'lag p99':>9} {'komut/s':>8}{ENDC}")
+    for count in args.counts:
+        # Kontrolcülerin renkli çıktıları ölçümü bozmasın
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            result = asyncio.run(run_once(count, args.duration, args.rate))
+        color = GREEN if result["lag_p99"] < 10 else YELLOW if result["lag_p99"] < 50 else RED
+        print(f"{result['count']:>5} {result['age_p50']:>7.1f}ms {result['age_p99']:>7.1f}ms "
+              f"{color}{result['lag_p50']:>7.1f}ms {result['lag_p99']:>7.1f}ms{ENDC} {result['cmd_rate']:>8.1f}")
+    print(f"{CYAN}yaş: komut anında SHM'deki telemetrinin yaşı, lag: asyncio döngü gecikmesi{ENDC}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import math
+import multiprocessing as mp
+import time
+import grpc
+from mavsdk import System, telemetry_pb2, telemetry_pb2_grpc
+from telemetry_shm import TelemetrySegment
+from connection_broker import broker, vehicle_for
+
+# Telemetri yayın hızı: eski döngü (her turda altı akış için yeni stream + __anext__)
+# ile üretimdeki yol (ucak111.telemetry_collector / ucak1.publish_telemetry: aracın
+# paylaşılan önbelleğine subscribe(), her wait_update() uyanışında SHM'ye yazma)
+# karşılaştırılır.
+# Karşı taraf, MAVSDK TelemetryService gRPC arayüzünü taklit eden yerel bir sunucudur;
+# her akış kendi hızında, ortak saate hizalı örnek üretir (gerçek mavsdk_server gibi,
+# yeni abone bir sonraki örneği bekler).
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+BENCH_SHM_NAME = "telemetry_bench_cache"
+GRPC_PORT = 50090
+ORIGIN_LAT, ORIGIN_LON, ORIGIN_ALT = 47.397742, 8.545594, 488.0
+
+# Akış -> örnek hızı (Hz); --rate ile hepsi tek hıza çekilebilir
+STREAM_RATES = {
+    "position": 50.0,
+    "position_velocity_ned": 50.0,
+    "attitude_euler": 50.0,
+    "flight_mode": 1.0,
+    "battery": 2.0,
+    "raw_gps": 5.0,
+}
+
+
+class FakeTelemetryService(telemetry_pb2_grpc.TelemetryServiceServicer):
+    """Sadece bu benchmark için: sabit hızlı sahte telemetri akışları."""
+
+    def __init__(self, rates):
+        self.rates = rates
+
+    async def _ticks(self, name):
+        period = 1.0 / self.rates[name]
+        while True:
+            now = time.time()
+            await asyncio.sleep(period - now % period)
+            yield time.time()
+
+    async def SubscribePosition(self, request, context):
+        async for now in self._ticks("position"):
+            yield telemetry_pb2.PositionResponse(position=telemetry_pb2.Position(
+                latitude_deg=ORIGIN_LAT + math.sin(now) * 1e-5, longitude_deg=ORIGIN_LON,
+                absolute_altitude_m=ORIGIN_ALT + 10, relative_altitude_m=10.0))
+
+    async def SubscribePositionVelocityNed(self, request, context):
+        async for _ in self._ticks("position_velocity_ned"):
+            yield telemetry_pb2.PositionVelocityNedResponse(position_velocity_ned=telemetry_pb2.PositionVelocityNed(
+                velocity=telemetry_pb2.VelocityNed(north_m_s=1.0, east_m_s=0.5)))
+
+    async def SubscribeAttitudeEuler(self, request, context):
+        async for _ in self._ticks("attitude_euler"):
+            yield telemetry_pb2.AttitudeEulerResponse(attitude_euler=telemetry_pb2.EulerAngle(yaw_deg=90.0))
+
+    async def SubscribeFlightMode(self, request, context):
+        async for _ in self._ticks("flight_mode"):
+            yield telemetry_pb2.FlightModeResponse(flight_mode=telemetry_pb2.FLIGHT_MODE_OFFBOARD)
+
+    async def SubscribeBattery(self, request, context):
+        async for _ in self._ticks("battery"):
+            yield telemetry_pb2.BatteryResponse(battery=telemetry_pb2.Battery(remaining_percent=0.9, voltage_v=16.0))
+
+    async def SubscribeRawGps(self, request, context):
+        async for _ in self._ticks("raw_gps"):
+            yield telemetry_pb2.RawGpsResponse(raw_gps=telemetry_pb2.RawGps())
+
+
+def serve(port, rates):
+    async def main():
+        server = grpc.aio.server()
+        telemetry_pb2_grpc.add_TelemetryServiceServicer_to_server(FakeTelemetryService(rates), server)
+        server.add_insecure_port(f"127.0.0.1:{port}")
+        await server.start()
+        await server.wait_for_termination()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+
+async def legacy_loop(drone, segment, interval, stats):
+    # Eski send_telemetry_forever: her turda altı akış sırayla açılıp kapanır
+    while True:
+        pos = await drone.telemetry.position().__anext__()
+        received = time.monotonic()
+        vel = await drone.telemetry.position_velocity_ned().__anext__()
+        att = await drone.telemetry.attitude_euler().__anext__()
+        fm = await drone.telemetry.flight_mode().__anext__()
+        bat = await drone.telemetry.battery().__anext__()
+        gps = await drone.telemetry.raw_gps().__anext__()
+        segment.write("1", {
+            "latitude": pos.latitude_deg, "longitude": pos.longitude_deg,
+            "absolute_altitude": pos.absolute_altitude_m,
+            "speed": math.hypot(vel.velocity.north_m_s, vel.velocity.east_m_s),
+            "yaw": att.yaw_deg, "flight_mode": str(fm),
+            "battery_percent": bat.remaining_percent * 100,
+            "satellites_visible": getattr(gps, "satellites_visible", "N/A"),
+        })
+        stats.append(time.monotonic() - received)
+        await asyncio.sleep(interval)
+
+
+async def subscribe_loop(drone, segment, interval, stats):
+    # Üretimdeki yol: uyku yok, yeni mesaj gelince yazılır (interval kullanılmaz)
+    vehicle = vehicle_for(drone, "1")
+    with vehicle.subscribe() as telemetry:
+        await telemetry.wait_ready()
+        while True:
+            await telemetry.wait_update()
+            segment.write("1", telemetry.snapshot())
+            stats.append(vehicle.telemetry.age("position"))
+
+
+async def measure(loop, port, duration, interval):
+    drone = System(mavsdk_server_address="127.0.0.1", port=port)
+    await drone.connect()
+    segment = TelemetrySegment.open(BENCH_SHM_NAME, max_drones=1)
+    stats = []
+    task = asyncio.create_task(loop(drone, segment, interval, stats))
+    # Isınma: ilk abonelikler / ilk örnekler
+    await asyncio.sleep(1.0)
+    stats.clear()
+    await asyncio.sleep(duration)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    await broker().close()
+    segment.close(unlink=True)
+    ages = sorted(stats)
+    p50 = ages[len(ages) // 2] * 1000 if ages else float("nan")
+    return len(stats) / duration, p50
+
+
+def main():
+    parser = argparse.ArgumentParser(description="subscribe() + wait_update() vs akış başına __anext__ yayın hızı benchmark'ı")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--interval", type=float, default=0.02, help="eski yayın döngüsünün uykusu (s)")
+    parser.add_argument("--rate", type=float, help="tüm akışlar için tek örnek hızı (Hz)")
+    parser.add_argument("--port", type=int, default=GRPC_PORT)
+    args = parser.parse_args()
+
+    rates = {name: args.rate for name in STREAM_RATES} if args.rate else STREAM_RATES
+    server = mp.Process(target=serve, args=(args.port, rates), daemon=True)
+    server.start()
+    try:
+        print(f"{CYAN}Akış hızları: " + ", ".join(f"{k}={v:g}Hz" for k, v in rates.items()) + ENDC)
+        print(f"{CYAN}{'yöntem':<12} {'yayın/s':>9} {'hedef/s':>9} {'konum yaşı p50':>15}{ENDC}")
+        # __anext__ her uykudan sonra bir kez yazar; subscribe() en az her konum mesajında
+        targets = (("__anext__", legacy_loop, 1 / args.interval), ("subscribe", subscribe_loop, rates["position"]))
+        for label, loop, target in targets:
+            rate, age = asyncio.run(measure(loop, args.port, args.duration, args.interval))
+            color = GREEN if rate >= 0.8 * target else RED
+            print(f"{label:<12} {color}{rate:>9.1f}{ENDC} {target:>9.0f} {age:>13.1f}ms")
+    finally:
+        server.terminate()
+        server.join()
+    print(f"{CYAN}konum yaşı: SHM'ye yazılan konumun yazma anındaki yaşı{ENDC}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+import argparse
+import math
+import random
+import time
+from telemetry_wire import pack_json, pack_binary, decode, MAX_DATAGRAM
+
+# UDP telemetri biçimleri: JSON vs binary v1. N drone'luk bir tur MTU'ya sığan
+# datagramlara bölünür; örnek başına bayt, datagram sayısı ve çözme süresi ölçülür.
+# Binary'den çözülen değerlerin JSON'dakilerle (float32/1e-7 derece hassasiyetinde)
+# aynı olduğu da doğrulanır.
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+ORIGIN_LAT, ORIGIN_LON = 47.397742, 8.545594
+
+
+def make_samples(count, seed=1):
+    rng = random.Random(seed)
+    return [
+        (str(i + 1), {
+            "timestamp": time.time(),
+            "latitude": ORIGIN_LAT + rng.uniform(0, 0.01), "longitude": ORIGIN_LON + rng.uniform(0, 0.01),
+            "absolute_altitude": 488 + rng.uniform(0, 20), "relative_altitude": rng.uniform(0, 20),
+            "speed": rng.uniform(0, 5), "roll": rng.uniform(-5, 5), "pitch": rng.uniform(-5, 5),
+            "yaw": rng.uniform(-180, 180), "flight_mode": "OFFBOARD",
+            "battery_percent": rng.uniform(20, 100), "battery_voltage": rng.uniform(14, 16.8),
+            "satellites_visible": rng.randint(6, 14), "fix_type": 3, "uptime": "03:12",
+        }, i * 7)
+        for i in range(count)
+    ]
+
+
+def decode_all(datagrams):
+    return [sample for payload, _ in datagrams for sample in decode(payload)]
+
+
+def timed(func, rounds):
+    best = math.inf
+    result = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def matches(samples, decoded):
+    if len(samples) != len(decoded):
+        return False
+    for (drone_id, telemetry, seq), (d_id, d_seq, d_tel) in zip(samples, decoded):
+        if d_id != drone_id or d_seq != seq or d_tel.get("flight_mode") != telemetry["flight_mode"]:
+            return False
+        if abs(d_tel["latitude"] - telemetry["latitude"]) > 1e-7 or abs(d_tel["yaw"] - telemetry["yaw"]) > 1e-3:
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON vs binary telemetri biçimi benchmark'ı")
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{CYAN}{'N':>6} {'biçim':<7} {'bayt/örnek':>11} {'datagram':>9} {'kodlama/örnek':>14} "
+          f"{'çözme/örnek':>12}  doğru{ENDC}")
+    for count in args.counts:
+        samples = make_samples(count)
+        for label, pack in (("json", lambda: pack_json(samples, 1881)), ("binary", lambda: pack_binary(samples))):
+            encode_time, datagrams = timed(pack, args.rounds)
+            decode_time, decoded = timed(lambda: decode_all(datagrams), args.rounds)
+            total = sum(len(payload) for payload, _ in datagrams)
+            largest = max(len(payload) for payload, _ in datagrams)
+            ok = matches(samples, decoded) and largest <= MAX_DATAGRAM
+            status = f"{GREEN}evet{ENDC}" if ok else f"{RED}hayır{ENDC}"
+            print(f"{count:>6} {label:<7} {total / count:>11.1f} {len(datagrams):>9} "
+                  f"{encode_time / count * 1e6:>12.2f}µs {decode_time / count * 1e6:>10.2f}µs  {status}")
+    print(f"{CYAN}Datagramlar en fazla {MAX_DATAGRAM} bayt (tek MTU){ENDC}")
+
+
+if __name__ == "__main__":
+    main()
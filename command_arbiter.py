@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+
+import asyncio
+import math
+import weakref
+from collections import namedtuple
+from mavsdk.offboard import VelocityNedYaw
+from geodesy import ground_distance
+from metrics import DroneMetrics
+
+# Kontrolcüler ile MAVSDK arasındaki komut hakemi (drone başına bir tane).
+# Kontrolcüler komutu göndermez, kaynak adıyla bırakır (velocity/goto; asla beklemez).
+# Tek gönderici görevi:
+#   - birleştirme: gönderilmeden üzerine yazılan komutlar atılır, sadece en sonuncusu gider
+#   - tekrar eleme: son gönderilenle tolerans içinde aynı setpoint gönderilmez
+#   - canlı tutma: değişmeyen hız setpoint'i sadece KEEPALIVE_RATE ile yeniden gönderilir
+#     (PX4 offboard'dan düşmesin, COM_OF_LOSS_T)
+#   - öncelik: kaçınma > sürü (flocking1 GOTO) > formasyon > seyir. Her komutun bir süresi (lease) vardır;
+#     yenilenmezse alt öncelikli kaynak devralır. Eşit öncelikte mevcut sahip kalır.
+# GOTO offboard'dan çıkarır; ardından hız komutu kazanırsa setpoint + offboard.start gider.
+# Aynı süreçte aynı drone'u süren tüm kaynaklar arbiter_for ile aynı hakemi paylaşır.
+# Tek seferlik komutlar (arm, land, hold...) call() ile aynı kilitten geçer; setpoint'lerle
+# araya girmez. Gönderilen her komut send_hooks'taki çağrılara bildirilir (ölçüm, kayıt).
+
+RED, ENDC = "\033[91m", "\033[0m"
+
+AVOIDANCE, FLOCK, FORMATION, CRUISE = 4, 3, 2, 1   # öncelik (büyük olan kazanır)
+KEEPALIVE_RATE = 4.0        # Hz; PX4 >2 Hz setpoint akışı ister, COM_OF_LOSS_T (1 s) içinde 4 setpoint
+LEASE = 0.5                 # s; yenilenmeyen komut bu süreden sonra geçersiz
+VELOCITY_TOLERANCE = 0.05   # m/s, bileşen başına
+YAW_TOLERANCE = 1.0         # derece
+GOTO_TOLERANCE = 1.0        # m, yatay ve dikey
+ERROR_PAUSE = 0.05          # s; gönderim hata verince yeniden denemeden önce
+TIME_SLACK = 1e-6           # s; zamanlayıcı uyanışı son tarihe yuvarlama payı kadar erken olabilir
+
+Command = namedtuple("Command", "kind values priority expires")
+# kind: "velocity" (vn, ve, vd, yaw) veya "goto" (lat, lon, alt, yaw)
+
+# Araca giden her komuttan sonra hook(drone_id, source, command, time) çağrılır
+send_hooks = []
+
+
+def _yaw_close(a, b):
+    return abs(math.remainder(a - b, 360.0)) <= YAW_TOLERANCE
+
+
+def same_command(a, b):
+    """İki komut tolerans içinde aynı mı (tekrar eleme)."""
+    if a is None or b is None or a.kind != b.kind:
+        return False
+    if a.kind == "velocity":
+        return (all(abs(x - y) <= VELOCITY_TOLERANCE for x, y in zip(a.values[:3], b.values[:3]))
+                and _yaw_close(a.values[3], b.values[3]))
+    lat1, lon1, alt1, yaw1 = a.values
+    lat2, lon2, alt2, yaw2 = b.values
+    return (ground_distance(lat1, lon1, lat2, lon2) <= GOTO_TOLERANCE
+            and abs(alt1 - alt2) <= GOTO_TOLERANCE and _yaw_close(yaw1, yaw2))
+
+
+class CommandArbiter:
+    def __init__(self, drone, drone_id, keepalive=KEEPALIVE_RATE, lease=LEASE):
+        self.drone = drone
+        self.drone_id = drone_id
+        self.keepalive_period = 1.0 / keepalive
+        self.lease = lease
+        self.metrics = DroneMetrics(drone_id)
+        self.pending = {}       # kaynak -> son Command
+        self.holder = None      # son gönderilen komutun kaynağı
+        self.sent = None        # son gönderilen Command
+        self.sent_at = -math.inf
+        self.in_goto = False    # son GOTO'dan sonra offboard henüz yeniden başlatılmadı
+        self._unseen = set()    # gönderici henüz bakmadan bırakılan komutların kaynakları
+        self.lock = asyncio.Lock()  # araca giden tüm komutlar sırayla
+        self._changed = asyncio.Event()
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"Drone{self.drone_id} arbiter")
+        return self
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        # Durdurulan hakem kayıttan düşer; grpc olay döngüsünü kapandıktan sonra da
+        # tuttuğu için aksi halde System yorumlayıcı kapanışına kadar yaşar
+        arbiters = _arbiters.get(asyncio.get_running_loop(), {})
+        if arbiters.get(self.drone) is self:
+            del arbiters[self.drone]
+
+    def velocity(self, source, setpoint, priority=CRUISE, lease=None):
+        """(vn, ve, vd, yaw) hız setpoint'ini bırakır; hemen döner."""
+        self._submit(source, "velocity", tuple(setpoint), priority, lease)
+
+    def goto(self, source, target, priority=AVOIDANCE, lease=None):
+        """(lat, lon, alt, yaw) GOTO hedefini bırakır; hemen döner."""
+        self._submit(source, "goto", tuple(target), priority, lease)
+
+    def release(self, source):
+        """Kaynağın komutunu süresi dolmadan geri çeker."""
+        if self.pending.pop(source, None) is not None:
+            self._unseen.discard(source)
+            self._changed.set()
+
+    async def call(self, plugin, method, *args):
+        """Tek seferlik komut (ör. call("action", "land")); gönderici ile sıralanır."""
+        async with self.lock:
+            return await getattr(getattr(self.drone, plugin), method)(*args)
+
+    def _submit(self, source, kind, values, priority, lease):
+        now = asyncio.get_running_loop().time()
+        self.metrics.submitted.inc()
+        if source in self._unseen:
+            self.metrics.coalesced.inc()
+        self.pending[source] = Command(kind, values, priority, now + (self.lease if lease is None else lease))
+        self._unseen.add(source)
+        self._changed.set()
+
+    def _winner(self, now):
+        for source in [source for source, command in self.pending.items() if command.expires <= now]:
+            del self.pending[source]
+            self._unseen.discard(source)
+        if not self.pending:
+            return None, None
+        source = max(self.pending, key=lambda s: (self.pending[s].priority, s == self.holder))
+        return source, self.pending[source]
+
+    def _deadline(self, command):
+        """Gönderici bir sonraki kez ne zaman uyanmalı (yeni komut gelmezse)."""
+        if command is None:
+            return None
+        wake = command.expires
+        if command.kind == "velocity":
+            wake = min(wake, self.sent_at + self.keepalive_period)
+        return wake
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        command = None
+        while True:
+            wake = self._deadline(command)
+            if not self._changed.is_set():
+                try:
+                    await asyncio.wait_for(self._changed.wait(), None if wake is None else max(0.0, wake - loop.time()))
+                except asyncio.TimeoutError:
+                    pass
+            self._changed.clear()
+            # Uyanılan son tarih (canlı tutma, süre bitimi) geçmiş sayılsın; yoksa 0 s beklemeyle döner
+            now = loop.time() + TIME_SLACK
+            source, command = self._winner(now)
+            # Bakılan ama kazanamayan komutlar öncelik yüzünden düşer
+            self.metrics.preempted.inc(len(self._unseen - {source}))
+            fresh = source in self._unseen
+            self._unseen.clear()
+            if command is None:
+                continue
+            if same_command(command, self.sent):
+                if command.kind == "goto" or now - self.sent_at < self.keepalive_period:
+                    if fresh:
+                        self.metrics.duplicates.inc()
+                    continue
+                self.metrics.keepalives.inc()
+            try:
+                await self._send(command)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"{RED}[Drone{self.drone_id}] {source} {command.kind} komutu gönderilemedi: {e}{ENDC}")
+                # Bir sonraki uyanışta yeniden denenir
+                self.sent = None
+                self._changed.set()
+                await asyncio.sleep(ERROR_PAUSE)
+                continue
+            self.holder, self.sent, self.sent_at = source, command, loop.time()
+            for hook in send_hooks:
+                hook(self.drone_id, source, command, self.sent_at)
+
+    async def _send(self, command):
+        async with self.lock:
+            await self._send_locked(command)
+
+    async def _send_locked(self, command):
+        metrics = self.metrics
+        if command.kind == "goto":
+            await self.drone.action.goto_location(*command.values)
+            metrics.gotos.inc()
+            self.in_goto = True
+            return
+        started = metrics.command.start()
+        await self.drone.offboard.set_velocity_ned(VelocityNedYaw(*command.values))
+        metrics.command.stop(started)
+        metrics.commands.inc()
+        if self.in_goto:
+            # GOTO offboard'dan çıkardı; setpoint akışı yeniden başladı, geri dön
+            await self.drone.offboard.start()
+            metrics.offboard_starts.inc()
+            self.in_goto = False
+
+
+# Olay döngüsü -> {drone: CommandArbiter}; döngü kapanınca hakemleri de gider
+_arbiters = weakref.WeakKeyDictionary()
+
+
+def arbiter_for(drone, drone_id):
+    """Drone'un (bu olay döngüsündeki) ortak hakemi; ilk çağrıda gönderici başlatılır."""
+    arbiters = _arbiters.setdefault(asyncio.get_running_loop(), {})
+    arbiter = arbiters.get(drone)
+    if arbiter is None:
+        arbiter = arbiters[drone] = CommandArbiter(drone, drone_id).start()
+    return arbiter
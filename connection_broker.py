@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+import asyncio
+import weakref
+from mavsdk import System
+from swarm_config import DroneSpec, default_spec
+from telemetry_cache import TelemetryCache
+from command_arbiter import arbiter_for
+
+# Süreç içi bağlantı aracısı: araç başına tek mavsdk System (tek mavsdk_server, tek gRPC
+# kanalı), tek TelemetryCache (her akışa bir abonelik) ve tek komut hakemi.
+# Aynı aracı kullanan tüm tüketiciler (telemetri toplayıcı, kontrolcüler, flocking) aynı
+# Vehicle'ı alır: telemetri subscribe() ile her tüketiciye dağıtılır, komutlar hakemden
+# sırayla gider. Eskiden Drone*_bayland flocking betiğini ayrı süreçte başlatıyordu; o süreç
+# aynı gRPC portunda ikinci bir System (ve mavsdk_server) açıyordu.
+# Aracı olay döngüsü başına birdir: broker().
+
+CYAN, ENDC = "\033[96m", "\033[0m"
+
+
+def as_spec(spec):
+    """DroneSpec veya drone ID (varsayılan portlar)."""
+    return spec if isinstance(spec, DroneSpec) else default_spec(spec)
+
+
+class Vehicle:
+    """Bir aracın paylaşılan bağlantısı: system, telemetry (önbellek), arbiter."""
+
+    def __init__(self, spec, system):
+        self.spec = spec
+        self.drone_id = spec.drone_id
+        self.system = system
+        self.telemetry = TelemetryCache(system)
+        self.arbiter = arbiter_for(system, spec.drone_id)
+
+    def subscribe(self):
+        """Yeni telemetri tüketicisi (kendi wait_update'i); akışlar ilk abonede açılır."""
+        self.telemetry.start()
+        return self.telemetry.subscribe()
+
+    async def command(self, plugin, method, *args):
+        """Tek seferlik komut, örn. command("action", "land"); setpoint'lerle sıralanır."""
+        return await self.arbiter.call(plugin, method, *args)
+
+    async def close(self):
+        await self.telemetry.stop()
+        await self.arbiter.stop()
+
+
+class ConnectionBroker:
+    def __init__(self):
+        self.vehicles = {}      # drone ID -> Vehicle
+        self.connects = 0       # açılan System bağlantıları (her biri bir mavsdk_server)
+        self._systems = {}      # System -> Vehicle
+        self._connecting = {}   # drone ID -> bağlanma görevi
+
+    async def connect(self, spec, server_address=None):
+        """
+        Aracın ortak Vehicle'ı; ilk çağrı bağlanır, eşzamanlı çağrılar aynı bağlantıyı bekler.
+        server_address: harici mavsdk_server (verilmezse mavsdk'nın gömülü sunucusu).
+        """
+        spec = as_spec(spec)
+        vehicle = self.vehicles.get(spec.drone_id)
+        if vehicle is not None:
+            if vehicle.spec.grpc_port != spec.grpc_port:
+                raise ValueError(f"Drone{spec.drone_id} zaten gRPC {vehicle.spec.grpc_port} ile bağlı "
+                                 f"(istenen {spec.grpc_port})")
+            return vehicle
+        task = self._connecting.get(spec.drone_id)
+        if task is None:
+            task = self._connecting[spec.drone_id] = asyncio.create_task(self._connect(spec, server_address))
+        # Bekleyenlerden biri iptal edilirse bağlantı diğerleri için sürer
+        return await asyncio.shield(task)
+
+    async def _connect(self, spec, server_address):
+        try:
+            if server_address:
+                system = System(mavsdk_server_address=server_address, port=spec.grpc_port)
+            else:
+                system = System(port=spec.grpc_port)
+            await system.connect(system_address=spec.connection)
+            self.connects += 1
+            print(f"{CYAN}[Broker] Drone{spec.drone_id} bağlandı: {spec.connection} (gRPC {spec.grpc_port}){ENDC}")
+            return self.attach(spec, system)
+        finally:
+            self._connecting.pop(spec.drone_id, None)
+
+    def attach(self, spec, system):
+        """Zaten bağlı (veya simülatör/tekrar oynatma) System'i araç olarak kaydeder."""
+        vehicle = self._systems.get(system)
+        if vehicle is None:
+            vehicle = self._systems[system] = Vehicle(as_spec(spec), system)
+            self.vehicles.setdefault(vehicle.drone_id, vehicle)
+        return vehicle
+
+    def vehicle_for(self, system, drone_id):
+        """System'in aracı; aracıdan geçmeden bağlanmışsa burada kaydedilir."""
+        return self._systems.get(system) or self.attach(drone_id, system)
+
+    async def close(self):
+        for vehicle in list(self._systems.values()):
+            await vehicle.close()
+        self._systems.clear()
+        self.vehicles.clear()
+
+
+# Olay döngüsü -> ConnectionBroker; döngü kapanınca aracı da gider
+_brokers = weakref.WeakKeyDictionary()
+
+
+def broker():
+    loop = asyncio.get_running_loop()
+    current = _brokers.get(loop)
+    if current is None:
+        current = _brokers[loop] = ConnectionBroker()
+    return current
+
+
+def vehicle_for(system, drone_id):
+    return broker().vehicle_for(system, drone_id)
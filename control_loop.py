@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+
+import asyncio
+import csv
+import json
+import math
+import os
+import time
+from collections import deque
+
+# Sabit hızlı kontrol döngüsü. Tick'ler mutlak zaman çizelgesine göre atılır
+# (başlangıç + k * periyot), böylece tick süresi ve uyanma gecikmesi birikmez (kayma yok).
+# Bir tick periyottan uzun sürerse kaçırılan tick'ler arka arkaya telafi edilmez,
+# sıradaki gelecek zamana atlanır ve kaçırılan son tarih (deadline miss) olarak sayılır.
+# Her tick için uyanma gecikmesi ve süre kaydedilir; stats() özet, export() CSV/JSON verir.
+# Bir ChangeListener (telemetry_notify) verilirse son tarih beklenirken yeni telemetri gelince
+# tick hemen atılır (ara tick, en sık MIN_WAKE_INTERVAL'da bir); sabit çizelge taban hız olarak
+# sürer. Ara tick'ler kayıtlara girmez (gecikme/jitter çizelgeye göredir), woken'da sayılır.
+
+RED, ENDC = "\033[91m", "\033[0m"
+
+CONTROL_RATE = 20.0   # Hz, varsayılan kontrol hızı
+HISTORY = 4096        # tick kaydı (son N tick)
+ERROR_PAUSE = 0.05    # s, tick hata verince bir sonraki tick'ten önce en az bu kadar beklenir
+MIN_WAKE_INTERVAL = 0.02  # s, bildirimle uyanan iki tick başlangıcı arası en kısa süre
+
+_loops = []
+
+
+class ControlLoop:
+    """
+    run(tick) tick'i 'rate' Hz'de çağırır. Kayıt başına (son tarih, uyanma gecikmesi,
+    süre, kaçırılan tick sayısı); süreler asyncio döngüsünün saatiyle ölçülür.
+    """
+
+    def __init__(self, name, rate=CONTROL_RATE, history=HISTORY):
+        self.name = name
+        self.rate = rate
+        self.period = 1.0 / rate
+        self.records = deque(maxlen=history)
+        self.ticks = 0
+        self.missed = 0       # tick'in bir sonraki son tarihe taşması
+        self.skipped = 0      # bu yüzden hiç atılmayan tick'ler
+        self.errors = 0
+        self.woken = 0        # bildirimle son tarihten önce atılan ara tick'ler
+        self.started = None
+        _loops.append(self)
+
+    async def run(self, tick, listener=None, min_interval=MIN_WAKE_INTERVAL):
+        """listener: verilirse yeni telemetri bildirimi son tarihi beklemeden tick attırır."""
+        loop = asyncio.get_running_loop()
+        start = self.started = loop.time()
+        seen = listener.count if listener is not None else None
+        began = -math.inf
+        k = 0
+        while True:
+            deadline = start + k * self.period
+            woken = False
+            delay = deadline - loop.time()
+            if delay > 0:
+                if listener is None:
+                    await asyncio.sleep(delay)
+                else:
+                    # Ara tick'ler arasında en az min_interval; son tarih yine de kaçmaz
+                    pause = min(deadline, began + min_interval) - loop.time()
+                    if pause > 0:
+                        await asyncio.sleep(pause)
+                    remaining = deadline - loop.time()
+                    if remaining > 0:
+                        woken = await listener.changed(seen, remaining) != seen
+            if listener is not None:
+                seen = listener.count
+            began = loop.time()
+            try:
+                await tick()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                print(f"{RED}[{self.name}] Tick hatası: {e}{ENDC}")
+                await asyncio.sleep(ERROR_PAUSE)
+            end = loop.time()
+            self.ticks += 1
+            if woken and end < deadline:
+                # Ara tick çizelgeyi kaydırmaz
+                self.woken += 1
+                continue
+            # Bitişten sonraki ilk son tarih; aradakiler atlanır
+            following = max(k + 1, math.floor((end - start) / self.period) + 1)
+            skipped = following - k - 1
+            if skipped:
+                self.missed += 1
+                self.skipped += skipped
+            # Son tarihe taşan ara tick o son tarihin tick'i sayılır (erken başladı, gecikme 0)
+            self.records.append((deadline, max(0.0, began - deadline), end - began, skipped))
+            k = following
+
+    def stats(self):
+        """Son HISTORY tick'in özeti (süreler ms); jitter: ardışık tick başlangıç aralığının sapması."""
+        lateness = sorted(record[1] for record in self.records)
+        durations = sorted(record[2] for record in self.records)
+        starts = [deadline + late for deadline, late, _, _ in self.records]
+        intervals = [b - a for a, b in zip(starts, starts[1:])]
+        jitter = math.sqrt(sum((interval - self.period) ** 2 for interval in intervals) / len(intervals)) if intervals else 0.0
+        elapsed = (self.records[-1][0] - self.records[0][0]) if len(self.records) > 1 else 0.0
+        return {
+            "name": self.name,
+            "rate": self.rate,
+            "ticks": self.ticks,
+            "missed": self.missed,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "woken": self.woken,
+            "achieved_rate": (len(self.records) - 1) / elapsed if elapsed else 0.0,
+            "lateness_p50_ms": _percentile(lateness, 50) * 1000,
+            "lateness_p99_ms": _percentile(lateness, 99) * 1000,
+            "lateness_max_ms": (lateness[-1] if lateness else 0.0) * 1000,
+            "duration_p50_ms": _percentile(durations, 50) * 1000,
+            "duration_p99_ms": _percentile(durations, 99) * 1000,
+            "duration_max_ms": (durations[-1] if durations else 0.0) * 1000,
+            "jitter_ms": jitter * 1000,
+        }
+
+    def export(self, path):
+        """Tick kayıtlarını CSV olarak yazar (zaman: döngü saati, s)."""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("deadline", "lateness", "duration", "skipped"))
+            writer.writerows(self.records)
+
+
+def _percentile(values, p):
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+def control_loops():
+    """Bu süreçte oluşturulmuş döngüler."""
+    return list(_loops)
+
+
+def clear_loops():
+    """Kayıtlı döngüleri unutur (ör. aynı süreçte art arda koşulan simülasyonlar arasında)."""
+    _loops.clear()
+
+
+def export_stats(directory, loops=None):
+    """Her döngü için <ad>.csv ve hepsinin özeti summary-<pid>.json yazılır; özet listesi döner."""
+    loops = control_loops() if loops is None else loops
+    os.makedirs(directory, exist_ok=True)
+    summary = []
+    for loop in loops:
+        loop.export(os.path.join(directory, loop.name.replace(" ", "_") + ".csv"))
+        summary.append(loop.stats())
+    with open(os.path.join(directory, f"summary-{os.getpid()}.json"), "w") as f:
+        json.dump({"time": time.time(), "loops": summary}, f, indent=2)
+    return summary
+
+
+def summarize(summary):
+    """Birden çok döngünün özetinden tek satırlık toplam (en kötü p99 değerleri)."""
+    if not summary:
+        return "kontrol döngüsü yok"
+    ticks = sum(item["ticks"] for item in summary)
+    missed = sum(item["missed"] for item in summary)
+    return (f"{len(summary)} döngü, {ticks} tick, {missed} kaçırılan son tarih, "
+            f"gecikme p99 {max(item['lateness_p99_ms'] for item in summary):.1f} ms, "
+            f"süre p99 {max(item['duration_p99_ms'] for item in summary):.1f} ms, "
+            f"jitter {max(item['jitter_ms'] for item in summary):.1f} ms")
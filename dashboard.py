@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+
+import os
+import shutil
+import sys
+import threading
+import time
+
+# Terminal panosu: drone başına tek satırlık tablo, sabit üst sınırlı kare hızında
+# (DASHBOARD_FPS) ayrı bir thread'de çizilir. Veri tarafı sadece update() ile son
+# durumu bırakır (referans ataması, asla stdout'u beklemez); çizici her karede en
+# son durumu biçimlendirip tek bir os.write ile yazar. Terminal yavaşsa aradaki
+# durumlar atlanır, veri alımı yavaşlamaz.
+#   in_place=True : ANSI imleç komutlarıyla ekranın başından yerinde yeniden çizer
+#   in_place=False: kareyi alta ekler (tty olmayan çıktı, log dosyası, alt süreç)
+
+GREEN, YELLOW, RED, BLUE, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[94m", "\033[96m", "\033[0m"
+
+DASHBOARD_FPS = 5.0
+HOME, CLEAR, CLEAR_LINE, CLEAR_BELOW = "\033[H", "\033[2J", "\033[K", "\033[J"
+HIDE_CURSOR, SHOW_CURSOR = "\033[?25l", "\033[?25h"
+
+
+def cell(value, fmt="", missing="-"):
+    """Tek hücre; None/eksik değerler için missing."""
+    if value is None or value == "N/A":
+        return missing
+    try:
+        return format(value, fmt)
+    except (TypeError, ValueError):
+        return str(value)
+
+
+# (başlık, genişlik, satır -> metin); satır = telemetri sözlüğü + "drone_id"
+TELEMETRY_COLUMNS = (
+    ("Drone", 6, lambda row: str(row["drone_id"])),
+    ("Enlem", 11, lambda row: cell(row.get("latitude"), ".7f")),
+    ("Boylam", 11, lambda row: cell(row.get("longitude"), ".7f")),
+    ("Mutlak", 7, lambda row: cell(row.get("absolute_altitude"), ".1f")),
+    ("Bağıl", 6, lambda row: cell(row.get("relative_altitude"), ".1f")),
+    ("Hız", 5, lambda row: cell(row.get("speed"), ".1f")),
+    ("Roll", 6, lambda row: cell(row.get("roll"), ".1f")),
+    ("Pitch", 6, lambda row: cell(row.get("pitch"), ".1f")),
+    ("Yaw", 6, lambda row: cell(row.get("yaw"), ".1f")),
+    ("Mod", 10, lambda row: cell(row.get("flight_mode"))),
+    ("Batarya", 7, lambda row: cell(row.get("battery_percent"), ".0f")),
+    ("Volt", 5, lambda row: cell(row.get("battery_voltage"), ".1f")),
+    ("Uydu", 4, lambda row: cell(row.get("satellites_visible"))),
+    ("Fix", 3, lambda row: cell(row.get("fix_type"))),
+    ("Uptime", 8, lambda row: cell(row.get("uptime"))),
+)
+
+
+def telemetry_rows(telemetry_all, skip=None):
+    """{"<id>": telemetri} -> ID sırasına göre satırlar (skip: gösterilmeyecek ID)."""
+    rows = []
+    for drone_id in sorted(telemetry_all, key=lambda key: (len(key), key)):
+        if drone_id != skip:
+            row = dict(telemetry_all[drone_id])
+            row["drone_id"] = drone_id
+            rows.append(row)
+    return rows
+
+
+def battery_color(row):
+    battery = row.get("battery_percent")
+    if isinstance(battery, (int, float)) and battery < 20:
+        return RED
+    return GREEN
+
+
+class Dashboard:
+    def __init__(self, title, columns=TELEMETRY_COLUMNS, fps=DASHBOARD_FPS, in_place=None,
+                 row_color=battery_color, fd=None):
+        self.title = title
+        self.columns = columns
+        self.period = 1.0 / fps
+        self.fd = sys.stdout.fileno() if fd is None else fd
+        self.in_place = os.isatty(self.fd) if in_place is None else in_place
+        self.row_color = row_color
+        self._latest = ((), ())
+        self._version = 0
+        self._drawn = 0
+        self._stopped = threading.Event()
+        self._thread = None
+        self.frames = 0
+        self.skipped = 0      # çizilmeden üzerine yazılan güncellemeler
+        self.bytes = 0
+
+    def update(self, rows, footer=()):
+        """Son durumu bırakır; asla beklemez (biçimlendirme ve yazma çizici thread'inde)."""
+        self._latest = (rows, footer)
+        self._version += 1
+
+    def start(self):
+        # Önceden print ile tamponlanmış satırlar panodan önce çıksın
+        sys.stdout.flush()
+        if self.in_place:
+            self._write(HIDE_CURSOR + CLEAR)
+        self._thread = threading.Thread(target=self._run, name="dashboard", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        # Son durum kaybolmasın
+        self._draw()
+        if self.in_place:
+            self._write(SHOW_CURSOR)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self):
+        next_frame = time.monotonic()
+        while not self._stopped.wait(max(0.0, next_frame - time.monotonic())):
+            next_frame += self.period
+            now = time.monotonic()
+            if next_frame < now:
+                # Yazma uzun sürdü: kaçan kareler telafi edilmez
+                next_frame = now + self.period
+            self._draw()
+
+    def _draw(self):
+        version = self._version
+        if version == self._drawn:
+            return
+        self.skipped += version - self._drawn - 1
+        self._drawn = version
+        rows, footer = self._latest
+        self._write(self.render(rows, footer))
+        self.frames += 1
+
+    def render(self, rows, footer=()):
+        """Tüm kare tek metin olarak (satır sonları ve ANSI komutları dahil)."""
+        size = shutil.get_terminal_size()
+        columns, used = [], 0
+        for column in self.columns:
+            if columns and used + column[1] + 1 > size.columns:
+                break
+            columns.append(column)
+            used += column[1] + 1
+
+        lines = [f"{CYAN}{self.title} | {time.strftime('%H:%M:%S')} | {len(rows)} drone{ENDC}",
+                 CYAN + " ".join(f"{header:>{width}}" for header, width, _ in columns) + ENDC]
+        room = len(rows)
+        if self.in_place:
+            # Ekrana sığmayan satırlar kaydırma yerine özetlenir (yerinde çizim bozulmasın)
+            room = max(1, size.lines - len(lines) - len(footer) - 1)
+            if room < len(rows):
+                room -= 1
+        for row in rows[:room]:
+            text = " ".join(f"{get(row)[:width]:>{width}}" for _, width, get in columns)
+            lines.append(f"{self.row_color(row)}{text}{ENDC}" if self.row_color else text)
+        if room < len(rows):
+            lines.append(f"{YELLOW}... +{len(rows) - room} drone{ENDC}")
+        lines.extend(footer)
+
+        if self.in_place:
+            return HOME + "".join(line + CLEAR_LINE + "\n" for line in lines) + CLEAR_BELOW
+        return "\n".join(lines) + "\n\n"
+
+    def _write(self, text):
+        data = text.encode()
+        self.bytes += len(data)
+        view = memoryview(data)
+        while view:
+            try:
+                written = os.write(self.fd, view)
+            except BlockingIOError:
+                if self._stopped.is_set():
+                    return
+                time.sleep(self.period / 10)
+                continue
+            except OSError:
+                # Terminal kapandı; veri alımı sürsün
+                return
+            view = view[written:]
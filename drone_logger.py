@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+
+import argparse
+import glob
+import json
+import os
+import struct
+import time
+import numpy as np
+from telemetry_shm import TelemetrySegment, SHM_NAME, SLOT, SLOT_FIELDS, FIELD_LAYOUT, decode_value
+from telemetry_notify import ChangeListener
+
+# Uçuş telemetri kaydedici: telemetri segmentine bağlanır, yazılan her örneği sütunlu,
+# parçalı bir kayda ekler. Kayıt dizini:
+#   meta.json                  sütunlar ve dtype'ları, parça kapasitesi
+#   chunk_000000/<sütun>.npy   sütun başına önceden ayrılmış NumPy dosyası (np.load(mmap_mode="r"))
+#   chunk_000000/rows          parçadaki geçerli satır sayısı (uint64)
+# "time" sütunu kaydedicinin okuma zamanıdır ve artan sıradadır (zaman indeksi): bir zaman
+# aralığı için sadece kesişen parçalar açılır, parça içinde ikili arama yapılır (FlightLog).
+# Slotlar çözülmeden ham bayt olarak toplanır, FLUSH_ROWS örnekte bir tek frombuffer ile
+# sütunlara dağıtılır; msync + fsync en fazla FSYNC_INTERVAL'da bir yapılır.
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+
+LOG_ROOT = "~/swarmind_logs"
+CHUNK_ROWS = 1 << 16      # parça başına satır (~6.5 MB)
+FLUSH_ROWS = 1024         # bu kadar örnek birikince sütunlara yazılır
+FLUSH_INTERVAL = 0.5      # s, örnek az olsa da en geç bu aralıkla yazılır
+FSYNC_INTERVAL = 5.0      # s, diske kalıcı yazım aralığı (güç kesintisinde en fazla bu kadar kaybolur)
+WAIT_TIMEOUT = 0.5        # s, bildirim gelmezse yine de bakılır
+STATUS_INTERVAL = 10.0    # s
+
+_NUMPY_FORMATS = {"I": "<u4", "H": "<u2", "h": "<i2", "d": "<f8", "f": "<f4"}
+
+
+def _numpy_format(fmt):
+    return f"S{fmt[:-1]}" if fmt.endswith("s") else _NUMPY_FORMATS[fmt]
+
+
+# Ham slot düzeninin (telemetry_shm.SLOT) numpy karşılığı
+SLOT_DTYPE = np.dtype({
+    "names": [name for name, _ in SLOT_FIELDS],
+    "formats": [_numpy_format(fmt) for _, fmt in SLOT_FIELDS],
+    "offsets": [FIELD_LAYOUT[name][0] for name, _ in SLOT_FIELDS],
+    "itemsize": SLOT.size,
+})
+# Kayıt sütunları: okuma zamanı + slot alanları (flags hariç)
+COLUMNS = [("time", "<f8")] + [(name, _numpy_format(fmt)) for name, fmt in SLOT_FIELDS if name != "flags"]
+ROWS = struct.Struct("<Q")
+
+
+def chunk_name(index):
+    return f"chunk_{index:06d}"
+
+
+def read_rows(chunk_dir):
+    try:
+        with open(os.path.join(chunk_dir, "rows"), "rb") as f:
+            return ROWS.unpack(f.read(ROWS.size))[0]
+    except (FileNotFoundError, struct.error):
+        return 0
+
+
+class ChunkWriter:
+    """Tek parça: sütun başına önceden ayrılmış memmap; dolunca yenisi açılır."""
+
+    def __init__(self, path, capacity):
+        os.makedirs(path)
+        self.path = path
+        self.capacity = capacity
+        self.rows = 0
+        self.columns = {
+            name: np.lib.format.open_memmap(os.path.join(path, f"{name}.npy"), mode="w+", dtype=dtype, shape=(capacity,))
+            for name, dtype in COLUMNS
+        }
+        self.rows_fd = os.open(os.path.join(path, "rows"), os.O_RDWR | os.O_CREAT, 0o644)
+        self._write_rows()
+
+    def full(self):
+        return self.rows >= self.capacity
+
+    def append(self, times, records):
+        """Sığdığı kadar satırı ekler, eklenen satır sayısını döner."""
+        count = min(len(times), self.capacity - self.rows)
+        end = self.rows + count
+        for name, column in self.columns.items():
+            column[self.rows:end] = times[:count] if name == "time" else records[name][:count]
+        self.rows = end
+        # Satır sayısı veriden sonra yazılır: okuyucu yarım satır görmez
+        self._write_rows()
+        return count
+
+    def sync(self):
+        for column in self.columns.values():
+            column.flush()
+        self._write_rows()
+        os.fsync(self.rows_fd)
+
+    def close(self):
+        self.sync()
+        os.close(self.rows_fd)
+        self.columns = {}
+
+    def _write_rows(self):
+        os.pwrite(self.rows_fd, ROWS.pack(self.rows), 0)
+
+
+class Recorder:
+    """Segmentte seq'i değişen slotları ham olarak toplar, toplu halde parçalara yazar."""
+
+    def __init__(self, segment, directory, drone_ids=None, chunk_rows=CHUNK_ROWS):
+        self.segment = segment
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        self.indexes = None if drone_ids is None else sorted(int(drone_id) - 1 for drone_id in drone_ids)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "meta.json"), "w") as f:
+            json.dump({"columns": COLUMNS, "chunk_rows": chunk_rows, "shm": segment.name,
+                       "started": time.time()}, f)
+        self.chunk = None
+        self.chunk_index = 0
+        self.pending = []
+        self.pending_times = []
+        self.last_seqs = {}
+        self.samples = 0
+        self.missed = 0
+        self.last_flush = self.last_sync = time.monotonic()
+
+    def poll(self):
+        """Son çağrıdan beri yazılan slotları toplar; toplanan örnek sayısını döner."""
+        now = time.time()
+        seqs = self.segment.sequences()
+        indexes = range(len(seqs)) if self.indexes is None else [i for i in self.indexes if i < len(seqs)]
+        collected = 0
+        for index in indexes:
+            seq = seqs[index]
+            last = self.last_seqs.get(index)
+            if not seq or seq == last:
+                continue
+            seq, raw = self.segment.read_raw(index + 1)
+            if raw is None:
+                continue
+            if last is not None:
+                # Her yazım seq'i 2 artırır; aradaki yazımlar kaçırılmıştır
+                self.missed += max(0, ((seq - last) & 0xFFFFFFFF) // 2 - 1)
+            self.last_seqs[index] = seq
+            self.pending.append(raw)
+            self.pending_times.append(now)
+            collected += 1
+        self.samples += collected
+        return collected
+
+    def maybe_flush(self):
+        now = time.monotonic()
+        if len(self.pending) >= FLUSH_ROWS or (self.pending and now - self.last_flush >= FLUSH_INTERVAL):
+            self.flush()
+        if now - self.last_sync >= FSYNC_INTERVAL:
+            self.sync()
+
+    def flush(self):
+        self.last_flush = time.monotonic()
+        if not self.pending:
+            return
+        records = np.frombuffer(b"".join(self.pending), dtype=SLOT_DTYPE)
+        times = np.array(self.pending_times, dtype="<f8")
+        self.pending, self.pending_times = [], []
+        start = 0
+        while start < len(times):
+            if self.chunk is None or self.chunk.full():
+                self._next_chunk()
+            start += self.chunk.append(times[start:], records[start:])
+
+    def sync(self):
+        self.last_sync = time.monotonic()
+        if self.chunk is not None:
+            self.chunk.sync()
+
+    def close(self):
+        self.flush()
+        if self.chunk is not None:
+            self.chunk.close()
+            self.chunk = None
+
+    def _next_chunk(self):
+        if self.chunk is not None:
+            self.chunk.close()
+            self.chunk_index += 1
+        self.chunk = ChunkWriter(os.path.join(self.directory, chunk_name(self.chunk_index)), self.chunk_rows)
+
+
+class FlightLog:
+    """Kaydı okur (kayıt sürerken de); sütunlar memmap, sadece istenen aralık belleğe gelir."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.dtypes = {name: np.dtype(dtype) for name, dtype in self.meta["columns"]}
+        self.chunks = []
+        self._columns = {}
+        self.refresh()
+
+    def refresh(self):
+        """Parça listesini ve satır sayılarını yeniden okur. Parça: (dizin, satır, ilk zaman, son zaman)"""
+        chunks = []
+        for path in sorted(glob.glob(os.path.join(self.directory, "chunk_*"))):
+            rows = read_rows(path)
+            if rows:
+                times = self.column(path, "time")
+                chunks.append((path, rows, float(times[0]), float(times[rows - 1])))
+        self.chunks = chunks
+        return self
+
+    def column(self, chunk_dir, name):
+        # Dosyalar önceden ayrıldığından memmap parça dolana kadar geçerli kalır
+        key = (chunk_dir, name)
+        column = self._columns.get(key)
+        if column is None:
+            column = self._columns[key] = np.load(os.path.join(chunk_dir, f"{name}.npy"), mmap_mode="r")
+        return column
+
+    def __len__(self):
+        return sum(rows for _, rows, _, _ in self.chunks)
+
+    def time_range(self):
+        if not self.chunks:
+            return None, None
+        return self.chunks[0][2], self.chunks[-1][3]
+
+    def window(self, start=None, end=None, fields=None, drone_ids=None):
+        """
+        start <= time < end aralığındaki örnekler: {sütun: ndarray}. Sadece aralıkla
+        kesişen parçalara dokunulur, parça içinde sınırlar ikili aramayla bulunur.
+        """
+        start = -np.inf if start is None else start
+        end = np.inf if end is None else end
+        names = ["time", "drone_id"] + [name for name in (fields or self.dtypes) if name not in ("time", "drone_id")]
+        parts = {name: [] for name in names}
+        for path, rows, first, last in self.chunks:
+            if last < start or first >= end:
+                continue
+            times = self.column(path, "time")[:rows]
+            lo, hi = np.searchsorted(times, [start, end], side="left")
+            if lo == hi:
+                continue
+            mask = None
+            if drone_ids is not None:
+                mask = np.isin(self.column(path, "drone_id")[lo:hi], [int(drone_id) for drone_id in drone_ids])
+            for name in names:
+                values = self.column(path, name)[lo:hi]
+                parts[name].append(values[mask] if mask is not None else np.array(values))
+        return {name: np.concatenate(values) if values else np.empty(0, dtype=self.dtypes[name])
+                for name, values in parts.items()}
+
+
+def decode_column(name, values):
+    """Ham sütun değerlerini telemetri değerlerine çevirir (NaN / -1 / boş -> None)."""
+    return [decode_value(name, value) for value in values.tolist()]
+
+
+def open_segment(name):
+    while True:
+        try:
+            return TelemetrySegment.open(name, create=False)
+        except FileNotFoundError:
+            time.sleep(1.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Telemetri segmentini sütunlu, parçalı kayda yazar")
+    # start_droneN.sh: drone_logger.py droneN <mavsdk adresi>
+    parser.add_argument("drone", nargs="?", help="sadece bu drone (ör. drone1)")
+    parser.add_argument("address", nargs="?", help="eski başlatma betikleriyle uyum için, kullanılmaz")
+    parser.add_argument("--ids", nargs="+", help="sadece bu drone ID'leri")
+    parser.add_argument("--dir", default=LOG_ROOT, help="kayıtların kök dizini")
+    parser.add_argument("--shm", default=SHM_NAME)
+    args = parser.parse_args()
+
+    drone_ids = args.ids
+    if args.drone:
+        drone_ids = (drone_ids or []) + [args.drone.removeprefix("drone")]
+    suffix = f"_drone{'-'.join(drone_ids)}" if drone_ids else ""
+    directory = os.path.join(os.path.expanduser(args.dir), time.strftime("%Y%m%d_%H%M%S") + suffix)
+
+    print(f"{CYAN}[Logger] '{args.shm}' segmenti bekleniyor...{ENDC}")
+    segment = open_segment(args.shm)
+    recorder = Recorder(segment, directory, drone_ids)
+    listener = ChangeListener(segment.name)
+    print(f"{GREEN}[Logger] Kayıt: {directory}{ENDC}")
+    status_at = time.monotonic()
+    cpu_at = time.process_time()
+    samples_at = 0
+    try:
+        while True:
+            listener.wait(timeout=WAIT_TIMEOUT)
+            recorder.poll()
+            recorder.maybe_flush()
+            now = time.monotonic()
+            if now - status_at >= STATUS_INTERVAL:
+                cpu = time.process_time()
+                rate = (recorder.samples - samples_at) / (now - status_at)
+                color = GREEN if not recorder.missed else YELLOW
+                print(f"{color}[Logger] {recorder.samples} örnek ({rate:.0f}/s), kaçırılan {recorder.missed}, "
+                      f"CPU %{(cpu - cpu_at) / (now - status_at) * 100:.1f}{ENDC}")
+                status_at, cpu_at, samples_at = now, cpu, recorder.samples
+    except KeyboardInterrupt:
+        pass
+    finally:
+        recorder.close()
+        listener.close()
+        segment.close()
+        print(f"{CYAN}[Logger] Kapandı: {recorder.samples} örnek, {directory}{ENDC}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,72 +1,105 @@
 #!/usr/bin/env python3
 
 import asyncio
-import json
 import math
-import multiprocessing.shared_memory as shm
-from mavsdk import System
-
-SHM_NAME = "telemetry_shared"
-SHM_SIZE = 4096
-SEE_RADIUS = 30
-COHESION_WEIGHT = 0.4
-SEPARATION_WEIGHT = 1.2
+from telemetry_shm import TelemetrySegment, SHM_NAME
+from geodesy import local_frame
+from command_arbiter import arbiter_for, FLOCK
+from connection_broker import broker
+from swarm_config import default_spec
+from flocking_params import SEE_RADIUS, COHESION_WEIGHT, SEPARATION_WEIGHT
+
+FLOCK_FIELDS = ("latitude", "longitude", "absolute_altitude")
+SPACING_BAND = 1.0  # m, spacing hedefi etrafında GOTO gönderilmeyen bant (ucak111 "hold" bandı)
+FLOCK_INTERVAL = 1.0  # s, GOTO hedefi bu aralıkla yenilenir
+FLOCK_LEASE = 1.5 * FLOCK_INTERVAL  # s, hakemdeki süresi; yenileme gecikse de kesintisiz kalır
 
 MY_ID = "1"
 GPRC_PORT = 50051
+OTHER_ID = "2"
 
 def meter_distance(lat1, lon1, lat2, lon2):
-    dx = (lon2 - lon1) * 111320 * math.cos(math.radians(lat1))
-    dy = (lat2 - lat1) * 110540
+    """(mesafe, doğu farkı, kuzey farkı) metre; geodesy süreç çerçevesinde."""
+    frame = local_frame(lat1, lon1)
+    e1, n1, _ = frame.to_enu(lat1, lon1)
+    e2, n2, _ = frame.to_enu(lat2, lon2)
+    dx, dy = e2 - e1, n2 - n1
     return math.hypot(dx, dy), dx, dy
 
-async def flock():
-    drone = System(port=GPRC_PORT)
-    await drone.connect(system_address=f"udp://:{14540 + int(MY_ID)}")
-    print(f"[Flocking1] Drone{MY_ID} bağlandı.")
-
-    memory = shm.SharedMemory(name=SHM_NAME)
+def flock_target(me, other, spacing=None):
+    """
+    Ayrılma + kohezyon ağırlıklı GOTO hedefi (lat, lon); diğer drone SEE_RADIUS
+    dışındaysa None. flocking_kernel.flock_targets bunun vektörel karşılığıdır.
+    spacing verilirse (ucak11 --flock-with) hedef diğer drone'a spacing metre mesafedir:
+    SPACING_BAND içindeyse None, dışındaysa aradaki farkın yarısı kadar (iki drone
+    birbirini izliyorsa ikisi birlikte tam farkı kapatır) yaklaşılır/uzaklaşılır.
+    """
+    dist, dx, dy = meter_distance(
+        me["latitude"], me["longitude"],
+        other["latitude"], other["longitude"]
+    )
+
+    if dist > SEE_RADIUS:
+        return None
+
+    if spacing is not None:
+        error = dist - spacing
+        if abs(error) <= SPACING_BAND or dist == 0:
+            return None
+        step = 0.5 * error / dist
+        return local_frame().displace(me["latitude"], me["longitude"], step * dx, step * dy)
+
+    # Ayrılma diğerinden uzağa, kohezyon ona doğru (ikisi de aynı metre farkından)
+    sep_x, sep_y = -dx, -dy
+    coh_x, coh_y = dx, dy
+
+    total_dx = SEPARATION_WEIGHT * sep_x + COHESION_WEIGHT * coh_x
+    total_dy = SEPARATION_WEIGHT * sep_y + COHESION_WEIGHT * coh_y
+
+    return local_frame().displace(me["latitude"], me["longitude"], total_dx, total_dy)
+
+async def flock(my_id=MY_ID, grpc_port=GPRC_PORT, other_id=OTHER_ID, drone=None, segment=None, spacing=None):
+    # drone/segment verilirse onlar kullanılır (ör. Drone*_bayland'ın bağlantısı, replay.py'nin FakeSystem'i)
+    # spacing: ağırlıklı hedef yerine bu mesafeyi tut (flock_target)
+    if drone is None:
+        vehicle = await broker().connect(default_spec(my_id)._replace(grpc_port=grpc_port))
+        drone = vehicle.system
+        print(f"[Flocking{my_id}] Drone{my_id} bağlandı.")
+
+    if segment is None:
+        segment = TelemetrySegment.open(SHM_NAME, create=False)
+
+    # Aynı süreçte aynı drone'a hız komutu gönderen kontrolcü varsa (ucak11 --flock-with)
+    # hakem öncelikle seçer: diğer drone SEE_RADIUS içinde ve spacing bandı dışındayken
+    # mesafeyi bu GOTO düzeltir (FLOCK, ucak111'in uzaklaş/yaklaş hızlarının üstünde),
+    # kaçınma (AVOIDANCE) yine onu keser; bantta veya menzil dışında hedef geri çekilir ve
+    # hız kontrolcüsü devralır. Aynı hedef tekrar gönderilmez.
+    arbiter = arbiter_for(drone, my_id)
 
     while True:
         try:
-            raw = bytes(memory.buf[:]).split(b'\x00', 1)[0]
-            data_all = json.loads(raw.decode('utf-8'))
+            me = segment.read(my_id, FLOCK_FIELDS)
+            other = segment.read(other_id, FLOCK_FIELDS)
 
-            if MY_ID not in data_all or "2" not in data_all:
+            if not me or not other or "latitude" not in me or "latitude" not in other:
                 await asyncio.sleep(0.2)
                 continue
 
-            me = data_all[MY_ID]
-            other = data_all["2"]
-
-            dist, dx, dy = meter_distance(
-                me["latitude"], me["longitude"],
-                other["latitude"], other["longitude"]
-            )
-
-            if dist > SEE_RADIUS:
-                await asyncio.sleep(1)
+            target = flock_target(me, other, spacing)
+            if target is None:
+                arbiter.release("flock")
+                await asyncio.sleep(FLOCK_INTERVAL)
                 continue
+            target_lat, target_lon = target
 
-            sep_x, sep_y = -dx, -dy
-            coh_x = (other["longitude"] - me["longitude"]) * 111320
-            coh_y = (other["latitude"] - me["latitude"]) * 110540
-
-            total_dx = SEPARATION_WEIGHT * sep_x + COHESION_WEIGHT * coh_x
-            total_dy = SEPARATION_WEIGHT * sep_y + COHESION_WEIGHT * coh_y
-
-            target_lon = me["longitude"] + total_dx / 111320
-            target_lat = me["latitude"] + total_dy / 110540
-
-            await drone.action.goto_location(
-                target_lat, target_lon, me["absolute_altitude"], 0
-            )
+            arbiter.goto("flock", (target_lat, target_lon, me["absolute_altitude"], 0),
+                         FLOCK, lease=FLOCK_LEASE)
 
-            print(f"[Flocking1] Drone1 yönlendirildi ➤ {target_lat:.6f}, {target_lon:.6f}")
+            print(f"[Flocking{my_id}] Drone{my_id} yönlendirildi ➤ {target_lat:.6f}, {target_lon:.6f}")
 
         except Exception as e:
-            print(f"[Flocking1] Hata: {e}")
-        await asyncio.sleep(1)
+            print(f"[Flocking{my_id}] Hata: {e}")
+        await asyncio.sleep(FLOCK_INTERVAL)
 
 if __name__ == "__main__":
     asyncio.run(flock())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+import numpy as np
+import flocking_params as params
+from geodesy import local_frame, nearest_batch
+
+# Tüm sürü için tek geçişte flocking: girdiler drone başına lat/lon/alt/yaw dizileri,
+# çıktılar VelocityNedYaw (veya GOTO) değerleri. Sabitler skaler kontrolcülerle ortak
+# flocking_params'tan okunur (mavsdk yüklenmez); sonuçlar ucak111.flocking_decision,
+# ucak1.flocking_decision ve flocking1.flock_target ile birebir aynıdır (bkz. bench_flocking.py).
+
+CHUNK = 512  # N x N mesafe matrisi bu kadar satırlık parçalarla hesaplanır
+
+# band_commands mod kodları (ucak111.FLOCKING_MODES anahtarları)
+BAND_MODES = ("free", "escape", "retreat", "hold", "approach")
+# flocking_commands mod kodları
+FLOCK_MODES = ("free", "flock", "avoid")
+
+
+def _enu(lat, lon):
+    """geodesy süreç çerçevesinde (doğu, kuzey); orijin yoksa ilk geçerli konum olur."""
+    valid = ~(np.isnan(lat) | np.isnan(lon))
+    frame = local_frame(*((lat[valid][0], lon[valid][0]) if valid.any() else (0.0, 0.0)))
+    east, north, _ = frame.to_enu_batch(lat, lon)
+    return frame, east, north
+
+
+def nearest_neighbors(lat, lon):
+    """
+    Her drone için en yakın diğer drone'un indeksi ve mesafesi (ENU'da).
+    Komşusu olmayan (veya konumu NaN olan) drone için indeks -1, mesafe inf.
+    """
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    _, east, north = _enu(lat, lon)
+    return nearest_batch(east, north, CHUNK)
+
+
+def _gather(values, index):
+    # -1 indeksli satırlar için NaN
+    out = np.full(index.shape, np.nan)
+    has = index >= 0
+    out[has] = values[index[has]]
+    return out
+
+
+def band_commands(lat, lon, yaw, neighbors=None):
+    """
+    ucak111.flocking_controller'ın vektörel hali.
+    Dönüş: (mod_kodu, vn, ve, vd, yaw) dizileri; mod adı için BAND_MODES[mod_kodu].
+    """
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    yaw = np.asarray(yaw, dtype=float)
+    index, dist = neighbors if neighbors is not None else nearest_neighbors(lat, lon)
+    _, east, north = _enu(lat, lon)
+    d_east, d_north = _gather(east, index) - east, _gather(north, index) - north
+    my_yaw = np.where(np.isnan(yaw), 0.0, yaw)
+
+    yaw_to_other = np.degrees(np.arctan2(d_east, d_north))
+    away = np.arctan2(-d_east, -d_north)
+    toward = np.arctan2(d_east, d_north)
+
+    has = index >= 0
+    esc = has & (dist < params.ESCAPE_DISTANCE)
+    retreat = has & (dist >= params.ESCAPE_DISTANCE) & (dist < params.TARGET_DISTANCE - 1)
+    hold = has & (dist >= params.TARGET_DISTANCE - 1) & (dist <= params.TARGET_DISTANCE + 1)
+    approach = has & (dist > params.TARGET_DISTANCE + 1)
+
+    mode = np.select([esc, retreat, hold, approach], [1, 2, 3, 4], default=0)
+    speed = np.select([esc, retreat | approach], [params.ESCAPE_SPEED, params.COHESION_SPEED], default=0.0)
+    angle = np.where(approach, toward, away)
+    vn = np.where(esc | retreat | approach, speed * np.cos(angle), 0.0)
+    ve = np.where(esc | retreat | approach, speed * np.sin(angle), 0.0)
+    vn = np.where(mode == 0, params.NORMAL_SPEED, vn)
+    vd = np.zeros_like(vn)
+    yaw_out = np.where(retreat | approach, yaw_to_other, my_yaw)
+    return mode, vn, ve, vd, yaw_out
+
+
+def flocking_commands(lat, lon, alt, yaw, neighbors=None):
+    """
+    ucak1.apply_flocking_and_avoidance'ın vektörel hali.
+    Dönüş: (mod_kodu, komut) — komut (N, 4): "avoid" satırlarında GOTO
+    (lat, lon, alt, yaw), diğerlerinde VelocityNedYaw (vn, ve, vd, yaw).
+    """
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    alt = np.asarray(alt, dtype=float)
+    yaw = np.asarray(yaw, dtype=float)
+    index, dist = neighbors if neighbors is not None else nearest_neighbors(lat, lon)
+    frame, east, north = _enu(lat, lon)
+    d_east, d_north = _gather(east, index) - east, _gather(north, index) - north
+    n_yaw = _gather(yaw, index)
+
+    has = index >= 0
+    avoid = has & (dist < params.AVOID_DISTANCE)
+    flock = has & (dist >= params.AVOID_DISTANCE) & (dist <= params.FLOCK_DISTANCE)
+    mode = np.select([avoid, flock], [2, 1], default=0)
+
+    sep = np.arctan2(-d_east, -d_north)
+    ali = np.radians(n_yaw)
+    coh = np.arctan2(d_east, d_north)
+    vx = params.SEPARATION_GAIN * np.cos(sep) + params.ALIGNMENT_GAIN * np.cos(ali) + params.COHESION_GAIN * np.cos(coh)
+    vy = params.SEPARATION_GAIN * np.sin(sep) + params.ALIGNMENT_GAIN * np.sin(ali) + params.COHESION_GAIN * np.sin(coh)
+    flock_yaw = np.degrees(np.arctan2(vy, vx))
+
+    goto_lat, goto_lon, _ = frame.to_geodetic_batch(east + params.AVOID_STEP * np.sin(sep),
+                                                    north + params.AVOID_STEP * np.cos(sep))
+
+    command = np.empty((lat.size, 4))
+    command[:, 0] = np.where(avoid, goto_lat, params.CRUISE_SPEED)
+    command[:, 1] = np.where(avoid, goto_lon, 0.0)
+    command[:, 2] = np.where(avoid, alt, 0.0)
+    command[:, 3] = np.select([avoid, flock], [np.degrees(sep), flock_yaw], default=yaw)
+    return mode, command
+
+
+def flock_targets(lat, lon, neighbors=None):
+    """
+    flocking1.flock_target'ın vektörel hali (diğer drone = en yakın komşu).
+    Dönüş: (aktif_maske, hedef_lat, hedef_lon); SEE_RADIUS dışındakiler için maske False.
+    """
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    index, _ = neighbors if neighbors is not None else nearest_neighbors(lat, lon)
+    frame, east, north = _enu(lat, lon)
+    dx, dy = _gather(east, index) - east, _gather(north, index) - north
+    active = (index >= 0) & (np.hypot(dx, dy) <= params.SEE_RADIUS)
+
+    total_dx = params.SEPARATION_WEIGHT * -dx + params.COHESION_WEIGHT * dx
+    total_dy = params.SEPARATION_WEIGHT * -dy + params.COHESION_WEIGHT * dy
+    target_lat, target_lon, _ = frame.to_geodetic_batch(east + total_dx, north + total_dy)
+    target_lat = np.where(active, target_lat, np.nan)
+    target_lon = np.where(active, target_lon, np.nan)
+    return active, target_lat, target_lon
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+
+# Flocking kontrolcülerinin sabitleri. Bağımlılıksız: import etmek mavsdk veya başka bir
+# modül yüklemez. Skaler kontrolcüler (ucak111, ucak1, flocking1) ve vektörel
+# flocking_kernel aynı değerleri buradan okur.
+
+# ucak111: en yakın drone'a göre bant (kaçın / uzaklaş / sabit / yaklaş)
+ESCAPE_DISTANCE = 10
+TARGET_DISTANCE = 15   # Sabit mesafe hedefi (kohezyon)
+COHESION_SPEED = 1.2   # Kohezyon/sabit mesafe yaklaşma hızı
+ESCAPE_SPEED = 3.5     # Kaçınma hızı
+NORMAL_SPEED = 0.8     # Serbest uçuş hızı
+
+# ucak1: GOTO kaçınma + ayrılma/hizalanma/kohezyon
+AVOID_DISTANCE = 7     # Bu mesafenin altında GOTO ile kaçınma
+FLOCK_DISTANCE = 30    # Bu mesafeye kadar flocking (ayrılma + hizalanma + kohezyon)
+AVOID_STEP = 5         # Kaçınma GOTO hedefinin uzaklığı (m)
+CRUISE_SPEED = 1.0
+SEPARATION_GAIN, ALIGNMENT_GAIN, COHESION_GAIN = 2, 1, 1
+
+# flocking1: ağırlıklı GOTO hedefi
+SEE_RADIUS = 30
+COHESION_WEIGHT = 0.4
+SEPARATION_WEIGHT = 1.2
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+import math
+
+# Ortak yerel koordinat çerçevesi. Her telemetri örneği bir kez (örnek başına 4 trig)
+# sabit bir orijine göre ENU'ya (doğu, kuzey, yukarı; metre) çevrilir; sonra tüm mesafe
+# ve yön hesapları düz Kartezyen işlemlerdir (çift başına trig yok). Orijinin
+# sin/cos(lat) değerleri çerçevede saklanır.
+# Projeksiyon küre üzerinde ortografiktir (orijindeki teğet düzleme dik izdüşüm): orijinden
+# 10 km içinde mesafe hatası haversine'e göre ~1e-6 bağıl, yönler enleme göre çarpık değil
+# (ham derece farklarıyla atan2 doğuyu cos(lat) kadar sıkıştırıyordu). Bkz. bench_geodesy.py.
+# Toplu (numpy) sürümler *_batch; numpy sadece onlar çağrılınca yüklenir.
+
+EARTH_RADIUS = 6371000
+M_PER_DEG_LAT = math.radians(1) * EARTH_RADIUS
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Büyük daire mesafesi (m); referans, sıcak yolda kullanılmaz."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return EARTH_RADIUS * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def initial_bearing(lat1, lon1, lat2, lon2):
+    """Büyük daire başlangıç yönü (radyan, kuzeyden saat yönünde); referans."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dlambda = math.radians(lon2 - lon1)
+    return math.atan2(math.sin(dlambda) * math.cos(phi2),
+                      math.cos(phi1) * math.sin(phi2) - math.sin(phi1) * math.cos(phi2) * math.cos(dlambda))
+
+
+class LocalFrame:
+    """Sabit orijin etrafında lat/lon/alt <-> ENU (m)."""
+
+    __slots__ = ("origin_lat", "origin_lon", "origin_alt", "sin_lat", "cos_lat")
+
+    def __init__(self, origin_lat, origin_lon, origin_alt=0.0):
+        self.origin_lat = origin_lat
+        self.origin_lon = origin_lon
+        self.origin_alt = origin_alt
+        phi = math.radians(origin_lat)
+        self.sin_lat = math.sin(phi)
+        self.cos_lat = math.cos(phi)
+
+    def to_enu(self, lat, lon, alt=None):
+        """(doğu, kuzey, yukarı); alt verilmezse yukarı 0."""
+        phi = math.radians(lat)
+        dlambda = math.radians(lon - self.origin_lon)
+        sin_phi, cos_phi = math.sin(phi), math.cos(phi)
+        cos_dl = math.cos(dlambda)
+        east = EARTH_RADIUS * cos_phi * math.sin(dlambda)
+        north = EARTH_RADIUS * (self.cos_lat * sin_phi - self.sin_lat * cos_phi * cos_dl)
+        return east, north, 0.0 if alt is None else alt - self.origin_alt
+
+    def to_geodetic(self, east, north, up=0.0):
+        """to_enu'nun tersi: (lat, lon, alt)."""
+        rho = math.hypot(east, north)
+        if rho == 0:
+            return self.origin_lat, self.origin_lon, self.origin_alt + up
+        sin_c = min(rho / EARTH_RADIUS, 1.0)
+        cos_c = math.sqrt(1 - sin_c * sin_c)
+        lat = math.asin(cos_c * self.sin_lat + north * sin_c * self.cos_lat / rho)
+        lon = math.atan2(east * sin_c, rho * cos_c * self.cos_lat - north * sin_c * self.sin_lat)
+        return math.degrees(lat), self.origin_lon + math.degrees(lon), self.origin_alt + up
+
+    def to_enu_batch(self, lat, lon, alt=None):
+        """Diziler için to_enu: (doğu, kuzey, yukarı) numpy dizileri."""
+        import numpy as np
+        phi = np.radians(np.asarray(lat, dtype=float))
+        dlambda = np.radians(np.asarray(lon, dtype=float) - self.origin_lon)
+        cos_phi = np.cos(phi)
+        east = EARTH_RADIUS * cos_phi * np.sin(dlambda)
+        north = EARTH_RADIUS * (self.cos_lat * np.sin(phi) - self.sin_lat * cos_phi * np.cos(dlambda))
+        up = np.zeros_like(east) if alt is None else np.asarray(alt, dtype=float) - self.origin_alt
+        return east, north, up
+
+    def to_geodetic_batch(self, east, north, up=None):
+        import numpy as np
+        east = np.asarray(east, dtype=float)
+        north = np.asarray(north, dtype=float)
+        rho = np.hypot(east, north)
+        safe = np.where(rho == 0, 1.0, rho)
+        sin_c = np.minimum(rho / EARTH_RADIUS, 1.0)
+        cos_c = np.sqrt(1 - sin_c * sin_c)
+        lat = np.degrees(np.arcsin(cos_c * self.sin_lat + north * sin_c * self.cos_lat / safe))
+        lon = self.origin_lon + np.degrees(np.arctan2(east * sin_c, rho * cos_c * self.cos_lat - north * sin_c * self.sin_lat))
+        alt = self.origin_alt + (0.0 if up is None else np.asarray(up, dtype=float))
+        return lat, lon, alt
+
+    def displace(self, lat, lon, east, north):
+        """(lat, lon) noktasından east/north metre ötesi: (lat, lon)."""
+        e0, n0, _ = self.to_enu(lat, lon)
+        lat, lon, _ = self.to_geodetic(e0 + east, n0 + north)
+        return lat, lon
+
+
+_frame = None
+
+
+def local_frame(lat=None, lon=None, alt=0.0):
+    """
+    Süreç genelindeki çerçeve; ilk çağrıda verilen konum orijin olur. Aynı süreçteki
+    tüm ENU değerleri aynı orijine göredir, farkları doğrudan alınabilir.
+    """
+    global _frame
+    if _frame is None:
+        if lat is None or lon is None:
+            raise ValueError("Çerçeve orijini henüz yok (ilk çağrıda lat/lon gerekli)")
+        _frame = LocalFrame(lat, lon, alt)
+    return _frame
+
+
+def reset_frame(frame=None):
+    """Süreç çerçevesini değiştirir/siler (ör. tekrar oynatmalar arasında)."""
+    global _frame
+    _frame = frame
+
+
+def bearing(d_east, d_north):
+    """ENU farkının yönü (radyan, kuzeyden saat yönünde; NED: vn = cos, ve = sin)."""
+    return math.atan2(d_east, d_north)
+
+
+def offset(a, b):
+    """
+    b'nin a'ya göre (doğu, kuzey) farkı (m). Örneklerde "east"/"north" varsa
+    (SwarmIndex/SpatialGrid örnek başına bir kez çevirdi) onlar kullanılır.
+    """
+    if "east" in a and "east" in b:
+        return b["east"] - a["east"], b["north"] - a["north"]
+    frame = local_frame(a["latitude"], a["longitude"])
+    ea, na, _ = frame.to_enu(a["latitude"], a["longitude"])
+    eb, nb, _ = frame.to_enu(b["latitude"], b["longitude"])
+    return eb - ea, nb - na
+
+
+def ground_distance(lat1, lon1, lat2, lon2):
+    """İki konum arası yatay mesafe (m), süreç çerçevesinde."""
+    frame = local_frame(lat1, lon1)
+    e1, n1, _ = frame.to_enu(lat1, lon1)
+    e2, n2, _ = frame.to_enu(lat2, lon2)
+    return math.hypot(e2 - e1, n2 - n1)
+
+
+def distances_batch(east, north, e0, n0):
+    """Her noktanın (e0, n0)'a mesafesi."""
+    import numpy as np
+    return np.hypot(np.asarray(east) - e0, np.asarray(north) - n0)
+
+
+def nearest_batch(east, north, chunk=512):
+    """
+    Her nokta için en yakın diğer noktanın indeksi ve mesafesi (N x N, chunk satırlık
+    parçalarla). Komşusu olmayan veya NaN olan nokta için indeks -1, mesafe inf.
+    """
+    import numpy as np
+    east = np.asarray(east, dtype=float)
+    north = np.asarray(north, dtype=float)
+    n = east.size
+    valid = ~(np.isnan(east) | np.isnan(north))
+    index = np.full(n, -1, dtype=np.intp)
+    dist = np.full(n, np.inf)
+    if n < 2:
+        return index, dist
+    for start in range(0, n, chunk):
+        rows = slice(start, min(start + chunk, n))
+        count = rows.stop - rows.start
+        d_sq = (east[None, :] - east[rows, None]) ** 2 + (north[None, :] - north[rows, None]) ** 2
+        # Kendisi ve geçersiz konumlar aday olamaz
+        d_sq[np.arange(count), np.arange(rows.start, rows.stop)] = np.inf
+        d_sq[:, ~valid] = np.inf
+        d_sq[~valid[rows], :] = np.inf
+        best = np.argmin(d_sq, axis=1)
+        best_dist = np.sqrt(d_sq[np.arange(count), best])
+        index[rows] = np.where(np.isfinite(best_dist), best, -1)
+        dist[rows] = best_dist
+    return index, dist
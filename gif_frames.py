@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+
+# GUI kartları için önceden ölçeklenmiş animasyon kareleri.
+# Anahtar (dosya, (genişlik, yükseklik)); aynı boyuttaki tüm drone kartları aynı kare
+# setini paylaşır, yani bellek drone sayısıyla değil farklı boyut sayısıyla büyür.
+# Ölçeklenmiş setler LRU ile CACHE_SIZE adetle sınırlıdır; kaynak dosya bir kez çözülür.
+# Çözme ve LANCZOS ölçekleme arka plan iş parçacığında yapılır. Tk nesnesine çevirme
+# (ör. ImageTk.PhotoImage) Tk iş parçacığı dışında yapılamaz: bitmiş işler poll() ile alınır.
+
+CACHE_SIZE = 4            # aynı anda tutulan ölçeklenmiş set sayısı
+DEFAULT_DURATION_MS = 100
+
+
+def decode_frames(path):
+    """Dosyadaki tüm kareleri RGBA olarak döner: (kareler, süreler_ms). Tek kareli resimler de olur."""
+    frames, durations = [], []
+    with Image.open(path) as image:
+        for index in range(getattr(image, "n_frames", 1)):
+            image.seek(index)
+            frames.append(image.convert("RGBA"))
+            durations.append(image.info.get("duration") or DEFAULT_DURATION_MS)
+    return frames, durations
+
+
+def scale_frames(frames, size):
+    return [frame.resize(size, Image.Resampling.LANCZOS) for frame in frames]
+
+
+class FrameSet:
+    """Tek (dosya, boyut) için hazır kareler ve kare süreleri."""
+
+    def __init__(self, frames, durations):
+        self.frames = frames
+        self.durations = durations
+
+    def __len__(self):
+        return len(self.frames)
+
+
+class FrameCache:
+    """
+    (dosya, boyut) -> FrameSet LRU önbelleği. convert verilirse her kare Tk iş parçacığında
+    (load / poll içinde) ona çevrilir. Yüklenemeyen dosya bir kez denenir, failed'a yazılır.
+    """
+
+    def __init__(self, convert=None, capacity=CACHE_SIZE):
+        self.convert = convert
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.failed = {}          # dosya -> hata mesajı
+        self.sources = {}         # dosya -> çözülmüş orijinal kareler
+        self.waiting = {}         # anahtar -> [callback, ...]
+        self.done = queue.SimpleQueue()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gif-frames")
+        self.decodes = 0
+        self.scales = 0
+
+    @staticmethod
+    def key(path, size):
+        return path, (int(size[0]), int(size[1]))
+
+    def get(self, path, size):
+        """Hazırsa FrameSet, değilse None (hiçbir iş başlatmaz)."""
+        key = self.key(path, size)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def request(self, path, size, callback=None):
+        """
+        Hazırsa FrameSet döner. Değilse None döner ve set arka planda hazırlanır;
+        poll() bitmiş işi aldığında callback(FrameSet veya hata halinde None) çağrılır.
+        Aynı anahtar için zaten bekleyen iş varsa yenisi başlatılmaz.
+        """
+        entry = self.get(path, size)
+        if entry is not None or path in self.failed:
+            return entry
+        key = self.key(path, size)
+        callbacks = self.waiting.get(key)
+        if callbacks is None:
+            callbacks = self.waiting[key] = []
+            self.executor.submit(self._prepare, key)
+        if callback is not None and callback not in callbacks:
+            callbacks.append(callback)
+        return None
+
+    def load(self, path, size):
+        """Senkron yükleme (küçük, tek kareli resimler için); hata halinde None."""
+        entry = self.get(path, size)
+        if entry is not None or path in self.failed:
+            return entry
+        key = self.key(path, size)
+        try:
+            frames, durations = self._scaled(key)
+        except Exception as e:
+            self.failed[path] = str(e)
+            return None
+        return self._store(key, frames, durations)
+
+    def pending(self):
+        return bool(self.waiting)
+
+    def poll(self):
+        """
+        Tk iş parçacığından çağrılır: biten setleri önbelleğe alır ve bekleyenlere bildirir.
+        Hâlâ bekleyen iş varsa True döner (çağıran tekrar planlamalı).
+        """
+        while True:
+            try:
+                key, frames, durations, error = self.done.get_nowait()
+            except queue.Empty:
+                break
+            callbacks = self.waiting.pop(key, [])
+            if error is not None:
+                self.failed[key[0]] = error
+                entry = None
+            else:
+                entry = self._store(key, frames, durations)
+            for callback in callbacks:
+                callback(entry)
+        return self.pending()
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _scaled(self, key):
+        path, size = key
+        source = self.sources.get(path)
+        if source is None:
+            source = self.sources[path] = decode_frames(path)
+            self.decodes += 1
+        frames, durations = source
+        self.scales += 1
+        return scale_frames(frames, size), list(durations)
+
+    def _prepare(self, key):
+        # İş parçacığı: sadece PIL işi, sonuç kuyruğa
+        try:
+            frames, durations = self._scaled(key)
+        except Exception as e:
+            self.done.put((key, None, None, str(e)))
+        else:
+            self.done.put((key, frames, durations, None))
+
+    def _store(self, key, frames, durations):
+        if self.convert is not None:
+            frames = [self.convert(frame) for frame in frames]
+        entry = self.entries[key] = FrameSet(frames, durations)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+        return entry
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import os
+import signal
+import time
+from readiness import StageTimer, wait_for_port, wait_connected, wait_healthy
+from swarm_config import specs_from_dir, specs_for_count, CONFIG_DIR, BASE_MAVLINK_PORT
+from telemetry_shm import TelemetrySegment, SHM_NAME, MAX_DRONES
+from ucak111 import telemetry_collector, flocking_controller, start_flight
+from connection_broker import broker
+import metrics
+
+# Sürü başlatıcı: PX4 SITL, (istenirse) harici mavsdk_server ve kontrolcüyü sabit
+# beklemeler olmadan ayağa kaldırır. Her aşama bir öncekinin gerçek hazır olma sinyaliyle
+# ilerler: süreç başladı -> gRPC portu açık -> bağlantı -> health_all_ok -> arm -> havada
+# -> kalkış irtifası -> offboard. Drone'lar paralel açılır; Gazebo modellerinde dünya ilk
+# drone'un PX4'ü tarafından kurulduğundan diğerleri sadece onun bağlanmasını bekler.
+# Sonunda aşama başına süre raporu basılır, ardından kontrol döngüleri (swarm.py gibi) çalışır.
+
+GREEN, YELLOW, RED, BLUE, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[94m", "\033[96m", "\033[0m"
+
+PX4_DIR = "~/PX4-Autopilot"
+PX4_BINARY = "build/px4_sitl_default/bin/px4"
+PX4_AUTOSTART = 4001
+PX4_MODEL = "gz_x500_mono_cam"
+POSE_SPACING = 5        # m, drone'lar y ekseninde dizilir (Drone N -> 0,(N-1)*5)
+LOG_DIR = "/tmp/swarmind_launch"
+STOP_TIMEOUT = 5        # s, SIGTERM sonrası SIGKILL öncesi
+
+STAGES = ("px4", "world", "mavsdk_server", "connect", "health", "arm", "takeoff", "in_air", "altitude", "offboard")
+
+
+def px4_instance(spec):
+    """PX4 -i değeri: instance N MAVLink'i 14540+N portuna yollar, config'teki porttan çıkarılır."""
+    return int(spec.connection.rsplit(":", 1)[1]) - BASE_MAVLINK_PORT
+
+
+async def spawn(name, argv, cwd=None, env=None):
+    """Süreci kendi süreç grubunda başlatır, çıktısı LOG_DIR/<name>.log dosyasına gider."""
+    os.makedirs(LOG_DIR, exist_ok=True)
+    with open(os.path.join(LOG_DIR, f"{name}.log"), "wb") as log:
+        return await asyncio.create_subprocess_exec(
+            *argv, cwd=cwd, env=env, stdin=asyncio.subprocess.DEVNULL,
+            stdout=log, stderr=asyncio.subprocess.STDOUT, start_new_session=True,
+        )
+
+
+async def unless_exited(proc, awaitable, name):
+    """awaitable'ı bekler; bu sırada süreç ölürse beklemeyi keser (zaman aşımını beklemez)."""
+    task = asyncio.ensure_future(awaitable)
+    exited = asyncio.ensure_future(proc.wait())
+    try:
+        await asyncio.wait({task, exited}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        exited.cancel()
+    if task.done():
+        return task.result()
+    task.cancel()
+    raise RuntimeError(f"{name} çıktı (kod {proc.returncode}), log: {os.path.join(LOG_DIR, name + '.log')}")
+
+
+async def stop_processes(procs):
+    for proc in procs:
+        if proc.returncode is None:
+            try:
+                os.killpg(proc.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    for proc in procs:
+        try:
+            await asyncio.wait_for(proc.wait(), STOP_TIMEOUT)
+        except TimeoutError:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+
+async def start_px4(spec, args):
+    drone_id = int(spec.drone_id)
+    env = dict(
+        os.environ, HEADLESS="1", PX4_SYS_AUTOSTART=str(args.autostart), PX4_SIM_MODEL=args.model,
+        PX4_GZ_MODEL_POSE=f"0,{(drone_id - 1) * args.spacing}",
+    )
+    px4_dir = os.path.expanduser(args.px4_dir)
+    # -d: etkileşimli pxh kabuğu olmadan (stdin yok)
+    return await spawn(f"px4_drone{drone_id}", [os.path.join(px4_dir, PX4_BINARY), "-i", str(px4_instance(spec)), "-d"],
+                       cwd=px4_dir, env=env)
+
+
+async def bring_up(spec, args, timer, procs, world_ready, builds_world):
+    """Tek drone'u uçuşa hazır hale getirir; System nesnesini döner."""
+    px4 = None
+    try:
+        if args.px4:
+            if not builds_world:
+                await timer.stage("world", world_ready.wait())
+            px4 = await timer.stage("px4", start_px4(spec, args))
+            procs.append(px4)
+
+        server_address = None
+        if args.mavsdk_server:
+            server = await spawn(f"mavsdk_server_drone{spec.drone_id}",
+                                 [os.path.expanduser(args.mavsdk_server), "-p", str(spec.grpc_port), spec.connection])
+            procs.append(server)
+            await timer.stage("mavsdk_server", unless_exited(
+                server, wait_for_port("127.0.0.1", spec.grpc_port), f"mavsdk_server_drone{spec.drone_id}"))
+            server_address = "127.0.0.1"
+
+        drone = (await broker().connect(spec, server_address)).system
+        connected = wait_connected(drone)
+        if px4 is not None:
+            connected = unless_exited(px4, connected, f"px4_drone{spec.drone_id}")
+        await timer.stage("connect", connected)
+    finally:
+        # Dünya kuruldu (veya kurulamadı): diğerleri beklemeyi bırakır, kendi hatalarını görür
+        if builds_world:
+            world_ready.set()
+    print(f"{CYAN}[Drone{spec.drone_id}] Bağlandı ({timer.total():.1f} s){ENDC}")
+
+    if args.no_takeoff:
+        await timer.stage("health", wait_healthy(drone))
+    else:
+        await start_flight(drone, spec.drone_id, timer)
+    print(f"{GREEN}[Drone{spec.drone_id}] Hazır ({timer.total():.1f} s){ENDC}")
+    return drone
+
+
+def print_report(specs, timers, elapsed):
+    stages = [name for name in STAGES if any(name in timer.stages for timer in timers.values())]
+    print(f"\n{CYAN}{'drone':<8}" + "".join(f"{name:>14}" for name in stages) + f"{'toplam':>10}{ENDC}")
+    for spec in specs:
+        timer = timers[spec.drone_id]
+        cells = []
+        for name in stages:
+            if timer.failed and timer.failed[0] == name:
+                cells.append(f"{RED}{'HATA':>14}{ENDC}")
+            elif name in timer.stages:
+                cells.append(f"{timer.duration(name):>13.1f}s")
+            else:
+                cells.append(f"{'-':>14}")
+        print(f"{spec.drone_id:<8}" + "".join(cells) + f"{timer.total():>9.1f}s")
+        if timer.failed:
+            print(f"{RED}  [Drone{spec.drone_id}] {timer.failed[0]}: {timer.failed[1]}{ENDC}")
+    # Her aşamada en yavaş drone: sürünün açılış süresini belirleyen yer
+    slowest = {}
+    for timer in timers.values():
+        for name in timer.stages:
+            slowest[name] = max(slowest.get(name, 0.0), timer.duration(name))
+    if slowest:
+        name = max(slowest, key=slowest.get)
+        print(f"{CYAN}En uzun aşama: {name} ({slowest[name]:.1f} s){ENDC}")
+    print(f"{GREEN}Sürü açılışı: {elapsed:.1f} s{ENDC}\n")
+
+
+async def run_launch(specs, args):
+    # tmux oturumu kapatılınca (SIGHUP) veya SIGTERM'de de başlatılan süreçler durdurulur
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGHUP):
+        loop.add_signal_handler(signum, asyncio.current_task().cancel)
+    telemetry_shm = TelemetrySegment.open(SHM_NAME, create=False)
+    timers = {spec.drone_id: StageTimer(f"Drone{spec.drone_id}") for spec in specs}
+    procs = []
+    world_ready = asyncio.Event()
+    # Gazebo dünyası ilk PX4 ile kurulur; diğer modellerde (veya PX4 başlatılmıyorsa) beklenecek bir şey yok
+    world_builder = specs[0].drone_id if args.px4 and args.model.startswith("gz_") else None
+    if world_builder is None:
+        world_ready.set()
+    start = time.monotonic()
+    try:
+        results = await asyncio.gather(
+            *(bring_up(spec, args, timers[spec.drone_id], procs, world_ready, spec.drone_id == world_builder)
+              for spec in specs),
+            return_exceptions=True,
+        )
+        print_report(specs, timers, time.monotonic() - start)
+        ready = [(spec, drone) for spec, drone in zip(specs, results) if not isinstance(drone, BaseException)]
+        if args.launch_only:
+            # Başlatılan süreçler çalışmaya devam eder (kendi süreç gruplarındalar)
+            procs = []
+            return
+        await asyncio.gather(
+            *(asyncio.gather(telemetry_collector(drone, spec.drone_id, telemetry_shm),
+                             flocking_controller(spec.drone_id, drone, telemetry_shm))
+              for spec, drone in ready),
+            return_exceptions=True,
+        )
+    finally:
+        await broker().close()
+        await stop_processes(procs)
+        telemetry_shm.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sürüyü hazır olma sinyalleriyle (sabit bekleme olmadan) başlatır")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--count", type=int, help="config dosyası olmadan 1..N drone")
+    source.add_argument("--config-dir", default=CONFIG_DIR, help="droneN_config.ini dosyalarının dizini")
+    parser.add_argument("--ids", nargs="+", help="sadece bu drone ID'leri")
+    parser.add_argument("--no-px4", dest="px4", action="store_false", help="PX4 zaten çalışıyor, başlatma")
+    parser.add_argument("--px4-dir", default=PX4_DIR)
+    parser.add_argument("--model", default=PX4_MODEL)
+    parser.add_argument("--autostart", type=int, default=PX4_AUTOSTART)
+    parser.add_argument("--spacing", type=float, default=POSE_SPACING)
+    parser.add_argument("--mavsdk-server", help="harici mavsdk_server yolu (verilmezse mavsdk'nın gömülü sunucusu)")
+    parser.add_argument("--no-takeoff", action="store_true", help="health_all_ok'ta dur, arm/takeoff yapma")
+    parser.add_argument("--launch-only", action="store_true", help="açılış raporundan sonra çık, kontrol döngüsü yok")
+    parser.add_argument("--metrics-port", type=int, help="Prometheus ölçüm uç noktası (ör. 9108)")
+    args = parser.parse_args()
+
+    specs = specs_for_count(args.count) if args.count else specs_from_dir(args.config_dir)
+    if args.ids:
+        specs = [spec for spec in specs if spec.drone_id in args.ids]
+    if not specs:
+        print(f"{RED}Drone bulunamadı ({args.config_dir}).{ENDC}")
+        return
+
+    max_id = max(int(spec.drone_id) for spec in specs)
+    telemetry_shm = TelemetrySegment.open(SHM_NAME, max_drones=max(max_id, MAX_DRONES))
+    if telemetry_shm.slot_count < max_id:
+        print(f"{RED}[SHM] Mevcut segment {telemetry_shm.slot_count} slotlu, Drone{max_id} sığmıyor.{ENDC}")
+        telemetry_shm.close()
+        return
+    print(f"{GREEN}[Launch] {len(specs)} drone paralel başlatılıyor, loglar: {LOG_DIR}{ENDC}")
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+    try:
+        asyncio.run(run_launch(specs, args))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    finally:
+        telemetry_shm.close(unlink=telemetry_shm.created and not args.launch_only)
+        print(f"{CYAN}[Launch] Kapandı.{ENDC}")
+
+
+if __name__ == "__main__":
+    main()
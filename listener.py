@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 
-import socket
-import json
+import argparse
+import asyncio
+from telemetry_receiver import start_receiver
+from dashboard import Dashboard, TELEMETRY_COLUMNS, DASHBOARD_FPS, telemetry_rows, battery_color
 
 # Renk kodları
 GREEN = "\033[92m"
@@ -13,42 +15,56 @@ ENDC = "\033[0m"
 
 LISTEN_PORT = 1881  # Hangi portu dinleyeceksen buraya yaz
 
-def main():
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    sock.bind(("0.0.0.0", LISTEN_PORT))
+# Telemetri sütunları + seq'ten hesaplanan bağlantı sayaçları
+COLUMNS = TELEMETRY_COLUMNS + (
+    ("Alınan", 8, lambda row: str(row["received"])),
+    ("Kayıp", 6, lambda row: str(row["lost"])),
+    ("SıraDışı", 8, lambda row: str(row["out_of_order"])),
+    ("Tekrar", 6, lambda row: str(row["duplicates"])),
+)
+
+def link_color(row):
+    if row["lost"]:
+        return YELLOW
+    return battery_color(row)
+
+def dashboard_rows(receiver):
+    """Son telemetri + bağlantı sayaçları; biçimlendirme çizici thread'inde yapılır."""
+    stats = receiver.stats()
+    rows = telemetry_rows(receiver.snapshot())
+    for row in rows:
+        row.update(stats["drones"][row["drone_id"]])
+    footer = []
+    if stats["decode_errors"]:
+        footer.append(f"{RED}Çözülemeyen datagram: {stats['decode_errors']}{ENDC}")
+    return rows, footer
+
+async def main(dashboard):
+    # Alım asyncio ile arka planda; pano kendi thread'inde en fazla fps kez çizer,
+    # döngü sadece son durumu bırakır (stdout'u hiç beklemez)
+    transport, receiver = await start_receiver("0.0.0.0", LISTEN_PORT)
 
     print(f"{CYAN}Listener başlatıldı: 0.0.0.0:{LISTEN_PORT}{ENDC}\n")
 
-    while True:
-        data, addr = sock.recvfrom(4096)  # DOĞRU: 2 değişken alıyoruz
-        try:
-            message = data.decode()
-            telemetry = json.loads(message)
-
-            drone_id = telemetry.get("drone_id", "Unknown")
-            udp_port = telemetry.get("udp_port", "Unknown")
-            telem = telemetry.get("telemetry", {})
-
-            print(f"\n{BLUE}--- Listener: Drone ID: {drone_id} | UDP Port: {udp_port} ---{ENDC}")
-            print(f"{GREEN}Latitude:{ENDC} {telem.get('latitude', 'N/A')}")
-            print(f"{GREEN}Longitude:{ENDC} {telem.get('longitude', 'N/A')}")
-            print(f"{BLUE}Absolute Altitude:{ENDC} {telem.get('absolute_altitude', 'N/A')} m")
-            print(f"{BLUE}Relative Altitude:{ENDC} {telem.get('relative_altitude', 'N/A')} m")
-            print(f"{YELLOW}Speed:{ENDC} {telem.get('speed', 'N/A')} m/s")
-            print(f"{YELLOW}Roll:{ENDC} {telem.get('roll', 'N/A')}°")
-            print(f"{YELLOW}Pitch:{ENDC} {telem.get('pitch', 'N/A')}°")
-            print(f"{YELLOW}Yaw:{ENDC} {telem.get('yaw', 'N/A')}°")
-            print(f"{RED}Flight Mode:{ENDC} {telem.get('flight_mode', 'N/A')}")
-            print(f"{GREEN}Battery:{ENDC} {telem.get('battery_percent', 'N/A')}%")
-            print(f"{GREEN}Voltage:{ENDC} {telem.get('battery_voltage', 'N/A')}V")
-            print(f"{CYAN}Satellites:{ENDC} {telem.get('satellites_visible', 'N/A')}")
-            print(f"{CYAN}Fix Type:{ENDC} {telem.get('fix_type', 'N/A')}")
-            print(f"{BLUE}Uptime:{ENDC} {telem.get('uptime', 'N/A')}")
-            print(f"{CYAN}-----------------------------{ENDC}")
-
-        except Exception as e:
-            print(f"{RED}UDP Veri Okuma Hatası:{ENDC} {e}")
+    dashboard.start()
+    try:
+        while True:
+            await asyncio.sleep(dashboard.period)
+            dashboard.update(*dashboard_rows(receiver))
+    finally:
+        transport.close()
+        dashboard.stop()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="UDP telemetri alıcısı ve terminal panosu")
+    parser.add_argument("--plain", action="store_true", help="yerinde çizim yerine kareleri alta ekle "
+                                                          "(çıktı terminal değilse zaten böyle)")
+    parser.add_argument("--fps", type=float, default=DASHBOARD_FPS, help="kare hızı üst sınırı")
+    args = parser.parse_args()
 
+    dashboard = Dashboard(f"Listener UDP :{LISTEN_PORT}", COLUMNS, args.fps,
+                          in_place=False if args.plain else None, row_color=link_color)
+    try:
+        asyncio.run(main(dashboard))
+    except KeyboardInterrupt:
+        pass
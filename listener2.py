@@ -1,10 +1,10 @@
 #!/usr/bin/env python3
 
-import time
-import multiprocessing.shared_memory as shm
-import json
-import sys
+import argparse
 import threading
+from telemetry_shm import TelemetrySegment, SHM_NAME
+from telemetry_notify import ChangeListener
+from dashboard import Dashboard, telemetry_rows, DASHBOARD_FPS
 
 # Renk Kodları
 GREEN = "\033[92m"
@@ -14,82 +14,57 @@ BLUE = "\033[94m"
 CYAN = "\033[96m"
 ENDC = "\033[0m"
 
-SHM_NAME = "telemetry_shared"
-SHM_SIZE = 4096
+PLAIN_FPS = 1.0  # alta eklerken kare hızı (ekran taşmasın)
 
-# Shared Memory okuma fonksiyonu
-def read_shared_memory(shm_name):
-    try:
-        memory = shm.SharedMemory(name=shm_name)
-        raw_bytes = bytes(memory.buf[:])
-        # JSON verisinin doğrudan okunması
-        decoded = raw_bytes.decode('utf-8').split('\x00')[0]
-        telemetry = json.loads(decoded)
-        return telemetry
-    except FileNotFoundError:
-        print(f"{RED}[Listener] {shm_name} bulunamadı!{ENDC}")
-        return None
-    except json.JSONDecodeError:
-        print(f"{RED}[Listener] JSON Decode hatası!{ENDC}")
-        return None
-
-# Telemetri verilerinin hızlıca işlenmesi
-def print_telemetry(telem):
-    print(f"{GREEN}Latitude:{ENDC} {telem.get('latitude', 'N/A')}")
-    print(f"{GREEN}Longitude:{ENDC} {telem.get('longitude', 'N/A')}")
-    print(f"{BLUE}Absolute Altitude:{ENDC} {telem.get('absolute_altitude', 'N/A')} m")
-    print(f"{BLUE}Relative Altitude:{ENDC} {telem.get('relative_altitude', 'N/A')} m")
-    print(f"{YELLOW}Speed:{ENDC} {telem.get('speed', 'N/A')} m/s")
-    print(f"{YELLOW}Roll:{ENDC} {telem.get('roll', 'N/A')}°")
-    print(f"{YELLOW}Pitch:{ENDC} {telem.get('pitch', 'N/A')}°")
-    print(f"{YELLOW}Yaw:{ENDC} {telem.get('yaw', 'N/A')}°")
-    print(f"{RED}Flight Mode:{ENDC} {telem.get('flight_mode', 'N/A')}")
-    print(f"{GREEN}Battery:{ENDC} {telem.get('battery_percent', 'N/A')}%")
-    print(f"{GREEN}Voltage:{ENDC} {telem.get('battery_voltage', 'N/A')}V")
-    print(f"{CYAN}Satellites:{ENDC} {telem.get('satellites_visible', 'N/A')}")
-    print(f"{CYAN}Fix Type:{ENDC} {telem.get('fix_type', 'N/A')}")
-    print(f"{BLUE}Uptime:{ENDC} {telem.get('uptime', 'N/A')}")
-    print(f"{CYAN}-----------------------------{ENDC}")
+# Shared Memory okuma fonksiyonu (segment bir kez açılır, slotlar doğrudan çözülür)
+def read_shared_memory(segment):
+    return segment.read_all()
 
-# Ana işlem fonksiyonu
-def main(my_id):
+# Ana işlem fonksiyonu: veri alımı bu thread'de, ekrana çizim Dashboard thread'inde
+def main(my_id, dashboard):
     print(f"{YELLOW}[ListenerDrone] Drone{my_id} ➔ {SHM_NAME} shared memory dinliyor...{ENDC}")
 
     # Shared Memory kontrolü ve açılması
     try:
-        shm.SharedMemory(name=SHM_NAME)
-    except FileNotFoundError as e:
+        segment = TelemetrySegment.open(SHM_NAME, create=False)
+    except (FileNotFoundError, ValueError) as e:
         print(f"{RED}Shared Memory açma hatası: {e}{ENDC}")
         return
 
-    # Hızlı veri okuma işlemi
-    while True:
-        telemetry_all = read_shared_memory(SHM_NAME)
-
-        if telemetry_all:
-            if my_id not in telemetry_all:
-                print(f"{RED}[Uyarı] Drone{my_id} verisi shared memory içinde yok.{ENDC}")
+    # Yeni telemetri yazılana kadar uyu, gelince oku; pano en son durumu kendi hızında çizer
+    listener = ChangeListener(segment.name)
+    with dashboard:
+        while True:
+            if not listener.wait(timeout=1.0):
+                continue
 
-            # Diğer drone'ların verilerini hızlıca ekrana basma
-            for drone_id, telem in telemetry_all.items():
-                if drone_id != my_id:
-                    print(f"\n{CYAN}--- Gelen Telemetri (Drone {drone_id}) ---{ENDC}")
-                    print_telemetry(telem)
-
-        # Veri okuma sıklığını artırmak için 0.1 saniye
-        time.sleep(0.1)
+            telemetry_all = read_shared_memory(segment)
+            if not telemetry_all:
+                continue
+            footer = () if my_id in telemetry_all else (f"{RED}[Uyarı] Drone{my_id} verisi shared memory içinde yok.{ENDC}",)
+            # Diğer drone'ların verileri
+            dashboard.update(telemetry_rows(telemetry_all, skip=my_id), footer)
 
 # Ana fonksiyonun çalışması
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print(f"{RED}Kullanım: python3 listener2.py <my_drone_id>{ENDC}")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="SHM'deki diğer drone'ların telemetrisini gösterir")
+    parser.add_argument("my_id")
+    # Drone betikleri bu süreci kendi terminallerinde başlatır; yerinde çizim o yüzden isteğe bağlı,
+    # varsayılan kareleri alta eklemek
+    parser.add_argument("--dashboard", action="store_true", help="tabloyu ekranda yerinde yeniden çiz")
+    parser.add_argument("--fps", type=float, help=f"kare hızı üst sınırı (varsayılan {DASHBOARD_FPS:g}, alta eklerken {PLAIN_FPS:g})")
+    args = parser.parse_args()
 
-    my_id = sys.argv[1]
+    my_id = args.my_id
+    dashboard = Dashboard(f"Listener Drone{my_id} ➔ {SHM_NAME}", fps=args.fps or (DASHBOARD_FPS if args.dashboard else PLAIN_FPS),
+                          in_place=args.dashboard)
     # Ana fonksiyonu çalıştırmak için ayrı bir thread oluşturuluyor
-    listener_thread = threading.Thread(target=main, args=(my_id,))
+    listener_thread = threading.Thread(target=main, args=(my_id, dashboard))
     listener_thread.daemon = True
     listener_thread.start()
 
     # Thread'in devam etmesini sağlamak
-    listener_thread.join()
+    try:
+        listener_thread.join()
+    except KeyboardInterrupt:
+        dashboard.stop()
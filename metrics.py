@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter_ns
+
+# Sıcak yol ölçümleri: sayaçlar ve HDR benzeri gecikme histogramları (telemetri okuma ->
+# komşu arama -> karar -> komut). Histogramlar log-lineer kovalar kullanır: her 2'nin
+# kuvveti aralığı SUB_BUCKETS eşit kovaya bölünür, kayıt bir bit_length ve bir kaydırma
+# kadar ucuzdur, göreli hata en fazla 1/SUB_BUCKETS. Örnekleme: her 'sample' çağrıdan biri
+# zamanlanır (sayaçlar her zaman artar). SWARMIND_METRICS=off | full | <N> ile ayarlanır.
+# serve() yerel bir HTTP uç noktası açar: /metrics (Prometheus metin biçimi), /stats.json.
+# Bu dosya doğrudan çalıştırılırsa uç noktadan okuyup tablo basar.
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+
+PREFIX = "swarmind_"
+METRICS_PORT = 9108
+SAMPLE_EVERY = 32          # varsayılan: 32 çağrıdan biri zamanlanır (bench_metrics: ek yük < %1)
+SUB_BITS = 4
+SUB_BUCKETS = 1 << SUB_BITS  # 2'nin kuvveti başına kova (göreli hata ≤ %6.25)
+MAX_BITS = 40              # ns; üstü son kovaya (~18 dk)
+BUCKET_COUNT = 2 * SUB_BUCKETS + (MAX_BITS - SUB_BITS - 1) * SUB_BUCKETS
+# Prometheus'a verilen kova sınırları: 2^k ns (256 ns .. ~4.3 s), HDR kova sınırlarıyla çakışır
+EXPORT_BOUNDS = tuple(1 << k for k in range(8, 33))
+WATCH_INTERVAL = 2.0
+
+
+def _sample_from_env():
+    value = os.environ.get("SWARMIND_METRICS", "").strip().lower()
+    if value in ("off", "0", "false"):
+        return 0
+    if value == "full":
+        return 1
+    return int(value) if value.isdigit() else SAMPLE_EVERY
+
+
+_sample = _sample_from_env()
+_metrics = {}   # (ad, etiketler) -> Counter / Histogram
+_help = {}
+_lock = threading.Lock()
+
+
+def bucket_index(ns):
+    if ns < 2 * SUB_BUCKETS:
+        return max(ns, 0)
+    shift = ns.bit_length() - SUB_BITS - 1
+    index = 2 * SUB_BUCKETS + (shift - 1) * SUB_BUCKETS + (ns >> shift) - SUB_BUCKETS
+    return min(index, BUCKET_COUNT - 1)
+
+
+def bucket_bounds(index):
+    """Kovanın [alt, üst) sınırları (ns)."""
+    if index < 2 * SUB_BUCKETS:
+        return index, index + 1
+    shift, offset = divmod(index - 2 * SUB_BUCKETS, SUB_BUCKETS)
+    shift += 1
+    mantissa = SUB_BUCKETS + offset
+    return mantissa << shift, (mantissa + 1) << shift
+
+
+class Counter:
+    __slots__ = ("name", "labels", "value")
+    kind = "counter"
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+
+class Histogram:
+    """
+    Süre histogramı (ns). Sıcak yolda:
+        started = h.start(); ...; h.stop(started)
+    start() örneklenmeyen çağrılarda 0 döner, stop(0) hiçbir şey yapmaz.
+    """
+    __slots__ = ("name", "labels", "counts", "count", "total", "max", "calls", "sample", "left")
+    kind = "histogram"
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0      # kaydedilen (örneklenen) ölçüm
+        self.total = 0      # ns
+        self.max = 0
+        self.calls = 0      # tüm çağrılar
+        self.sample = _sample
+        self.left = _sample  # sonraki zamanlanan çağrıya kalan (kapalıyken 0'a hiç inmez)
+
+    def start(self):
+        self.calls += 1
+        # Bölme yerine geri sayım: örneklenmeyen çağrı bir çıkarma ve bir karşılaştırma
+        left = self.left - 1
+        if left:
+            self.left = left
+            return 0
+        self.left = self.sample
+        return perf_counter_ns()
+
+    def stop(self, started):
+        if started:
+            self.record(perf_counter_ns() - started)
+
+    def record(self, ns):
+        self.counts[bucket_index(ns)] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def quantile(self, q):
+        """q (0..1) yüzdeliği, ns (kovanın üst sınırı; en fazla max)."""
+        if not self.count:
+            return 0
+        rank = max(1, round(q * self.count))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bucket_bounds(index)[1], self.max)
+        return self.max
+
+    def cumulative(self, bounds=EXPORT_BOUNDS):
+        """Her sınır için sınırın altındaki ölçüm sayısı (Prometheus 'le' kovaları)."""
+        result = []
+        seen = 0
+        index = 0
+        for bound in bounds:
+            while index < BUCKET_COUNT and bucket_bounds(index)[1] <= bound:
+                seen += self.counts[index]
+                index += 1
+            result.append(seen)
+        return result
+
+
+def _get(cls, name, help, labels):
+    key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+    metric = _metrics.get(key)
+    if metric is None:
+        with _lock:
+            metric = _metrics.get(key)
+            if metric is None:
+                metric = _metrics[key] = cls(name, key[1])
+                if help:
+                    _help.setdefault(name, help)
+    return metric
+
+
+def counter(name, help="", **labels):
+    return _get(Counter, name, help, labels)
+
+
+def histogram(name, help="", **labels):
+    return _get(Histogram, name, help, labels)
+
+
+def configure(sample):
+    """Örnekleme: 0 = kapalı, 1 = her çağrı, N = N çağrıdan biri (mevcut histogramlar dahil)."""
+    global _sample
+    _sample = sample
+    for metric in list(_metrics.values()):
+        if metric.kind == "histogram":
+            metric.sample = metric.left = sample
+
+
+def sample_rate():
+    return _sample
+
+
+def reset():
+    """Tüm ölçümleri siler (ör. aynı süreçte art arda koşulan benchmark'lar arasında)."""
+    with _lock:
+        _metrics.clear()
+
+
+class DroneMetrics:
+    """Bir drone'un kontrol hattı ölçümleri (drone etiketiyle)."""
+
+    def __init__(self, drone_id):
+        drone = str(drone_id)
+        self.shm_read = histogram("shm_read_seconds", "SHM okuma + çözme süresi", drone=drone)
+        self.neighbor_search = histogram("neighbor_search_seconds", "En yakın komşu sorgusu", drone=drone)
+        self.decision = histogram("decision_seconds", "Kontrolcü kararı", drone=drone)
+        self.command = histogram("command_seconds", "set_velocity_ned gidiş-dönüş süresi",
+                                 drone=drone, command="set_velocity_ned")
+        self.commands = counter("commands_total", "Gönderilen komutlar", drone=drone, command="set_velocity_ned")
+        self.gotos = counter("commands_total", "Gönderilen komutlar", drone=drone, command="goto_location")
+        self.offboard_starts = counter("commands_total", "Gönderilen komutlar", drone=drone, command="offboard_start")
+        # command_arbiter: kontrolcülerin bıraktığı komutlar ve gönderilmeyenler (nedenine göre)
+        self.submitted = counter("arbiter_submitted_total", "Kontrolcülerin hakeme bıraktığı komutlar", drone=drone)
+        self.duplicates = counter("arbiter_dropped_total", "Hakemin göndermediği komutlar", drone=drone, reason="duplicate")
+        self.coalesced = counter("arbiter_dropped_total", "Hakemin göndermediği komutlar", drone=drone, reason="coalesced")
+        self.preempted = counter("arbiter_dropped_total", "Hakemin göndermediği komutlar", drone=drone, reason="preempted")
+        self.keepalives = counter("arbiter_keepalive_total", "Değişmeyen setpoint'in canlı tutma gönderimi", drone=drone)
+        self.shm_write = histogram("shm_write_seconds", "Telemetrinin SHM'ye yazılması", drone=drone)
+        self.published = counter("telemetry_published_total", "SHM'ye yazılan telemetri", drone=drone)
+        self._drone = drone
+        self._modes = {}
+
+    def mode(self, name):
+        """Mod sayacı (flocking modu başına)."""
+        metric = self._modes.get(name)
+        if metric is None:
+            metric = self._modes[name] = counter("flocking_mode_total", "Karar modları", drone=self._drone, mode=name)
+        return metric
+
+
+def _label_text(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+
+def prometheus_text():
+    """Tüm ölçümler Prometheus metin biçiminde (süreler saniye)."""
+    lines = []
+    families = {}
+    for metric in list(_metrics.values()):
+        families.setdefault(metric.name, []).append(metric)
+    for name, metrics in sorted(families.items()):
+        full = PREFIX + name
+        kind = metrics[0].kind
+        if name in _help:
+            lines.append(f"# HELP {full} {_help[name]}")
+        lines.append(f"# TYPE {full} {kind}")
+        for metric in metrics:
+            if kind == "counter":
+                lines.append(f"{full}{_label_text(metric.labels)} {metric.value}")
+                continue
+            for bound, n in zip(EXPORT_BOUNDS, metric.cumulative()):
+                lines.append(f"{full}_bucket{_label_text(metric.labels, [('le', f'{bound / 1e9:.9g}')])} {n}")
+            lines.append(f"{full}_bucket{_label_text(metric.labels, [('le', '+Inf')])} {metric.count}")
+            lines.append(f"{full}_sum{_label_text(metric.labels)} {metric.total / 1e9:.9g}")
+            lines.append(f"{full}_count{_label_text(metric.labels)} {metric.count}")
+        if kind == "histogram":
+            # Örneklenmeyenler dahil çağrı sayısı
+            lines.append(f"# TYPE {full}_calls_total counter")
+            for metric in metrics:
+                lines.append(f"{full}_calls_total{_label_text(metric.labels)} {metric.calls}")
+    return "\n".join(lines) + "\n"
+
+
+def snapshot():
+    """JSON için: histogramlar yüzdeliklerle (µs), sayaçlar değerleriyle."""
+    items = []
+    for metric in list(_metrics.values()):
+        item = {"name": metric.name, "labels": dict(metric.labels), "kind": metric.kind}
+        if metric.kind == "counter":
+            item["value"] = metric.value
+        else:
+            item.update(calls=metric.calls, count=metric.count,
+                        p50_us=metric.quantile(0.5) / 1000, p99_us=metric.quantile(0.99) / 1000,
+                        p999_us=metric.quantile(0.999) / 1000, max_us=metric.max / 1000,
+                        mean_us=metric.total / metric.count / 1000 if metric.count else 0.0)
+        items.append(item)
+    return {"pid": os.getpid(), "time": time.time(), "sample": _sample, "metrics": items}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/metrics"):
+            body, kind = prometheus_text().encode(), "text/plain; version=0.0.4"
+        elif self.path.startswith("/stats.json"):
+            body, kind = json.dumps(snapshot()).encode(), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", kind)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port=METRICS_PORT, host="127.0.0.1"):
+    """Uç noktayı arka plan thread'inde açar; sunucuyu döner (port 0: boş port)."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
+
+
+def print_table(stats):
+    print(f"{CYAN}[Metrics] pid {stats['pid']}, örnekleme 1/{stats['sample'] or '-'}{ENDC}")
+    print(f"{CYAN}{'ölçüm':<26} {'etiketler':<34} {'çağrı':>9} {'p50':>9} {'p99':>9} {'p99.9':>9} {'max':>9}{ENDC}")
+    items = sorted(stats["metrics"], key=lambda item: (item["kind"], item["name"], sorted(item["labels"].items())))
+    for item in items:
+        labels = ",".join(f"{k}={v}" for k, v in sorted(item["labels"].items()))
+        if item["kind"] == "counter":
+            print(f"{item['name']:<26} {labels:<34} {item['value']:>9}")
+        else:
+            color = GREEN if item["p99_us"] < 1000 else YELLOW
+            print(f"{item['name']:<26} {labels:<34} {item['calls']:>9} {item['p50_us']:>7.1f}µs "
+                  f"{color}{item['p99_us']:>7.1f}µs{ENDC} {item['p999_us']:>7.1f}µs {item['max_us']:>7.1f}µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Çalışan bir sürecin ölçüm uç noktasını okur")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=METRICS_PORT)
+    parser.add_argument("--watch", type=float, nargs="?", const=WATCH_INTERVAL, help="her N saniyede bir yenile")
+    args = parser.parse_args()
+
+    url = f"http://{args.host}:{args.port}/stats.json"
+    while True:
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                stats = json.load(response)
+        except OSError as e:
+            print(f"{RED}[Metrics] {url} okunamadı: {e}{ENDC}")
+        else:
+            print_table(stats)
+        if not args.watch:
+            break
+        time.sleep(args.watch)
+
+
+if __name__ == "__main__":
+    main()
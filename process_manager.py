@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+
+import os
+import queue
+import signal
+import subprocess
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# GUI'nin arka plan süreç yöneticisi. Başlatma, durdurma ve tmux çağrıları Tk iş
+# parçacığında değil, iş parçacığı havuzunda yapılır; durum değişiklikleri
+# events kuyruğuna yazılır, GUI poll() ile (after döngüsünde) alır.
+# Her komut kendi süreç grubunda başlatılır (start_new_session): kabuk çıkıp arka
+# plana attığı süreçler kalsa bile (ör. "QGroundControl.AppImage &") grup ID'si ile
+# hepsine sinyal gider. tmux oturumlarındaki süreçler tmux sunucusunun çocuklarıdır;
+# onlar için panel PID'leri (her panel kendi süreç grubu) tmux'tan sorulur.
+# Durdurma: SIGTERM (tmux'ta kill-session -> SIGHUP), grace süresi içinde çıkmayana SIGKILL.
+
+MAX_WORKERS = 16          # paralel başlatma/durdurma (acil durdurmada drone başına bir iş)
+STOP_GRACE = 3.0          # SIGTERM/SIGHUP sonrası SIGKILL'e kadar beklenen süre (s)
+EMERGENCY_GRACE = 0.5
+TMUX_TIMEOUT = 2.0
+EXIT_POLL = 0.05
+
+ProcessEvent = namedtuple("ProcessEvent", "name state pid detail")
+# state: starting, running, exited, stopping, stopped, failed
+
+
+def group_alive(pgid):
+    try:
+        os.killpg(pgid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def signal_group(pgid, signum):
+    try:
+        os.killpg(pgid, signum)
+        return True
+    except (ProcessLookupError, PermissionError):
+        return False
+
+
+def wait_groups(pgids, timeout):
+    """Gruplar boşalana kadar (en fazla timeout) bekler; hâlâ yaşayanları döner."""
+    deadline = time.monotonic() + timeout
+    alive = [pgid for pgid in pgids if group_alive(pgid)]
+    while alive and time.monotonic() < deadline:
+        time.sleep(EXIT_POLL)
+        alive = [pgid for pgid in alive if group_alive(pgid)]
+    return alive
+
+
+def tmux(*args):
+    return subprocess.run(["tmux", *args], capture_output=True, text=True, timeout=TMUX_TIMEOUT)
+
+
+def session_panes(session):
+    """tmux oturumundaki panel süreçlerinin PID'leri (oturum yoksa boş)."""
+    result = tmux("list-panes", "-s", "-t", session, "-F", "#{pane_pid}")
+    if result.returncode != 0:
+        return []
+    return [int(line) for line in result.stdout.split() if line.isdigit()]
+
+
+def all_panes():
+    """Tek tmux çağrısıyla {oturum: [panel PID, ...]} (sunucu yoksa boş)."""
+    result = tmux("list-panes", "-a", "-F", "#{session_name} #{pane_pid}")
+    panes = {}
+    if result.returncode == 0:
+        for line in result.stdout.splitlines():
+            session, _, pid = line.rpartition(" ")
+            if pid.isdigit():
+                panes.setdefault(session, []).append(int(pid))
+    return panes
+
+
+class ProcessManager:
+    def __init__(self, workers=MAX_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="processes")
+        self.events = queue.SimpleQueue()
+        self.procs = {}       # ad -> Popen (pid = süreç grubu)
+        self.states = {}      # ad -> son durum
+        self._lock = threading.Lock()
+
+    def _emit(self, name, state, pid=None, detail=""):
+        self.states[name] = state
+        self.events.put(ProcessEvent(name, state, pid, detail))
+
+    def start(self, name, command):
+        """Kabuk komutunu arka planda kendi süreç grubunda başlatır; hemen döner."""
+        self._emit(name, "starting")
+        self.executor.submit(self._start, name, command)
+
+    def stop(self, name, sessions=(), grace=STOP_GRACE):
+        """Adın süreç grubunu ve verilen tmux oturumlarını arka planda durdurur; hemen döner."""
+        self._emit(name, "stopping")
+        self.executor.submit(self._stop, name, tuple(sessions), grace)
+
+    def emergency_stop(self, names=None, sessions=(), grace=EMERGENCY_GRACE):
+        """
+        Tüm (veya verilen) süreç gruplarına hemen SIGTERM, oturum panellerine arka planda
+        SIGHUP gönderir; grace içinde çıkmayanlar birlikte SIGKILL alır. Birkaç ms içinde döner.
+        """
+        with self._lock:
+            targets = dict(self.procs) if names is None else {n: self.procs[n] for n in names if n in self.procs}
+        for name, proc in targets.items():
+            signal_group(proc.pid, signal.SIGTERM)
+            self._emit(name, "stopping", proc.pid, "emergency")
+        # Havuz iş parçacıklarını oluşturmak da zaman alır: dağıtım da arka planda
+        self.executor.submit(self._emergency, list(targets), list(sessions), grace)
+        return len(targets) + len(sessions)
+
+    def poll(self):
+        """Tk iş parçacığından çağrılır: birikmiş durum değişikliklerini döner."""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def running(self):
+        with self._lock:
+            return {name: proc.pid for name, proc in self.procs.items() if group_alive(proc.pid)}
+
+    def close(self, stop=False):
+        """Havuzu kapatır; stop=True ise izlenen süreç grupları da sonlandırılır."""
+        if stop:
+            self.emergency_stop()
+        self.executor.shutdown(wait=stop, cancel_futures=not stop)
+
+    def _start(self, name, command):
+        with self._lock:
+            old = self.procs.get(name)
+        if old is not None and group_alive(old.pid):
+            # Aynı ad yeniden başlatılıyor: eski grup önce kapanır
+            self._stop_group(old.pid, STOP_GRACE)
+        try:
+            proc = subprocess.Popen(command, shell=True, text=True, start_new_session=True)
+        except OSError as e:
+            self._emit(name, "failed", None, str(e))
+            return
+        with self._lock:
+            self.procs[name] = proc
+        self._emit(name, "running", proc.pid)
+        threading.Thread(target=self._watch, args=(name, proc), name=f"watch-{name}", daemon=True).start()
+
+    def _watch(self, name, proc):
+        code = proc.wait()
+        with self._lock:
+            current = self.procs.get(name) is proc
+        # Kabuk çıktı ama arka plana attığı süreçler grupta yaşıyor olabilir
+        if current and self.states.get(name) == "running":
+            self._emit(name, "exited", proc.pid, f"kod {code}" + (", grup yaşıyor" if group_alive(proc.pid) else ""))
+
+    def _stop(self, name, sessions, grace):
+        with self._lock:
+            proc = self.procs.pop(name, None)
+        killed = []
+        if proc is not None:
+            killed += self._stop_group(proc.pid, grace)
+        for session in sessions:
+            killed += self._stop_session(session, grace)
+        self._emit(name, "stopped", proc.pid if proc else None, "SIGKILL" if killed else "")
+
+    def _emergency(self, names, sessions, grace):
+        # Tüm gruplar aynı grace süresini birlikte bekler (iş başına ayrı bekleme yok)
+        with self._lock:
+            procs = {name: self.procs.pop(name) for name in names if name in self.procs}
+        groups = [proc.pid for proc in procs.values()]
+        # Oturum başına tmux çağrısı sırayla işlenir (tmux sunucusu tek): paneller tek
+        # listeden alınıp kill-session'ın yapacağı gibi SIGHUP ile hemen sinyallenir
+        try:
+            panes = all_panes()
+        except (OSError, subprocess.TimeoutExpired) as e:
+            self._emit("tmux", "failed", None, str(e))
+            panes = {}
+        for session in sessions:
+            for pid in panes.get(session, ()):
+                if signal_group(pid, signal.SIGHUP):
+                    groups.append(pid)
+        alive = wait_groups(groups, grace)
+        for group in alive:
+            signal_group(group, signal.SIGKILL)
+        for name, proc in procs.items():
+            self._emit(name, "stopped", proc.pid, "SIGKILL" if proc.pid in alive else "")
+        # Panelleri ölen oturumlar zaten kapanır; kalanlar paralel temizlenir
+        for session in sessions:
+            if session in panes:
+                self.executor.submit(tmux, "kill-session", "-t", session)
+
+    def _stop_group(self, pgid, grace):
+        if not signal_group(pgid, signal.SIGTERM):
+            return []
+        alive = wait_groups([pgid], grace)
+        for group in alive:
+            signal_group(group, signal.SIGKILL)
+        return alive
+
+    def _stop_session(self, session, grace):
+        try:
+            panes = session_panes(session)
+            # kill-session panellere SIGHUP gönderir (launcher bunu yakalayıp PX4'leri kapatır)
+            tmux("kill-session", "-t", session)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            self._emit(session, "failed", None, str(e))
+            return []
+        alive = wait_groups(panes, grace)
+        for group in alive:
+            signal_group(group, signal.SIGKILL)
+        return alive
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+import asyncio
+import time
+from contextlib import aclosing
+
+# Sabit beklemeler (sleep) yerine gerçek hazır olma sinyalleri. Her bekleyici koşul
+# sağlandığı anda döner; süre aşılırsa TimeoutError (mesajında aşama adı) fırlatır.
+# StageTimer aşamaların sürelerini tutar, launcher.py bunlardan rapor basar.
+
+PORT_POLL_INTERVAL = 0.1  # s
+PORT_TIMEOUT = 30         # mavsdk_server gRPC portu
+CONNECT_TIMEOUT = 120     # PX4 açılışı dahil
+HEALTH_TIMEOUT = 120      # GPS fix, home konumu, sensör kalibrasyonu
+IN_AIR_TIMEOUT = 30
+ALTITUDE_TIMEOUT = 60
+ALTITUDE_TOLERANCE = 0.5  # m, kalkış irtifasına bu kadar yaklaşınca hazır sayılır
+
+
+async def _within(awaitable, timeout, stage):
+    try:
+        return await asyncio.wait_for(awaitable, timeout)
+    except TimeoutError:
+        raise TimeoutError(f"{stage} {timeout} s içinde hazır olmadı") from None
+
+
+async def _first(stream, predicate):
+    # Akış koşul sağlanınca kapatılır (mavsdk aboneliği de biter)
+    async with aclosing(stream) as values:
+        async for value in values:
+            if predicate(value):
+                return value
+    raise ConnectionError("Telemetri akışı kapandı")
+
+
+async def wait_for_port(host, port, timeout=PORT_TIMEOUT):
+    """TCP portu bağlantı kabul edene kadar bekler (ör. mavsdk_server gRPC portu)."""
+    async def probe():
+        while True:
+            try:
+                _, writer = await asyncio.open_connection(host, port)
+            except OSError:
+                await asyncio.sleep(PORT_POLL_INTERVAL)
+            else:
+                writer.close()
+                await writer.wait_closed()
+                return
+    await _within(probe(), timeout, f"port {host}:{port}")
+
+
+async def wait_connected(drone, timeout=CONNECT_TIMEOUT):
+    """mavsdk sistemi keşfedene (PX4'ten heartbeat gelene) kadar bekler."""
+    await _within(_first(drone.core.connection_state(), lambda state: state.is_connected), timeout, "bağlantı")
+
+
+async def wait_healthy(drone, timeout=HEALTH_TIMEOUT):
+    await _within(_first(drone.telemetry.health_all_ok(), bool), timeout, "health_all_ok")
+
+
+async def wait_in_air(drone, timeout=IN_AIR_TIMEOUT):
+    await _within(_first(drone.telemetry.in_air(), bool), timeout, "in_air")
+
+
+async def wait_altitude(drone, altitude, tolerance=ALTITUDE_TOLERANCE, timeout=ALTITUDE_TIMEOUT):
+    """Göreli irtifa altitude - tolerance'a ulaşana kadar bekler."""
+    await _within(_first(drone.telemetry.position(),
+                         lambda position: position.relative_altitude_m >= altitude - tolerance),
+                  timeout, f"irtifa {altitude:.1f} m")
+
+
+class StageTimer:
+    """Bir drone'un açılış aşamaları: {aşama: (başlangıç, bitiş)}, hata olursa failed=(aşama, hata)."""
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.monotonic()
+        self.stages = {}
+        self.failed = None
+
+    async def stage(self, name, awaitable):
+        start = time.monotonic()
+        try:
+            return await awaitable
+        except BaseException as e:
+            self.failed = (name, e)
+            raise
+        finally:
+            self.stages[name] = (start, time.monotonic())
+
+    def duration(self, name):
+        start, end = self.stages[name]
+        return end - start
+
+    def total(self):
+        if not self.stages:
+            return 0.0
+        return max(end for _, end in self.stages.values()) - self.started
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import itertools
+import json
+import math
+import os
+import selectors
+import sys
+import time
+from collections import Counter, namedtuple
+from telemetry_shm import TelemetrySegment, TELEMETRY_FIELDS
+from control_loop import control_loops, clear_loops, summarize
+from geodesy import LocalFrame, reset_frame
+
+# Tekrar oynatma: kayıtlı (drone_logger) veya sentetik telemetriyi, kontrolcülerin
+# kullandığı paylaşılan segmente aynı sırayla yazar; kontrolcüler gerçek System yerine
+# komutları kaydeden FakeSystem ile çalışır. PX4/Gazebo gerekmez.
+# Zaman sanaldır: asyncio döngüsünün saati (loop.time) VirtualClock'tan gelir, döngü
+# bekleyecek iş kalmadığında uyumak yerine saati bir sonraki zamanlayıcıya atlatır.
+# Böylece kontrolcülerin sleep/timeout'ları da aynı saatle işler: speed=1 gerçek zaman,
+# speed=N N kat hızlı, speed=0 olabildiğince hızlı. Aynı girdi her seferinde aynı komut
+# dizisini üretir (deterministik), digest() ile karşılaştırılabilir.
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+
+REPLAY_SHM_PREFIX = "telemetry_replay"
+REPLAY_FIELDS = tuple(name for name in TELEMETRY_FIELDS if name != "timestamp")
+TAIL = 1.0                # s, son kareden sonra kontrolcülerin çalışmaya devam ettiği süre
+TAKEOFF_ALTITUDE = 2.5    # m, FakeSystem action.get_takeoff_altitude cevabı
+
+# Sentetik senaryolar (PX4 SITL varsayılan konumu etrafında)
+ORIGIN_LAT, ORIGIN_LON, ORIGIN_ALT = 47.397742, 8.545594, 488.0
+SYNTHETIC_RATE = 20.0     # Hz, drone başına
+SYNTHETIC_DURATION = 30.0
+SYNTHETIC_ALTITUDE = 10.0
+SYNTHETIC_SPEED = 2.0     # m/s
+SYNTHETIC_RADIUS = 40.0   # m
+
+Frame = namedtuple("Frame", "time drone_id data")
+Command = namedtuple("Command", "time drone_id name args")
+ReplayResult = namedtuple("ReplayResult", "commands frames duration wall_time loops")
+
+_segment_ids = itertools.count(1)
+
+
+class VirtualClock:
+    """speed > 0: gerçek zamanın speed katı; speed = 0: sadece advance() ile ilerler."""
+
+    def __init__(self, speed=0.0):
+        self.speed = speed
+        self.now = 0.0
+        self._real_start = time.perf_counter()
+
+    def time(self):
+        if self.speed > 0:
+            return (time.perf_counter() - self._real_start) * self.speed
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class _VirtualSelector(selectors.DefaultSelector):
+    """
+    speed = 0: hazır soket yoksa 'timeout' kadar uyumak yerine saati ilerletir.
+    speed > 0: timeout / speed kadar gerçekten bekler (saat gerçek zamanla akar).
+    """
+
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+
+    def select(self, timeout=None):
+        if self.clock.speed > 0:
+            return super().select(None if timeout is None else timeout / self.clock.speed)
+        ready = super().select(0)
+        if ready or timeout == 0:
+            return ready
+        if timeout is None:
+            # Zamanlayıcı yok: sadece dışarıdan gelecek bir olay uyandırabilir
+            return super().select(None)
+        self.clock.advance(timeout)
+        return ready
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    def __init__(self, speed=0.0):
+        self.clock = VirtualClock(speed)
+        super().__init__(_VirtualSelector(self.clock))
+
+    def time(self):
+        return self.clock.time()
+
+
+def _plain(value):
+    # mavsdk setpoint nesneleri (VelocityNedYaw vb.) alan değerlerine açılır
+    if hasattr(value, "__dict__"):
+        return tuple(_plain(field) for field in vars(value).values())
+    if isinstance(value, float):
+        return round(value, 6)
+    return value
+
+
+class FakePlugin:
+    """mavsdk eklentisi (offboard, action) yerine: her çağrıyı Command olarak kaydeder."""
+
+    def __init__(self, system, name, results=None):
+        self._system = system
+        self._name = name
+        self._results = results or {}
+
+    def __getattr__(self, method):
+        name = f"{self._name}.{method}"
+        result = self._results.get(method)
+
+        async def call(*args, **kwargs):
+            self._system.record(name, args + tuple(kwargs.values()))
+            return result
+        return call
+
+
+class FakeSystem:
+    """Kontrolcülerin kullandığı System alt kümesi; komutlar 'commands' listesine eklenir."""
+
+    def __init__(self, drone_id, commands=None):
+        self.drone_id = str(drone_id)
+        self.commands = [] if commands is None else commands
+        self.offboard = FakePlugin(self, "offboard")
+        self.action = FakePlugin(self, "action", {"get_takeoff_altitude": TAKEOFF_ALTITUDE})
+
+    async def connect(self, system_address=None):
+        pass
+
+    def record(self, name, args):
+        loop = asyncio.get_running_loop()
+        self.commands.append(Command(round(loop.time(), 6), self.drone_id, name, tuple(_plain(arg) for arg in args)))
+
+
+def recorded_frames(directory, start=None, end=None, drone_ids=None):
+    """drone_logger kaydını kare listesine çevirir; zaman ilk örneğe göre (s)."""
+    from drone_logger import FlightLog, decode_column
+    window = FlightLog(directory).window(start, end, REPLAY_FIELDS, drone_ids)
+    times = window["time"].tolist()
+    if not times:
+        return []
+    ids = [str(drone_id) for drone_id in window["drone_id"].tolist()]
+    columns = [(name, decode_column(name, window[name])) for name in REPLAY_FIELDS]
+    first = times[0]
+    return [Frame(times[i] - first, ids[i], {name: values[i] for name, values in columns if values[i] is not None})
+            for i in range(len(times))]
+
+
+def _converge(index, count, t):
+    # Çember üzerinden merkeze doğru uçup karşı tarafa geçerler (kaçınma bandından geçer)
+    angle = 2 * math.pi * index / count
+    r = SYNTHETIC_RADIUS - SYNTHETIC_SPEED * t
+    return r * math.cos(angle), r * math.sin(angle), math.degrees(angle + math.pi)
+
+
+def _line(index, count, t):
+    # 12 m aralıklı sıra halinde kuzeye, ortadaki drone yavaş (mesafe bantları değişir)
+    speed = SYNTHETIC_SPEED * (0.5 if index == count // 2 else 1.0)
+    return speed * t, (index - count / 2) * 12.0, 0.0
+
+
+def _orbit(index, count, t):
+    angle = 2 * math.pi * index / count + SYNTHETIC_SPEED * t / SYNTHETIC_RADIUS
+    return SYNTHETIC_RADIUS * math.cos(angle), SYNTHETIC_RADIUS * math.sin(angle), math.degrees(angle + math.pi / 2)
+
+
+SCENARIOS = {"converge": _converge, "line": _line, "orbit": _orbit}
+
+
+def synthetic_frames(scenario, count, duration=SYNTHETIC_DURATION, rate=SYNTHETIC_RATE):
+    """Senaryo fonksiyonu (kuzey, doğu, yaw) konumlarından telemetri kareleri üretir."""
+    path = SCENARIOS[scenario]
+    frame = LocalFrame(ORIGIN_LAT, ORIGIN_LON, ORIGIN_ALT)
+    frames = []
+    for step in range(int(duration * rate) + 1):
+        t = step / rate
+        for index in range(count):
+            north, east, yaw = path(index, count, t)
+            lat, lon, _ = frame.to_geodetic(east, north)
+            frames.append(Frame(t, str(index + 1), {
+                "latitude": lat,
+                "longitude": lon,
+                "absolute_altitude": ORIGIN_ALT + SYNTHETIC_ALTITUDE,
+                "relative_altitude": SYNTHETIC_ALTITUDE,
+                "speed": SYNTHETIC_SPEED, "roll": 0.0, "pitch": 0.0, "yaw": (yaw + 180) % 360 - 180,
+                "battery_percent": 90.0, "flight_mode": "OFFBOARD",
+                "satellites_visible": 10, "fix_type": 3, "uptime": int(t),
+            }))
+    return frames
+
+
+async def _ucak111(drone_id, system, segment, drone_ids):
+    from ucak111 import flocking_controller
+    await flocking_controller(drone_id, system, segment)
+
+
+async def _ucak1(drone_id, system, segment, drone_ids):
+    # ucak1.send_telemetry_forever'ın kontrol görevi (telemetriyi tekrar oynatma yazar)
+    from ucak1 import flocking_loop
+    await flocking_loop(drone_id, system, segment)
+
+
+async def _flocking1(drone_id, system, segment, drone_ids):
+    from flocking1 import flock
+    # İkili eşleşme: her drone listedeki bir sonrakini izler
+    other_id = drone_ids[(drone_ids.index(drone_id) + 1) % len(drone_ids)]
+    await flock(drone_id, other_id=other_id, drone=system, segment=segment)
+
+
+async def _ucak11(drone_id, system, segment, drone_ids):
+    # ucak11 --flock-with: aynı drone'a ucak111 hız komutları + flocking1 GOTO'ları (tek hakem)
+    from ucak11 import flock_companion
+    other_id = drone_ids[(drone_ids.index(drone_id) + 1) % len(drone_ids)]
+    await asyncio.gather(_ucak111(drone_id, system, segment, drone_ids),
+                         flock_companion(drone_id, other_id, system, segment))
+
+
+CONTROLLERS = {"ucak111": _ucak111, "ucak1": _ucak1, "flocking1": _flocking1, "ucak11": _ucak11}
+
+
+async def publish(frames, segment):
+    """Kareleri zamanlarında segmente yazar; aynı zamanlı kareler arka arkaya yazılır."""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for frame in frames:
+        delay = start + frame.time - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        segment.write(frame.drone_id, frame.data)
+
+
+async def _replay(frames, controller, drone_ids, segment, commands, tail):
+    tasks = [asyncio.create_task(controller(drone_id, FakeSystem(drone_id, commands), segment, drone_ids))
+             for drone_id in drone_ids]
+    try:
+        # Kontrolcüler dinleyicilerini ilk yazımdan önce bağlasın (bildirim kaçmasın)
+        await asyncio.sleep(0)
+        await publish(frames, segment)
+        await asyncio.sleep(tail)
+    finally:
+        for task in tasks:
+            task.cancel()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+    for drone_id, result in zip(drone_ids, results):
+        if isinstance(result, Exception):
+            raise RuntimeError(f"Drone{drone_id} kontrolcüsü durdu: {result!r}") from result
+    return asyncio.get_running_loop().time()
+
+
+def run_replay(frames, controller="ucak111", speed=0.0, tail=TAIL, verbose=False):
+    """
+    Kareleri yeni bir segmentte tekrar oynatır, kontrolcünün komutlarını döner.
+    speed: 1 = gerçek zaman, N = N kat hızlı, 0 = olabildiğince hızlı.
+    """
+    controller = CONTROLLERS.get(controller, controller)
+    drone_ids = sorted({frame.drone_id for frame in frames}, key=int)
+    segment = TelemetrySegment.open(f"{REPLAY_SHM_PREFIX}_{os.getpid()}_{next(_segment_ids)}",
+                                    max_drones=max(int(drone_id) for drone_id in drone_ids))
+    commands = []
+    clear_loops()
+    # Kontrolcülerin ENU çerçevesi her tekrar oynatmada ilk kareden yeniden kurulur
+    reset_frame()
+    began = time.perf_counter()
+    try:
+        # Kontrolcülerin renkli çıktıları istenmedikçe bastırılır
+        with contextlib.ExitStack() as stack:
+            if not verbose:
+                stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+            with asyncio.Runner(loop_factory=lambda: VirtualClockLoop(speed)) as runner:
+                duration = runner.run(_replay(frames, controller, drone_ids, segment, commands, tail))
+    finally:
+        segment.close(unlink=True)
+    wall_time = time.perf_counter() - began
+    loops = [loop.stats() for loop in control_loops()]
+    clear_loops()
+    reset_frame()
+    return ReplayResult(commands, len(frames), duration, wall_time, loops)
+
+
+def digest(commands):
+    """Komut dizisinin özeti: iki tekrar oynatma aynı komutları üretti mi?"""
+    h = hashlib.sha256()
+    for command in commands:
+        h.update(json.dumps(command, separators=(",", ":")).encode())
+    return h.hexdigest()[:16]
+
+
+def first_difference(commands, expected):
+    """(indeks, bu, beklenen) veya None; biri kısa kalırsa eksik taraf None."""
+    for index, (got, want) in enumerate(itertools.zip_longest(commands, expected)):
+        if got != want:
+            return index, got, want
+    return None
+
+
+def save_commands(path, commands):
+    with open(path, "w") as f:
+        json.dump([list(command) for command in commands], f)
+
+
+def load_commands(path):
+    # JSON listeleri tuple'a geri çevrilir (Command alanları ve args)
+    with open(path) as f:
+        return [Command(t, drone_id, name, tuple(tuple(arg) if isinstance(arg, list) else arg for arg in args))
+                for t, drone_id, name, args in json.load(f)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kayıtlı veya sentetik telemetriyi kontrolcülere tekrar oynatır")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--log", help="drone_logger kayıt dizini")
+    source.add_argument("--synthetic", choices=sorted(SCENARIOS), help="sentetik senaryo")
+    parser.add_argument("--from", dest="start", type=float, help="kayıt zamanı (time sütunu), başlangıç")
+    parser.add_argument("--to", dest="end", type=float, help="kayıt zamanı, bitiş")
+    parser.add_argument("--ids", nargs="+", help="sadece bu drone ID'leri")
+    parser.add_argument("--count", type=int, default=2, help="sentetik drone sayısı")
+    parser.add_argument("--duration", type=float, default=SYNTHETIC_DURATION, help="sentetik süre (s)")
+    parser.add_argument("--rate", type=float, default=SYNTHETIC_RATE, help="sentetik drone başına hız (Hz)")
+    parser.add_argument("--controller", choices=sorted(CONTROLLERS), default="ucak111")
+    parser.add_argument("--speed", type=float, default=0.0, help="1 = gerçek zaman, N = N kat, 0 = olabildiğince hızlı")
+    parser.add_argument("--save", help="komutları JSON olarak kaydet")
+    parser.add_argument("--compare", help="komutları kayıtlı JSON ile karşılaştır (farkta çıkış kodu 1)")
+    parser.add_argument("--verbose", action="store_true", help="kontrolcü çıktılarını göster")
+    args = parser.parse_args()
+
+    if args.log:
+        frames = recorded_frames(os.path.expanduser(args.log), args.start, args.end, args.ids)
+    else:
+        frames = synthetic_frames(args.synthetic, args.count, args.duration, args.rate)
+        if args.ids:
+            frames = [frame for frame in frames if frame.drone_id in args.ids]
+    if not frames:
+        print(f"{RED}Tekrar oynatılacak telemetri yok.{ENDC}")
+        sys.exit(1)
+
+    result = run_replay(frames, args.controller, args.speed, verbose=args.verbose)
+    commands = result.commands
+    print(f"{GREEN}[Replay] {result.frames} kare, {len(commands)} komut; sanal {result.duration:.1f} s, "
+          f"gerçek {result.wall_time:.2f} s ({result.duration / max(result.wall_time, 1e-9):.0f}x, "
+          f"{len(commands) / max(result.wall_time, 1e-9):.0f} komut/s){ENDC}")
+    for (drone_id, name), n in sorted(Counter((c.drone_id, c.name) for c in commands).items(),
+                                      key=lambda item: (int(item[0][0]), item[0][1])):
+        print(f"  Drone{drone_id:<4} {name:<28} {n:>7}")
+    if result.loops:
+        print(f"{CYAN}[Replay] Kontrol: {summarize(result.loops)}{ENDC}")
+    print(f"{CYAN}[Replay] digest: {digest(commands)}{ENDC}")
+
+    if args.save:
+        save_commands(args.save, commands)
+        print(f"{CYAN}[Replay] Komutlar kaydedildi: {args.save}{ENDC}")
+    if args.compare:
+        difference = first_difference(commands, load_commands(args.compare))
+        if difference is None:
+            print(f"{GREEN}[Replay] Komutlar aynı ({args.compare}).{ENDC}")
+        else:
+            index, got, want = difference
+            print(f"{RED}[Replay] {index}. komutta fark:\n  bu:       {got}\n  beklenen: {want}{ENDC}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
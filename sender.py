@@ -1,27 +1,72 @@
 #!/usr/bin/env python3
 
 import sys
-import socket
-import json
-import configparser
-import os
+import argparse
+from telemetry_sender import TelemetrySender, serve, SEND_INTERVAL
+from swarm_config import read_drone_config, config_path, DEFAULT_UDP_IP, DEFAULT_UDP_PORT
 
-if len(sys.argv) != 2:
-    print("Usage: sender.py <telemetry_json>")
-    sys.exit(1)
+# Renkler
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
 
-telemetry_json = sys.argv[1]
+# Kullanım:
+#   sender.py <telemetry_json>      tek paket (eski kullanım, her çağrı yeni süreç)
+#   sender.py --serve               kalıcı servis: segmentteki değişen drone'ları toplu gönderir
 
-# Config dosyasını oku
-config = configparser.ConfigParser()
-config.read(os.path.expanduser("~/Masaüstü/drone2_config.ini"))  # Drone2 ini dosyası
 
-udp_ip = config.get("UDP", "IP").strip()
-udp_port = config.getint("UDP", "Port")
+def udp_target(args):
+    """Hedef adres: --ip/--port verilmediyse drone config dosyasından, o da yoksa varsayılan."""
+    ip, port = args.ip, args.port
+    if ip is None or port is None:
+        try:
+            spec = read_drone_config(args.config)
+            ip, port = ip or spec.udp_ip, port or spec.udp_port
+        except FileNotFoundError:
+            ip, port = ip or DEFAULT_UDP_IP, port or DEFAULT_UDP_PORT
+    return ip, port
 
-# UDP bağlantısı oluştur ve veriyi gönder
-sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-sock.sendto(telemetry_json.encode(), (udp_ip, udp_port))
 
-print(f"Telemetry verisi UDP ile gönderildi: {udp_ip}:{udp_port}")
+def main():
+    parser = argparse.ArgumentParser(description="UDP telemetri göndericisi")
+    parser.add_argument("telemetry_json", nargs="?", help="tek seferlik gönderilecek JSON")
+    parser.add_argument("--serve", action="store_true", help="segmenti izleyen kalıcı servis olarak çalış")
+    parser.add_argument("--config", default=config_path(2), help="UDP hedefinin okunacağı drone config dosyası")
+    parser.add_argument("--ip")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--drones", nargs="+", help="sadece bu drone ID'lerini gönder")
+    parser.add_argument("--interval", type=float, default=SEND_INTERVAL, help="gönderim turları arası en kısa süre (s)")
+    args = parser.parse_args()
 
+    if not args.serve and args.telemetry_json is None:
+        print("Usage: sender.py <telemetry_json> | sender.py --serve")
+        sys.exit(1)
+
+    udp_ip, udp_port = udp_target(args)
+    sender = TelemetrySender(udp_ip, udp_port)
+    try:
+        if not args.serve:
+            sender.send_raw(args.telemetry_json.encode())
+            print(f"Telemetry verisi UDP ile gönderildi: {udp_ip}:{udp_port}")
+            return
+
+        # Tek paket kullanımı her çağrıda yeni süreç açar; segment/bildirim modülleri
+        # (asyncio dahil) sadece servis modunda yüklenir
+        from telemetry_shm import TelemetrySegment, SHM_NAME
+        try:
+            segment = TelemetrySegment.open(SHM_NAME, create=False)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"{RED}Shared Memory açma hatası: {e}{ENDC}")
+            sys.exit(1)
+        print(f"{CYAN}[Sender] {SHM_NAME} ➔ {udp_ip}:{udp_port} (en fazla {1 / args.interval:.0f} tur/s){ENDC}")
+        try:
+            serve(segment, sender, set(args.drones) if args.drones else None, args.interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            segment.close()
+            print(f"{GREEN}[Sender] {sender.messages} örnek, {sender.packets} datagram gönderildi.{ENDC}")
+    finally:
+        sender.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+# ========== SETTINGS ==========
+# Bağımlılıksız sabitler: import etmek Tk, PIL veya başka bir modül yüklemez ve diske
+# hiçbir şey yazmaz. Telemetri araçları, başlatıcılar ve süreç yöneticileri buradan okur;
+# GUI varlıkları (görünüm modu, yer tutucu resim) config.py'de ilk ihtiyaçta hazırlanır.
+
+# Paylaşılan telemetri segmentinin adı (düzen ve boyut telemetry_shm.py'de)
+SHM_NAME = "telemetry_shared"
+TIMEOUT_THRESHOLD = 3 # seconds
+
+# --- Image Paths ---
+# Statik yer tutucu resim (drone durduğunda veya GIF yüklenemediğinde)
+DRONE_IMAGE_PATH = "drone_feed_placeholder.png"
+# Drone uçuşu için animasyonlu GIF
+# Kendi yolunuza göre güncellemeyi unutmayın!
+DRONE_GIF_PATH = "/home/arda/Masaüstü/Drone.gif"
+
+# --- Kart ve Besleme Boyutları ---
+CARD_WIDTH_SMALL = 300 # Daha küçük kart genişliği
+CARD_HEIGHT_SMALL = 380 # Daha küçük kart yüksekliği (içeriğe göre ayarlandı)
+FEED_WIDTH_SMALL = CARD_WIDTH_SMALL - 40 # örn. 260
+FEED_HEIGHT_SMALL = 150 # Daha küçük besleme yüksekliği
+
+# customtkinter varsayılan ayarları (config.apply_appearance ile uygulanır)
+APPEARANCE_MODE = "dark" # Başlangıçta koyu mod
+COLOR_THEME = "blue" # Varsayılan tema (widget'ların genel mavi tonu)
+
+# Renk Temaları
+# Koyu Tema Renkleri
+COLORS_DARK = {
+    "primary": "#1E1E2E",       # Ana navigasyon kenar çubuğu
+    "secondary": "#2A2A3A",     # QGC paneli, nav butonları için hover
+    "tertiary": "#272A3A",      # QGC paneli için biraz farklı bir ton (gerekirse)
+    "accent": "#4E9FEC",        # Vurgu rengi
+    "success": "#2ECC71",
+    "success_hover": "#27AE60",
+    "danger": "#E74C3C",
+    "danger_hover": "#C0392B",
+    "warning": "#F39C12",
+    "dark": "#121212",          # Ana içerik alanı arka planı
+    "card_bg": "#2C3E50",       # Kart arka planı
+    "text_primary": "#FFFFFF",  # Birincil metin rengi
+    "text_secondary": "#B8B8B8", # İkincil metin rengi
+    "gray": "#7F8C8D",          # Gri tonu
+    "disconnected": "#5B5B5B"   # Bağlantı kesildiğinde kullanılacak renk
+}
+
+# Açık Tema Renkleri
+COLORS_LIGHT = {
+    "primary": "#E0E0E0",       # Açık tema için ana arka plan
+    "secondary": "#F0F0F0",     # Açık tema için ikincil arka plan
+    "tertiary": "#E8E8E8",
+    "accent": "#1ABC9C",        # Farklı bir vurgu rengi
+    "success": "#28B463",
+    "success_hover": "#239B56",
+    "danger": "#CB4335",
+    "danger_hover": "#B03A2E",
+    "warning": "#F5B041",
+    "dark": "#FFFFFF",          # Ana içerik alanı arka planı
+    "card_bg": "#ECF0F1",       # Açık kart arka planı
+    "text_primary": "#333333",   # Koyu metin
+    "text_secondary": "#666666", # Daha açık koyu metin
+    "gray": "#AAAAAA",
+    "disconnected": "#888888"
+}
+
+# Başlangıçta kullanılacak renk temasını ayarla
+COLORS = COLORS_DARK # Bu, uygulamanın başlangıçta kullanacağı renk sözlüğüdür
+
+# Fontlar
+FONTS = {
+    "title": ("Roboto", 24, "bold"),
+    "subtitle": ("Roboto", 16, "bold"),
+    "body": ("Roboto", 14),
+    "small": ("Roboto", 12),
+    "button": ("Roboto", 14, "bold"),
+    "button_small": ("Roboto", 12, "bold") # Daha küçük kart butonları için
+}
+
+COMMANDS = {
+    # QGC command: QGroundControl GUI uygulamasını başlatır.
+    "qgc": """
+        cd ~/PX4-Autopilot || exit 1;
+        export LIBGL_ALWAYS_SOFTWARE=1;
+        ./QGroundControl.AppImage &
+    """,
+
+    # Tüm sürü: launcher.py drone'ları paralel açar, her aşamayı hazır olma sinyaliyle ilerletir
+    # ({ids} yerine boşlukla ayrılmış drone ID'leri gelir)
+    "swarm": """
+        cd ~/Masaüstü || exit 1;
+        export LIBGL_ALWAYS_SOFTWARE=1;
+        tmux kill-session -t swarm_session 2>/dev/null;
+        tmux new-session -d -s swarm_session "export LIBGL_ALWAYS_SOFTWARE=1; python3 ~/Masaüstü/launcher.py --ids {ids}"
+    """,
+
+    # Tek drone: kontrolcü PX4'ü beklemek için sabit süre uyumaz, health_all_ok'u bekler
+    # Drone 1'yi başlatır (ID: 2, Pozisyon: 0,5)
+    "drone2": """
+        cd ~/PX4-Autopilot || exit 1;
+        export LIBGL_ALWAYS_SOFTWARE=1;
+        tmux kill-session -t drone2_session 2>/dev/null;
+        tmux new-session -d -s drone2_session "export LIBGL_ALWAYS_SOFTWARE=1; cd ~/PX4-Autopilot; HEADLESS=1 PX4_SYS_AUTOSTART=4001 PX4_SIM_MODEL=gz_x500_mono_cam 	 	PX4_GZ_MODEL_POSE='0,5' ./build/px4_sitl_default/bin/px4 -i 1";
+        tmux kill-session -t drone2_py 2>/dev/null;
+        tmux new-session -d -s drone2_py "python3 /home/arda/Masaüstü/ucak11.py"
+    """,
+
+    # Drone 2'i başlatır (ID: 1, Pozisyon: default)
+    "drone1": """
+        cd ~/PX4-Autopilot || exit 1;
+        export LIBGL_ALWAYS_SOFTWARE=1;
+        tmux kill-session -t drone1_session 2>/dev/null;
+        tmux new-session -d -s drone1_session "export LIBGL_ALWAYS_SOFTWARE=1; cd ~/PX4-Autopilot; HEADLESS=1 PX4_SYS_AUTOSTART=4001 PX4_SIM_MODEL=gz_x500_mono_cam  ./build/px4_sitl_default/bin/px4 -i 2";
+        tmux kill-session -t drone1_py 2>/dev/null;
+        tmux new-session -d -s drone1_py "python3 /home/arda/Masaüstü/ucak22.py"
+    """
+}
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+
+import heapq
+import math
+import time
+from geodesy import local_frame
+
+# Komşu sorguları için yerel ENU düzleminde düzgün ızgara (uniform grid).
+# Her drone bir hücrede tutulur; "SEE_RADIUS içindekiler" ve "en yakın k drone"
+# sorguları sadece çevredeki hücrelere bakar, tüm sürüyü taramaz.
+# Konumlar geodesy'nin süreç çerçevesine göredir (projector verilmezse).
+
+DEFAULT_CELL_SIZE = 30  # m, flocking SEE_RADIUS ile aynı
+STALE_AFTER = 3.0       # s, bu süre yeni telemetri yazmayan drone SwarmIndex'ten düşer
+
+
+class SpatialGrid:
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE, projector=None):
+        self.cell_size = cell_size
+        self.projector = projector
+        # (cx, cy) -> {key: None}; küme yerine sıralı dict: eşit mesafeli komşularda
+        # seçim hash tohumuna değil ekleme sırasına bağlı (tekrar oynatma deterministik)
+        self.cells = {}
+        self.positions = {}  # key -> (east, north, cell)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __contains__(self, key):
+        return key in self.positions
+
+    def _cell(self, east, north):
+        return (math.floor(east / self.cell_size), math.floor(north / self.cell_size))
+
+    def project(self, lat, lon):
+        # Süreç çerçevesinin orijini ilk görülen konum olur
+        east, north, _ = (self.projector or local_frame(lat, lon)).to_enu(lat, lon)
+        return east, north
+
+    def update(self, key, lat, lon):
+        """Drone konumunu günceller ve (doğu, kuzey) döner; hücre değişmediyse sadece konum yazılır."""
+        east, north = self.project(lat, lon)
+        cell = self._cell(east, north)
+        old = self.positions.get(key)
+        if old is not None and old[2] != cell:
+            members = self.cells[old[2]]
+            del members[key]
+            if not members:
+                del self.cells[old[2]]
+        if old is None or old[2] != cell:
+            self.cells.setdefault(cell, {})[key] = None
+        self.positions[key] = (east, north, cell)
+        return east, north
+
+    def remove(self, key):
+        old = self.positions.pop(key, None)
+        if old is not None:
+            members = self.cells[old[2]]
+            del members[key]
+            if not members:
+                del self.cells[old[2]]
+
+    def sync(self, snapshot):
+        """
+        {id: {"latitude", "longitude", ...}} anlık görüntüsüyle artımlı eşitleme.
+        Örneklere ENU konumu ("east", "north") eklenir (geodesy.offset bunu kullanır).
+        """
+        for key, data in snapshot.items():
+            lat, lon = data.get("latitude"), data.get("longitude")
+            if lat is not None and lon is not None:
+                data["east"], data["north"] = self.update(key, lat, lon)
+        for key in [key for key in self.positions if key not in snapshot]:
+            self.remove(key)
+
+    def position(self, key):
+        east, north, _ = self.positions[key]
+        return east, north
+
+    def within(self, east, north, radius, exclude=None):
+        """(mesafe, key) listesi, mesafeye göre sıralı."""
+        reach = math.ceil(radius / self.cell_size)
+        cx, cy = self._cell(east, north)
+        radius_sq = radius * radius
+        found = []
+        for x in range(cx - reach, cx + reach + 1):
+            for y in range(cy - reach, cy + reach + 1):
+                for key in self.cells.get((x, y), ()):
+                    if key == exclude:
+                        continue
+                    pe, pn, _ = self.positions[key]
+                    d_sq = (pe - east) ** 2 + (pn - north) ** 2
+                    if d_sq <= radius_sq:
+                        found.append((math.sqrt(d_sq), key))
+        found.sort()
+        return found
+
+    def nearest(self, east, north, k=1, exclude=None):
+        """En yakın k drone: (mesafe, key) listesi. Halkalar halinde dışarı doğru arar."""
+        total = len(self.positions) - (1 if exclude in self.positions else 0)
+        k = min(k, total)
+        if k <= 0:
+            return []
+        cx, cy = self._cell(east, north)
+        best = []  # max-heap: (-mesafe_kare, key)
+        seen = 0
+        ring = 0
+        while True:
+            if ring == 0:
+                ring_cells = [(cx, cy)]
+            else:
+                ring_cells = [(x, y) for x in range(cx - ring, cx + ring + 1)
+                              for y in (cy - ring, cy + ring)]
+                ring_cells += [(x, y) for x in (cx - ring, cx + ring)
+                               for y in range(cy - ring + 1, cy + ring)]
+            for cell in ring_cells:
+                for key in self.cells.get(cell, ()):
+                    if key == exclude:
+                        continue
+                    seen += 1
+                    pe, pn, _ = self.positions[key]
+                    d_sq = (pe - east) ** 2 + (pn - north) ** 2
+                    if len(best) < k:
+                        heapq.heappush(best, (-d_sq, key))
+                    elif d_sq < -best[0][0]:
+                        heapq.heapreplace(best, (-d_sq, key))
+            # Bir sonraki halkadaki her nokta en az ring * cell_size uzakta
+            if seen >= total or (len(best) == k and -best[0][0] <= (ring * self.cell_size) ** 2):
+                break
+            ring += 1
+        return sorted((math.sqrt(-d_sq), key) for d_sq, key in best)
+
+    def nearest_to(self, key, k=1):
+        east, north = self.position(key)
+        return self.nearest(east, north, k, exclude=key)
+
+    def within_of(self, key, radius):
+        east, north = self.position(key)
+        return self.within(east, north, radius, exclude=key)
+
+
+class SwarmIndex:
+    """
+    Telemetri segmentinden beslenen ızgara. refresh() sadece seq sayacı
+    değişen slotları okur, böylece her tur tüm sürüyü yeniden çözmez.
+    stale_after saniye yazılmayan drone (düşen/kapanan) komşu sorgularından çıkar;
+    slotu tekrar yazılınca geri gelir.
+    Aynı süreçteki tüm kontrolcüler tek bir örneği paylaşabilir (shared_index).
+    """
+
+    def __init__(self, segment, fields=("latitude", "longitude", "yaw"), cell_size=DEFAULT_CELL_SIZE,
+                 stale_after=STALE_AFTER):
+        self.segment = segment
+        self.fields = fields
+        self.stale_after = stale_after
+        self.grid = SpatialGrid(cell_size)
+        self.data = {}     # "<drone_id>" -> son okunan alanlar
+        self.updated = {}  # "<drone_id>" -> son okunduğu an
+        self.seqs = []
+
+    def refresh(self, now=None):
+        """now: saat (varsayılan time.monotonic; asyncio döngüsünde loop.time() verilir)."""
+        now = time.monotonic() if now is None else now
+        seqs = self.segment.sequences()
+        old = self.seqs
+        for index, seq in enumerate(seqs):
+            if seq == (old[index] if index < len(old) else 0):
+                continue
+            key = str(index + 1)
+            data = self.segment.read(key, self.fields)
+            if data is None:
+                # Yazım sürüyor; bir sonraki turda tekrar denenecek
+                seqs[index] = old[index] if index < len(old) else 0
+            elif "latitude" in data and "longitude" in data:
+                # ENU'ya örnek başına bir kez çevrilir; kararlar bu konumları kullanır
+                data["east"], data["north"] = self.grid.update(key, data["latitude"], data["longitude"])
+                self.data[key] = data
+                self.updated[key] = now
+        self.seqs = seqs
+        for key in [key for key, updated in self.updated.items() if now - updated > self.stale_after]:
+            self.grid.remove(key)
+            del self.data[key], self.updated[key]
+        return self.data
+
+    def nearest(self, drone_id, k=1):
+        """[(mesafe, key, veri), ...]"""
+        if drone_id not in self.grid:
+            return []
+        return [(dist, key, self.data[key]) for dist, key in self.grid.nearest_to(drone_id, k)]
+
+    def within(self, drone_id, radius):
+        if drone_id not in self.grid:
+            return []
+        return [(dist, key, self.data[key]) for dist, key in self.grid.within_of(drone_id, radius)]
+
+
+def shared_index(segment, fields=("latitude", "longitude", "yaw")):
+    """
+    Aynı segment ve alanlar için süreç içinde tek SwarmIndex. Segmentin üzerinde
+    tutulur (segment.indexes), segment.close() ile birlikte bırakılır.
+    """
+    index = segment.indexes.get(fields)
+    if index is None:
+        index = segment.indexes[fields] = SwarmIndex(segment, fields)
+    return index
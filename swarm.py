@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import multiprocessing as mp
+from telemetry_shm import TelemetrySegment, SHM_NAME, MAX_DRONES
+from swarm_config import specs_from_dir, specs_for_count, CONFIG_DIR
+from ucak111 import telemetry_collector, flocking_controller, start_flight
+from control_loop import export_stats, summarize
+from connection_broker import broker
+import metrics
+
+# Tek giriş noktası: N drone'un telemetri toplayıcısı ve kontrolcüsü aynı asyncio
+# döngüsünde (veya --workers ile birkaç süreçe bölünmüş olarak) çalışır.
+
+GREEN, YELLOW, RED, BLUE, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[94m", "\033[96m", "\033[0m"
+
+
+async def run_drone(spec, telemetry_shm, takeoff=True):
+    # Araç başına tek System ve tek telemetri aboneliği; toplayıcı ve kontrolcü paylaşır
+    drone = (await broker().connect(spec)).system
+
+    if takeoff:
+        await start_flight(drone, spec.drone_id)
+
+    await asyncio.gather(
+        telemetry_collector(drone, spec.drone_id, telemetry_shm),
+        flocking_controller(spec.drone_id, drone, telemetry_shm)
+    )
+
+
+async def run_swarm(specs, takeoff=True):
+    telemetry_shm = TelemetrySegment.open(SHM_NAME, create=False)
+    try:
+        results = await asyncio.gather(
+            *(run_drone(spec, telemetry_shm, takeoff) for spec in specs),
+            return_exceptions=True
+        )
+        for spec, result in zip(specs, results):
+            if isinstance(result, Exception):
+                print(f"{RED}[Drone{spec.drone_id}] Hata: {result}{ENDC}")
+    finally:
+        await broker().close()
+        telemetry_shm.close()
+
+
+def worker_main(specs, takeoff, loop_stats=None, metrics_port=None):
+    if metrics_port:
+        metrics.serve(metrics_port)
+        print(f"{CYAN}[Swarm] Ölçümler: http://127.0.0.1:{metrics_port}/metrics{ENDC}")
+    try:
+        asyncio.run(run_swarm(specs, takeoff))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if loop_stats:
+            # Her süreç kendi döngülerini yazar (summary-<pid>.json)
+            print(f"{CYAN}[Swarm] Kontrol: {summarize(export_stats(loop_stats))}{ENDC}")
+
+
+def split_specs(specs, workers):
+    """Drone'ları süreçlere sırayla dağıtır."""
+    return [specs[i::workers] for i in range(workers) if specs[i::workers]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="N drone'lu sürüyü tek giriş noktasından çalıştırır")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--count", type=int, help="config dosyası olmadan 1..N drone")
+    source.add_argument("--config-dir", default=CONFIG_DIR, help="droneN_config.ini dosyalarının dizini")
+    parser.add_argument("--workers", type=int, default=1, help="süreç sayısı (1 = tek asyncio döngüsü)")
+    parser.add_argument("--no-takeoff", action="store_true", help="arm/takeoff/offboard adımlarını atla")
+    parser.add_argument("--loop-stats", help="çıkışta kontrol döngüsü tick kayıtlarını bu dizine yaz (CSV + özet JSON)")
+    parser.add_argument("--metrics-port", type=int, help="Prometheus ölçüm uç noktası (süreç i için port + i)")
+    args = parser.parse_args()
+
+    specs = specs_for_count(args.count) if args.count else specs_from_dir(args.config_dir)
+    if not specs:
+        print(f"{RED}Drone bulunamadı ({args.config_dir}).{ENDC}")
+        return
+
+    # Segment tüm ID'leri alacak büyüklükte bir kez oluşturulur, süreçler sadece bağlanır
+    max_id = max(int(spec.drone_id) for spec in specs)
+    telemetry_shm = TelemetrySegment.open(SHM_NAME, max_drones=max(max_id, MAX_DRONES))
+    if telemetry_shm.slot_count < max_id:
+        print(f"{RED}[SHM] Mevcut segment {telemetry_shm.slot_count} slotlu, Drone{max_id} sığmıyor.{ENDC}")
+        telemetry_shm.close()
+        return
+    print(f"{GREEN}[Swarm] {len(specs)} drone, {args.workers} süreç.{ENDC}")
+
+    takeoff = not args.no_takeoff
+    try:
+        if args.workers <= 1:
+            worker_main(specs, takeoff, args.loop_stats, args.metrics_port)
+        else:
+            procs = [mp.Process(target=worker_main,
+                                args=(group, takeoff, args.loop_stats, args.metrics_port and args.metrics_port + i))
+                     for i, group in enumerate(split_specs(specs, args.workers))]
+            for p in procs:
+                p.start()
+            for p in procs:
+                p.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        telemetry_shm.close(unlink=telemetry_shm.created)
+        print(f"{CYAN}[Swarm] Kapandı.{ENDC}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+import configparser
+import glob
+import os
+import re
+from collections import namedtuple
+
+# Drone başına ayarlar. droneN_config.ini dosyalarından veya sadece drone sayısından üretilir.
+DroneSpec = namedtuple("DroneSpec", "drone_id connection grpc_port udp_ip udp_port")
+
+CONFIG_DIR = "~/Masaüstü"
+BASE_MAVLINK_PORT = 14540   # Drone N -> udp://:14540+N
+BASE_GRPC_PORT = 50050      # Drone N -> mavsdk_server 50050+N
+DEFAULT_UDP_IP = "127.0.0.1"
+DEFAULT_UDP_PORT = 1881
+
+
+def config_path(drone_id, config_dir=CONFIG_DIR):
+    return os.path.join(os.path.expanduser(config_dir), f"drone{drone_id}_config.ini")
+
+
+def default_spec(drone_id):
+    """Config dosyası olmayan drone için varsayılan portlar."""
+    drone_id = int(drone_id)
+    return DroneSpec(
+        drone_id=str(drone_id),
+        connection=f"udp://:{BASE_MAVLINK_PORT + drone_id}",
+        grpc_port=BASE_GRPC_PORT + drone_id,
+        udp_ip=DEFAULT_UDP_IP,
+        udp_port=DEFAULT_UDP_PORT,
+    )
+
+
+def read_drone_config(path):
+    """Tek bir droneN_config.ini dosyasını okur; eksik anahtarlar varsayılana düşer."""
+    config = configparser.ConfigParser()
+    if not config.read(os.path.expanduser(path)):
+        raise FileNotFoundError(f"Config bulunamadı: {path}")
+    drone_id = config.get("swarm", "ID").strip()
+    default = default_spec(drone_id)
+    return DroneSpec(
+        drone_id=drone_id,
+        connection=config.get("swarm", "Connection", fallback=default.connection).strip(),
+        grpc_port=config.getint("swarm", "Port", fallback=default.grpc_port),
+        udp_ip=config.get("UDP", "IP", fallback=default.udp_ip).strip(),
+        udp_port=config.getint("UDP", "Port", fallback=default.udp_port),
+    )
+
+
+def specs_from_dir(config_dir=CONFIG_DIR):
+    """Dizindeki tüm droneN_config.ini dosyalarını ID sırasıyla okur."""
+    paths = glob.glob(os.path.join(os.path.expanduser(config_dir), "drone*_config.ini"))
+    specs = []
+    for path in paths:
+        if re.fullmatch(r"drone\d+_config\.ini", os.path.basename(path)):
+            specs.append(read_drone_config(path))
+    return sorted(specs, key=lambda spec: int(spec.drone_id))
+
+
+def specs_for_count(count, first_id=1):
+    """Config dosyası olmadan 1..N drone için varsayılan ayarlar."""
+    return [default_spec(drone_id) for drone_id in range(first_id, first_id + count)]
@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import contextlib
+import math
+import os
+import time
+from types import SimpleNamespace
+import numpy as np
+from replay import VirtualClockLoop
+from telemetry_shm import TelemetrySegment
+from control_loop import control_loops, clear_loops, export_stats, summarize
+from geodesy import LocalFrame, reset_frame
+import metrics
+
+# PX4 SITL yerine hafif kinematik sürü simülatörü. Her drone bir nokta kütledir; tüm
+# sürü tek bir numpy adımında ilerler (hız setpoint'ine ivme sınırlı yaklaşma, kalkış,
+# goto için konum kontrolü, yaw hız sınırı, batarya). SimSystem, scriptlerin kullandığı
+# mavsdk System alt kümesini sunar: telemetry (position, position_velocity_ned,
+# attitude_euler, flight_mode, battery, raw_gps, in_air, health_all_ok), action (arm,
+# takeoff, land, hold, goto_location, get/set_takeoff_altitude), offboard
+# (set_velocity_ned, start, stop) ve core.connection_state. Akışlar adım sonunda
+# uyanır, drone başına görev yoktur. Saat asyncio döngüsünün saatidir; replay.py'nin
+# VirtualClockLoop'u ile gerçek zamandan hızlı (veya N kat) koşar.
+
+GREEN, YELLOW, RED, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[96m", "\033[0m"
+
+ORIGIN_LAT, ORIGIN_LON, ORIGIN_ALT = 47.397742, 8.545594, 488.0  # PX4 SITL varsayılan konumu
+SPACING = 5.0             # m, Drone N başlangıçta kuzeyde (N-1)*5 (launcher POSE_SPACING)
+STEP_RATE = 50.0          # Hz, fizik adımı
+FAST_RATE = 10.0          # Hz, position / position_velocity_ned / attitude_euler akışları
+SLOW_RATE = 2.0           # Hz, flight_mode / battery / raw_gps / in_air / health_all_ok akışları
+MAX_ACCEL = 4.0           # m/s²
+MAX_SPEED = 12.0          # m/s, yatay
+MAX_CLIMB = 3.0           # m/s, dikey
+YAW_RATE = 90.0           # derece/s
+TAKEOFF_SPEED = 1.5       # m/s
+TAKEOFF_ALTITUDE = 2.5    # m, PX4 MIS_TAKEOFF_ALT
+LAND_SPEED = 0.7          # m/s
+GOTO_SPEED = 5.0          # m/s, goto/hold konum kontrolü hız sınırı
+GOTO_GAIN = 1.0           # 1/s, konum hatası -> hız
+OFFBOARD_LOSS_TIMEOUT = 1.0  # s, setpoint gelmezse offboard'dan HOLD'a düşer (PX4 COM_OF_LOSS_T)
+IN_AIR_ALTITUDE = 0.3     # m
+BATTERY_DRAIN = 1 / 1200  # kalan oran / s (silahlıyken ~20 dk)
+FULL_VOLTAGE, EMPTY_VOLTAGE = 16.8, 14.0
+GRAVITY = 9.81
+
+# Uçuş modları (mavsdk FlightMode adlarıyla)
+MODES = ("READY", "TAKEOFF", "HOLD", "OFFBOARD", "LAND")
+READY, TAKEOFF, HOLD, OFFBOARD, LAND = range(len(MODES))
+
+class SwarmSim:
+    """N drone'un durumu numpy dizilerinde; step() hepsini birden ilerletir."""
+
+    def __init__(self, count, spacing=SPACING, origin=(ORIGIN_LAT, ORIGIN_LON, ORIGIN_ALT),
+                 step_rate=STEP_RATE, fast_rate=FAST_RATE, slow_rate=SLOW_RATE):
+        self.count = count
+        self.origin_lat, self.origin_lon, self.origin_alt = origin
+        self.frame = LocalFrame(*origin)
+        self.dt = 1.0 / step_rate
+        # Akış grupları adım sayısının katlarında uyanır
+        self.every = {"fast": max(1, round(step_rate / fast_rate)), "slow": max(1, round(step_rate / slow_rate))}
+        self.events = {group: asyncio.Event() for group in self.every}
+        self.steps = 0
+        self.now = 0.0
+
+        self.ned = np.zeros((count, 3))     # kuzey, doğu, aşağı (m, orijine göre)
+        self.ned[:, 0] = np.arange(count) * spacing
+        self.vel = np.zeros((count, 3))
+        self.accel = np.zeros((count, 3))
+        self.yaw = np.zeros(count)          # derece
+        self.mode = np.full(count, READY, dtype=np.int8)
+        self.armed = np.zeros(count, dtype=bool)
+        self.setpoint = np.zeros((count, 3))
+        self.setpoint_yaw = np.zeros(count)
+        self.setpoint_time = np.full(count, -np.inf)
+        self.target = self.ned.copy()       # HOLD/goto hedefi
+        self.target_yaw = np.full(count, np.nan)
+        self.takeoff_altitude = np.full(count, TAKEOFF_ALTITUDE)
+        self.battery = np.ones(count)
+        self.offboard_losses = 0
+        self._publish()
+
+    # --- fizik ---
+
+    def step(self, now=None):
+        """Tek fizik adımı (dt = 1 / step_rate); now verilmezse saat dt kadar ilerler."""
+        dt = self.dt
+        now = self.now = self.now + dt if now is None else now
+        altitude = -self.ned[:, 2]
+
+        # Setpoint akışı kesilen offboard drone'lar olduğu yerde durur
+        lost = (self.mode == OFFBOARD) & (now - self.setpoint_time > OFFBOARD_LOSS_TIMEOUT)
+        if lost.any():
+            self.offboard_losses += int(lost.sum())
+            self._hold(lost)
+
+        takeoff = self.mode == TAKEOFF
+        reached = takeoff & (altitude >= self.takeoff_altitude - 0.05)
+        if reached.any():
+            self._hold(reached)
+            takeoff &= ~reached
+        landing = self.mode == LAND
+        landed = landing & (altitude <= 0.01)
+        if landed.any():
+            self.mode[landed] = READY
+            self.armed[landed] = False
+            landing &= ~landed
+
+        # HOLD (goto dahil): hedefe oransal hız
+        hold = self.mode == HOLD
+        desired = (self.target - self.ned) * GOTO_GAIN
+        _limit(desired, GOTO_SPEED, MAX_CLIMB)
+        desired[~hold] = 0.0
+        desired_yaw = np.where(hold & ~np.isnan(self.target_yaw), self.target_yaw, self.yaw)
+
+        offboard = self.mode == OFFBOARD
+        desired[offboard] = self.setpoint[offboard]
+        desired_yaw[offboard] = self.setpoint_yaw[offboard]
+        desired[takeoff] = (0.0, 0.0, -TAKEOFF_SPEED)
+        desired[landing] = (0.0, 0.0, LAND_SPEED)
+        desired[~self.armed] = 0.0
+        _limit(desired, MAX_SPEED, MAX_CLIMB)
+
+        # İvme sınırı
+        change = desired - self.vel
+        norm = np.linalg.norm(change, axis=1)
+        scale = np.minimum(1.0, MAX_ACCEL * dt / np.maximum(norm, 1e-9))
+        change *= scale[:, None]
+        self.vel += change
+        self.accel = change / dt
+        self.ned += self.vel * dt
+
+        # Yer
+        below = self.ned[:, 2] > 0
+        self.ned[below, 2] = 0.0
+        self.vel[below, 2] = np.minimum(self.vel[below, 2], 0.0)
+
+        turn = (desired_yaw - self.yaw + 180) % 360 - 180
+        self.yaw = (self.yaw + np.clip(turn, -YAW_RATE * dt, YAW_RATE * dt) + 180) % 360 - 180
+        self.battery = np.maximum(0.0, self.battery - self.armed * BATTERY_DRAIN * dt)
+
+        self.steps += 1
+        self._publish()
+
+    def _hold(self, mask):
+        self.mode[mask] = HOLD
+        self.target[mask] = self.ned[mask]
+        self.target_yaw[mask] = np.nan
+
+    def _publish(self):
+        """Akışların okuyacağı son değerleri listelere çevirir, zamanı gelen grupları uyandırır."""
+        for group, every in self.every.items():
+            if self.steps % every:
+                continue
+            if group == "fast":
+                self.fast = self._fast_values()
+            else:
+                self.slow = self._slow_values()
+            event, self.events[group] = self.events[group], asyncio.Event()
+            event.set()
+
+    def _fast_values(self):
+        north, east, down = self.ned.T
+        accel_north, accel_east = self.accel[:, 0], self.accel[:, 1]
+        yaw = np.radians(self.yaw)
+        # Nokta kütle: ivme -> eğim (gövde ekseninde)
+        forward = accel_north * np.cos(yaw) + accel_east * np.sin(yaw)
+        right = -accel_north * np.sin(yaw) + accel_east * np.cos(yaw)
+        lat, lon, _ = self.frame.to_geodetic_batch(east, north)
+        return {
+            "latitude": lat.tolist(),
+            "longitude": lon.tolist(),
+            "absolute_altitude": (self.origin_alt - down).tolist(),
+            "relative_altitude": (-down).tolist(),
+            "velocity": self.vel.tolist(),
+            "roll": np.degrees(np.arctan(right / GRAVITY)).tolist(),
+            "pitch": np.degrees(-np.arctan(forward / GRAVITY)).tolist(),
+            "yaw": self.yaw.tolist(),
+        }
+
+    def _slow_values(self):
+        return {
+            "mode": self.mode.tolist(),
+            "battery": self.battery.tolist(),
+            "in_air": (-self.ned[:, 2] > IN_AIR_ALTITUDE).tolist(),
+        }
+
+    async def run(self, duration=None):
+        """Adımları döngü saatine göre sabit aralıkla atar (kayma birikmez)."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        steps = 0
+        while duration is None or steps * self.dt < duration:
+            steps += 1
+            delay = start + steps * self.dt - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.step(loop.time())
+
+    # --- akışlar ---
+
+    async def stream(self, group, make, index):
+        """İlk değer hemen, sonra grubun her uyanışında bir mesaj (mavsdk akışı gibi)."""
+        while True:
+            yield make(index)
+            await self.events[group].wait()
+
+    def min_separation(self):
+        """Havadaki drone'lar arası en küçük mesafe (m); ikiden az drone havadaysa inf."""
+        airborne = self.ned[-self.ned[:, 2] > IN_AIR_ALTITUDE]
+        if len(airborne) < 2:
+            return math.inf
+        diff = airborne[:, None, :] - airborne[None, :, :]
+        dist = np.einsum("ijk,ijk->ij", diff, diff)
+        np.fill_diagonal(dist, np.inf)
+        return float(np.sqrt(dist.min()))
+
+
+def _limit(vectors, horizontal, vertical):
+    """Yatay hız normunu ve dikey hızı sınırlar (yerinde)."""
+    speed = np.hypot(vectors[:, 0], vectors[:, 1])
+    scale = np.minimum(1.0, horizontal / np.maximum(speed, 1e-9))
+    vectors[:, :2] *= scale[:, None]
+    np.clip(vectors[:, 2], -vertical, vertical, out=vectors[:, 2])
+
+
+class _Core:
+    def __init__(self, sim, index):
+        self._sim, self._index = sim, index
+
+    def connection_state(self):
+        return self._sim.stream("slow", lambda i: SimpleNamespace(is_connected=True), self._index)
+
+
+class _Telemetry:
+    def __init__(self, sim, index):
+        self._sim, self._index = sim, index
+
+    def position(self):
+        def make(i):
+            fast = self._sim.fast
+            return SimpleNamespace(latitude_deg=fast["latitude"][i], longitude_deg=fast["longitude"][i],
+                                   absolute_altitude_m=fast["absolute_altitude"][i],
+                                   relative_altitude_m=fast["relative_altitude"][i])
+        return self._sim.stream("fast", make, self._index)
+
+    def position_velocity_ned(self):
+        def make(i):
+            north, east, down = self._sim.fast["velocity"][i]
+            return SimpleNamespace(velocity=SimpleNamespace(north_m_s=north, east_m_s=east, down_m_s=down))
+        return self._sim.stream("fast", make, self._index)
+
+    def attitude_euler(self):
+        def make(i):
+            fast = self._sim.fast
+            return SimpleNamespace(roll_deg=fast["roll"][i], pitch_deg=fast["pitch"][i], yaw_deg=fast["yaw"][i])
+        return self._sim.stream("fast", make, self._index)
+
+    def flight_mode(self):
+        return self._sim.stream("slow", lambda i: MODES[self._sim.slow["mode"][i]], self._index)
+
+    def battery(self):
+        def make(i):
+            remaining = self._sim.slow["battery"][i]
+            return SimpleNamespace(remaining_percent=remaining,
+                                   voltage_v=EMPTY_VOLTAGE + (FULL_VOLTAGE - EMPTY_VOLTAGE) * remaining)
+        return self._sim.stream("slow", make, self._index)
+
+    def raw_gps(self):
+        return self._sim.stream("slow", lambda i: SimpleNamespace(satellites_visible=10, fix_type=3), self._index)
+
+    def in_air(self):
+        return self._sim.stream("slow", lambda i: self._sim.slow["in_air"][i], self._index)
+
+    def health_all_ok(self):
+        return self._sim.stream("slow", lambda i: True, self._index)
+
+
+class _Action:
+    def __init__(self, sim, index):
+        self._sim, self._index = sim, index
+
+    async def arm(self):
+        self._sim.armed[self._index] = True
+
+    async def disarm(self):
+        sim, i = self._sim, self._index
+        if -sim.ned[i, 2] > IN_AIR_ALTITUDE:
+            raise RuntimeError(f"Drone{i + 1} havada, disarm reddedildi")
+        sim.armed[i] = False
+        sim.mode[i] = READY
+
+    async def get_takeoff_altitude(self):
+        return float(self._sim.takeoff_altitude[self._index])
+
+    async def set_takeoff_altitude(self, altitude):
+        self._sim.takeoff_altitude[self._index] = altitude
+
+    async def takeoff(self):
+        sim, i = self._sim, self._index
+        if not sim.armed[i]:
+            raise RuntimeError(f"Drone{i + 1} arm edilmedi, takeoff reddedildi")
+        sim.mode[i] = TAKEOFF
+
+    async def land(self):
+        self._sim.mode[self._index] = LAND
+
+    async def hold(self):
+        self._sim._hold(_single(self._sim.count, self._index))
+
+    async def goto_location(self, latitude_deg, longitude_deg, absolute_altitude_m, yaw_deg):
+        sim, i = self._sim, self._index
+        if not sim.armed[i]:
+            raise RuntimeError(f"Drone{i + 1} arm edilmedi, goto reddedildi")
+        # PX4 gibi: goto offboard'dan çıkarır (HOLD + yeni hedef)
+        sim.mode[i] = HOLD
+        east, north, _ = sim.frame.to_enu(latitude_deg, longitude_deg)
+        sim.target[i] = (north, east, sim.origin_alt - absolute_altitude_m)
+        sim.target_yaw[i] = np.nan if yaw_deg is None or math.isnan(yaw_deg) else yaw_deg
+
+
+class _Offboard:
+    def __init__(self, sim, index):
+        self._sim, self._index = sim, index
+
+    async def set_velocity_ned(self, velocity_ned_yaw):
+        sim, i = self._sim, self._index
+        sim.setpoint[i] = (velocity_ned_yaw.north_m_s, velocity_ned_yaw.east_m_s, velocity_ned_yaw.down_m_s)
+        sim.setpoint_yaw[i] = velocity_ned_yaw.yaw_deg
+        sim.setpoint_time[i] = asyncio.get_running_loop().time()
+
+    async def start(self):
+        sim, i = self._sim, self._index
+        # PX4: offboard'a geçmeden önce setpoint akışı başlamış olmalı
+        if asyncio.get_running_loop().time() - sim.setpoint_time[i] > OFFBOARD_LOSS_TIMEOUT:
+            raise RuntimeError(f"Drone{i + 1} offboard setpoint'i yok, start reddedildi")
+        sim.mode[i] = OFFBOARD
+
+    async def stop(self):
+        sim, i = self._sim, self._index
+        if sim.mode[i] == OFFBOARD:
+            sim._hold(_single(sim.count, i))
+
+    async def is_active(self):
+        return bool(self._sim.mode[self._index] == OFFBOARD)
+
+
+def _single(count, index):
+    mask = np.zeros(count, dtype=bool)
+    mask[index] = True
+    return mask
+
+
+class SimSystem:
+    """mavsdk.System yerine: Drone N (1'den başlar) simülatördeki N-1. satırdır."""
+
+    def __init__(self, sim, drone_id):
+        index = int(drone_id) - 1
+        self.core = _Core(sim, index)
+        self.telemetry = _Telemetry(sim, index)
+        self.action = _Action(sim, index)
+        self.offboard = _Offboard(sim, index)
+
+    async def connect(self, system_address=None):
+        pass
+
+
+async def fly(sim, drone_id, segment, takeoff=True, controller="ucak111"):
+    """
+    swarm.run_drone'un simülatör karşılığı: kalkış, ardından toplayıcı + flocking.
+    controller="ucak11": ucak111'e ek olarak flocking1 bir sonraki drone'u izler (--flock-with).
+    """
+    from ucak111 import telemetry_collector, flocking_controller, start_flight
+    from connection_broker import broker
+    drone = broker().attach(drone_id, SimSystem(sim, drone_id)).system
+    if takeoff:
+        await start_flight(drone, drone_id)
+    tasks = [
+        telemetry_collector(drone, drone_id, segment),
+        flocking_controller(drone_id, drone, segment),
+    ]
+    if controller == "ucak11":
+        from ucak11 import flock_companion
+        tasks.append(flock_companion(drone_id, str(int(drone_id) % sim.count + 1), drone, segment))
+    await asyncio.gather(*tasks)
+
+
+async def run_sim(sim, segment, duration, takeoff=True, probe_interval=1.0, controller="ucak111", trace=None):
+    """
+    Simülasyonu 'duration' sanal saniye koşar; en küçük ayrımı döner.
+    trace listesi verilirse her yoklamada (zaman, o anki en küçük ayrım) eklenir.
+    """
+    tasks = [asyncio.create_task(fly(sim, str(i + 1), segment, takeoff, controller)) for i in range(sim.count)]
+    separation = math.inf
+    try:
+        stepper = asyncio.create_task(sim.run(duration))
+        while not stepper.done():
+            await asyncio.wait({stepper}, timeout=probe_interval)
+            current = sim.min_separation()
+            separation = min(separation, current)
+            if trace is not None:
+                trace.append((sim.now, current))
+        stepper.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Paylaşılan telemetri akışları ve hakemler (connection_broker)
+        from connection_broker import broker
+        await broker().close()
+    for drone_id, result in enumerate(results, 1):
+        if isinstance(result, Exception):
+            raise RuntimeError(f"Drone{drone_id} durdu: {result!r}") from result
+    return separation
+
+
+def simulate(count, duration, speed=0.0, shm_name=None, takeoff=True, verbose=False, loop_stats=None,
+             controller="ucak111", trace=None, **options):
+    """
+    Sanal saatte N drone'luk simülasyon; (sim, en küçük ayrım, gerçek süre, kontrol
+    döngüsü özetleri) döner.
+    shm_name verilirse o segmente yazılır (GUI/listener izleyebilir), yoksa geçici segment.
+    """
+    sim_holder = {}
+    name = shm_name or f"telemetry_sim_{os.getpid()}"
+    segment = TelemetrySegment.open(name, max_drones=count)
+    clear_loops()
+    # Kontrolcülerin ENU çerçevesi simülasyon orijini (önceki koşulardan bağımsız)
+    reset_frame(LocalFrame(*options.get("origin", (ORIGIN_LAT, ORIGIN_LON, ORIGIN_ALT))))
+    began = time.perf_counter()
+
+    async def main():
+        # Event'ler döngü içinde oluşturulmalı
+        sim = sim_holder["sim"] = SwarmSim(count, **options)
+        return await run_sim(sim, segment, duration, takeoff, controller=controller, trace=trace)
+
+    try:
+        with contextlib.ExitStack() as stack:
+            if not verbose:
+                stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+            with asyncio.Runner(loop_factory=lambda: VirtualClockLoop(speed)) as runner:
+                separation = runner.run(main())
+    finally:
+        segment.close(unlink=segment.created)
+    wall = time.perf_counter() - began
+    loops = export_stats(loop_stats) if loop_stats else [loop.stats() for loop in control_loops()]
+    clear_loops()
+    reset_frame()
+    return sim_holder["sim"], separation, wall, loops
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PX4 SITL yerine kinematik sürü simülatörü + ucak111 kontrolcüleri")
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=60.0, help="sanal süre (s)")
+    parser.add_argument("--speed", type=float, default=0.0, help="1 = gerçek zaman, N = N kat, 0 = olabildiğince hızlı")
+    parser.add_argument("--spacing", type=float, default=SPACING)
+    parser.add_argument("--controller", choices=("ucak111", "ucak11"), default="ucak111",
+                        help="ucak11: ucak111 + flocking1 (--flock-with bir sonraki drone)")
+    parser.add_argument("--shm", help="telemetriyi bu segmente yaz (ör. telemetry_shared; GUI için --speed 1)")
+    parser.add_argument("--no-takeoff", action="store_true", help="arm/takeoff/offboard adımlarını atla")
+    parser.add_argument("--verbose", action="store_true", help="kontrolcü çıktılarını göster")
+    parser.add_argument("--loop-stats", help="kontrol döngüsü tick kayıtlarını bu dizine yaz (CSV + özet JSON)")
+    parser.add_argument("--metrics-port", type=int, help="Prometheus ölçüm uç noktası (ör. 9108)")
+    args = parser.parse_args()
+
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+
+    print(f"{GREEN}[Sim] {args.count} drone, {args.duration:g} s sanal süre "
+          f"({'olabildiğince hızlı' if args.speed <= 0 else f'{args.speed:g}x'}).{ENDC}")
+    sim, separation, wall, loops = simulate(args.count, args.duration, args.speed, args.shm, not args.no_takeoff,
+                                            args.verbose, args.loop_stats, args.controller, spacing=args.spacing)
+    modes = {MODES[mode]: int((sim.mode == mode).sum()) for mode in range(len(MODES)) if (sim.mode == mode).any()}
+    print(f"{GREEN}[Sim] Gerçek süre {wall:.2f} s ({args.duration / wall:.1f}x), {sim.steps} adım{ENDC}")
+    print(f"{CYAN}[Sim] Modlar: {modes}; offboard kaybı: {sim.offboard_losses}; "
+          f"en küçük ayrım: {separation:.1f} m; en düşük batarya: {sim.battery.min() * 100:.0f}%{ENDC}")
+    print(f"{CYAN}[Sim] Kontrol: {summarize(loops)}{ENDC}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+
+import asyncio
+import math
+import time
+
+# Her MAVSDK telemetri akışına bir kez abone olup son değeri zaman damgasıyla tutar.
+# Eski döngüler her turda altı akış için yeni bir gRPC stream açıp (__anext__) kapatıyordu;
+# tur süresi altı akışın gecikmelerinin toplamı oluyordu. Burada akışlar arka planda
+# açık kalır, döngüler snapshot() ile anında son değerleri alır.
+# Aynı aracın birden çok tüketicisi (connection_broker) tek önbelleği paylaşır; her biri
+# subscribe() ile kendi uyanma sinyalini alır (akışlara yine bir kez abone olunur).
+
+RED, YELLOW, ENDC = "\033[91m", "\033[93m", "\033[0m"
+RESUBSCRIBE_DELAY = 0.5  # akış hata verirse yeniden abone olmadan önce bekleme (s)
+READY_STREAMS = ("position", "attitude_euler")  # kontrol döngülerinin ihtiyaç duyduğu akışlar
+
+
+class TelemetryCache:
+    STREAMS = ("position", "position_velocity_ned", "attitude_euler",
+               "flight_mode", "battery", "raw_gps")
+
+    def __init__(self, drone, streams=STREAMS):
+        self.drone = drone
+        self.streams = streams
+        self.latest = {}    # akış -> son ham mesaj
+        self.updated = {}   # akış -> son mesajın time.monotonic() zamanı
+        self.data = {}      # SHM'ye yazılan düz alanlar
+        self.timestamp = None
+        self.start_time = time.monotonic()
+        self._ready = asyncio.Event()
+        self._changed = asyncio.Event()
+        self._subscribers = [self._changed]
+        self._tasks = []
+
+    def start(self):
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._follow(name)) for name in self.streams]
+        return self
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def __aenter__(self):
+        return self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _follow(self, name):
+        handle = getattr(self, "_on_" + name)
+        while True:
+            try:
+                async for message in getattr(self.drone.telemetry, name)():
+                    self.latest[name] = message
+                    self.updated[name] = time.monotonic()
+                    self.timestamp = time.time()
+                    handle(message)
+                    for changed in self._subscribers:
+                        changed.set()
+                    if not self._ready.is_set() and all(s in self.latest for s in READY_STREAMS):
+                        self._ready.set()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"{RED}[Telemetri] {name} akışı hatası: {e}{ENDC}")
+            # Akış bitti veya koptu: yeniden abone ol
+            await asyncio.sleep(RESUBSCRIBE_DELAY)
+
+    def _on_position(self, pos):
+        self.data["latitude"] = pos.latitude_deg
+        self.data["longitude"] = pos.longitude_deg
+        self.data["absolute_altitude"] = pos.absolute_altitude_m
+        self.data["relative_altitude"] = pos.relative_altitude_m
+
+    def _on_position_velocity_ned(self, vel):
+        self.data["speed"] = math.hypot(vel.velocity.north_m_s, vel.velocity.east_m_s)
+
+    def _on_attitude_euler(self, att):
+        self.data["roll"] = att.roll_deg
+        self.data["pitch"] = att.pitch_deg
+        self.data["yaw"] = att.yaw_deg
+
+    def _on_flight_mode(self, fm):
+        self.data["flight_mode"] = str(fm)
+
+    def _on_battery(self, bat):
+        self.data["battery_percent"] = bat.remaining_percent * 100
+        self.data["battery_voltage"] = bat.voltage_v
+
+    def _on_raw_gps(self, gps):
+        self.data["satellites_visible"] = getattr(gps, "satellites_visible", "N/A")
+        self.data["fix_type"] = getattr(gps, "fix_type", "N/A")
+
+    async def wait_ready(self, timeout=None):
+        """Konum ve yönelim ilk kez gelene kadar bekler; timeout dolarsa False döner."""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            print(f"{YELLOW}[Telemetri] {timeout}s içinde konum gelmedi.{ENDC}")
+            return False
+
+    async def wait_update(self, timeout=None):
+        """
+        Son çağrıdan beri yeni mesaj gelene kadar bekler (tek tüketici, ör. SHM yazıcısı).
+        Arada gelen birden çok mesaj tek uyanışta toplanır; timeout dolarsa False döner.
+        """
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._changed.clear()
+        return True
+
+    def subscribe(self):
+        """Ek tüketici için ayrı uyanma sinyali (wait_update gibi, ama tüketici başına)."""
+        subscription = Subscription(self)
+        self._subscribers.append(subscription.changed)
+        return subscription
+
+    def age(self, name):
+        """Akışın son mesajının yaşı (s); hiç mesaj gelmediyse inf."""
+        updated = self.updated.get(name)
+        return math.inf if updated is None else time.monotonic() - updated
+
+    def snapshot(self):
+        """Son değerlerin kopyası (uptime dahil); döngüler her tur bunu kullanır."""
+        data = dict(self.data)
+        seconds = int(time.monotonic() - self.start_time)
+        data["uptime"] = f"{seconds // 60:02}:{seconds % 60:02}"
+        return data
+
+
+class Subscription:
+    """Paylaşılan önbelleğin tek tüketicisi: snapshot() önbellekten, wait_update() kendi sinyalinden."""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.changed = asyncio.Event()
+
+    async def wait_update(self, timeout=None):
+        """Bu tüketicinin son çağrısından beri yeni mesaj gelene kadar bekler."""
+        try:
+            await asyncio.wait_for(self.changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self.changed.clear()
+        return True
+
+    async def wait_ready(self, timeout=None):
+        return await self.cache.wait_ready(timeout)
+
+    def snapshot(self):
+        return self.cache.snapshot()
+
+    def close(self):
+        if self.changed in self.cache._subscribers:
+            self.cache._subscribers.remove(self.changed)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
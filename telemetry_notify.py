@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+
+import asyncio
+import atexit
+import itertools
+import os
+import select
+import socket
+import tempfile
+
+# Telemetri segmenti için değişiklik bildirimi. Her dinleyici, segmentin yanındaki
+# "<segment>.notify" dizinine bir Unix datagram soketi bağlar; yazıcı her yazımdan
+# sonra dizindeki tüm soketlere 1 baytlık bildirim gönderir. Dinleyici yeni veri
+# gelene kadar uyur (boşta CPU ~0), gelince hemen uyanır. Bildirimler birikmez:
+# soket kuyruğu doluysa yenisi atılır, gerçek durum zaten SHM'deki seq sayaçlarındadır.
+
+NOTIFY_SUFFIX = ".notify"
+_listener_ids = itertools.count(1)
+
+
+def notify_dir(name):
+    """Segment adına göre bildirim soketlerinin dizini (/dev/shm altında, yoksa tmp)."""
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, name.lstrip("/") + NOTIFY_SUFFIX)
+
+
+class ChangeNotifier:
+    """Yazıcı tarafı: notify() tüm dinleyicileri uyandırır, asla beklemez."""
+
+    def __init__(self, name):
+        self.directory = notify_dir(name)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+        self._mtime = None
+        self._targets = []
+        self.sent = 0
+        self.dropped = 0
+
+    def _refresh(self):
+        # Dizin değişmediyse (dinleyici eklenip çıkmadıysa) liste yeniden okunmaz
+        try:
+            mtime = os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            self._mtime, self._targets = None, []
+            return
+        if mtime != self._mtime:
+            self._mtime = mtime
+            self._targets = [entry.path for entry in os.scandir(self.directory)
+                             if entry.name.endswith(".sock")]
+
+    def notify(self):
+        self._refresh()
+        for path in self._targets:
+            try:
+                self.sock.sendto(b"\x01", path)
+                self.sent += 1
+            except BlockingIOError:
+                # Dinleyicide zaten okunmamış bildirim var
+                self.dropped += 1
+            except ConnectionRefusedError:
+                # Süreci ölmüş dinleyiciden kalan soket dosyası
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+                self._mtime = None
+            except FileNotFoundError:
+                self._mtime = None
+
+    def close(self):
+        self.sock.close()
+
+
+class ChangeListener:
+    """
+    Dinleyici tarafı. Senkron kod wait(), asyncio kodu changed() kullanır;
+    Tk gibi olay döngüleri fileno()'yu izleyip drain() çağırabilir.
+    count her uyanışta artar, böylece birden çok görev aynı dinleyiciyi paylaşabilir.
+    """
+
+    def __init__(self, name):
+        self.directory = notify_dir(name)
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, f"{os.getpid()}-{next(_listener_ids)}.sock")
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.bind(self.path)
+        self.sock.setblocking(False)
+        self.count = 0
+        self._loop = None
+        self._waiters = {}  # bekleme sırasıyla uyandırılır (dict sıralı)
+        atexit.register(self.close)
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def drain(self):
+        """Bekleyen tüm bildirimleri okur; en az biri varsa True."""
+        got = False
+        while True:
+            try:
+                self.sock.recv(64)
+                got = True
+            except (BlockingIOError, OSError):
+                break
+        if got:
+            self.count += 1
+        return got
+
+    def wait(self, timeout=None):
+        """Bildirim gelene kadar bloklar; timeout dolarsa False döner."""
+        if self.drain():
+            return True
+        ready, _, _ = select.select([self.sock], [], [], timeout)
+        return bool(ready) and self.drain()
+
+    def _on_readable(self):
+        if self.drain():
+            for waiter in self._waiters:
+                if not waiter.done():
+                    waiter.set_result(self.count)
+
+    async def changed(self, seen, timeout=None):
+        """
+        count 'seen'den farklı olana kadar bekler ve yeni count'u döner
+        (timeout dolarsa 'seen' aynen döner).
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._loop is not None and not self._loop.is_closed():
+                self._loop.remove_reader(self.fileno())
+            loop.add_reader(self.fileno(), self._on_readable)
+            self._loop = loop
+        self._on_readable()
+        if self.count != seen:
+            return self.count
+        waiter = loop.create_future()
+        self._waiters[waiter] = None
+        try:
+            return await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            return seen
+        finally:
+            self._waiters.pop(waiter, None)
+
+    def close(self):
+        if self.sock.fileno() < 0:
+            return
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.remove_reader(self.fileno())
+        self.sock.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
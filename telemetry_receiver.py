@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+
+import asyncio
+import socket
+import time
+from telemetry_wire import decode, is_control, HELLO_PREFIX, ack_message, choose_format, WIRE_MAGIC
+from metrics import histogram
+
+# Yer istasyonu UDP alıcısı (asyncio DatagramProtocol). Çözülen örnekler drone başına
+# sabit boyutlu halka tamponlara yazılır; sıra numaralarından kayıp, sıra dışı ve
+# tekrar eden paketler sayılır. Sıcak yolda ekrana hiçbir şey basılmaz; GUI, logger
+# veya terminal panosu latest()/snapshot()/history()/stats() ile son durumu okur.
+
+LISTEN_PORT = 1881
+RING_CAPACITY = 256           # drone başına saklanan son örnek sayısı
+RECV_BUFFER = 4 * 1024 * 1024  # çekirdek soket tamponu (patlamalarda kayıp olmasın)
+SEQ_WINDOW = 1024             # geç gelen/tekrar ayrımı için hatırlanan son seq sayısı;
+                              # daha geriye giden seq = gönderici yeniden başladı
+RESET_RUN = 8                 # pencere içinde art arda bu kadar geriye giden seq da yeniden başlama
+_WINDOW_MASK = (1 << SEQ_WINDOW) - 1
+
+
+class RingBuffer:
+    """Önceden ayrılmış sabit boyutlu halka; dolunca en eski örneğin üzerine yazar."""
+
+    def __init__(self, capacity=RING_CAPACITY):
+        self.capacity = capacity
+        self.items = [None] * capacity
+        self.head = 0     # bir sonraki yazılacak indeks
+        self.count = 0
+        self.overwritten = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, item):
+        self.items[self.head] = item
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self.overwritten += 1
+
+    def latest(self):
+        return self.items[self.head - 1] if self.count else None
+
+    def values(self):
+        """Eskiden yeniye tüm örnekler."""
+        if self.count < self.capacity:
+            return self.items[:self.count]
+        return self.items[self.head:] + self.items[:self.head]
+
+
+class DroneTrack:
+    """Tek drone'un örnek tamponu ve sıra numarası istatistikleri."""
+
+    def __init__(self, capacity=RING_CAPACITY):
+        self.ring = RingBuffer(capacity)
+        self.last_seq = None
+        self.seen = 0     # bit k: last_seq - k alındı
+        self.received = 0
+        self.lost = 0
+        self.out_of_order = 0
+        self.duplicates = 0
+        self.resets = 0
+        self.last_time = 0.0
+        self.behind = 0          # art arda last_seq'in gerisinde (veya eşit) gelen paket
+        self.behind_duplicates = 0  # bunlardan tekrar sayılanlar
+
+    def add(self, seq, telemetry, now):
+        self.received += 1
+        self.last_time = now
+        if seq is not None:
+            last = self.last_seq
+            diff = 0 if last is None else (seq - last) & 0xFFFFFFFF
+            if last is None or (diff >= 0x80000000 and 0x100000000 - diff >= SEQ_WINDOW):
+                self._reset(seq, last is not None)
+            elif 0 < diff < 0x80000000:
+                # İleri: aradaki seq'ler kayıp (geç gelirse aşağıda düzeltilir)
+                self.lost += diff - 1
+                self.last_seq = seq
+                # Pencereden uzun sıçramada eski bitlerin hiçbiri kalmaz (dev kaydırma yapılmaz)
+                self.seen = ((self.seen << diff) | 1) & _WINDOW_MASK if diff < SEQ_WINDOW else 1
+                self.behind = self.behind_duplicates = 0
+            elif self.behind + 1 >= RESET_RUN:
+                # Pencere içinde geriye giden seq'ler art arda geliyor: gönderici yeniden
+                # başladı (ör. 0'dan), tekrar sanılan paketler düzeltilir
+                self.duplicates -= self.behind_duplicates
+                self._reset(seq, True)
+            else:
+                self.behind += 1
+                bit = 1 << ((0x100000000 - diff) & 0xFFFFFFFF)
+                if self.seen & bit:
+                    self.duplicates += 1
+                    self.behind_duplicates += 1
+                else:
+                    # Geç gelen paket: kayıp sayılmıştı, sıra dışı olarak düzelt
+                    self.seen |= bit
+                    self.out_of_order += 1
+                    self.lost -= 1
+                return
+        self.ring.append((now, seq, telemetry))
+
+    def _reset(self, seq, restarted):
+        if restarted:
+            self.resets += 1
+        self.last_seq, self.seen = seq, 1
+        self.behind = self.behind_duplicates = 0
+
+
+class TelemetryReceiver(asyncio.DatagramProtocol):
+    def __init__(self, capacity=RING_CAPACITY):
+        self.capacity = capacity
+        self.tracks = {}
+        self.transport = None
+        self.packets = 0
+        self.decode_errors = 0
+        self.socket_errors = 0
+        self.decode_binary = histogram("decode_seconds", "Datagram çözme süresi", format="binary")
+        self.decode_json = histogram("decode_seconds", "Datagram çözme süresi", format="json")
+
+    def connection_made(self, transport):
+        self.transport = transport
+        sock = transport.get_extra_info("socket")
+        if sock is not None:
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECV_BUFFER)
+            except OSError:
+                pass
+
+    def datagram_received(self, data, addr):
+        if is_control(data):
+            if data.startswith(HELLO_PREFIX):
+                self.transport.sendto(ack_message(choose_format(data)), addr)
+            return
+        self.packets += 1
+        timing = self.decode_binary if data[:2] == WIRE_MAGIC else self.decode_json
+        started = timing.start()
+        try:
+            samples = decode(data)
+        except (ValueError, UnicodeDecodeError, AttributeError):
+            self.decode_errors += 1
+            return
+        timing.stop(started)
+        now = time.time()
+        tracks = self.tracks
+        for drone_id, seq, telemetry in samples:
+            track = tracks.get(drone_id)
+            if track is None:
+                track = tracks[drone_id] = DroneTrack(self.capacity)
+            track.add(seq, telemetry, now)
+
+    def error_received(self, exc):
+        self.socket_errors += 1
+
+    def latest(self, drone_id):
+        """Drone'un son telemetrisi (yoksa None)."""
+        track = self.tracks.get(str(drone_id))
+        item = track.ring.latest() if track else None
+        return item[2] if item else None
+
+    def snapshot(self):
+        """{"<drone_id>": son telemetri} — listener2/GUI'deki read_all ile aynı biçim."""
+        return {drone_id: track.ring.latest()[2] for drone_id, track in self.tracks.items() if track.ring.count}
+
+    def history(self, drone_id):
+        """Drone'un tampondaki örnekleri, eskiden yeniye: [(alış_zamanı, seq, telemetri), ...]"""
+        track = self.tracks.get(str(drone_id))
+        return track.ring.values() if track else []
+
+    def stats(self):
+        return {
+            "packets": self.packets,
+            "decode_errors": self.decode_errors,
+            "socket_errors": self.socket_errors,
+            "drones": {
+                drone_id: {
+                    "received": track.received, "lost": track.lost,
+                    "out_of_order": track.out_of_order, "duplicates": track.duplicates,
+                    "resets": track.resets, "age": time.time() - track.last_time,
+                }
+                for drone_id, track in self.tracks.items()
+            },
+        }
+
+
+async def start_receiver(host="0.0.0.0", port=LISTEN_PORT, capacity=RING_CAPACITY):
+    """Alıcıyı çalışan asyncio döngüsüne bağlar; (transport, receiver) döner."""
+    loop = asyncio.get_running_loop()
+    return await loop.create_datagram_endpoint(lambda: TelemetryReceiver(capacity), local_addr=(host, port))
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+import socket
+import time
+from telemetry_wire import (
+    MAX_DATAGRAM, FORMAT_JSON, FORMAT_BINARY, SUPPORTED_FORMATS, ACK_PREFIX,
+    pack_json, pack_binary, hello_message, parse_ack,
+)
+
+# Kalıcı UDP telemetri göndericisi. Soket bir kez açılır; birden çok drone'un örnekleri
+# MTU'yu aşmayacak şekilde tek datagramda toplanır. serve() telemetri segmentini
+# doğrudan okur ve sadece seq sayacı değişen slotları gönderir.
+#
+# Biçim alıcıyla anlaşılır (bkz. telemetry_wire): alıcı binary'yi ACK'leyene kadar
+# ve ACK'ler kesilirse JSON gönderilir. Her örneğe drone başına artan bir iletim
+# sırası (seq) verilir; alıcı bununla kayıp ve sıra dışı paketleri sayar.
+
+SEND_INTERVAL = 0.1       # serve(): iki gönderim turu arası en kısa süre (s)
+NEGOTIATE_INTERVAL = 2.0  # HELLO aralığı (s)
+ACK_TIMEOUT = 3 * NEGOTIATE_INTERVAL  # bu kadar ACK gelmezse JSON'a dön
+
+
+class TelemetrySender:
+    def __init__(self, udp_ip, udp_port, max_datagram=MAX_DATAGRAM, formats=SUPPORTED_FORMATS):
+        self.address = (udp_ip, udp_port)
+        self.max_datagram = max_datagram
+        self.formats = formats
+        self.format = FORMAT_JSON
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.packets = 0
+        self.messages = 0
+        self.bytes_sent = 0
+        self.tx_seqs = {}  # drone_id -> son iletim sırası
+        self._hello_at = None
+        self._ack_at = None
+
+    def negotiate(self):
+        """Gelen ACK'leri işler, gerekirse HELLO yollar; her gönderimden önce çağrılır."""
+        if len(self.formats) < 2:
+            return
+        now = time.monotonic()
+        while True:
+            try:
+                data, _ = self.sock.recvfrom(256, socket.MSG_DONTWAIT)
+            except (BlockingIOError, InterruptedError):
+                break
+            except ConnectionRefusedError:
+                # Alıcı portu kapalı (ICMP); bir sonraki HELLO'da tekrar denenir
+                continue
+            if data.startswith(ACK_PREFIX):
+                fmt = parse_ack(data)
+                if fmt in self.formats:
+                    self.format = fmt
+                    self._ack_at = now
+        if self._ack_at is not None and now - self._ack_at > ACK_TIMEOUT:
+            self.format, self._ack_at = FORMAT_JSON, None
+        if self._hello_at is None or now - self._hello_at >= NEGOTIATE_INTERVAL:
+            self._hello_at = now
+            try:
+                self.sock.sendto(hello_message(self.formats), self.address)
+            except OSError:
+                pass
+
+    def _send(self, payload, count):
+        self.sock.sendto(payload, self.address)
+        self.packets += 1
+        self.messages += count
+        self.bytes_sent += len(payload)
+
+    def send_raw(self, payload):
+        """Hazır kodlanmış bir datagramı gönderir (eski 'sender.py <json>' kullanımı)."""
+        self._send(payload, 1)
+
+    def send(self, drone_id, telemetry):
+        self.send_batch([(drone_id, telemetry)])
+
+    def send_batch(self, samples):
+        """
+        [(drone_id, telemetry), ...] örneklerini max_datagram'ı aşmayan toplu
+        datagramlara böler; gönderilen datagram sayısını döner.
+        """
+        self.negotiate()
+        numbered = []
+        for drone_id, telemetry in samples:
+            seq = self.tx_seqs[drone_id] = (self.tx_seqs.get(drone_id, 0) + 1) & 0xFFFFFFFF
+            numbered.append((drone_id, telemetry, seq))
+        if self.format == FORMAT_BINARY:
+            datagrams = pack_binary(numbered, self.max_datagram)
+        else:
+            datagrams = pack_json(numbered, self.address[1], self.max_datagram)
+        for payload, count in datagrams:
+            self._send(payload, count)
+        return len(datagrams)
+
+    def close(self):
+        self.sock.close()
+
+
+def changed_samples(segment, last_seqs, drone_ids=None):
+    """Son turdan beri yazılmış slotların (drone_id, telemetri) listesi; last_seqs güncellenir."""
+    return segment.read_changed(last_seqs, drone_ids=drone_ids)
+
+
+def serve(segment, sender, drone_ids=None, interval=SEND_INTERVAL, stop=None):
+    """
+    Segmentte yeni telemetri yazıldıkça değişen drone'ları toplu gönderir.
+    Yazım yoksa uyur; en fazla 'interval' saniyede bir tur gönderir.
+    """
+    from telemetry_notify import ChangeListener  # asyncio'yu tek paket kullanımında yükleme
+    listener = ChangeListener(segment.name)
+    last_seqs = {}
+    try:
+        while stop is None or not stop.is_set():
+            if not listener.wait(timeout=1.0):
+                # Veri olmasa da anlaşma (ACK/HELLO) güncel kalsın
+                sender.negotiate()
+                continue
+            started = time.monotonic()
+            samples = changed_samples(segment, last_seqs, drone_ids)
+            if samples:
+                sender.send_batch(samples)
+            remaining = interval - (time.monotonic() - started)
+            if remaining > 0:
+                time.sleep(remaining)
+    finally:
+        listener.close()
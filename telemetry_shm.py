@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+
+import math
+import os
+import struct
+import time
+import multiprocessing.shared_memory as shm
+from settings import SHM_NAME
+from telemetry_notify import ChangeNotifier, ChangeListener, notify_dir
+
+# Paylaşılan telemetri alanı: sabit başlık + her drone için sabit boyutlu bir slot.
+# Drone N her zaman (N - 1). slota yazar, böylece her yazıcı yalnızca kendi slotuna dokunur.
+# Slotlar seqlock ile korunur: yazıcı seq'i tek yapar, veriyi yazar, seq'i tekrar çift yapar;
+# okuyucu seq'i önce ve sonra okur, değişmişse (veya tekse) tekrar dener. Kilit yoktur.
+# Not: Sıralama garantisi x86-64 (TSO) bellek modeline dayanır.
+# Başlıktaki generation sayacı her yazımda artar; okuyucular ucuzca "değişti mi?"
+# diye bakabilir, uyumak için telemetry_notify dinleyicilerini kullanır.
+
+SHM_MAGIC = b"SWTL"
+SHM_VERSION = 1
+MAX_DRONES = 256
+
+# magic, version, header_size, slot_size, slot_count
+HEADER = struct.Struct("<4sHHHH")
+HEADER_SIZE = 64
+# Başlıkta sabit alanlardan sonra: tüm yazımların sayacı
+GENERATION = struct.Struct("<I")
+GENERATION_OFFSET = HEADER.size
+
+# Slot alanları (sıra = bellekteki sıra)
+SLOT_FIELDS = (
+    ("seq", "I"),
+    ("drone_id", "H"),
+    ("flags", "H"),
+    ("timestamp", "d"),
+    ("latitude", "d"),
+    ("longitude", "d"),
+    ("absolute_altitude", "d"),
+    ("relative_altitude", "d"),
+    ("speed", "f"),
+    ("roll", "f"),
+    ("pitch", "f"),
+    ("yaw", "f"),
+    ("battery_percent", "f"),
+    ("battery_voltage", "f"),
+    ("satellites_visible", "h"),
+    ("fix_type", "h"),
+    ("uptime", "I"),
+    ("flight_mode", "24s"),
+)
+SLOT = struct.Struct("<" + "".join(fmt for _, fmt in SLOT_FIELDS))
+SLOT_SIZE = 128
+UPTIME_UNSET = 0xFFFFFFFF
+SHM_SIZE = HEADER_SIZE + MAX_DRONES * SLOT_SIZE
+
+# Telemetri alanları (slot yönetim alanları hariç)
+TELEMETRY_FIELDS = tuple(name for name, _ in SLOT_FIELDS[3:])
+_FLOAT_FIELDS = {name for name, fmt in SLOT_FIELDS[3:] if fmt in ("d", "f")}
+_INT_FIELDS = {"satellites_visible", "fix_type"}
+
+# Alan başına (offset, Struct) — okuyucular sadece ihtiyaç duydukları alanları çözer
+FIELD_LAYOUT = {}
+_offset = 0
+for _name, _fmt in SLOT_FIELDS:
+    _st = struct.Struct("<" + _fmt)
+    FIELD_LAYOUT[_name] = (_offset, _st)
+    _offset += _st.size
+del _offset, _name, _fmt, _st
+
+SEQ = FIELD_LAYOUT["seq"][1]
+PAYLOAD = struct.Struct("<" + "".join(fmt for _, fmt in SLOT_FIELDS[1:]))
+
+# Okuyucu, yazıcının yarıda kalan bir yazımını en fazla bu kadar tekrar dener
+SEQLOCK_RETRIES = 1000
+# Aynı anda başlayan süreç segmenti yeni oluşturmuşsa başlığın yazılmasını bu kadar bekle (s)
+HEADER_WAIT = 1.0
+HEADER_POLL = 0.005
+
+assert SLOT.size <= SLOT_SIZE and SLOT_SIZE % 8 == 0
+assert SEQ.size + PAYLOAD.size == SLOT.size
+
+
+def _uptime_seconds(value):
+    # Eski JSON formatındaki "MM:SS" değerini de kabul et
+    if isinstance(value, str) and ":" in value:
+        minutes, seconds = value.split(":", 1)
+        return int(minutes) * 60 + int(seconds)
+    return int(value)
+
+
+def _int_value(value):
+    # mavsdk enum'ları (ör. FixType) .value ile tamsayıya çevrilir
+    value = getattr(value, "value", value)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return -1
+
+
+def pack_values(data):
+    """Telemetri sözlüğünü slot sırasına göre değer listesine çevirir (eksik alan = NaN / -1)."""
+    nan = math.nan
+    get = data.get
+    uptime = get("uptime")
+    mode = get("flight_mode")
+    return [
+        time.time(),
+        get("latitude", nan), get("longitude", nan),
+        get("absolute_altitude", nan), get("relative_altitude", nan),
+        get("speed", nan), get("roll", nan), get("pitch", nan), get("yaw", nan),
+        get("battery_percent", nan), get("battery_voltage", nan),
+        _int_value(get("satellites_visible", -1)), _int_value(get("fix_type", -1)),
+        _uptime_seconds(uptime) if uptime is not None else UPTIME_UNSET,
+        str(mode).encode("utf-8")[:24] if mode is not None else b"",
+    ]
+
+
+def decode_value(name, value):
+    """Ham alan değerini sözlük değerine çevirir; alan boşsa None döner."""
+    if name in _FLOAT_FIELDS:
+        return None if value != value else value
+    if name in _INT_FIELDS:
+        return None if value < 0 else value
+    if name == "flight_mode":
+        return value.rstrip(b"\x00").decode("utf-8", errors="ignore") or None
+    if name == "uptime":
+        if value == UPTIME_UNSET:
+            return None
+        return f"{value // 60:02}:{value % 60:02}"
+    return value
+
+
+class TelemetrySegment:
+    """
+    Binary telemetri alanına erişim. Her drone sadece kendi slotunu yazar,
+    okuyucular slotları (veya tek tek alanları) doğrudan çözer.
+    """
+
+    def __init__(self, memory, created=False):
+        self.memory = memory
+        self.name = memory.name
+        self.created = created
+        self.buf = memory.buf
+        # Oluşturan süreç başlığı magic en son olacak şekilde yazar; magic hâlâ sıfırsa
+        # segment yeni oluşturulmuştur, başlık birazdan gelir
+        deadline = time.monotonic() + HEADER_WAIT
+        while bytes(self.buf[:4]) == b"\x00\x00\x00\x00" and time.monotonic() < deadline:
+            time.sleep(HEADER_POLL)
+        magic, version, header_size, slot_size, slot_count = HEADER.unpack_from(self.buf, 0)
+        if magic != SHM_MAGIC or version != SHM_VERSION:
+            raise ValueError(
+                f"{memory.name} eski/uyumsuz formatta (magic={magic!r}, version={version}). "
+                f"Segmenti silip yeniden başlatın."
+            )
+        self.header_size = header_size
+        self.slot_size = slot_size
+        self.slot_count = slot_count
+        self.read_retries = 0
+        self.notifier = None
+        self.listener = None
+        self.indexes = {}  # alanlar -> SwarmIndex (spatial_index.shared_index)
+
+    @classmethod
+    def open(cls, name=SHM_NAME, create=True, max_drones=MAX_DRONES):
+        """Segmenti oluşturur (create=True ise) veya mevcut olana bağlanır."""
+        if create:
+            try:
+                memory = shm.SharedMemory(name=name, create=True, size=HEADER_SIZE + max_drones * SLOT_SIZE)
+            except FileExistsError:
+                pass
+            else:
+                # Bağlanan süreçler magic'i görünce başlığın tamamını görür: magic en son yazılır
+                header = HEADER.pack(SHM_MAGIC, SHM_VERSION, HEADER_SIZE, SLOT_SIZE, max_drones)
+                memory.buf[4:HEADER.size] = header[4:]
+                memory.buf[:4] = header[:4]
+                return cls(memory, created=True)
+        return cls(shm.SharedMemory(name=name), created=False)
+
+    def change_listener(self):
+        """Bu segmentin değişiklik dinleyicisi; süreçteki tüm okuyucular (kontrolcüler) paylaşır."""
+        if self.listener is None:
+            self.listener = ChangeListener(self.name)
+        return self.listener
+
+    def close(self, unlink=False):
+        if self.notifier is not None:
+            self.notifier.close()
+        if self.listener is not None:
+            self.listener.close()
+        self.indexes.clear()
+        self.buf = None
+        self.memory.close()
+        if unlink:
+            try:
+                self.memory.unlink()
+            except FileNotFoundError:
+                pass
+            # Bildirim dizini de (artık dinleyici kalmadıysa) kaldırılır
+            try:
+                os.rmdir(notify_dir(self.name))
+            except OSError:
+                pass
+
+    def slot_offset(self, drone_id):
+        index = int(drone_id) - 1
+        if not 0 <= index < self.slot_count:
+            raise IndexError(f"Drone ID {drone_id} segment kapasitesi dışında ({self.slot_count}).")
+        return self.header_size + index * self.slot_size
+
+    def write(self, drone_id, data):
+        """
+        Drone'un slotunu yerinde günceller (seqlock yazıcı tarafı, asla beklemez).
+        seq tek iken slot yazılıyor demektir; yazım bitince tekrar çift olur.
+        """
+        buf = self.buf
+        offset = self.slot_offset(drone_id)
+        # Değerler önceden hazırlanır, slotun "yazılıyor" penceresi sadece kopyalama kadar sürer
+        payload = PAYLOAD.pack(int(drone_id), 0, *pack_values(data))
+        seq = SEQ.unpack_from(buf, offset)[0]
+        # Önceki yazıcı yarıda kaldıysa seq zaten tektir
+        start = seq | 1
+        SEQ.pack_into(buf, offset, start)
+        buf[offset + SEQ.size:offset + SLOT.size] = payload
+        SEQ.pack_into(buf, offset, ((start + 1) & 0xFFFFFFFF) or 2)
+        # Yazıcılar arası yarışta bir artış kaybolabilir; sayaç yine de değişmiş olur
+        generation = GENERATION.unpack_from(buf, GENERATION_OFFSET)[0]
+        GENERATION.pack_into(buf, GENERATION_OFFSET, (generation + 1) & 0xFFFFFFFF)
+        if self.notifier is None:
+            self.notifier = ChangeNotifier(self.name)
+        self.notifier.notify()
+
+    def generation(self):
+        """Segmentteki toplam yazım sayacı; değişmediyse hiçbir slot yazılmamıştır."""
+        return GENERATION.unpack_from(self.buf, GENERATION_OFFSET)[0]
+
+    def read_slot(self, drone_id, fields=None):
+        """
+        Seqlock okuyucu tarafı: (seq, {alan: değer}) döner. Slot hiç yazılmadıysa
+        (0, None), okuma sırasında sürekli yazılıyorsa (seq, None) döner.
+        Sadece gerçekten eşzamanlı bir yazım olduğunda tekrar dener.
+        """
+        buf = self.buf
+        offset = self.slot_offset(drone_id)
+        if fields is None:
+            names = TELEMETRY_FIELDS
+        else:
+            names = fields
+            layout = [(offset + FIELD_LAYOUT[name][0], FIELD_LAYOUT[name][1]) for name in fields]
+        for _ in range(SEQLOCK_RETRIES):
+            begin = SEQ.unpack_from(buf, offset)[0]
+            if begin == 0:
+                return 0, None
+            if begin & 1:
+                self.read_retries += 1
+                continue
+            if fields is None:
+                values = SLOT.unpack_from(buf, offset)[3:]
+            else:
+                values = [st.unpack_from(buf, field_offset)[0] for field_offset, st in layout]
+            if SEQ.unpack_from(buf, offset)[0] == begin:
+                break
+            self.read_retries += 1
+        else:
+            return begin, None
+        result = {}
+        for name, value in zip(names, values):
+            value = decode_value(name, value)
+            if value is not None:
+                result[name] = value
+        return begin, result
+
+    def read_raw(self, drone_id):
+        """
+        Slotun ham baytları (SLOT düzeninde, seq dahil): (seq, bytes). Hiç yazılmadıysa
+        (0, None), sürekli yazılıyorsa (seq, None). Kaydediciler çözmeden saklar.
+        """
+        buf = self.buf
+        offset = self.slot_offset(drone_id)
+        for _ in range(SEQLOCK_RETRIES):
+            begin = SEQ.unpack_from(buf, offset)[0]
+            if begin == 0:
+                return 0, None
+            if begin & 1:
+                self.read_retries += 1
+                continue
+            raw = bytes(buf[offset:offset + SLOT.size])
+            if SEQ.unpack_from(buf, offset)[0] == begin:
+                return begin, raw
+            self.read_retries += 1
+        return begin, None
+
+    def read(self, drone_id, fields=None):
+        """Tek drone'un telemetrisini sözlük olarak döner (hiç yazılmadıysa None)."""
+        return self.read_slot(drone_id, fields)[1]
+
+    def sequences(self):
+        """Tüm slotların seq sayaçları (0 = hiç yazılmamış)."""
+        end = self.header_size + self.slot_count * self.slot_size
+        words = self.buf[self.header_size:end].cast("I")
+        try:
+            return words[::self.slot_size // 4].tolist()
+        finally:
+            words.release()
+
+    def read_changed(self, last_seqs, fields=None, drone_ids=None):
+        """
+        Son çağrıdan beri yazılmış slotların [(drone_id, {...}), ...] listesi.
+        last_seqs ({slot_indeksi: seq}) çağıranda tutulur ve burada güncellenir;
+        değişmeyen slotlar çözülmez. drone_ids verilirse sadece o slotlara bakılır.
+        """
+        samples = []
+        if drone_ids is None:
+            candidates = enumerate(self.sequences())
+        else:
+            # Sadece istenen slotların seq'leri okunur: maliyet segment boyutundan bağımsız
+            buf, unpack = self.buf, SEQ.unpack_from
+            candidates = [(int(drone_id) - 1, unpack(buf, self.slot_offset(drone_id))[0])
+                          for drone_id in drone_ids if 0 < int(drone_id) <= self.slot_count]
+        for index, seq in candidates:
+            if not seq or last_seqs.get(index) == seq:
+                continue
+            drone_id = str(index + 1)
+            seq, data = self.read_slot(drone_id, fields)
+            if data is not None:
+                last_seqs[index] = seq
+                samples.append((drone_id, data))
+        return samples
+
+    def read_all(self, fields=None):
+        """Yazılmış tüm slotları {"<drone_id>": {...}} biçiminde döner."""
+        result = {}
+        for index, seq in enumerate(self.sequences()):
+            if seq:
+                data = self.read(index + 1, fields)
+                if data is not None:
+                    result[str(index + 1)] = data
+        return result
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+
+import json
+import math
+import struct
+
+# UDP telemetri datagram biçimleri.
+#
+# JSON (her zaman desteklenir, eski listener/sender ile uyumlu):
+#   {"drone_id": "2", "udp_port": 1881, "seq": 42, "telemetry": {...}}  veya  {"drones": [...]}
+#   seq: gönderici tarafından drone başına artan iletim sırası (eski göndericilerde yok)
+#
+# Binary v1 (anlaşmayla): 6 baytlık çerçeve başlığı + drone başına 61 baytlık sabit kayıt.
+#   Konum MAVLink'teki gibi 1e-7 derece tamsayı (~1 cm), diğer ölçümler float32,
+#   uçuş modu FLIGHT_MODES tablosunda indeks. Bir çerçeve en fazla MAX_DATAGRAM bayt.
+#
+# Anlaşma: gönderici ara ara HELLO (desteklediği biçimler) yollar; alıcı en iyi ortak
+# biçimi ACK ile bildirir. ACK gelmezse veya eskirse gönderici JSON'a döner. Alıcı her
+# datagramın biçimini ilk baytlardan anlar, yani biçim değişimi sırasında veri kaybolmaz.
+
+MAX_DATAGRAM = 1400  # Ethernet MTU 1500 - IP/UDP başlıkları, parçalanma olmasın
+
+FORMAT_JSON = "json"
+FORMAT_BINARY = "bin1"
+SUPPORTED_FORMATS = (FORMAT_BINARY, FORMAT_JSON)  # tercih sırasıyla
+
+WIRE_MAGIC = b"SW"
+WIRE_VERSION = 1
+HELLO_PREFIX = b"SWH"
+ACK_PREFIX = b"SWA"
+
+# magic, version, flags, kayıt sayısı
+FRAME_HEADER = struct.Struct("<2sBBH")
+# drone_id, seq, timestamp, lat(1e-7), lon(1e-7), abs_alt, rel_alt, speed, roll, pitch, yaw,
+# battery_percent, battery_voltage, satellites, fix_type, uptime(s), flight_mode
+RECORD = struct.Struct("<HIdiiffffffffbbIB")
+MAX_RECORDS = (MAX_DATAGRAM - FRAME_HEADER.size) // RECORD.size
+
+UPTIME_UNSET = 0xFFFFFFFF
+COORD_SCALE = 1e7
+COORD_UNSET = -0x80000000
+
+FLIGHT_MODES = (
+    "UNKNOWN", "READY", "TAKEOFF", "HOLD", "MISSION", "RETURN_TO_LAUNCH", "LAND",
+    "OFFBOARD", "FOLLOW_ME", "MANUAL", "ALTCTL", "POSCTL", "ACRO", "STABILIZED", "RATTITUDE",
+)
+_MODE_CODES = {name: code for code, name in enumerate(FLIGHT_MODES)}
+MODE_UNSET = 255
+
+_FLOAT_FIELDS = ("absolute_altitude", "relative_altitude", "speed", "roll", "pitch", "yaw",
+                 "battery_percent", "battery_voltage")
+
+
+def _coord(value):
+    if value is None or value != value:
+        return COORD_UNSET
+    return int(round(value * COORD_SCALE))
+
+
+def _small_int(value):
+    value = getattr(value, "value", value)
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return -1
+    return value if 0 <= value <= 127 else -1
+
+
+def _uptime(value):
+    if value is None:
+        return UPTIME_UNSET
+    if isinstance(value, str) and ":" in value:
+        minutes, seconds = value.split(":", 1)
+        return int(minutes) * 60 + int(seconds)
+    return int(value)
+
+
+def encode_record(drone_id, telemetry, seq=0):
+    get = telemetry.get
+    nan = math.nan
+    mode = get("flight_mode")
+    return RECORD.pack(
+        int(drone_id), seq & 0xFFFFFFFF, get("timestamp") or 0.0,
+        _coord(get("latitude")), _coord(get("longitude")),
+        *[nan if get(name) is None else get(name) for name in _FLOAT_FIELDS],
+        _small_int(get("satellites_visible")), _small_int(get("fix_type")),
+        _uptime(get("uptime")),
+        _MODE_CODES.get(str(mode), 0) if mode is not None else MODE_UNSET,
+    )
+
+
+def encode_frame(records):
+    """Hazır kayıtları tek binary çerçevede birleştirir (en fazla MAX_RECORDS)."""
+    return FRAME_HEADER.pack(WIRE_MAGIC, WIRE_VERSION, 0, len(records)) + b"".join(records)
+
+
+def encode_json(drone_id, telemetry, seq=None, udp_port=None):
+    message = {"drone_id": str(drone_id), "udp_port": udp_port, "telemetry": telemetry}
+    if seq is not None:
+        message["seq"] = seq
+    return json.dumps(message, separators=(",", ":")).encode()
+
+
+def pack_binary(samples, max_datagram=MAX_DATAGRAM):
+    """[(drone_id, telemetri, seq), ...] -> binary çerçeveler; [(datagram, örnek_sayısı), ...]"""
+    per_frame = (max_datagram - FRAME_HEADER.size) // RECORD.size
+    records = [encode_record(drone_id, telemetry, seq or 0) for drone_id, telemetry, seq in samples]
+    return [(encode_frame(records[start:start + per_frame]), len(records[start:start + per_frame]))
+            for start in range(0, len(records), per_frame)]
+
+
+_BATCH_HEAD, _BATCH_TAIL = b'{"drones":[', b"]}"
+
+
+def pack_json(samples, udp_port=None, max_datagram=MAX_DATAGRAM):
+    """
+    [(drone_id, telemetri, seq), ...] -> max_datagram'ı aşmayan JSON datagramları;
+    [(datagram, örnek_sayısı), ...]. Tek örnekli datagram eski tek mesaj biçimindedir.
+    """
+    budget = max_datagram - len(_BATCH_HEAD) - len(_BATCH_TAIL)
+    datagrams, parts, size = [], [], 0
+    for drone_id, telemetry, seq in samples:
+        part = encode_json(drone_id, telemetry, seq, udp_port)
+        extra = len(part) + (1 if parts else 0)
+        if parts and size + extra > budget:
+            datagrams.append(_join_json(parts))
+            parts, size, extra = [], 0, len(part)
+        parts.append(part)
+        size += extra
+    if parts:
+        datagrams.append(_join_json(parts))
+    return datagrams
+
+
+def _join_json(parts):
+    if len(parts) == 1:
+        return parts[0], 1
+    return _BATCH_HEAD + b",".join(parts) + _BATCH_TAIL, len(parts)
+
+
+def _decode_record(values):
+    (drone_id, seq, timestamp, lat, lon, abs_alt, rel_alt, speed, roll, pitch, yaw,
+     battery, voltage, satellites, fix_type, uptime, mode) = values
+    telemetry = {"timestamp": timestamp}
+    if lat != COORD_UNSET:
+        telemetry["latitude"] = lat / COORD_SCALE
+    if lon != COORD_UNSET:
+        telemetry["longitude"] = lon / COORD_SCALE
+    for name, value in zip(_FLOAT_FIELDS, (abs_alt, rel_alt, speed, roll, pitch, yaw, battery, voltage)):
+        if value == value:
+            telemetry[name] = value
+    if satellites >= 0:
+        telemetry["satellites_visible"] = satellites
+    if fix_type >= 0:
+        telemetry["fix_type"] = fix_type
+    if uptime != UPTIME_UNSET:
+        telemetry["uptime"] = f"{uptime // 60:02}:{uptime % 60:02}"
+    if mode != MODE_UNSET:
+        telemetry["flight_mode"] = FLIGHT_MODES[mode] if mode < len(FLIGHT_MODES) else "UNKNOWN"
+    return str(drone_id), seq, telemetry
+
+
+def decode(datagram):
+    """
+    JSON veya binary datagramı [(drone_id, seq, telemetri), ...] listesine çevirir
+    (JSON mesajında seq yoksa None). Bilinmeyen biçimde ValueError.
+    """
+    if datagram[:2] == WIRE_MAGIC and datagram[:3] not in (HELLO_PREFIX, ACK_PREFIX):
+        magic, version, _, count = FRAME_HEADER.unpack_from(datagram, 0)
+        if version != WIRE_VERSION:
+            raise ValueError(f"Desteklenmeyen binary telemetri sürümü: {version}")
+        if len(datagram) < FRAME_HEADER.size + count * RECORD.size:
+            raise ValueError("Kısa binary telemetri çerçevesi")
+        return [_decode_record(values) for values in
+                RECORD.iter_unpack(datagram[FRAME_HEADER.size:FRAME_HEADER.size + count * RECORD.size])]
+    payload = json.loads(datagram)
+    return [(str(item.get("drone_id", "Unknown")), item.get("seq"), item.get("telemetry", {}))
+            for item in payload.get("drones", [payload])]
+
+
+def hello_message(formats=SUPPORTED_FORMATS):
+    return HELLO_PREFIX + json.dumps({"formats": list(formats)}).encode()
+
+
+def ack_message(fmt):
+    return ACK_PREFIX + json.dumps({"format": fmt}).encode()
+
+
+def is_control(datagram):
+    return datagram[:3] in (HELLO_PREFIX, ACK_PREFIX)
+
+
+def choose_format(hello, supported=SUPPORTED_FORMATS):
+    """HELLO'daki biçimlerden alıcının da desteklediği ilkini seçer (yoksa JSON)."""
+    try:
+        offered = json.loads(hello[len(HELLO_PREFIX):]).get("formats", [])
+    except ValueError:
+        return FORMAT_JSON
+    for fmt in offered:
+        if fmt in supported:
+            return fmt
+    return FORMAT_JSON
+
+
+def parse_ack(ack):
+    try:
+        return json.loads(ack[len(ACK_PREFIX):]).get("format", FORMAT_JSON)
+    except ValueError:
+        return FORMAT_JSON
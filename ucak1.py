@@ -2,19 +2,24 @@
 
 import asyncio
 import configparser
-import multiprocessing.shared_memory as shm
-import json
-from mavsdk import System
 from mavsdk.offboard import VelocityNedYaw
-from datetime import datetime
 import os
 import subprocess
 import math
+import weakref
+from telemetry_shm import TelemetrySegment, SHM_NAME
+from spatial_index import SpatialGrid
+from geodesy import offset, bearing, ground_distance, local_frame
+from control_loop import ControlLoop, CONTROL_RATE
+from metrics import DroneMetrics
+from command_arbiter import arbiter_for, AVOIDANCE, FORMATION, CRUISE
+from connection_broker import broker, vehicle_for
+from swarm_config import default_spec
+from flocking_params import (AVOID_DISTANCE, FLOCK_DISTANCE, AVOID_STEP, CRUISE_SPEED,
+                             SEPARATION_GAIN, ALIGNMENT_GAIN, COHESION_GAIN)
 
 GREEN, YELLOW, RED, BLUE, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[94m", "\033[96m", "\033[0m"
 
-SHM_NAME = "telemetry_shared"
-SHM_SIZE = 4096
 
 async def run():
     config = configparser.ConfigParser()
@@ -23,16 +28,13 @@ async def run():
     connection_string = config.get("swarm", "Connection").strip()
 
     print(f"{CYAN}[Drone{drone_id}] Config Okundu: {connection_string}{ENDC}")
-    drone = System(port=50051)
-    await drone.connect(system_address=connection_string)
-
-    try:
-        telemetry_shm = shm.SharedMemory(name=SHM_NAME, create=True, size=SHM_SIZE)
-        telemetry_shm.buf[:2] = b'{}'
-        telemetry_shm.buf[2:] = b'\x00' * (SHM_SIZE - 2)
-        print(f"{GREEN}[SHM] Yeni oluşturuldu ve boş JSON yazıldı.{ENDC}")
-    except FileExistsError:
-        telemetry_shm = shm.SharedMemory(name=SHM_NAME)
+    vehicle = await broker().connect(default_spec(drone_id)._replace(connection=connection_string, grpc_port=50051))
+    drone = vehicle.system
+
+    telemetry_shm = TelemetrySegment.open(SHM_NAME)
+    if telemetry_shm.created:
+        print(f"{GREEN}[SHM] Yeni oluşturuldu ({telemetry_shm.slot_count} slot).{ENDC}")
+    else:
         print(f"{YELLOW}[SHM] Mevcut alana bağlandı.{ENDC}")
 
     subprocess.Popen(["python3", "/home/arda/Masaüstü/listener2.py", drone_id])
@@ -45,95 +47,123 @@ async def run():
 
     await send_telemetry_forever(drone, drone_id, telemetry_shm)
 
-async def send_telemetry_forever(drone, drone_id, telemetry_shm):
-    start_time = datetime.now()
-
+async def send_telemetry_forever(drone, drone_id, telemetry_shm, cache=None):
+    # Aracın paylaşılan önbelleği (akışlara bir kez abone); yayın ve kontrol ayrı görevler
+    # (biri diğerini bekletmez)
+    if cache is None:
+        cache = vehicle_for(drone, drone_id).subscribe()
+    await cache.wait_ready()
+    await asyncio.gather(
+        publish_telemetry(drone_id, telemetry_shm, cache),
+        flocking_loop(drone_id, drone, telemetry_shm),
+    )
+
+async def publish_telemetry(drone_id, telemetry_shm, cache):
+    metrics = DroneMetrics(drone_id)
     while True:
-        try:
-            pos = await drone.telemetry.position().__anext__()
-            vel = await drone.telemetry.position_velocity_ned().__anext__()
-            att = await drone.telemetry.attitude_euler().__anext__()
-            fm = await drone.telemetry.flight_mode().__anext__()
-            bat = await drone.telemetry.battery().__anext__()
-            gps = await drone.telemetry.raw_gps().__anext__()
-
-            data = {
-                "latitude": pos.latitude_deg, "longitude": pos.longitude_deg,
-                "absolute_altitude": pos.absolute_altitude_m,
-                "speed": math.hypot(vel.velocity.north_m_s, vel.velocity.east_m_s),
-                "roll": att.roll_deg, "pitch": att.pitch_deg, "yaw": att.yaw_deg,
-                "flight_mode": str(fm), "battery_percent": bat.remaining_percent * 100,
-                "satellites_visible": getattr(gps, "satellites_visible", "N/A")
-            }
-
-            try:
-                raw = bytes(telemetry_shm.buf[:]).split(b'\x00', 1)[0]
-                current = json.loads(raw.decode("utf-8")) if raw else {}
-            except Exception as e:
-                print(f"{RED}[SHM] JSON okuma hatası: {e}{ENDC}")
-                current = {}
-
-            current[drone_id] = data
-            encoded = json.dumps(current).encode("utf-8")
-
-            if len(encoded) > SHM_SIZE:
-                print(f"{RED}[SHM] Veri büyük! Yazılamıyor.{ENDC}")
-            else:
-                telemetry_shm.buf[:len(encoded)] = encoded
-                telemetry_shm.buf[len(encoded):] = b'\x00' * (SHM_SIZE - len(encoded))
-                print(f"{CYAN}[Drone{drone_id}] Telemetri paylaşıldı.{ENDC}")
-
-            await apply_flocking_and_avoidance(drone_id, data, current, drone)
-            await asyncio.sleep(0.02)
-        except Exception as e:
-            print(f"{RED}Hata: {e}{ENDC}")
-            await asyncio.sleep(0.02)
+        # Yeni mesaj gelince sadece kendi slotumuzu yerinde güncelle
+        await cache.wait_update()
+        started = metrics.shm_write.start()
+        telemetry_shm.write(drone_id, cache.snapshot())
+        metrics.shm_write.stop(started)
+        metrics.published.inc()
+
+async def flocking_loop(drone_id, drone, telemetry_shm, rate=CONTROL_RATE):
+    """apply_flocking_and_avoidance'ı SHM'deki son telemetriyle sabit hızda çağırır."""
+    fields = ("latitude", "longitude", "absolute_altitude", "yaw")
+    metrics = DroneMetrics(drone_id)
+
+    async def tick():
+        started = metrics.shm_read.start()
+        current = telemetry_shm.read_all(fields)
+        metrics.shm_read.stop(started)
+        my = current.get(drone_id)
+        if not my or any(my.get(name) is None for name in fields):
+            return
+        await apply_flocking_and_avoidance(drone_id, my, current, drone)
+
+    await ControlLoop(f"Drone{drone_id} flocking", rate).run(tick)
 
 def calculate_distance(lat1, lon1, lat2, lon2):
-    R = 6371000
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlambda = math.radians(lon2 - lon1)
-    a = math.sin(dphi/2)**2 + math.cos(phi1)*math.cos(phi2)*math.sin(dlambda/2)**2
-    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    return ground_distance(lat1, lon1, lat2, lon2)
 
-async def apply_flocking_and_avoidance(drone_id, my, all_data, drone):
+AVOID_HOLD = 3         # GOTO kaçınması sürerken hız komutu gönderilmeyen süre (s)
+
+def flocking_decision(my, nearest, dist):
+    """
+    ("avoid", (lat, lon, alt, yaw)) GOTO hedefi veya ("flock"/"free", (vx, vy, vz, yaw))
+    hız komutu döner. flocking_kernel.flocking_commands bunun vektörel karşılığıdır.
+    """
     my_lat, my_lon, my_yaw = my["latitude"], my["longitude"], my["yaw"]
+    d_east, d_north = offset(my, nearest)
 
-    others = [d for oid, d in all_data.items() if oid != drone_id]
-    if not others:
-        await drone.offboard.set_velocity_ned(VelocityNedYaw(1.0, 0.0, 0.0, my_yaw))
-        return
-
-    nearest = min(others, key=lambda o: calculate_distance(my_lat, my_lon, o["latitude"], o["longitude"]))
-    dist = calculate_distance(my_lat, my_lon, nearest["latitude"], nearest["longitude"])
-
-    if dist < 7:
-        print(f"{RED}🚨 Kaçınma: {dist:.1f}m{ENDC}")
-        angle = math.atan2(my_lon - nearest["longitude"], my_lat - nearest["latitude"])
-        lat = math.degrees(math.radians(my_lat) + (5 / 6371000) * math.cos(angle))
-        lon = math.degrees(math.radians(my_lon) + (5 / 6371000) * math.sin(angle) / math.cos(math.radians(my_lat)))
-        try:
-            await drone.action.goto_location(lat, lon, my["absolute_altitude"], math.degrees(angle))
-            await asyncio.sleep(3)
-        except Exception as e:
-            print(f"{RED}[Kaçınma GOTO Hatası] {e}{ENDC}")
-
-    elif 7 <= dist <= 30:
-        print(f"{CYAN}🔄 Flocking Aktif: {dist:.1f}m{ENDC}")
-        sep_angle = math.atan2(my_lon - nearest["longitude"], my_lat - nearest["latitude"])
+    if dist < AVOID_DISTANCE:
+        angle = bearing(-d_east, -d_north)
+        lat, lon = local_frame(my_lat, my_lon).displace(my_lat, my_lon, AVOID_STEP * math.sin(angle),
+                                                        AVOID_STEP * math.cos(angle))
+        return "avoid", (lat, lon, my["absolute_altitude"], math.degrees(angle))
+
+    elif AVOID_DISTANCE <= dist <= FLOCK_DISTANCE:
+        sep_angle = bearing(-d_east, -d_north)
         ali_angle = math.radians(nearest["yaw"])
-        coh_angle = math.atan2(nearest["longitude"] - my_lon, nearest["latitude"] - my_lat)
+        coh_angle = bearing(d_east, d_north)
 
-        vx = 2 * math.cos(sep_angle) + 1 * math.cos(ali_angle) + 1 * math.cos(coh_angle)
-        vy = 2 * math.sin(sep_angle) + 1 * math.sin(ali_angle) + 1 * math.sin(coh_angle)
+        vx = SEPARATION_GAIN * math.cos(sep_angle) + ALIGNMENT_GAIN * math.cos(ali_angle) + COHESION_GAIN * math.cos(coh_angle)
+        vy = SEPARATION_GAIN * math.sin(sep_angle) + ALIGNMENT_GAIN * math.sin(ali_angle) + COHESION_GAIN * math.sin(coh_angle)
         final_yaw = math.degrees(math.atan2(vy, vx))
+        return "flock", (CRUISE_SPEED, 0.0, 0.0, final_yaw)
+
+    return "free", (CRUISE_SPEED, 0.0, 0.0, my_yaw)
 
-        await drone.offboard.set_velocity_ned(VelocityNedYaw(1.0, 0.0, 0.0, final_yaw))
+_grid = SpatialGrid()
+_avoid_until = weakref.WeakKeyDictionary()  # drone -> GOTO kaçınmasının bittiği döngü zamanı
+_last_mode = weakref.WeakKeyDictionary()     # drone -> son karar modu (sadece değişince yazılır)
+_metrics = weakref.WeakKeyDictionary()       # drone -> DroneMetrics
 
+async def apply_flocking_and_avoidance(drone_id, my, all_data, drone):
+    """
+    Tek karar; asla beklemez. Komutlar drone'un hakemine bırakılır (command_arbiter).
+    GOTO kaçınması AVOID_HOLD boyunca diğer komutlardan önceliklidir ve bu sürede yeni
+    karar verilmez (eskiden burada sleep(3) tüm döngüyü durduruyordu); süre dolunca hakem
+    GOTO'nun çıkardığı offboard moduna geri döner.
+    """
+    now = asyncio.get_running_loop().time()
+    if drone in _avoid_until:
+        if now < _avoid_until[drone]:
+            return
+        del _avoid_until[drone]
+    my_lat, my_lon, my_yaw = my["latitude"], my["longitude"], my["yaw"]
+    metrics = _metrics.get(drone)
+    if metrics is None:
+        metrics = _metrics[drone] = DroneMetrics(drone_id)
+
+    # Izgarayı SHM anlık görüntüsüyle artımlı eşitle, en yakın drone'u sorgula
+    started = metrics.neighbor_search.start()
+    _grid.sync(all_data)
+    _grid.update(drone_id, my_lat, my_lon)
+    neighbors = _grid.nearest_to(drone_id, 1)
+    metrics.neighbor_search.stop(started)
+    if not neighbors:
+        mode, command = "free", (CRUISE_SPEED, 0.0, 0.0, my_yaw)
+    else:
+        dist, nearest_id = neighbors[0]
+        started = metrics.decision.start()
+        mode, command = flocking_decision(my, all_data[nearest_id], dist)
+        metrics.decision.stop(started)
+    metrics.mode(mode).inc()
+
+    # Her tick'te değil, sadece mod değişince yaz
+    if neighbors and _last_mode.get(drone) != mode:
+        label = {"avoid": f"{RED}🚨 Kaçınma", "flock": f"{CYAN}🔄 Flocking Aktif"}.get(mode, f"{YELLOW}🟢 Serbest uçuş")
+        print(f"{label}: {dist:.1f}m{ENDC}")
+    _last_mode[drone] = mode
+
+    arbiter = arbiter_for(drone, drone_id)
+    if mode == "avoid":
+        arbiter.goto("avoid", command, AVOIDANCE, lease=AVOID_HOLD)
+        _avoid_until[drone] = now + AVOID_HOLD
     else:
-        print(f"{YELLOW}🟢 Serbest uçuş: {dist:.1f}m{ENDC}")
-        await drone.offboard.set_velocity_ned(VelocityNedYaw(1.0, 0.0, 0.0, my_yaw))
+        arbiter.velocity("flocking", command, FORMATION if mode == "flock" else CRUISE)
 
 if __name__ == "__main__":
     asyncio.run(run())
@@ -1,224 +1,56 @@
 #!/usr/bin/env python3
 
+import argparse
 import asyncio
-import configparser
-import multiprocessing.shared_memory as shm
-import json
-from mavsdk import System
-from mavsdk.offboard import VelocityNedYaw
-import os
-import math
 from datetime import datetime
+from telemetry_shm import TelemetrySegment, SHM_NAME
+from swarm_config import read_drone_config, config_path
+from ucak111 import telemetry_collector, flocking_controller, start_flight, TARGET_DISTANCE
+from flocking1 import flock
+from connection_broker import broker
 
 GREEN, YELLOW, RED, BLUE, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[94m", "\033[96m", "\033[0m"
-SHM_NAME = "telemetry_shared"
-SHM_SIZE = 4096
 
-async def telemetry_collector(drone, drone_id, telemetry_shm):
-    """
-    Tüm telemetry streamlerini paralel takip eder, shared memory'ye yazar.
-    """
-    last = {}
-    lock = asyncio.Lock()
-
-    async def update_position():
-        async for pos in drone.telemetry.position():
-            async with lock:
-                last['latitude'] = pos.latitude_deg
-                last['longitude'] = pos.longitude_deg
-                last['absolute_altitude'] = pos.absolute_altitude_m
-
-    async def update_velocity():
-        async for vel in drone.telemetry.position_velocity_ned():
-            async with lock:
-                last['speed'] = math.hypot(vel.velocity.north_m_s, vel.velocity.east_m_s)
-
-    async def update_attitude():
-        async for att in drone.telemetry.attitude_euler():
-            async with lock:
-                last['roll'] = att.roll_deg
-                last['pitch'] = att.pitch_deg
-                last['yaw'] = att.yaw_deg
-
-    async def update_flight_mode():
-        async for fm in drone.telemetry.flight_mode():
-            async with lock:
-                last['flight_mode'] = str(fm)
-
-    async def update_battery():
-        async for bat in drone.telemetry.battery():
-            async with lock:
-                last['battery_percent'] = bat.remaining_percent * 100
-
-    async def update_gps():
-        async for gps in drone.telemetry.raw_gps():
-            async with lock:
-                last['satellites_visible'] = getattr(gps, "satellites_visible", "N/A")
-
-    # SHM'ye güvenli yazıcı
-    async def publisher():
-        while True:
-            async with lock:
-                try:
-                    raw = bytes(telemetry_shm.buf[:]).split(b'\x00', 1)[0]
-                    try:
-                        current = json.loads(raw.decode("utf-8")) if raw else {}
-                    except Exception:
-                        current = {}
-                except Exception:
-                    current = {}
-
-                current[drone_id] = last.copy()
-                encoded = json.dumps(current).encode("utf-8")
-                if len(encoded) < SHM_SIZE:
-                    telemetry_shm.buf[:len(encoded)] = encoded
-                    telemetry_shm.buf[len(encoded):] = b'\x00' * (SHM_SIZE - len(encoded))
-                else:
-                    print(f"{RED}[SHM] Veri büyük!{ENDC}")
-            await asyncio.sleep(0.01)
-
-    await asyncio.gather(
-        update_position(),
-        update_velocity(),
-        update_attitude(),
-        update_flight_mode(),
-        update_battery(),
-        update_gps(),
-        publisher()
-    )
-
-async def flocking_controller(drone_id, drone, telemetry_shm):
-    ESCAPE_DISTANCE = 10
-    TARGET_DISTANCE = 15   # Sabit mesafe hedefi (kohezyon)
-    COHESION_SPEED = 1.2   # Kohezyon/sabit mesafe yaklaşma hızı
-    ESCAPE_SPEED = 3.5     # Kaçınma hızı
-    NORMAL_SPEED = 0.8     # Serbest uçuş hızı
-
-    while True:
-        try:
-            # SHM'den oku
-            for _ in range(3):
-                try:
-                    raw = bytes(telemetry_shm.buf[:]).split(b'\x00', 1)[0]
-                    all_data = json.loads(raw.decode("utf-8")) if raw else {}
-                    break
-                except Exception as e:
-                    all_data = {}
-                    await asyncio.sleep(0.01)
-            else:
-                print(f"{RED}[Flocking SHM Hatası]: JSON okunamıyor!{ENDC}")
-                await asyncio.sleep(0.02)
-                continue
-
-            my = all_data.get(drone_id)
-            if not my:
-                await asyncio.sleep(0.02)
-                continue
-
-            my_lat, my_lon, my_yaw = my.get("latitude"), my.get("longitude"), my.get("yaw")
-            others = [d for oid, d in all_data.items() if oid != drone_id and "latitude" in d]
-            if not others:
-                await drone.offboard.set_velocity_ned(VelocityNedYaw(NORMAL_SPEED, 0.0, 0.0, my_yaw or 0))
-                await asyncio.sleep(0.05)
-                continue
+async def run(config_file=config_path(1), flock_with=None):
+    spec = read_drone_config(config_file)
+    drone_id = spec.drone_id
 
-            # En yakın drone
-            nearest = min(
-                others,
-                key=lambda o: calculate_distance(my_lat, my_lon, o["latitude"], o["longitude"])
-            )
-            dist = calculate_distance(my_lat, my_lon, nearest["latitude"], nearest["longitude"])
-            yaw_to_other = math.degrees(math.atan2(nearest["longitude"] - my_lon, nearest["latitude"] - my_lat))
-
-            if dist < ESCAPE_DISTANCE:
-                print(f"{RED}🚨 Kaçınma: {dist:.1f}m{ENDC}")
-                # Kaçınma vektörü
-                angle = math.atan2(my_lon - nearest["longitude"], my_lat - nearest["latitude"])
-                vx = ESCAPE_SPEED * math.cos(angle)
-                vy = ESCAPE_SPEED * math.sin(angle)
-                await drone.offboard.set_velocity_ned(VelocityNedYaw(vx, vy, 0.0, my_yaw or 0))
-                await asyncio.sleep(0.2)
-
-            elif ESCAPE_DISTANCE <= dist < (TARGET_DISTANCE - 1):
-                # 10-14m: Uzaklaş (kohezyon - sabit mesafeye çekil)
-                print(f"{CYAN}⬅️ Kohezyon (Uzaklaş): {dist:.1f}m{ENDC}")
-                angle = math.atan2(my_lon - nearest["longitude"], my_lat - nearest["latitude"])
-                vx = COHESION_SPEED * math.cos(angle)
-                vy = COHESION_SPEED * math.sin(angle)
-                await drone.offboard.set_velocity_ned(VelocityNedYaw(vx, vy, 0.0, yaw_to_other))
-                await asyncio.sleep(0.15)
-
-            elif (TARGET_DISTANCE - 1) <= dist <= (TARGET_DISTANCE + 1):
-                # 14-16m: Sabit tut
-                print(f"{GREEN}✅ Mesafe Sabit: {dist:.1f}m{ENDC}")
-                await drone.offboard.set_velocity_ned(VelocityNedYaw(0.0, 0.0, 0.0, my_yaw or 0))
-                await asyncio.sleep(0.15)
-
-            elif dist > (TARGET_DISTANCE + 1):
-                # 16m üstü: yaklaş (kohezyon)
-                print(f"{BLUE}➡️ Kohezyon (Yaklaş): {dist:.1f}m{ENDC}")
-                angle = math.atan2(nearest["longitude"] - my_lon, nearest["latitude"] - my_lat)
-                vx = COHESION_SPEED * math.cos(angle)
-                vy = COHESION_SPEED * math.sin(angle)
-                await drone.offboard.set_velocity_ned(VelocityNedYaw(vx, vy, 0.0, yaw_to_other))
-                await asyncio.sleep(0.15)
-
-            else:
-                print(f"{YELLOW}🟢 Serbest uçuş: {dist:.1f}m{ENDC}")
-                await drone.offboard.set_velocity_ned(VelocityNedYaw(NORMAL_SPEED, 0.0, 0.0, my_yaw or 0))
-                await asyncio.sleep(0.25)
-
-        except Exception as e:
-            print(f"{RED}[Flocking Controller Hatası]: {e}{ENDC}")
-            await asyncio.sleep(0.05)
-
-def calculate_distance(lat1, lon1, lat2, lon2):
-    if None in (lat1, lon1, lat2, lon2):
-        return 1e9
-    R = 6371000
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlambda = math.radians(lon2 - lon1)
-    a = math.sin(dphi/2)**2 + math.cos(phi1)*math.cos(phi2)*math.sin(dlambda/2)**2
-    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-async def run():
-    config = configparser.ConfigParser()
-    config.read(os.path.expanduser("~/Masaüstü/drone1_config.ini"))
-    drone_id = config.get("swarm", "ID").strip()
-    connection_string = config.get("swarm", "Connection").strip()
-
-    print(f"{CYAN}[Drone{drone_id}] Config Okundu: {connection_string}{ENDC}")
-    drone = System(port=50051)
-    await drone.connect(system_address=connection_string)
+    print(f"{CYAN}[Drone{drone_id}] Config Okundu: {spec.connection}{ENDC}")
+    drone = (await broker().connect(spec)).system
 
     # SHM aç
-    try:
-        telemetry_shm = shm.SharedMemory(name=SHM_NAME, create=True, size=SHM_SIZE)
-        telemetry_shm.buf[:2] = b'{}'
-        telemetry_shm.buf[2:] = b'\x00' * (SHM_SIZE - 2)
-        print(f"{GREEN}[SHM] Yeni oluşturuldu ve boş JSON yazıldı.{ENDC}")
-    except FileExistsError:
-        telemetry_shm = shm.SharedMemory(name=SHM_NAME)
+    telemetry_shm = TelemetrySegment.open(SHM_NAME)
+    if telemetry_shm.created:
+        print(f"{GREEN}[SHM] Yeni oluşturuldu ({telemetry_shm.slot_count} slot).{ENDC}")
+    else:
         print(f"{YELLOW}[SHM] Mevcut alana bağlandı.{ENDC}")
 
-    print(f"{BLUE}[Drone{drone_id}] Arming başlatılıyor...{ENDC}")
-    await drone.action.arm()
-    await asyncio.sleep(4)  # Arming sonrası kısa bekleme
-
-    print(f"{BLUE}[Drone{drone_id}] Takeoff başlatılıyor...{ENDC}")
-    await drone.action.takeoff()
-    await asyncio.sleep(22)  # Takeoff sonrası drone havalansın (10 saniye!)
-
-    print(f"{BLUE}[Drone{drone_id}] Offboard başlatılıyor...{ENDC}")
-    await drone.offboard.set_velocity_ned(VelocityNedYaw(0.0, 0.0, 0.0, 0.0))
-    await drone.offboard.start()
+    # Arm/takeoff/offboard adımları hazır olma sinyalleriyle ilerler
+    await start_flight(drone, drone_id)
 
-    await asyncio.gather(
+    tasks = [
         telemetry_collector(drone, drone_id, telemetry_shm),
         flocking_controller(drone_id, drone, telemetry_shm)
-    )
+    ]
+    if flock_with:
+        tasks.append(flock_companion(drone_id, flock_with, drone, telemetry_shm))
+    await asyncio.gather(*tasks)
+
+def flock_companion(drone_id, other_id, drone, telemetry_shm):
+    """
+    ucak111 ile birlikte koşan flocking1 (ucak11 --flock-with; replay ve swarm_sim de bunu kullanır).
+    GOTO'lar aynı bağlantı (broker) ve aynı hakem üzerinden gider (ayrı süreçte çalışınca
+    ikinci bir System açıyor, hız komutlarıyla çakışıyordu). flocking1'in ağırlıklı hedefi her
+    zaman uzaklaştırır ve ucak111'in TARGET_DISTANCE bandıyla SEE_RADIUS çevresinde salınırdı;
+    burada aynı bandı tutar: bant dışında mesafeyi GOTO düzeltir (FLOCK önceliği), bantta
+    ve kaçınmada ucak111 hız komutları kalır.
+    """
+    return flock(drone_id, other_id=other_id, drone=drone, segment=telemetry_shm, spacing=TARGET_DISTANCE)
 
 if __name__ == "__main__":
-    asyncio.run(run())
+    parser = argparse.ArgumentParser(description="ucak111 kontrolcüsüyle tek drone")
+    parser.add_argument("--config", default=config_path(1))
+    parser.add_argument("--flock-with", metavar="ID", help="flocking1 ile bu drone'u da izle (aynı süreçte)")
+    args = parser.parse_args()
+    asyncio.run(run(args.config, args.flock_with))
 
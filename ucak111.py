@@ -1,222 +1,171 @@
 #!/usr/bin/env python3
 
 import asyncio
-import configparser
-import multiprocessing.shared_memory as shm
-import json
-from mavsdk import System
 from mavsdk.offboard import VelocityNedYaw
-import os
 import math
 from datetime import datetime
+from telemetry_shm import TelemetrySegment, SHM_NAME
+from swarm_config import read_drone_config, config_path
+from spatial_index import shared_index
+from geodesy import offset, bearing, ground_distance
+from control_loop import ControlLoop, CONTROL_RATE
+from metrics import DroneMetrics
+from readiness import StageTimer, wait_healthy, wait_in_air, wait_altitude
+from command_arbiter import arbiter_for, AVOIDANCE, FORMATION, CRUISE
+from flocking_params import ESCAPE_DISTANCE, TARGET_DISTANCE, COHESION_SPEED, ESCAPE_SPEED, NORMAL_SPEED
+from connection_broker import broker, vehicle_for
 
 GREEN, YELLOW, RED, BLUE, CYAN, ENDC = "\033[92m", "\033[93m", "\033[91m", "\033[94m", "\033[96m", "\033[0m"
-SHM_NAME = "telemetry_shared"
-SHM_SIZE = 4096
 
 async def telemetry_collector(drone, drone_id, telemetry_shm):
     """
-    Tüm telemetry streamlerini paralel takip eder, shared memory'ye yazar.
+    Aracın paylaşılan telemetri önbelleğinden (connection_broker; her akışa bir kez
+    abone) son değerleri shared memory'ye yazar.
     """
-    last = {}
-    lock = asyncio.Lock()
-
-    async def update_position():
-        async for pos in drone.telemetry.position():
-            async with lock:
-                last['latitude'] = pos.latitude_deg
-                last['longitude'] = pos.longitude_deg
-                last['absolute_altitude'] = pos.absolute_altitude_m
-
-    async def update_velocity():
-        async for vel in drone.telemetry.position_velocity_ned():
-            async with lock:
-                last['speed'] = math.hypot(vel.velocity.north_m_s, vel.velocity.east_m_s)
-
-    async def update_attitude():
-        async for att in drone.telemetry.attitude_euler():
-            async with lock:
-                last['roll'] = att.roll_deg
-                last['pitch'] = att.pitch_deg
-                last['yaw'] = att.yaw_deg
-
-    async def update_flight_mode():
-        async for fm in drone.telemetry.flight_mode():
-            async with lock:
-                last['flight_mode'] = str(fm)
-
-    async def update_battery():
-        async for bat in drone.telemetry.battery():
-            async with lock:
-                last['battery_percent'] = bat.remaining_percent * 100
-
-    async def update_gps():
-        async for gps in drone.telemetry.raw_gps():
-            async with lock:
-                last['satellites_visible'] = getattr(gps, "satellites_visible", "N/A")
-
-    # SHM'ye güvenli yazıcı
-    async def publisher():
+    metrics = DroneMetrics(drone_id)
+    with vehicle_for(drone, drone_id).subscribe() as telemetry:
         while True:
-            async with lock:
-                try:
-                    raw = bytes(telemetry_shm.buf[:]).split(b'\x00', 1)[0]
-                    try:
-                        current = json.loads(raw.decode("utf-8")) if raw else {}
-                    except Exception:
-                        current = {}
-                except Exception:
-                    current = {}
-
-                current[drone_id] = last.copy()
-                encoded = json.dumps(current).encode("utf-8")
-                if len(encoded) < SHM_SIZE:
-                    telemetry_shm.buf[:len(encoded)] = encoded
-                    telemetry_shm.buf[len(encoded):] = b'\x00' * (SHM_SIZE - len(encoded))
-                else:
-                    print(f"{RED}[SHM] Veri büyük!{ENDC}")
-            await asyncio.sleep(0.01)
-
-    await asyncio.gather(
-        update_position(),
-        update_velocity(),
-        update_attitude(),
-        update_flight_mode(),
-        update_battery(),
-        update_gps(),
-        publisher()
-    )
-
-async def flocking_controller(drone_id, drone, telemetry_shm):
-    ESCAPE_DISTANCE = 10
-    TARGET_DISTANCE = 15   # Sabit mesafe hedefi (kohezyon)
-    COHESION_SPEED = 1.2   # Kohezyon/sabit mesafe yaklaşma hızı
-    ESCAPE_SPEED = 3.5     # Kaçınma hızı
-    NORMAL_SPEED = 0.8     # Serbest uçuş hızı
-
-    while True:
-        try:
-            # SHM'den oku
-            for _ in range(3):
-                try:
-                    raw = bytes(telemetry_shm.buf[:]).split(b'\x00', 1)[0]
-                    all_data = json.loads(raw.decode("utf-8")) if raw else {}
-                    break
-                except Exception as e:
-                    all_data = {}
-                    await asyncio.sleep(0.01)
-            else:
-                print(f"{RED}[Flocking SHM Hatası]: JSON okunamıyor!{ENDC}")
-                await asyncio.sleep(0.02)
-                continue
-
-            my = all_data.get(drone_id)
-            if not my:
-                await asyncio.sleep(0.02)
-                continue
-
-            my_lat, my_lon, my_yaw = my.get("latitude"), my.get("longitude"), my.get("yaw")
-            others = [d for oid, d in all_data.items() if oid != drone_id and "latitude" in d]
-            if not others:
-                await drone.offboard.set_velocity_ned(VelocityNedYaw(NORMAL_SPEED, 0.0, 0.0, my_yaw or 0))
-                await asyncio.sleep(0.05)
-                continue
-
-            # En yakın drone
-            nearest = min(
-                others,
-                key=lambda o: calculate_distance(my_lat, my_lon, o["latitude"], o["longitude"])
-            )
-            dist = calculate_distance(my_lat, my_lon, nearest["latitude"], nearest["longitude"])
-            yaw_to_other = math.degrees(math.atan2(nearest["longitude"] - my_lon, nearest["latitude"] - my_lat))
-
-            if dist < ESCAPE_DISTANCE:
-                print(f"{RED}🚨 Kaçınma: {dist:.1f}m{ENDC}")
-                # Kaçınma vektörü
-                angle = math.atan2(my_lon - nearest["longitude"], my_lat - nearest["latitude"])
-                vx = ESCAPE_SPEED * math.cos(angle)
-                vy = ESCAPE_SPEED * math.sin(angle)
-                await drone.offboard.set_velocity_ned(VelocityNedYaw(vx, vy, 0.0, my_yaw or 0))
-                await asyncio.sleep(0.2)
-
-            elif ESCAPE_DISTANCE <= dist < (TARGET_DISTANCE - 1):
-                # 10-14m: Uzaklaş (kohezyon - sabit mesafeye çekil)
-                print(f"{CYAN}⬅️ Kohezyon (Uzaklaş): {dist:.1f}m{ENDC}")
-                angle = math.atan2(my_lon - nearest["longitude"], my_lat - nearest["latitude"])
-                vx = COHESION_SPEED * math.cos(angle)
-                vy = COHESION_SPEED * math.sin(angle)
-                await drone.offboard.set_velocity_ned(VelocityNedYaw(vx, vy, 0.0, yaw_to_other))
-                await asyncio.sleep(0.15)
-
-            elif (TARGET_DISTANCE - 1) <= dist <= (TARGET_DISTANCE + 1):
-                # 14-16m: Sabit tut
-                print(f"{GREEN}✅ Mesafe Sabit: {dist:.1f}m{ENDC}")
-                await drone.offboard.set_velocity_ned(VelocityNedYaw(0.0, 0.0, 0.0, my_yaw or 0))
-                await asyncio.sleep(0.15)
-
-            elif dist > (TARGET_DISTANCE + 1):
-                # 16m üstü: yaklaş (kohezyon)
-                print(f"{BLUE}➡️ Kohezyon (Yaklaş): {dist:.1f}m{ENDC}")
-                angle = math.atan2(nearest["longitude"] - my_lon, nearest["latitude"] - my_lat)
-                vx = COHESION_SPEED * math.cos(angle)
-                vy = COHESION_SPEED * math.sin(angle)
-                await drone.offboard.set_velocity_ned(VelocityNedYaw(vx, vy, 0.0, yaw_to_other))
-                await asyncio.sleep(0.15)
-
-            else:
-                print(f"{YELLOW}🟢 Serbest uçuş: {dist:.1f}m{ENDC}")
-                await drone.offboard.set_velocity_ned(VelocityNedYaw(NORMAL_SPEED, 0.0, 0.0, my_yaw or 0))
-                await asyncio.sleep(0.25)
-
-        except Exception as e:
-            print(f"{RED}[Flocking Controller Hatası]: {e}{ENDC}")
-            await asyncio.sleep(0.05)
+            # Yeni mesaj gelince hemen yaz; veri yoksa uyu (yazım dinleyicileri uyandırır)
+            await telemetry.wait_update()
+            # Sadece kendi slotumuzu yerinde güncelle
+            started = metrics.shm_write.start()
+            telemetry_shm.write(drone_id, telemetry.snapshot())
+            metrics.shm_write.stop(started)
+            metrics.published.inc()
+
+
+# Mod -> (renk, mesaj)
+FLOCKING_MODES = {
+    "escape": (RED, "🚨 Kaçınma"),
+    "retreat": (CYAN, "⬅️ Kohezyon (Uzaklaş)"),
+    "hold": (GREEN, "✅ Mesafe Sabit"),
+    "approach": (BLUE, "➡️ Kohezyon (Yaklaş)"),
+    "free": (YELLOW, "🟢 Serbest uçuş"),
+}
+# Mod -> hakem önceliği (aynı drone'u süren diğer kaynaklara karşı)
+MODE_PRIORITY = {"escape": AVOIDANCE, "retreat": FORMATION, "hold": FORMATION,
+                 "approach": FORMATION, "free": CRUISE}
+
+def flocking_decision(my, nearest, dist):
+    """
+    En yakın drone'a göre mod ve VelocityNedYaw değerlerini (vx, vy, vz, yaw) döner.
+    flocking_kernel.band_commands bunun vektörel karşılığıdır.
+    """
+    my_yaw = my.get("yaw")
+    # Yönler metre cinsinden ENU farkından (ham derece farkı doğuyu cos(lat) kadar sıkıştırır)
+    d_east, d_north = offset(my, nearest)
+    yaw_to_other = math.degrees(bearing(d_east, d_north))
+
+    if dist < ESCAPE_DISTANCE:
+        # Kaçınma vektörü
+        angle = bearing(-d_east, -d_north)
+        return "escape", (ESCAPE_SPEED * math.cos(angle), ESCAPE_SPEED * math.sin(angle), 0.0, my_yaw or 0)
+
+    elif ESCAPE_DISTANCE <= dist < (TARGET_DISTANCE - 1):
+        # 10-14m: Uzaklaş (kohezyon - sabit mesafeye çekil)
+        angle = bearing(-d_east, -d_north)
+        return "retreat", (COHESION_SPEED * math.cos(angle), COHESION_SPEED * math.sin(angle), 0.0, yaw_to_other)
+
+    elif (TARGET_DISTANCE - 1) <= dist <= (TARGET_DISTANCE + 1):
+        # 14-16m: Sabit tut
+        return "hold", (0.0, 0.0, 0.0, my_yaw or 0)
+
+    elif dist > (TARGET_DISTANCE + 1):
+        # 16m üstü: yaklaş (kohezyon)
+        angle = bearing(d_east, d_north)
+        return "approach", (COHESION_SPEED * math.cos(angle), COHESION_SPEED * math.sin(angle), 0.0, yaw_to_other)
+
+    return "free", (NORMAL_SPEED, 0.0, 0.0, my_yaw or 0)
+
+async def flocking_controller(drone_id, drone, telemetry_shm, rate=CONTROL_RATE):
+    """
+    Yeni telemetride hemen, yoksa sabit hızda (rate Hz) karar verir ve setpoint'i hakeme
+    bırakır; tekrar eden setpoint'ler gönderilmez, değişmeyen setpoint sadece canlı tutma hızında gider
+    (command_arbiter). Tick gecikmeleri ControlLoop'ta kaydedilir. Telemetri yazımı
+    (telemetry_collector) ayrı görevdir, kontrol döngüsünü beklemez.
+    """
+    # Aynı süreçteki tüm kontrolcüler tek ızgarayı paylaşır
+    index = shared_index(telemetry_shm)
+    metrics = DroneMetrics(drone_id)
+    arbiter = arbiter_for(drone, drone_id)
+    last_mode = None
+
+    async def tick():
+        nonlocal last_mode
+        # SHM'den sadece değişen slotları oku, ızgarayı güncelle
+        started = metrics.shm_read.start()
+        all_data = index.refresh(asyncio.get_running_loop().time())
+        metrics.shm_read.stop(started)
+        my = all_data.get(drone_id)
+        if not my:
+            # Kendi telemetrimiz yazılana kadar komut yok
+            return
+
+        # En yakın drone (ızgara sorgusu, tüm sürü taranmaz)
+        started = metrics.neighbor_search.start()
+        neighbors = index.nearest(drone_id, 1)
+        metrics.neighbor_search.stop(started)
+        if not neighbors:
+            mode, setpoint = "free", (NORMAL_SPEED, 0.0, 0.0, my.get("yaw") or 0)
+        else:
+            dist, _, nearest = neighbors[0]
+            started = metrics.decision.start()
+            mode, setpoint = flocking_decision(my, nearest, dist)
+            metrics.decision.stop(started)
+            # Sadece mod değişince yaz (her tick'te değil); sayılar metrics'te
+            if mode != last_mode:
+                color, label = FLOCKING_MODES[mode]
+                print(f"{color}[Drone{drone_id}] {label}: {dist:.1f}m{ENDC}")
+        last_mode = mode
+        metrics.mode(mode).inc()
+        arbiter.velocity("flocking", setpoint, MODE_PRIORITY[mode])
+
+    # Yeni telemetri yazılınca son tarihi beklemeden karar ver (telemetry_notify); veri
+    # gelmezse sabit hız taban olarak sürer
+    await ControlLoop(f"Drone{drone_id} flocking", rate).run(tick, telemetry_shm.change_listener())
 
 def calculate_distance(lat1, lon1, lat2, lon2):
     if None in (lat1, lon1, lat2, lon2):
         return 1e9
-    R = 6371000
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlambda = math.radians(lon2 - lon1)
-    a = math.sin(dphi/2)**2 + math.cos(phi1)*math.cos(phi2)*math.sin(dlambda/2)**2
-    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-async def run():
-    config = configparser.ConfigParser()
-    config.read(os.path.expanduser("~/Masaüstü/drone1_config.ini"))
-    drone_id = config.get("swarm", "ID").strip()
-    connection_string = config.get("swarm", "Connection").strip()
-
-    print(f"{CYAN}[Drone{drone_id}] Config Okundu: {connection_string}{ENDC}")
-    drone = System(port=50051)
-    await drone.connect(system_address=connection_string)
+    return ground_distance(lat1, lon1, lat2, lon2)
+
+async def start_flight(drone, drone_id, timer=None):
+    """
+    Arm -> takeoff -> offboard sırası. Sabit beklemeler yerine her adım bir öncekinin
+    gerçekten tamamlanmasını bekler (health_all_ok, in_air, kalkış irtifası).
+    """
+    timer = timer or StageTimer(f"Drone{drone_id}")
+    print(f"{BLUE}[Drone{drone_id}] Arming başlatılıyor...{ENDC}")
+    await timer.stage("health", wait_healthy(drone))
+    await timer.stage("arm", drone.action.arm())
+
+    print(f"{BLUE}[Drone{drone_id}] Takeoff başlatılıyor...{ENDC}")
+    altitude = await drone.action.get_takeoff_altitude()
+    await timer.stage("takeoff", drone.action.takeoff())
+    await timer.stage("in_air", wait_in_air(drone))
+    await timer.stage("altitude", wait_altitude(drone, altitude))
+
+    print(f"{BLUE}[Drone{drone_id}] Offboard başlatılıyor...{ENDC}")
+    await drone.offboard.set_velocity_ned(VelocityNedYaw(0.0, 0.0, 0.0, 0.0))
+    await timer.stage("offboard", drone.offboard.start())
+    return timer
+
+async def run(config_file=config_path(1)):
+    spec = read_drone_config(config_file)
+    drone_id = spec.drone_id
+
+    print(f"{CYAN}[Drone{drone_id}] Config Okundu: {spec.connection}{ENDC}")
+    drone = (await broker().connect(spec)).system
 
     # SHM aç
-    created_new_shm = False
-    try:
-        telemetry_shm = shm.SharedMemory(name=SHM_NAME, create=True, size=SHM_SIZE)
-        created_new_shm = True
-        telemetry_shm.buf[:2] = b'{}'
-        telemetry_shm.buf[2:] = b'\x00' * (SHM_SIZE - 2)
-        print(f"{GREEN}[SHM] Yeni oluşturuldu ve boş JSON yazıldı.{ENDC}")
-    except FileExistsError:
-        telemetry_shm = shm.SharedMemory(name=SHM_NAME)
+    telemetry_shm = TelemetrySegment.open(SHM_NAME)
+    if telemetry_shm.created:
+        print(f"{GREEN}[SHM] Yeni oluşturuldu ({telemetry_shm.slot_count} slot).{ENDC}")
+    else:
         print(f"{YELLOW}[SHM] Mevcut alana bağlandı.{ENDC}")
 
     try:
-        print(f"{BLUE}[Drone{drone_id}] Arming başlatılıyor...{ENDC}")
-        await asyncio.sleep(4)
-        await drone.action.arm()
-        await asyncio.sleep(4)  # Arming sonrası kısa bekleme
-
-        print(f"{BLUE}[Drone{drone_id}] Takeoff başlatılıyor...{ENDC}")
-        await drone.action.takeoff()
-        await asyncio.sleep(22)  # Takeoff sonrası drone havalansın
-
-        print(f"{BLUE}[Drone{drone_id}] Offboard başlatılıyor...{ENDC}")
-        await drone.offboard.set_velocity_ned(VelocityNedYaw(0.0, 0.0, 0.0, 0.0))
-        await drone.offboard.start()
+        await start_flight(drone, drone_id)
 
         await asyncio.gather(
             telemetry_collector(drone, drone_id, telemetry_shm),
@@ -224,12 +173,7 @@ async def run():
         )
     finally:
         print(f"{CYAN}[SHM] Temizleniyor...{ENDC}")
-        telemetry_shm.close()
-        if created_new_shm:
-            try:
-                telemetry_shm.unlink()
-            except FileNotFoundError:
-                pass
+        telemetry_shm.close(unlink=telemetry_shm.created)
         print(f"{GREEN}[SHM] Kapandı ve silindi.{ENDC}")
 
 if __name__ == "__main__":